@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+
+mkdir -p "$LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/analysis"
+grep -E "Stage [0-9]+ \(|^.* - (INFO|WARNING) -   " $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stdout.log > $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/analysis/summary.txt
+exit $?
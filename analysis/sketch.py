@@ -0,0 +1 @@
+../workload/report/sketch.py
\ No newline at end of file
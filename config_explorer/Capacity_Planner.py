@@ -9,6 +9,30 @@ import util
 from src.config_explorer.capacity_planner import *
 from decimal import Decimal
 
+# Parallelism sizes and GPU count considered by the what-if solver
+SOLVER_PP_SIZES = [1, 2, 4, 8]
+SOLVER_DP_SIZES = [1, 2, 4, 8]
+SOLVER_MAX_GPUS = 64
+
+@st.cache_data(show_spinner="Precomputing GPU fit table...")
+def model_gpu_fit_table(model_name: str, gpu_specs: dict, gpu_mem_util: float, _model_info: ModelInfo, _model_config: AutoConfig):
+    """
+    GPU fit table of a model over every accelerator, shared by sessions and reruns
+    """
+    text_config = get_text_config(_model_config)
+    max_len = max_context_len(_model_config)
+    context_lens = sorted({2 ** k for k in range(10, max_len.bit_length()) if 2 ** k < max_len} | {max_len})
+    return gpu_fit_table(
+        ModelMemoryProfile.from_model(_model_info, _model_config),
+        gpu_specs,
+        context_lens,
+        tp_values=find_possible_tp(text_config),
+        pp_values=[pp for pp in SOLVER_PP_SIZES if pp <= text_config.num_hidden_layers],
+        dp_values=SOLVER_DP_SIZES,
+        gpu_mem_util=gpu_mem_util,
+        max_gpus=SOLVER_MAX_GPUS,
+    )
+
 def update_gpu_spec():
     """
     Update user selected GPU spec in session state
@@ -22,13 +46,19 @@ def register_new_accelerator():
     """
     acc_name = st.text_input("Name", placeholder="NVIDIA-A100-40GB")
     acc_mem = st.number_input("Memory (GB)", min_value=1, step=1)
+    acc_bandwidth = st.number_input("Memory bandwidth (GB/s)", min_value=1, step=1,
+                                    help="Used for roofline latency and throughput estimates")
+    acc_tflops = st.number_input("Dense BF16/FP16 TFLOPS", min_value=1, step=1,
+                                 help="Used for roofline latency and throughput estimates")
 
     if st.button("Register", use_container_width=True):
         if acc_name:
 
             db.gpu_specs[acc_name] = {
                 "name": acc_name,
-                "memory": acc_mem
+                "memory": acc_mem,
+                "memory_bandwidth": acc_bandwidth,
+                "tflops": acc_tflops,
             }
             st.rerun()
 
@@ -108,7 +138,7 @@ def model_specification():
         if selected_model and selected_model != "":
             # Fetch model info
             try:
-                model_info = get_model_info_from_hf(selected_model)
+                model_info = util.model_metadata_store().get_model_info(selected_model)
                 user_scenario.model_info = model_info
             except Exception as e:
                 st.warning("Cannot access model information, see error below.")
@@ -117,7 +147,7 @@ def model_specification():
 
             # Fetch model config
             try:
-                model_config = get_model_config_from_hf(selected_model, hf_token=hf_token)
+                model_config = util.model_metadata_store().get_model_config(selected_model, hf_token=hf_token)
                 text_config = get_text_config(model_config)
                 user_scenario.model_config = model_config
                 user_scenario.text_config = text_config
@@ -127,7 +157,7 @@ def model_specification():
                     st.warning("This is a gated model, please submit a HF token to view information")
                     hf_token = st.text_input("HF token")
                     if hf_token:
-                        model_config = get_model_config_from_hf(selected_model, hf_token=hf_token)
+                        model_config = util.model_metadata_store().get_model_config(selected_model, hf_token=hf_token)
                         user_scenario.model_config = model_config
                 else:
                     st.warning("Cannot access model config, see error below.")
@@ -310,6 +340,13 @@ Higher max model length means fewer concurrent requests can be served, \
             col2.warning("Model does not have safetensors data available, cannot estimate KV cache memory requirement.")
             return None
 
+        placement = vllm_memory_placement(col2)
+        if placement is not None:
+            max_concurrent_requests_num = per_gpu_max_concurrent_requests(placement[1],
+                                                                          user_scenario.max_model_len,
+                                                                          user_scenario.dp_size,
+                                                                          )
+
         try:
             kv_details = KVCacheDetail(
                 model_info,
@@ -320,8 +357,9 @@ Higher max model length means fewer concurrent requests can be served, \
         except AttributeError as e:
             col2.warning(f"There is not enough information to estimate KV cache requirement per request: {e}")
             return None
+        _, per_request_kv_cache_memory, _ = memory_totals(placement)
 
-        col2.info(f"Assuming the worst case scenario, such that every request contains `--max-model-len` tokens, each request takes {util.pretty_round(kv_details.per_request_kv_cache_gb)} GB for KV cache, which means the maximum concurrent requests that can be processed is {max_concurrent_requests_num}.")
+        col2.info(f"Assuming the worst case scenario, such that every request contains `--max-model-len` tokens, each request takes {util.pretty_round(per_request_kv_cache_memory)} GB for KV cache, which means the maximum concurrent requests that can be processed is {max_concurrent_requests_num}.")
 
         # Display details on how KV cache is estimated
         with st.expander("See how KV cache is calculated below"):
@@ -441,27 +479,19 @@ def hardware_specification():
                 return None
 
             model_size_per_gpu = per_gpu_model_memory_required(model_info, model_config, tp, pp)
-            allocatable_kv_cache = allocatable_kv_cache_memory(model_info,
-                                                    model_config,
-                                                    gpu_memory,
-                                                    user_scenario.gpu_mem_util,
-                                                    tp,
-                                                    pp,
-                                                    dp,
-                                                    )
-
-            kv_details = KVCacheDetail(model_info, model_config,
-                                    user_scenario.max_model_len,
-                                    user_scenario.concurrency,
-                                    )
-            per_request_kv_cache_memory = kv_details.per_request_kv_cache_gb
-            all_request_kv_cache_memory = kv_details.kv_cache_size_gb
+            # Place attention, dense and expert weights of each layer as vLLM does, for the most loaded GPU
+            placement = vllm_memory_placement(st)
+            per_gpu_breakdown = None
+            if placement is not None:
+                per_gpu_breakdown, kv_cache_blocks_per_gpu = placement
+                model_size_per_gpu = per_gpu_breakdown["Weights_GB"].max()
+            total_model_size, per_request_kv_cache_memory, allocatable_kv_cache = memory_totals(placement)
+            all_request_kv_cache_memory = per_request_kv_cache_memory * concurrency
 
             # Compute more info for pretty print
             total_memory = gpu_memory * available_gpu_count
             total_available_gpu_mem = available_gpu_mem * available_gpu_count
             reserved = total_memory - total_available_gpu_mem
-            total_model_size = model_size * dp
             kv_cache_available_per_gpu = available_gpu_mem - model_size_per_gpu
             free = total_available_gpu_mem - total_model_size - all_request_kv_cache_memory
 
@@ -475,7 +505,13 @@ def hardware_specification():
 - Free memory available for KV cache: {util.pretty_round(kv_cache_available_per_gpu)} GB
 """)
 
-            memory_util_chart(col1)
+            if per_gpu_breakdown is not None:
+                with col1.expander("Memory breakdown per GPU by component"):
+                    st.caption("Weights of each pipeline stage, as placed by vLLM: TP shards attention, dense MLP and embeddings, and experts are sharded across `TP x DP` GPUs or, with EP, distributed whole across them. The compressed KV cache of MLA models is replicated on every TP rank.")
+                    st.dataframe(per_gpu_breakdown, hide_index=True)
+                    st.write(f"KV cache blocks per GPU (16 tokens each, as `# GPU blocks` of vLLM): {kv_cache_blocks_per_gpu}")
+
+            memory_util_chart(col1, placement)
 
             with col1.expander("Total memory breakdown"):
                 st.markdown(f"""
@@ -518,15 +554,74 @@ def hardware_specification():
         """
                 col2.code(vllm_serve_cmd)
 
-def memory_util_chart(st_context):
+def vllm_memory_placement(st_context) -> tuple[pd.DataFrame, int] | None:
     """
-    Show memory utilization chart
+    Returns the memory breakdown per GPU and the KV cache blocks of each GPU, placing weights as vLLM does,
+    or None with a warning if the layers of the model cannot be derived from its config
+    """
+
+    user_scenario = st.session_state[util.USER_SCENARIO_KEY]
+    gpu_memory = user_scenario.get_gpu_memory(db.gpu_specs)
+    tp = user_scenario.tp_size
+    pp = user_scenario.pp_size
+    dp = user_scenario.dp_size
+
+    try:
+        layer_memory = ModelLayerMemory.from_model(user_scenario.model_info, user_scenario.model_config)
+        breakdown = per_gpu_memory_breakdown(layer_memory, tp, pp, dp, user_scenario.enable_ep)
+        kv_cache_blocks = per_gpu_kv_cache_blocks(layer_memory,
+                                                  gpu_memory,
+                                                  user_scenario.gpu_mem_util,
+                                                  tp,
+                                                  pp,
+                                                  dp,
+                                                  user_scenario.enable_ep,
+                                                  )
+    except Exception as e:
+        st_context.warning(f"Cannot place the layers of the model on GPUs as vLLM does, weights and KV cache are assumed to be evenly split across GPUs: {e}")
+        return None
+    return breakdown, kv_cache_blocks
+
+def memory_totals(placement: tuple[pd.DataFrame, int] | None) -> tuple[float, float, float]:
+    """
+    Returns the weights of all GPUs, the KV cache of a request of max-model-len tokens and the KV cache allocatable
+    on all GPUs, in GB. Without placement, weights and KV cache are evenly split across GPUs.
     """
 
     user_scenario = st.session_state[util.USER_SCENARIO_KEY]
     model_info = user_scenario.model_info
     model_config = user_scenario.model_config
-    text_config = user_scenario.text_config
+    tp = user_scenario.tp_size
+    pp = user_scenario.pp_size
+    dp = user_scenario.dp_size
+
+    if placement is None:
+        model_size = model_memory_req(model_info, model_config) * dp
+        per_request_kv_cache = kv_cache_req(model_info, model_config, user_scenario.max_model_len)
+        allocatable_kv_cache = allocatable_kv_cache_memory(model_info,
+                                                           model_config,
+                                                           user_scenario.get_gpu_memory(db.gpu_specs),
+                                                           user_scenario.gpu_mem_util,
+                                                           tp,
+                                                           pp,
+                                                           dp,
+                                                           )
+        return model_size, per_request_kv_cache, allocatable_kv_cache
+
+    # Each stage of each DP replica runs on TP GPUs, and a request is cached by every GPU of a replica
+    breakdown, kv_cache_blocks = placement
+    model_size = breakdown["Weights_GB"].sum() * tp * dp
+    per_token_bytes = breakdown["KV_Cache_Bytes_Per_Token"].sum() * tp
+    per_request_kv_cache = bytes_to_gib(per_token_bytes * user_scenario.max_model_len)
+    allocatable_kv_cache = bytes_to_gib(per_token_bytes * kv_cache_blocks * 16 * dp)
+    return model_size, per_request_kv_cache, allocatable_kv_cache
+
+def memory_util_chart(st_context, placement: tuple[pd.DataFrame, int] | None):
+    """
+    Show memory utilization chart
+    """
+
+    user_scenario = st.session_state[util.USER_SCENARIO_KEY]
     gpu_memory = user_scenario.get_gpu_memory(db.gpu_specs)
     gpu_memory_util = user_scenario.gpu_mem_util
     concurrency = user_scenario.concurrency
@@ -538,8 +633,8 @@ def memory_util_chart(st_context):
     total_memory = gpus_required(tp, pp, dp) * gpu_memory
     available = gpus_required(tp, pp, dp) * available_gpu_memory(gpu_memory, gpu_memory_util)
     reserved = total_memory - available
-    model_size = model_memory_req(model_info, model_config) * dp
-    max_concurrency_kv_cache = kv_cache_req(model_info, model_config, user_scenario.max_model_len, concurrency)
+    model_size, per_request_kv_cache, _ = memory_totals(placement)
+    max_concurrency_kv_cache = per_request_kv_cache * concurrency
     free = available - model_size - max_concurrency_kv_cache
 
     if free < 0:
@@ -582,6 +677,109 @@ def memory_util_chart(st_context):
     with col:
         st.pyplot(fig, bbox_inches="tight")
 
+def performance_estimation():
+    """
+    Estimate latency and throughput bounds of a replica with a roofline model
+    """
+
+    user_scenario = st.session_state[util.USER_SCENARIO_KEY]
+    model_info = user_scenario.model_info
+    model_config = user_scenario.model_config
+
+    with st.container(border=True):
+        st.write("**Performance Estimation**")
+        st.caption("Estimate the best achievable TTFT, ITL and token throughput of a replica with a roofline model: each forward pass takes the longer of its FLOPs over the accelerator FLOPS and its bytes moved (model weights and KV cache) over the accelerator memory bandwidth, both scaled by TP. For MoE models, FLOPs count the active parameters, and a forward pass reads the experts its tokens are routed to. Measured performance is lower, due to kernel efficiency, scheduling and communication.")
+
+        if model_info is None or model_config is None:
+            st.warning("Model config not found.")
+            return None
+
+        gpu_spec = user_scenario.get_gpu_spec(db.gpu_specs)
+        if "memory_bandwidth" not in gpu_spec or "tflops" not in gpu_spec:
+            st.warning(f"Memory bandwidth and FLOPS of `{user_scenario.gpu_name}` are unknown.")
+            return None
+
+        try:
+            profile = ModelComputeProfile.from_model(model_info, model_config)
+        except Exception as e:
+            st.warning(f"Cannot estimate performance for this model: {e}")
+            return None
+
+        col1, col2 = st.columns(2)
+        input_len = col1.number_input("Input sequence length",
+                                      min_value=1,
+                                      value=1024,
+                                      key=util.SELECTED_ROOFLINE_ISL_KEY,
+                                      )
+        output_len = col2.number_input("Output sequence length",
+                                       min_value=1,
+                                       value=1024,
+                                       key=util.SELECTED_ROOFLINE_OSL_KEY,
+                                       )
+
+        estimate = estimate_roofline(profile,
+                                     gpu_spec["memory_bandwidth"],
+                                     gpu_spec["tflops"],
+                                     input_len,
+                                     output_len,
+                                     batch_size=max(1, user_scenario.concurrency),
+                                     tp=user_scenario.tp_size,
+                                     )
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Min TTFT (ms)", util.pretty_round(estimate.ttft_s.item() * 1000),
+                    help=f"Prefill of {user_scenario.concurrency} prompts, {'compute' if estimate.prefill_compute_bound.item() else 'memory bandwidth'} bound")
+        col2.metric("Min ITL (ms)", util.pretty_round(estimate.itl_s.item() * 1000),
+                    help=f"Decode step of {user_scenario.concurrency} requests, {'compute' if estimate.decode_compute_bound.item() else 'memory bandwidth'} bound")
+        col3.metric("Max prefill tokens/s", f"{estimate.prefill_tokens_per_s.item():,.0f}")
+        col4.metric("Max decode tokens/s", f"{estimate.decode_tokens_per_s.item():,.0f}")
+
+def what_if_solver():
+    """
+    Find the cheapest configurations serving a concurrency at a context length, from a table precomputed for the model
+    """
+
+    user_scenario = st.session_state[util.USER_SCENARIO_KEY]
+    model_info = user_scenario.model_info
+    model_config = user_scenario.model_config
+
+    with st.container(border=True):
+        st.write("**What-if Solver**")
+        st.caption(f"Find the cheapest configurations across all accelerators, TP, PP (up to {SOLVER_PP_SIZES[-1]}) and DP (up to {SOLVER_DP_SIZES[-1]}) with at most {SOLVER_MAX_GPUS} GPUs, serving a number of concurrent requests at a context length. Configurations with fewer GPUs, then less total GPU memory, are considered cheaper.")
+
+        if model_info is None or model_config is None:
+            st.warning("Model config not found.")
+            return None
+
+        try:
+            fit_table = model_gpu_fit_table(user_scenario.model_name, db.gpu_specs, user_scenario.gpu_mem_util, model_info, model_config)
+        except Exception as e:
+            st.warning(f"Cannot precompute GPU fit table for this model: {e}")
+            return None
+
+        largest_context_len = int(fit_table["Context_Len"].max())
+        col1, col2 = st.columns(2)
+        concurrency = col1.number_input("Concurrent requests",
+                                        min_value=1,
+                                        value=max(1, user_scenario.concurrency),
+                                        key=util.SELECTED_WHAT_IF_CONCURRENCY_KEY,
+                                        )
+        context_len = col2.number_input("Context length (tokens per request)",
+                                        min_value=1,
+                                        max_value=largest_context_len,
+                                        value=min(max(1, user_scenario.max_model_len), largest_context_len),
+                                        key=util.SELECTED_WHAT_IF_CONTEXT_LEN_KEY,
+                                        help="Concurrency is looked up at the next precomputed context length (powers of two and the max context length of the model), which is conservative.",
+                                        )
+
+        fits = find_cheapest_fit(fit_table, concurrency, context_len)
+        if fits.empty:
+            st.warning(f"No configuration with at most {SOLVER_MAX_GPUS} GPUs serves {concurrency} concurrent requests of {context_len} tokens.")
+            return None
+
+        cheapest = fits.iloc[0]
+        st.info(f"Cheapest configuration: `{cheapest['GPUs']}` x `{cheapest['GPU']}` with `TP={cheapest['TP']}`, `PP={cheapest['PP']}`, `DP={cheapest['DP']}`, serving up to {cheapest['Max_Concurrency']} concurrent requests of {cheapest['Context_Len']} tokens.")
+        st.dataframe(fits.head(20), hide_index=True)
+
 if __name__ == '__main__':
 
     # Set up streamlit config
@@ -604,4 +802,6 @@ if __name__ == '__main__':
     model_specification()
     parallelism_specification()
     workload_specification()
-    hardware_specification()
\ No newline at end of file
+    hardware_specification()
+    performance_estimation()
+    what_if_solver()
@@ -1,8 +1,10 @@
+import os
 from typing import Any, Dict, List
 from numpy import float64
 from pandas import DataFrame
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
+import db
 import util
 
 import src.config_explorer.explorer as xp
@@ -12,6 +14,17 @@ BENCHMARK_PATH_KEY = "benchmark_path"
 BENCHMARK_DATA_KEY = "benchmark_data"
 SELECTED_SCENARIO_KEY = "selected_scenario"
 SELECTED_SLO_METRICS_KEY = "selected_slo_metrics"
+BENCHMARK_WATCHER_KEY = "benchmark_watcher"
+SWEEP_INDEX_KEY = "sweep_index"
+AUTO_REFRESH_KEY = "auto_refresh"
+AUTO_REFRESH_SECONDS = 10
+
+# Measured metrics with roofline predictions, and their prediction columns
+ROOFLINE_METRICS = {
+    'Mean_TTFT_ms': 'Roofline_TTFT_ms',
+    'Mean_ITL_ms': 'Roofline_ITL_ms',
+    'Mean_TPOT_ms': 'Roofline_ITL_ms',
+}
 
 # ------- Scenario presets -------
 
@@ -105,21 +118,37 @@ def init_session_state():
     if SELECTED_SLO_METRICS_KEY not in st.session_state:
         st.session_state[SELECTED_SLO_METRICS_KEY] = DEFAULT_SLOS
 
-@st.cache_data
 def read_benchmark_path(benchmark_path: str) -> DataFrame:
     """
-    Reads the data at the path
+    Reads the data at the path, from report logs where a sweep wrote them and
+    from report files otherwise, only parsing report files and logs which are
+    new or changed since the path was last read
     """
 
-    runs = xp.make_benchmark_runs_df()
-
-    report_files = xp.get_benchmark_report_files(benchmark_path)
-    for br_file in report_files:
+    watcher = st.session_state.get(BENCHMARK_WATCHER_KEY)
+    if watcher is None or watcher.source_dir != os.path.abspath(benchmark_path):
+        # Parse reports in parallel, reusing rows cached from previous imports
+        watcher = xp.BenchmarkReportWatcher(
+            benchmark_path,
+            cache_file=xp.get_runs_cache_file(benchmark_path),
+        )
+        st.session_state[BENCHMARK_WATCHER_KEY] = watcher
+    watcher.refresh()
+    return watcher.runs_df
 
-        # Update session state data
-        xp.add_benchmark_report_to_df(runs, br_file)
+@st.fragment(run_every=AUTO_REFRESH_SECONDS)
+def auto_refresh_benchmark_data():
+    """
+    Periodically loads new report files of a live sweep, rerunning the page
+    when data changed
+    """
 
-    return runs
+    watcher = st.session_state.get(BENCHMARK_WATCHER_KEY)
+    if watcher is None:
+        return
+    if watcher.refresh():
+        st.session_state[BENCHMARK_DATA_KEY] = watcher.runs_df
+        st.rerun()
 
 def user_benchmark_path():
     """
@@ -141,10 +170,17 @@ def user_benchmark_path():
             try:
                 st.session_state[BENCHMARK_DATA_KEY] = read_benchmark_path(benchmark_path)
 
-                st.toast(f"Successfully imported {len(st.session_state[BENCHMARK_DATA_KEY])} report files. You may view the raw data below.", icon="🎉")
+                log_files = st.session_state[BENCHMARK_WATCHER_KEY].log_files
+                st.toast(f"Successfully imported {len(st.session_state[BENCHMARK_DATA_KEY])} benchmark reports, from {len(log_files)} report logs and report files of results without a log. You may view the raw data below.", icon="🎉")
             except Exception:
                 st.toast("File not found, please double check path.", icon='⚠️')
 
+    if st.toggle("Auto-refresh",
+                 key=AUTO_REFRESH_KEY,
+                 help=f"Load new benchmark report files and report logs of the imported path every {AUTO_REFRESH_SECONDS} seconds, such as during a sweep.",
+                 ):
+        auto_refresh_benchmark_data()
+
 
 @st.dialog("Add SLO metric")
 def add_metric_dialog():
@@ -178,7 +214,7 @@ def delete_metric_dialog():
     Dialogue to delete a SLO metric
     """
 
-    st.write(f"Deleting a metric means that the optimal configuration does not take this metric into account. Any of the non-default (`{", ".join(DEFAULT_SLOS)}`) metrics can be deleted.\n\nIf you'd like to disable the default metrics, set them to an extremely high or low value to disable their effect.")
+    st.write(f"Deleting a metric means that the optimal configuration does not take this metric into account. Any of the non-default (`{', '.join(DEFAULT_SLOS)}`) metrics can be deleted.\n\nIf you'd like to disable the default metrics, set them to an extremely high or low value to disable their effect.")
 
     curr_metrics = st.session_state[SELECTED_SLO_METRICS_KEY]
 
@@ -191,18 +227,29 @@ def delete_metric_dialog():
         st.session_state[SELECTED_SLO_METRICS_KEY].remove(to_delete)
         st.rerun()
 
-def filter_data_on_inputs(data: DataFrame, user_inputs: dict) -> DataFrame:
+def get_sweep_index() -> xp.SweepIndex:
+    """
+    Gets the index of the imported data, building it when data changed
+    """
+
+    benchmark_data = st.session_state[BENCHMARK_DATA_KEY]
+    sweep_index = st.session_state.get(SWEEP_INDEX_KEY)
+    if sweep_index is None or sweep_index.runs_df is not benchmark_data:
+        sweep_index = xp.SweepIndex(benchmark_data)
+        st.session_state[SWEEP_INDEX_KEY] = sweep_index
+    return sweep_index
+
+def filter_data_on_inputs(sweep_index: xp.SweepIndex, user_inputs: dict) -> DataFrame:
     """
     Filters data on inputs and SLOs
     """
 
-    return data[
-        (data['Model'] == user_inputs['model']) &
-        (data['GPU'] == user_inputs['gpu_type']) &
-        (data['Num_GPUs'] <= user_inputs['num_gpus']) &
-        (data['ISL'] >= user_inputs['isl']) &
-        (data['OSL'] >= user_inputs['osl'])
-        ]
+    return sweep_index.get_df(
+        {'Model': user_inputs['model'], 'GPU': user_inputs['gpu_type']},
+        max_num_gpus=user_inputs['num_gpus'],
+        min_isl=user_inputs['isl'],
+        min_osl=user_inputs['osl'],
+        )
 
 def inputs(tab: DeltaGenerator):
     """
@@ -221,15 +268,18 @@ def inputs(tab: DeltaGenerator):
         tab.info("Import data above.")
         return None
 
+    sweep_index = get_sweep_index()
+    model_gpus = sweep_index.model_gpus()
+
     with tab.container(border=True):
         scenario_to_return['Model'] = st.selectbox(
             "Select a model",
-            options=benchmark_data['Model'].unique()
+            options=list(dict.fromkeys(model for model, _ in model_gpus))
             )
 
         scenario_to_return['GPU'] = st.selectbox(
             "Select an accelerator type",
-            options=benchmark_data['GPU'].unique()
+            options=list(dict.fromkeys(gpu for _, gpu in model_gpus))
         )
 
     with tab.container(border=True):
@@ -237,10 +287,10 @@ def inputs(tab: DeltaGenerator):
         st.caption("Define the type of workload for the LLM. Based on the model and environment inputs, the available options are shown below.")
 
         # Show available combinations
-        runs = benchmark_data[
-            (benchmark_data["Model"] == scenario_to_return['Model']) &
-            (benchmark_data["GPU"] == scenario_to_return['GPU'])
-        ]
+        runs = sweep_index.get_df({
+            'Model': scenario_to_return['Model'],
+            'GPU': scenario_to_return['GPU'],
+        })
 
         selected_workload = st.radio("Select workload", options=preset_scenarios.keys())
 
@@ -378,6 +428,10 @@ def display_optimal_config_overview(container: DeltaGenerator,
                     format_func=lambda p: f"{xp.PERFORMANCE_METRIC_COLUMNS[p].label}",
     )
 
+    # Rows meeting SLOs and Pareto fronts are memoized by the index, so they
+    # are only found once for each scenario and SLOs
+    sweep_index = get_sweep_index()
+
     # Configuration columns of interest
     tradeoff_plot = xplotting.plot_pareto_tradeoff(
         runs_df=original_benchmark_data,
@@ -386,19 +440,17 @@ def display_optimal_config_overview(container: DeltaGenerator,
         col_y=col_y,
         slos=slos,
         log_x=log_x,
-        log_y=log_y
+        log_y=log_y,
+        sweep_index=sweep_index,
         )
     container.pyplot(tradeoff_plot)
 
     # Print tab1le of optimal configurations
-    # Get scenario rows from all runs in dataset
-    runs_scenario = xp.get_scenario_df(original_benchmark_data, user_selected_scenario)
-
-    # Get just the rows that meet SLOs
-    runs_meet_slo = xp.get_meet_slo_df(runs_scenario, slos)
+    # Get just the rows of the scenario that meet SLOs
+    runs_meet_slo = sweep_index.get_meet_slo_df(user_selected_scenario, slos)
 
     # Get rows on Pareto front
-    runs_pareto_front = xp.get_pareto_front_df(runs_meet_slo, col_x, col_y, True)
+    runs_pareto_front = sweep_index.get_pareto_front_df(user_selected_scenario, slos, col_x, col_y, True)
 
     # Print the rows on Pareto front, showing just the columns of interest
     columns_of_interest = config_columns + slo_columns
@@ -408,6 +460,112 @@ def display_optimal_config_overview(container: DeltaGenerator,
 
     container.dataframe(runs_pareto_front[columns_of_interest])
 
+def find_accelerator_spec(gpu: str) -> str | None:
+    """
+    Finds the accelerator in db.json matching the GPU of benchmark runs, by name or prefix
+    """
+
+    if gpu in db.gpu_specs:
+        return gpu
+    for name, spec in db.gpu_specs.items():
+        if spec.get('prefix') and spec['prefix'].lower() in gpu.lower():
+            return name
+    return None
+
+def add_roofline_columns(runs: DataFrame,
+                         profile: util.ModelComputeProfile,
+                         gpu_spec: dict,
+                         compute_efficiency: float,
+                         bandwidth_efficiency: float,
+                         ) -> DataFrame:
+    """
+    Adds roofline TTFT and ITL predictions of aggregate runs
+
+    TTFT is bounded by the prefill of a single prompt, and ITL by a decode step of the concurrent requests of a replica.
+    """
+
+    runs = runs.copy()
+    tp = runs['TP'].fillna(1).to_numpy(dtype=float)
+    engines = (runs['Replicas'].fillna(1) * runs['DP'].fillna(1)).to_numpy(dtype=float)
+    # Runs at a fixed QPS have no max concurrency, so are estimated at a batch of one
+    batch_size = (runs['Max_Concurrency'].fillna(1).to_numpy(dtype=float) / engines).clip(min=1)
+    kwargs = dict(
+        memory_bandwidth=gpu_spec['memory_bandwidth'],
+        tflops=gpu_spec['tflops'],
+        input_len=runs['ISL'].to_numpy(),
+        output_len=runs['OSL'].to_numpy(),
+        tp=tp,
+        compute_efficiency=compute_efficiency,
+        bandwidth_efficiency=bandwidth_efficiency,
+    )
+    prefill = util.estimate_roofline(profile, batch_size=1, **kwargs)
+    decode = util.estimate_roofline(profile, batch_size=batch_size, **kwargs)
+    runs['Roofline_TTFT_ms'] = prefill.ttft_s * 1000
+    runs['Roofline_ITL_ms'] = decode.itl_s * 1000
+    return runs
+
+def display_roofline_overview(container: DeltaGenerator, user_selected_scenario: Dict[str, Any]):
+    """
+    Displays measured latency against roofline predictions
+    """
+
+    container.subheader("Compare with roofline estimates")
+    container.caption("A roofline model bounds the latency of a replica by the longer of the FLOPs of a forward pass over the accelerator FLOPS and its bytes moved (model weights and KV cache) over the accelerator memory bandwidth. The gap between measured and estimated latency shows how far a configuration is from the hardware limits. Prefill/decode disaggregated runs are not shown.")
+
+    # Rows of aggregate runs of the scenario
+    runs = get_sweep_index().get_df(user_selected_scenario)
+    runs = runs[~runs['Is_PD'].fillna(False).astype(bool)]
+    if len(runs) == 0:
+        container.info("No aggregate runs match the selected scenario.")
+        return None
+
+    col1, col2, col3 = container.columns(3)
+    acc_names = list(db.gpu_specs.keys())
+    matched_acc = find_accelerator_spec(str(user_selected_scenario['GPU']))
+    acc_name = col1.selectbox("Accelerator specification",
+                              options=acc_names,
+                              index=acc_names.index(matched_acc) if matched_acc else 0,
+                              help="Memory bandwidth and FLOPS of the accelerator, from `db.json`.",
+                              )
+    compute_efficiency = col2.slider("Achievable fraction of peak FLOPS", 0.05, 1.0, 1.0, 0.05)
+    bandwidth_efficiency = col3.slider("Achievable fraction of peak memory bandwidth", 0.05, 1.0, 1.0, 0.05)
+
+    gpu_spec = db.gpu_specs[acc_name]
+    if 'memory_bandwidth' not in gpu_spec or 'tflops' not in gpu_spec:
+        container.warning(f"Memory bandwidth and FLOPS of `{acc_name}` are unknown.")
+        return None
+
+    model_name = user_selected_scenario['Model']
+    try:
+        store = util.model_metadata_store()
+        profile = util.ModelComputeProfile.from_model(store.get_model_info(model_name), store.get_model_config(model_name))
+    except Exception as e:
+        container.warning(f"Cannot access model information of `{model_name}`: {e}")
+        return None
+
+    runs = add_roofline_columns(runs, profile, gpu_spec, compute_efficiency, bandwidth_efficiency)
+
+    metric_col1, metric_col2 = container.columns(2)
+    col_y = metric_col1.selectbox("Select y-axis latency metric",
+                    options=ROOFLINE_METRICS.keys(),
+                    format_func=lambda p: xp.PERFORMANCE_METRIC_COLUMNS[p].label_with_units(),
+        )
+    col_x = metric_col2.selectbox("Select x-axis input metric",
+                    options=xp.INPUT_COLUMNS.keys(),
+                    index=list(xp.INPUT_COLUMNS.keys()).index('Max_Concurrency'),
+                    format_func=lambda p: f"{xp.INPUT_COLUMNS[p].label}",
+        )
+
+    roofline_plot = xplotting.plot_roofline(
+        runs_df=runs,
+        scenario=user_selected_scenario,
+        config_keys=['Replicas', 'TP'],
+        col_x=col_x,
+        col_y=col_y,
+        col_roofline=ROOFLINE_METRICS[col_y],
+    )
+    container.pyplot(roofline_plot)
+
 def outputs(tab: DeltaGenerator, user_inputs: dict):
     """
     Outputs to the Visualizer
@@ -433,11 +591,12 @@ def outputs(tab: DeltaGenerator, user_inputs: dict):
     slos_cols = []
     if selected_display_preset:
 
-        tab1, tab2 = tab.tabs(["📈 Performance overview", "🌟 Optimal configuration overview"])
+        tab1, tab2, tab3 = tab.tabs(["📈 Performance overview", "🌟 Optimal configuration overview", "📐 Roofline comparison"])
 
         # Describe each tab
         tab1.info("View a summary of the data based on the selected preset. Each preset groups configurations define a specific scenario, helping to highlight its performance characteristics.")
         tab2.info("Given SLO requirements, filter for the best configurations of parallelism and replicas in aggregate and disaggregated setup.")
+        tab3.info("Compare measured latency of aggregate configurations with bounds estimated from the model size and accelerator memory bandwidth and FLOPS.")
 
         scenario_preset = scenarios_config_keys_mapping[selected_display_preset]
         user_selected_scenario = user_inputs['scenario']
@@ -575,6 +734,7 @@ def outputs(tab: DeltaGenerator, user_inputs: dict):
             tab1.warning("This feature is not yet available. To perform you own data exploration, see this [example Jupyter notebook](https://github.com/llm-d/llm-d-benchmark/blob/main/analysis/analysis.ipynb) for analysis using the `config_explorer` library.")
 
         display_optimal_config_overview(tab2, config_cols, slos_cols, original_benchmark_data, user_inputs, user_selected_scenario)
+        display_roofline_overview(tab3, user_selected_scenario)
 
 if __name__ == "__main__":
     # Set up streamlit config
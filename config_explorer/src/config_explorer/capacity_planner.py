@@ -4,11 +4,18 @@ Capacity planner provides functionality to estimate the minimum number of GPUs r
 
 from dataclasses import dataclass
 from enum import StrEnum
+import json
 import math
 from functools import reduce
+import hashlib
+import os
 import re
-from typing import List
+import time
+from typing import Any, List
 from huggingface_hub import HfApi, ModelInfo
+from huggingface_hub.constants import HF_HUB_OFFLINE
+import numpy as np
+import pandas as pd
 
 import contextlib
 import io
@@ -146,6 +153,275 @@ def get_model_config_from_hf(model_name: str, hf_token: str=None) -> AutoConfig:
 
     return model_config
 
+# ---------------------- Model metadata store ----------------------
+DEFAULT_MODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "llm-d-benchmark", "models")
+DEFAULT_MODEL_CACHE_TTL = 24 * 60 * 60      # seconds
+MODEL_INFO_FILE = "model_info.json"
+MODEL_CONFIG_FILE = "config.json"
+
+def model_info_to_dict(model_info: ModelInfo) -> dict[str, Any]:
+    """
+    Returns the fields of ModelInfo used for capacity planning, which can be saved as JSON
+    """
+
+    # Gated models have public model info, but their config needs a token with access
+    data = {"id": model_info.id, "sha": model_info.sha, "gated": model_info.gated or False, "safetensors": None}
+    if model_info.safetensors is not None:
+        data["safetensors"] = {
+            "parameters": dict(model_info.safetensors.parameters),
+            "total": model_info.safetensors.total,
+        }
+    return data
+
+def model_info_from_dict(data: dict[str, Any]) -> ModelInfo:
+    """
+    Returns ModelInfo from the fields saved by model_info_to_dict()
+    """
+
+    return ModelInfo(**data)
+
+def model_config_from_dict(data: dict[str, Any]) -> AutoConfig:
+    """
+    Returns model config from the contents of config.json, without connecting to Hugging Face
+
+    Configs of architectures unknown to transformers (such as models with remote code) are loaded as a generic
+    config, with the same attributes.
+    """
+
+    from transformers import CONFIG_MAPPING, PretrainedConfig
+
+    model_type = data.get("model_type")
+    if model_type in CONFIG_MAPPING:
+        return CONFIG_MAPPING[model_type].from_dict(data)
+
+    config = PretrainedConfig.from_dict(data)
+    if isinstance(getattr(config, "text_config", None), dict):
+        config.text_config = model_config_from_dict(config.text_config)
+    return config
+
+class ModelMetadataStore:
+    """
+    ModelMetadataStore is a persistent local cache of model info and model config from Hugging Face
+
+    Entries are looked up in order from:
+    1. the snapshot directory, if given, which is never refreshed. A snapshot can be made with save_snapshot() or by
+       copying config.json of models, and allows planning in air-gapped environments.
+    2. the cache directory, if the entry is younger than the TTL.
+    3. Hugging Face, unless offline, saving the entry in the cache directory.
+    4. the cache directory, if the entry is expired but Hugging Face cannot be reached.
+
+    Entries of a model are stored in <directory>/<model name>/model_info.json and config.json.
+
+    A store can be shared by users with different HF tokens. The config of a gated model is only served from memory
+    or the cache directory to tokens that Hugging Face gave access to, otherwise it is fetched again with the token
+    of the caller, so Hugging Face decides. Entries in memory expire with the same TTL as the cache directory.
+    """
+
+    def __init__(self,
+                 cache_dir: str | None = DEFAULT_MODEL_CACHE_DIR,
+                 ttl: float | None = DEFAULT_MODEL_CACHE_TTL,
+                 snapshot_dir: str | None = None,
+                 offline: bool | None = None,
+                 ):
+        """
+        Creates a store. Without cache_dir, entries are only kept in memory. A TTL of None never expires entries.
+        Offline defaults to the HF_HUB_OFFLINE environment variable.
+        """
+
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.snapshot_dir = snapshot_dir
+        self.offline = HF_HUB_OFFLINE if offline is None else offline
+        # (model name, file name) -> (data, time loaded)
+        self._memo = {}
+        # (model name, hash of HF token) given access to the config of a gated model
+        self._access = set()
+
+    def _path(self, base_dir: str, model_name: str, file_name: str) -> str:
+        """
+        Returns the path of an entry of a model
+        """
+
+        parts = model_name.strip("/").split("/")
+        if any(part in ("", ".", "..") for part in parts):
+            raise ValueError(f"Invalid model name: {model_name}")
+        return os.path.join(base_dir, *parts, file_name)
+
+    def _read_snapshot(self, model_name: str, file_name: str) -> dict[str, Any] | None:
+        """
+        Reads an entry from the snapshot directory, if it exists
+        """
+
+        if self.snapshot_dir:
+            path = self._path(self.snapshot_dir, model_name, file_name)
+            if os.path.isfile(path):
+                with open(path, "r", encoding="UTF-8") as file:
+                    return json.load(file)
+        return None
+
+    def _read_cache(self, model_name: str, file_name: str, max_age: float | None) -> dict[str, Any] | None:
+        """
+        Reads an entry from the cache directory, if it exists and is younger than max_age
+        """
+
+        if self.cache_dir:
+            path = self._path(self.cache_dir, model_name, file_name)
+            try:
+                if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+                    return None
+                with open(path, "r", encoding="UTF-8") as file:
+                    return json.load(file)
+            except (OSError, ValueError):
+                # Missing or unreadable entry
+                return None
+        return None
+
+    def _write(self, base_dir: str, model_name: str, file_name: str, data: dict[str, Any]) -> None:
+        """
+        Writes an entry atomically, so concurrent readers never see a partial file
+        """
+
+        path = self._path(base_dir, model_name, file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as file:
+            json.dump(data, file, indent=2)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _token_key(hf_token: str | None) -> str | None:
+        """
+        Returns a hash of a HF token, so tokens are not kept in memory
+        """
+
+        return hashlib.sha256(hf_token.encode()).hexdigest() if hf_token else None
+
+    def _get(self, model_name: str, file_name: str, fetch, hf_token: str | None = None, gated: bool = False) -> dict[str, Any]:
+        """
+        Returns an entry, fetching it from Hugging Face if needed
+
+        Entries of gated models are only served from memory or the cache directory to tokens with access. Offline,
+        access cannot be checked, and any token is accepted.
+        """
+
+        key = (model_name, file_name)
+        token_key = self._token_key(hf_token)
+        shared = not gated or (model_name, token_key) in self._access or (self.offline and bool(hf_token))
+
+        if shared and key in self._memo:
+            data, loaded = self._memo[key]
+            if self.offline or self.ttl is None or time.time() - loaded <= self.ttl:
+                return data
+
+        data = self._read_snapshot(model_name, file_name)
+        if data is None and shared:
+            data = self._read_cache(model_name, file_name, None if self.offline else self.ttl)
+        if data is None:
+            if self.offline:
+                if not shared:
+                    raise PermissionError(f"{model_name} is a gated model, a HF token is needed to read its {file_name} from the cache directory")
+                raise FileNotFoundError(f"{file_name} of {model_name} is not in the model snapshot or cache directory, and Hugging Face is offline")
+            try:
+                data = fetch()
+            except Exception:
+                # Fall back to an expired entry, unless the caller may not have access to it
+                data = self._read_cache(model_name, file_name, None) if shared else None
+                if data is None:
+                    raise
+            else:
+                if gated:
+                    self._access.add((model_name, token_key))
+                if self.cache_dir:
+                    try:
+                        self._write(self.cache_dir, model_name, file_name, data)
+                    except OSError:
+                        # Cache is an optimization, a read only directory is not an error
+                        pass
+
+        self._memo[key] = (data, time.time())
+        return data
+
+    def _get_model_info_data(self, model_name: str, hf_token: str | None) -> dict[str, Any]:
+        """
+        Returns the fields of model info, from the store or Hugging Face
+        """
+
+        return self._get(
+            model_name, MODEL_INFO_FILE,
+            lambda: model_info_to_dict(get_model_info_from_hf(model_name, hf_token)))
+
+    def _is_gated(self, model_name: str, hf_token: str | None) -> bool:
+        """
+        Returns True if access to the files of a model may need a HF token
+        """
+
+        try:
+            model_info = self._get_model_info_data(model_name, hf_token)
+        except FileNotFoundError:
+            # Offline without model info, the config can only come from the snapshot or cache directory
+            return False
+        # Model info cached before gating was recorded is checked again
+        return model_info.get("gated", True) is not False
+
+    def _get_model_config_data(self, model_name: str, hf_token: str | None) -> dict[str, Any]:
+        """
+        Returns the contents of config.json, from the store or Hugging Face
+        """
+
+        return self._get(
+            model_name, MODEL_CONFIG_FILE,
+            lambda: get_model_config_from_hf(model_name, hf_token).to_dict(),
+            hf_token, self._is_gated(model_name, hf_token))
+
+    def get_model_info(self, model_name: str, hf_token: str | None = None) -> ModelInfo:
+        """
+        Returns model info, from the store or Hugging Face
+        """
+
+        return model_info_from_dict(self._get_model_info_data(model_name, hf_token))
+
+    def get_model_config(self, model_name: str, hf_token: str | None = None) -> AutoConfig:
+        """
+        Returns model config, from the store or Hugging Face
+        """
+
+        return model_config_from_dict(self._get_model_config_data(model_name, hf_token))
+
+    def invalidate(self, model_name: str | None = None) -> None:
+        """
+        Removes cached entries of a model, or of all models, so they are fetched again. Only the entry files of the
+        cache directory are removed, snapshots and other files are left in place.
+        """
+
+        if model_name is None:
+            self._memo.clear()
+            self._access.clear()
+            if self.cache_dir and os.path.isdir(self.cache_dir):
+                for dir_path, _, file_names in os.walk(self.cache_dir, topdown=False):
+                    for file_name in file_names:
+                        if file_name in (MODEL_INFO_FILE, MODEL_CONFIG_FILE):
+                            os.remove(os.path.join(dir_path, file_name))
+                    if dir_path != self.cache_dir and not os.listdir(dir_path):
+                        os.rmdir(dir_path)
+            return
+
+        self._access = {access for access in self._access if access[0] != model_name}
+        for file_name in (MODEL_INFO_FILE, MODEL_CONFIG_FILE):
+            self._memo.pop((model_name, file_name), None)
+            if self.cache_dir:
+                path = self._path(self.cache_dir, model_name, file_name)
+                if os.path.isfile(path):
+                    os.remove(path)
+
+    def save_snapshot(self, snapshot_dir: str, model_names: List[str], hf_token: str | None = None) -> None:
+        """
+        Saves model info and config of models to a snapshot directory, for use in offline mode
+        """
+
+        for model_name in model_names:
+            self._write(snapshot_dir, model_name, MODEL_INFO_FILE, self._get_model_info_data(model_name, hf_token))
+            self._write(snapshot_dir, model_name, MODEL_CONFIG_FILE, self._get_model_config_data(model_name, hf_token))
+
 def get_text_config(model_config: AutoConfig) -> dict:
     """
     Returns text config (for LLMs)
@@ -538,6 +814,8 @@ def get_num_experts(model_config: AutoConfig) -> int | None:
         return model_config.n_routed_experts
     if hasattr(model_config, "num_experts"):
         return model_config.num_experts
+    if hasattr(model_config, "num_local_experts"):
+        return model_config.num_local_experts
     return None
 
 def get_ep_size(tp_size: int, dp_size: int) -> int:
@@ -560,6 +838,530 @@ def experts_per_ep_group(model_config: AutoConfig,
         return 0
     return num_experts / ep_size
 
+# ---------------------- Per-layer memory ----------------------
+def _attention_params(text_config: AutoConfig, mla: bool) -> tuple[int, int]:
+    """
+    Returns the (TP sharded, replicated) parameters of the attention of a layer, including its norms
+    """
+
+    hidden_size = text_config.hidden_size
+    num_heads = text_config.num_attention_heads
+    norms = 2 * hidden_size
+
+    if mla:
+        # Low rank projections of the query and compressed KV are replicated across TP ranks in vLLM
+        q_lora_rank = getattr(text_config, "q_lora_rank", None)
+        kv_lora_rank = text_config.kv_lora_rank
+        qk_head_dim = text_config.qk_nope_head_dim + text_config.qk_rope_head_dim
+        replicated = hidden_size * (kv_lora_rank + text_config.qk_rope_head_dim) + kv_lora_rank
+        if q_lora_rank:
+            replicated += hidden_size * q_lora_rank + q_lora_rank
+            sharded = q_lora_rank * num_heads * qk_head_dim
+        else:
+            sharded = hidden_size * num_heads * qk_head_dim
+        sharded += kv_lora_rank * num_heads * (text_config.qk_nope_head_dim + text_config.v_head_dim)
+        sharded += num_heads * text_config.v_head_dim * hidden_size
+        return sharded, replicated + norms
+
+    head_dim = getattr(text_config, "head_dim", None) or hidden_size // num_heads
+    num_kv_heads = getattr(text_config, "num_key_value_heads", None) or num_heads
+    sharded = 2 * hidden_size * num_heads * head_dim + 2 * hidden_size * num_kv_heads * head_dim
+    return sharded, norms
+
+def _mlp_params(text_config: AutoConfig, layer: int) -> tuple[int, int, int, int]:
+    """
+    Returns the (dense MLP or shared experts, routed experts, number of routed experts, router) parameters of the MLP
+    of a layer
+    """
+
+    hidden_size = text_config.hidden_size
+    num_experts = get_num_experts(text_config) or 0
+
+    # DeepSeek: the first layers are dense, then every moe_layer_freq layers is MoE
+    if hasattr(text_config, "n_routed_experts"):
+        is_moe_layer = num_experts > 0 \
+            and layer >= (getattr(text_config, "first_k_dense_replace", 0) or 0) \
+            and layer % (getattr(text_config, "moe_layer_freq", 1) or 1) == 0
+        expert_size = getattr(text_config, "moe_intermediate_size", None)
+        shared_size = (getattr(text_config, "n_shared_experts", 0) or 0) * (expert_size or 0)
+    # Qwen MoE: every decoder_sparse_step layers is MoE, except for mlp_only_layers
+    elif hasattr(text_config, "num_experts"):
+        is_moe_layer = num_experts > 0 \
+            and layer not in (getattr(text_config, "mlp_only_layers", None) or []) \
+            and (layer + 1) % (getattr(text_config, "decoder_sparse_step", 1) or 1) == 0
+        expert_size = getattr(text_config, "moe_intermediate_size", None)
+        shared_size = getattr(text_config, "shared_expert_intermediate_size", 0) or 0
+    # Mixtral: every layer is MoE, with experts of the size of the dense MLP
+    else:
+        is_moe_layer = num_experts > 0
+        expert_size = None
+        shared_size = 0
+
+    if not is_moe_layer:
+        return 3 * hidden_size * text_config.intermediate_size, 0, 0, 0
+
+    expert_size = expert_size or text_config.intermediate_size
+    router = hidden_size * num_experts
+    return 3 * hidden_size * shared_size, 3 * hidden_size * expert_size * num_experts, num_experts, router
+
+def _pp_layer_counts(num_layers: int, pp: int) -> List[int]:
+    """
+    Returns the number of layers of each PP stage, as partitioned by vLLM
+    """
+
+    counts = [num_layers // pp] * pp
+    # Remaining layers go to the stages before the last one, which also holds the LM head
+    for ii in range(2, num_layers % pp + 2):
+        counts[-ii] += 1
+    return counts
+
+@dataclass
+class ModelLayerMemory:
+    """
+    ModelLayerMemory stores the weight memory of each layer of a model, separating attention, dense MLP and expert
+    weights, derived once from model info and config
+    """
+
+    model: str
+    layers: pd.DataFrame                    # Per layer memory in GiB and KV cache bytes per token
+    embedding_gb: float                     # Input embedding
+    lm_head_gb: float                       # Output embedding, 0 if tied to the input embedding
+    other_gb: float                         # Parameters of the checkpoint outside of the layers, such as MTP layers
+    tie_word_embeddings: bool
+    mla: bool                               # MLA caches a compressed KV, which TP does not shard
+    num_kv_heads: int
+
+    @classmethod
+    def from_model(cls, model_info: ModelInfo, model_config: AutoConfig) -> "ModelLayerMemory":
+        """
+        Derives the per-layer memory of a model.
+
+        Parameters are counted from the config. The bytes per parameter are set so that all weights add up to
+        model_memory_req(), accounting for quantization and mixed precision of the checkpoint.
+        """
+
+        kv_cache_detail = KVCacheDetail(model_info, model_config)
+        mla = kv_cache_detail.attention_type == AttentionType.MLA
+        text_config = get_text_config(model_config)
+        hidden_size = text_config.hidden_size
+        num_layers = text_config.num_hidden_layers
+        tie_word_embeddings = bool(getattr(text_config, "tie_word_embeddings", False))
+
+        attention_sharded, attention_replicated = _attention_params(text_config, mla)
+        rows = []
+        for layer in range(num_layers):
+            dense, experts, num_experts, router = _mlp_params(text_config, layer)
+            rows.append((attention_sharded, attention_replicated + router, dense, experts, num_experts))
+        params = np.array([row[:4] for row in rows], dtype=np.float64)
+        embedding = text_config.vocab_size * hidden_size
+        lm_head = 0 if tie_word_embeddings else embedding
+        modelled = params.sum() + embedding + lm_head
+
+        total_params = model_total_params(model_info)
+        memory_bytes = gib_to_bytes(model_memory_req(model_info, model_config))
+        bytes_per_param = memory_bytes / max(modelled, total_params)
+
+        def to_gib(num_params):
+            return bytes_to_gib(num_params * bytes_per_param)
+
+        layers = pd.DataFrame({
+            "Layer": np.arange(num_layers),
+            "Attention_GB": to_gib(params[:, 0]),          # Sharded by TP
+            "Replicated_GB": to_gib(params[:, 1]),         # Replicated across TP ranks
+            "Dense_MLP_GB": to_gib(params[:, 2]),          # Dense MLP or shared experts, sharded by TP
+            "Expert_GB": to_gib(params[:, 3]),             # All routed experts, sharded by TP or distributed by EP
+            "Num_Experts": [row[4] for row in rows],
+            "KV_Cache_Bytes_Per_Token": kv_cache_detail.per_token_memory_bytes // num_layers,
+        })
+        return cls(
+            model=model_info.id,
+            layers=layers,
+            embedding_gb=to_gib(embedding),
+            lm_head_gb=to_gib(lm_head),
+            other_gb=to_gib(max(0, total_params - modelled)),
+            tie_word_embeddings=tie_word_embeddings,
+            mla=mla,
+            num_kv_heads=kv_cache_detail.num_key_value_heads,
+        )
+
+    @property
+    def total_gb(self) -> float:
+        """
+        Memory of all weights of a replica in GiB
+        """
+
+        layers = self.layers[["Attention_GB", "Replicated_GB", "Dense_MLP_GB", "Expert_GB"]].to_numpy().sum()
+        return layers + self.embedding_gb + self.lm_head_gb + self.other_gb
+
+def per_gpu_memory_breakdown(layer_memory: ModelLayerMemory,
+                             tp: int = 1,
+                             pp: int = 1,
+                             dp: int = 1,
+                             enable_ep: bool = False,
+                             ) -> pd.DataFrame:
+    """
+    Calculates the weight memory and KV cache bytes per token of a GPU of each PP stage, placing weights as vLLM does.
+
+    TP shards attention, dense MLP and embeddings, except for replicated projections and norms. PP stages hold
+    consecutive layers, with the embedding on the first stage and the LM head on the last. Without EP, every expert is
+    sharded across TP x DP GPUs, as vLLM flattens TP and DP for MoE layers. With EP, experts are distributed whole
+    across TP x DP GPUs, and the GPU holding the most experts is reported. KV heads are sharded by TP, down to one head per GPU, while the compressed KV of MLA is replicated.
+    """
+
+    layers = layer_memory.layers
+    ep_size = get_ep_size(tp, dp)
+    rows = []
+    start = 0
+    for stage, num_layers in enumerate(_pp_layer_counts(len(layers), pp)):
+        stage_layers = layers.iloc[start:start + num_layers]
+        start += num_layers
+        num_experts = stage_layers["Num_Experts"].to_numpy()
+        expert_gb = stage_layers["Expert_GB"].to_numpy()
+        if enable_ep:
+            # vLLM places the remainder of uneven splits on the first EP ranks
+            experts = -(-num_experts // ep_size)
+            expert_gb = np.divide(expert_gb * experts, num_experts, out=np.zeros_like(expert_gb), where=num_experts > 0)
+        else:
+            experts = num_experts
+            expert_gb = expert_gb / (tp * dp)
+
+        embedding_gb = layer_memory.embedding_gb / tp if stage == 0 else 0
+        lm_head_gb = 0
+        if stage == pp - 1:
+            # A tied LM head is only shared with the embedding when both are on the same stage
+            lm_head_gb = layer_memory.lm_head_gb / tp
+            if layer_memory.tie_word_embeddings and pp > 1:
+                lm_head_gb = layer_memory.embedding_gb / tp
+        if layer_memory.mla:
+            kv_bytes = stage_layers["KV_Cache_Bytes_Per_Token"].sum()
+        else:
+            kv_heads = max(1, layer_memory.num_kv_heads // tp)
+            kv_bytes = stage_layers["KV_Cache_Bytes_Per_Token"].sum() * kv_heads // layer_memory.num_kv_heads
+
+        row = {
+            "Stage": stage,
+            "Layers": num_layers,
+            "Attention_GB": stage_layers["Attention_GB"].sum() / tp + stage_layers["Replicated_GB"].sum(),
+            "Dense_MLP_GB": stage_layers["Dense_MLP_GB"].sum() / tp,
+            "Expert_GB": expert_gb.sum(),
+            "Experts_Per_Layer": int(experts.max()) if num_layers else 0,
+            "Embedding_GB": embedding_gb + lm_head_gb,
+            "Other_GB": layer_memory.other_gb / (tp * pp),
+            "KV_Cache_Bytes_Per_Token": int(kv_bytes),
+        }
+        row["Weights_GB"] = row["Attention_GB"] + row["Dense_MLP_GB"] + row["Expert_GB"] + row["Embedding_GB"] + row["Other_GB"]
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def per_gpu_kv_cache_blocks(layer_memory: ModelLayerMemory,
+                            gpu_memory: int,
+                            gpu_mem_util: float = 0.9,
+                            tp: int = 1,
+                            pp: int = 1,
+                            dp: int = 1,
+                            enable_ep: bool = False,
+                            block_size: int = 16,
+                            ) -> int:
+    """
+    Calculates the number of KV cache blocks of each GPU, as vLLM reports in "# GPU blocks".
+
+    vLLM allocates the same number of blocks on every GPU, limited by the GPU with the least memory for KV cache
+    relative to its KV cache per token. Returns 0 if the weights do not fit.
+    """
+
+    breakdown = per_gpu_memory_breakdown(layer_memory, tp, pp, dp, enable_ep)
+    kv_cache_memory = gib_to_bytes(available_gpu_memory(gpu_memory, gpu_mem_util) - breakdown["Weights_GB"])
+    per_block_memory = breakdown["KV_Cache_Bytes_Per_Token"] * block_size
+    blocks = np.floor(kv_cache_memory / per_block_memory).clip(lower=0)
+    return int(blocks.min())
+
+def per_gpu_max_concurrent_requests(kv_cache_blocks: int,
+                                    max_model_len: int,
+                                    dp: int = 1,
+                                    block_size: int = 16,
+                                    ) -> int:
+    """
+    Calculates the maximum concurrent requests of max_model_len tokens across DP replicas, from the KV cache blocks of
+    each GPU
+    """
+
+    return dp * (kv_cache_blocks * block_size // max_model_len)
+
+# ---------------------- Batch planning ----------------------
+@dataclass
+class ModelMemoryProfile:
+    """
+    ModelMemoryProfile stores per-model constants for capacity planning, derived once from model info and config
+    """
+
+    model: str
+    per_token_memory_bytes: int             # KV cache bytes per token, across all GPUs
+    model_memory_gb: float                  # Model weights in GiB, for one replica
+
+    @classmethod
+    def from_model(cls, model_info: ModelInfo, model_config: AutoConfig) -> "ModelMemoryProfile":
+        """
+        Derives the memory profile of a model
+        """
+
+        kv_cache_detail = KVCacheDetail(model_info, model_config)
+        return cls(
+            model=model_info.id,
+            per_token_memory_bytes=kv_cache_detail.per_token_memory_bytes,
+            model_memory_gb=model_memory_req(model_info, model_config),
+        )
+
+@dataclass
+class CapacityPlanBatch:
+    """
+    CapacityPlanBatch stores capacity estimates of many deployments, as arrays of the broadcast shape of the inputs
+    """
+
+    gpus_required: np.ndarray
+    kv_cache_allocatable_gb: np.ndarray
+    per_request_kv_cache_gb: np.ndarray
+    max_concurrent_requests: np.ndarray
+    total_kv_cache_blocks: np.ndarray
+
+def plan_capacity_batch(profile: ModelMemoryProfile,
+                        max_model_len: int | np.ndarray,
+                        gpu_memory: float | np.ndarray,
+                        gpu_mem_util: float | np.ndarray = 0.9,
+                        tp: int | np.ndarray = 1,
+                        pp: int | np.ndarray = 1,
+                        dp: int | np.ndarray = 1,
+                        block_size: int | np.ndarray = 16,
+                        ) -> CapacityPlanBatch:
+    """
+    Estimates capacity for arrays of deployment parameters in a single vectorized pass.
+
+    Parameters are broadcast against each other, so a sweep of TP/PP/DP x context length x GPU memory x
+    gpu_mem_util may be given as arrays from numpy.meshgrid, or as arrays with different axes of length 1.
+    Results match max_concurrent_requests(), total_kv_cache_blocks(), allocatable_kv_cache_memory() and
+    gpus_required() for each combination, without recomputing per-model constants.
+    """
+
+    max_model_len, gpu_memory, gpu_mem_util, tp, pp, dp, block_size = np.broadcast_arrays(
+        max_model_len, gpu_memory, gpu_mem_util, tp, pp, dp, block_size)
+
+    gpu_count = tp * pp * dp
+    kv_cache_allocatable = available_gpu_memory(gpu_memory, gpu_mem_util) * gpu_count - profile.model_memory_gb * dp
+    per_request_kv_cache = bytes_to_gib(profile.per_token_memory_bytes * max_model_len.astype(np.float64))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_concurrent = np.floor(kv_cache_allocatable / per_request_kv_cache)
+        per_block_memory = profile.per_token_memory_bytes / (tp * pp) * block_size
+        kv_blocks = gib_to_bytes(kv_cache_allocatable) // per_block_memory
+    max_concurrent = np.where(per_request_kv_cache == 0, 0, np.maximum(max_concurrent, 0))
+    kv_blocks = np.where(per_block_memory == 0, 0, kv_blocks)
+
+    return CapacityPlanBatch(
+        gpus_required=gpu_count.astype(np.int64),
+        kv_cache_allocatable_gb=kv_cache_allocatable,
+        per_request_kv_cache_gb=per_request_kv_cache,
+        max_concurrent_requests=max_concurrent.astype(np.int64),
+        total_kv_cache_blocks=kv_blocks.astype(np.int64),
+    )
+
+def gpu_fit_table(profile: ModelMemoryProfile,
+                  gpu_specs: dict[str, dict],
+                  context_lens: List[int],
+                  tp_values: List[int],
+                  pp_values: List[int] = [1],
+                  dp_values: List[int] = [1],
+                  gpu_mem_util: float = 0.9,
+                  max_gpus: int | None = None,
+                  ) -> pd.DataFrame:
+    """
+    Precomputes whether a model fits, its max concurrency and memory headroom for every accelerator x TP x PP x DP x
+    context length, in a single vectorized pass.
+
+    gpu_specs maps accelerator names to specs with "memory" in GB, as in db.json. Rows are sorted by context length,
+    then by cost (number of GPUs, then their total memory), so find_cheapest_fit() returns the cheapest configurations
+    first. The table only depends on its arguments, so it can be cached and reused for any what-if query of a model.
+    """
+
+    gpu_names = list(gpu_specs)
+    gpu_memory = np.array([gpu_specs[name]["memory"] for name in gpu_names], dtype=float)
+    gpu, tp, pp, dp, context_len = (grid.ravel() for grid in np.meshgrid(
+        np.arange(len(gpu_names)), tp_values, pp_values, dp_values, context_lens, indexing="ij"))
+    if max_gpus is not None:
+        keep = tp * pp * dp <= max_gpus
+        gpu, tp, pp, dp, context_len = gpu[keep], tp[keep], pp[keep], dp[keep], context_len[keep]
+
+    plan = plan_capacity_batch(profile, context_len, gpu_memory[gpu], gpu_mem_util, tp, pp, dp)
+    table = pd.DataFrame({
+        "GPU": np.array(gpu_names, dtype=object)[gpu],
+        "GPU_Memory_GB": gpu_memory[gpu],
+        "TP": tp,
+        "PP": pp,
+        "DP": dp,
+        "Context_Len": context_len,
+        "GPUs": plan.gpus_required,
+        "Total_GPU_Memory_GB": gpu_memory[gpu] * plan.gpus_required,
+        "KV_Cache_Memory_GB": plan.kv_cache_allocatable_gb,
+        "Per_Request_KV_Cache_GB": plan.per_request_kv_cache_gb,
+        "Max_Concurrency": plan.max_concurrent_requests,
+        "Fits": plan.max_concurrent_requests >= 1,
+    })
+    # Memory left after model weights and KV cache of max concurrency
+    table["Headroom_GB"] = table["KV_Cache_Memory_GB"] - table["Per_Request_KV_Cache_GB"] * table["Max_Concurrency"].clip(lower=0)
+    return table.sort_values(
+        ["Context_Len", "GPUs", "Total_GPU_Memory_GB", "TP", "PP", "DP"], kind="stable", ignore_index=True)
+
+def find_cheapest_fit(fit_table: pd.DataFrame,
+                      concurrency: int,
+                      context_len: int,
+                      ) -> pd.DataFrame:
+    """
+    Finds configurations of a table from gpu_fit_table() serving a concurrency at a context length, cheapest first.
+
+    Concurrency is looked up at the smallest context length in the table that is at least context_len, which is
+    conservative when context_len is not in the table.
+    """
+
+    context_lens = fit_table["Context_Len"].to_numpy()
+    # Rows are sorted by context length, so its rows are a contiguous range
+    start = np.searchsorted(context_lens, context_len, side="left")
+    if start == len(context_lens):
+        raise ValueError(f"Context length {context_len} exceeds the largest context length of the table")
+    end = np.searchsorted(context_lens, context_lens[start], side="right")
+    rows = fit_table.iloc[start:end]
+    return rows[rows["Max_Concurrency"] >= concurrency]
+
+# ---------------------- Roofline estimation ----------------------
+@dataclass
+class ModelComputeProfile:
+    """
+    ModelComputeProfile stores per-model constants for roofline estimation, derived once from model info and config
+    """
+
+    model: str
+    num_params: int                         # Active parameters, each costing 2 FLOPs (multiply and add) per token
+    model_memory_gb: float                  # Model weights in GiB, read once per forward pass
+    per_token_memory_bytes: int             # KV cache bytes per token, written in prefill and read in decode
+    num_hidden_layers: int
+    attention_dim: int                      # num_attention_heads x head_dimension
+    expert_memory_gb: float = 0.0           # Routed expert weights in GiB, part of model_memory_gb
+    expert_fraction: float = 1.0            # Routed experts of a token over the routed experts of a layer
+
+    @classmethod
+    def from_model(cls, model_info: ModelInfo, model_config: AutoConfig) -> "ModelComputeProfile":
+        """
+        Derives the compute profile of a model.
+
+        A token of an MoE model only runs num_experts_per_tok of the routed experts of each layer, so only their
+        parameters count as active.
+        """
+
+        kv_cache_detail = KVCacheDetail(model_info, model_config)
+        text_config = get_text_config(model_config)
+        num_params = model_total_params(model_info)
+        num_experts = get_num_experts(text_config)
+        experts_per_token = getattr(text_config, "num_experts_per_tok", None)
+        expert_memory_gb = 0.0
+        expert_fraction = 1.0
+        if num_experts and experts_per_token:
+            layer_memory = ModelLayerMemory.from_model(model_info, model_config)
+            expert_memory_gb = float(layer_memory.layers["Expert_GB"].sum())
+            expert_fraction = min(1.0, experts_per_token / num_experts)
+            # Parameters and weight memory are in proportion, as all weights have the same bytes per parameter
+            inactive_share = expert_memory_gb * (1 - expert_fraction) / layer_memory.total_gb
+            num_params = round(num_params * (1 - inactive_share))
+
+        return cls(
+            model=model_info.id,
+            num_params=num_params,
+            model_memory_gb=model_memory_req(model_info, model_config),
+            per_token_memory_bytes=kv_cache_detail.per_token_memory_bytes,
+            num_hidden_layers=kv_cache_detail.num_hidden_layers,
+            attention_dim=kv_cache_detail.num_attention_heads * kv_cache_detail.head_dimension,
+            expert_memory_gb=expert_memory_gb,
+            expert_fraction=expert_fraction,
+        )
+
+    def weight_bytes(self, num_tokens: float | np.ndarray) -> float | np.ndarray:
+        """
+        Returns the weight bytes read by a forward pass of num_tokens tokens. Dense weights are read once, and routed
+        experts by the expected fraction of them that any token is routed to, assuming uniform routing.
+        """
+
+        expert_bytes = gib_to_bytes(self.expert_memory_gb)
+        experts_read = 1 - (1 - self.expert_fraction) ** num_tokens
+        return gib_to_bytes(self.model_memory_gb) - expert_bytes + expert_bytes * experts_read
+
+@dataclass
+class RooflineEstimate:
+    """
+    RooflineEstimate stores latency and throughput bounds of many deployments, as arrays of the broadcast shape of the
+    inputs
+    """
+
+    ttft_s: np.ndarray                      # Prefill time of a batch of prompts
+    itl_s: np.ndarray                       # Time of a decode step of a batch at the mean context length
+    prefill_tokens_per_s: np.ndarray
+    decode_tokens_per_s: np.ndarray
+    prefill_compute_bound: np.ndarray       # Whether prefill is limited by FLOPS rather than memory bandwidth
+    decode_compute_bound: np.ndarray        # Whether decode is limited by FLOPS rather than memory bandwidth
+
+def estimate_roofline(profile: ModelComputeProfile,
+                      memory_bandwidth: float | np.ndarray,
+                      tflops: float | np.ndarray,
+                      input_len: int | np.ndarray,
+                      output_len: int | np.ndarray,
+                      batch_size: int | np.ndarray = 1,
+                      tp: int | np.ndarray = 1,
+                      compute_efficiency: float | np.ndarray = 1.0,
+                      bandwidth_efficiency: float | np.ndarray = 1.0,
+                      ) -> RooflineEstimate:
+    """
+    Estimates TTFT/ITL lower bounds and prefill/decode throughput upper bounds of a replica with an analytic roofline
+    model, for arrays of deployment and workload parameters in a single vectorized pass.
+
+    memory_bandwidth (GB/s) and tflops (dense BF16/FP16) are per accelerator, as in db.json. A forward pass takes the
+    longer of its FLOPs over the FLOPS and its bytes moved over the memory bandwidth: prefill of batch_size prompts of
+    input_len tokens, and a decode step of batch_size requests at the mean context length of input_len + output_len / 2.
+    TP shards every layer, so FLOPS and bandwidth scale with TP. Pipeline stages run one after another, so PP does not
+    reduce latency and is not a parameter. Efficiencies scale the peak FLOPS and bandwidth to what is achievable.
+    FLOPs count the active parameters of MoE models, and a forward pass reads the experts its tokens are routed to
+    (see ModelComputeProfile.weight_bytes()).
+    """
+
+    memory_bandwidth, tflops, input_len, output_len, batch_size, tp, compute_efficiency, bandwidth_efficiency = \
+        np.broadcast_arrays(memory_bandwidth, tflops, input_len, output_len, batch_size, tp,
+                            compute_efficiency, bandwidth_efficiency)
+
+    flops_per_s = tflops * 1e12 * tp * compute_efficiency
+    bytes_per_s = memory_bandwidth * 1e9 * tp * bandwidth_efficiency
+    # Attention FLOPs (QK^T and AV) of a token attending to a context of one token
+    attention_flops = 4 * profile.num_hidden_layers * profile.attention_dim
+    input_len = input_len.astype(np.float64)
+    batch_size = batch_size.astype(np.float64)
+
+    # Prefill: causal attention over the prompt, writing its KV cache
+    prefill_flops = batch_size * (2 * profile.num_params * input_len + attention_flops * input_len ** 2 / 2)
+    prefill_bytes = profile.weight_bytes(batch_size * input_len) + batch_size * input_len * profile.per_token_memory_bytes
+    prefill_compute_s = prefill_flops / flops_per_s
+    prefill_memory_s = prefill_bytes / bytes_per_s
+    ttft = np.maximum(prefill_compute_s, prefill_memory_s)
+
+    # Decode: one token per request, reading the KV cache of its context
+    context_len = input_len + output_len / 2
+    decode_flops = batch_size * (2 * profile.num_params + attention_flops * context_len)
+    decode_bytes = profile.weight_bytes(batch_size) + batch_size * context_len * profile.per_token_memory_bytes
+    decode_compute_s = decode_flops / flops_per_s
+    decode_memory_s = decode_bytes / bytes_per_s
+    itl = np.maximum(decode_compute_s, decode_memory_s)
+
+    return RooflineEstimate(
+        ttft_s=ttft,
+        itl_s=itl,
+        prefill_tokens_per_s=batch_size * input_len / ttft,
+        decode_tokens_per_s=batch_size / itl,
+        prefill_compute_bound=prefill_compute_s >= prefill_memory_s,
+        decode_compute_bound=decode_compute_s >= decode_memory_s,
+    )
+
 # ---------------------- Utility helpers ----------------------
 def bits_to_bytes(bits: int) -> int:
     """
@@ -8,7 +8,22 @@ to populate the DataFrame with data from a benchmark report file. The columns
 in the DataFrame are described in the COLUMNS dictionary.
 
 To assist with loading benchmark report files, get_benchmark_report_files() can
-be used to find all benchmark report files within a search directory.
+be used to find all benchmark report files within a search directory. When
+loading many files, load_benchmark_reports() parses them in parallel and
+creates a populated DataFrame in one step, optionally caching parsed rows on
+disk so reloading a directory only parses new or changed files. The cache
+file of a directory, in a user cache directory, is given by
+get_runs_cache_file(). To follow a
+sweep while results are written, BenchmarkReportWatcher rescans a directory
+and appends rows of new reports to its DataFrame. Harnesses may
+also append reports to a report log per experiment (see convert.py), found
+with get_report_log_files() and loaded with load_report_logs() using one
+sequential read per log.
+
+A populated DataFrame may be persisted as a partitioned Parquet dataset with
+export_benchmark_runs_parquet(). Reading it back with
+import_benchmark_runs_parquet() can apply scenario and SLO filters while
+reading, so only the needed partitions, row groups, and columns are loaded.
 
 Once a DataFrame has been populated, analysis can proceed by selecting a set of
 columns to be held constant during analysis. These columns should describe a
@@ -19,7 +34,10 @@ prefill/decode disaggregated and aggregated setups, we may key together
 referred to as a "scenario". We can find what unique combinations of these
 parameters exist within the dataset with get_scenarios(). If we are using a
 text interface, such as a CLI or Jupyter notebook, we can use print_scenarios()
-to view a table of scenarios available.
+to view a table of scenarios available. To look up many scenarios, such as
+when counting rows of every scenario, make_scenario_index() groups the rows of
+all scenarios in a single pass, and the index it returns may be passed to
+get_scenario_df() and plotting functions.
 
 Upon selection of a particular scenario, we now need to choose another grouping
 of columns which we will use to uniquely define a configuration. We can
@@ -33,14 +51,26 @@ service-level objectives (SLOs) with the SLO class, creating a list of SLOs and
 using get_meet_slo_df() to make a DataFrame of only rows that meet our SLOs.
 We can use get_pareto_front_df() to find optimal configurations against pairs
 of metrics, showing, for example, the tradeoff between throughput and latency.
+get_pareto_front_multi_df() does the same for any number of metrics. For
+interactive use, SweepIndex groups rows by model and GPU and memoizes rows
+meeting SLOs and Pareto fronts.
 """
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from fnmatch import fnmatch
+from functools import partial
+import hashlib
+import json
 from math import floor
+import multiprocessing
 import os
 from pathlib import Path
+import time
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 # TODO These packages can be imported in different ways depending on whether
@@ -245,7 +275,7 @@ INPUT_COLUMNS = {
         label='Max Blocks',
     ),
     'Prefix_Cache_Scorer_Mode': ColumnProperties(
-        dtype='bool',
+        dtype='str',
         label='Prefix Mode',
     ),
     # Workload
@@ -716,6 +746,31 @@ COLUMNS = {}
 COLUMNS.update(INPUT_COLUMNS)
 COLUMNS.update(PERFORMANCE_METRIC_COLUMNS)
 
+# Version of the cache format written by load_benchmark_reports()
+RUNS_CACHE_VERSION = 1
+
+# Directory of cache files of benchmark runs, one per imported directory
+DEFAULT_RUNS_CACHE_DIR = os.path.join(
+    os.path.expanduser('~'), '.cache', 'llm-d-benchmark', 'benchmark_runs')
+
+# Cache files kept in a cache directory, removing the least recently used
+RUNS_CACHE_MAX_FILES = 32
+
+# Glob pattern of benchmark report file names
+BENCHMARK_REPORT_PATTERN = 'benchmark_report,_*.yaml'
+
+# Directory listings taken within this time of the directory modification
+# time are taken again, as entries added in the same tick of a filesystem with
+# coarse modification times (ext3, NFS, FAT) do not change it
+WATCHER_MTIME_RESOLUTION_NS = 2_000_000_000
+
+# Refreshes of a watcher after which all directories are listed again, in case
+# the clock of a network filesystem is behind
+WATCHER_FULL_SCAN_REFRESHES = 20
+
+# Default columns to partition a Parquet store of benchmark runs by
+PARQUET_PARTITION_COLUMNS = ['Model', 'GPU', 'Workload_Generator']
+
 @dataclass
 class SLO:
     """Service level objective."""
@@ -731,9 +786,7 @@ class SLO:
         if COLUMNS[self.col].dtype != 'float':
             raise TypeError(f'Column must have float datatype: {self.col}')
         if COLUMNS[self.col].pref == Pref.NEUTRAL:
-            raise Exception(
-                f'Column must have a preferred direction: {
-                    self.col}')
+            raise Exception(f'Column must have a preferred direction: {self.col}')
 
 
 def check_dir(dir: str) -> None:
@@ -808,11 +861,24 @@ def get_benchmark_report_files(source_dir: str) -> list[str]:
     rb_files = []
     check_dir(source_dir)
     path = Path(source_dir)
-    for file in path.rglob("benchmark_report,_*.yaml"):
+    for file in path.rglob(BENCHMARK_REPORT_PATTERN):
         rb_files.append(str(file))
     return rb_files
 
 
+def get_report_log_files(source_dir: str) -> list[str]:
+    """Get a list of report logs within provided path (recursive).
+
+    Args:
+        source_dir (str): Directory to recursively search for report logs.
+
+    Returns:
+        list: List of paths to report logs.
+    """
+    check_dir(source_dir)
+    return [str(file) for file in Path(source_dir).rglob(convert.REPORT_LOG_FILE)]
+
+
 def make_benchmark_runs_df() -> pd.DataFrame:
     """Create DataFrame for benchmark run results.
 
@@ -887,17 +953,18 @@ def _get_replicas_and_parallelism(
     return rp
 
 
-def add_benchmark_report_to_df(
-        runs_df: pd.DataFrame,
-        br_file: str) -> None:
-    """Load a results file and add it to the DataFrame of benchmark runs.
+def _make_benchmark_run_row(
+        report: schema.BenchmarkReport,
+        br_file: str) -> dict[str, Any]:
+    """Make a row of the benchmark runs DataFrame from a benchmark report.
 
     Args:
-        runs_df (DataFrame): DataFrame to add a row to for the provided run.
-        br_file (str): Benchmark report file to import.
-    """
-    report = convert.import_benchmark_report(br_file)
+        report (BenchmarkReport): Benchmark run to evaluate.
+        br_file (str): Benchmark report file the run was imported from.
 
+    Returns:
+        dict[str, Any]: Values for each column in COLUMNS.
+    """
     # Get plugin parameters
     prefix_cache_scorer_block_size = None
     prefix_cache_scorer_lur_capacity_per_server = None
@@ -956,11 +1023,18 @@ def add_benchmark_report_to_df(
         concurrency = get_nested(
             report.scenario.load.args, [
                 'profile', 'measured_concurrencies'])[0]
+    elif report.scenario.load.name == schema.WorkloadGenerator.LOADGEN:
+        stage = report.scenario.load.metadata.get('stage')
+        concurrency = get_nested(
+            report.scenario.load.args, [
+                'load', 'stages'])[stage].get('concurrency')
     else:
         concurrency = None
 
     max_qps = None
-    if report.scenario.load.name == schema.WorkloadGenerator.INFERENCE_PERF:
+    if report.scenario.load.name in [
+            schema.WorkloadGenerator.INFERENCE_PERF,
+            schema.WorkloadGenerator.LOADGEN]:
         # Workload generator stage
         stage = report.scenario.load.metadata.get('stage')
         if stage is not None:
@@ -993,8 +1067,7 @@ def add_benchmark_report_to_df(
     itl_mult = 1000 if report.metrics.latency.inter_token_latency.units == schema.Units.S_PER_TOKEN else 1
     e2el_mult = 1000 if report.metrics.latency.request_latency.units == schema.Units.S else 1
 
-    # Add row to DataFrame
-    runs_df.loc[len(runs_df)] = {
+    return {
         # Details about particular run
         'Directory': os.path.abspath(br_file).rsplit(os.sep, 1)[0],
         'Directory_Base': os.path.abspath(br_file).rsplit(os.sep, 2)[0],
@@ -1122,6 +1195,541 @@ def add_benchmark_report_to_df(
     }
 
 
+def add_benchmark_report_to_df(
+        runs_df: pd.DataFrame,
+        br_file: str,
+        strict: bool = True) -> None:
+    """Load a results file and add it to the DataFrame of benchmark runs.
+
+    Args:
+        runs_df (DataFrame): DataFrame to add a row to for the provided run.
+        br_file (str): Benchmark report file to import.
+        strict (bool): Run all consistency checks of the benchmark report.
+    """
+    report = convert.import_benchmark_report(br_file, strict=strict)
+    runs_df.loc[len(runs_df)] = _make_benchmark_run_row(report, br_file)
+
+
+def _load_benchmark_run_row(br_file: str, strict: bool = True) -> dict[str, Any]:
+    """Load a benchmark report file as a row of the benchmark runs DataFrame.
+
+    This is a module level function so it can be sent to worker processes.
+
+    Args:
+        br_file (str): Benchmark report file to import.
+        strict (bool): Run all consistency checks of the benchmark report.
+
+    Returns:
+        dict[str, Any]: Values for each column in COLUMNS.
+    """
+    report = convert.import_benchmark_report(br_file, strict=strict)
+    return _make_benchmark_run_row(report, br_file)
+
+
+def _file_cache_key(file: str) -> list[int]:
+    """Get the key identifying the current contents of a file in the cache.
+
+    Args:
+        file (str): File to get key for.
+
+    Returns:
+        list[int]: Modification time (ns) and size of file.
+    """
+    stat = os.stat(file)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def get_runs_cache_file(
+        source_dir: str,
+        cache_dir: str = DEFAULT_RUNS_CACHE_DIR,
+        max_files: int = RUNS_CACHE_MAX_FILES) -> str:
+    """Get the cache file of benchmark runs for a directory of benchmark
+    reports, in a user cache directory rather than with the reports.
+
+    The cache directory is created if needed. Cache files of other
+    directories are removed, least recently used first, to keep at most
+    max_files.
+
+    Args:
+        source_dir (str): Directory of benchmark reports.
+        cache_dir (str): Directory of cache files.
+        max_files (int): Maximum number of cache files in cache_dir.
+
+    Returns:
+        str: Cache file for source_dir, which may not exist yet.
+    """
+    source_dir = os.path.abspath(source_dir)
+    name = hashlib.sha256(source_dir.encode()).hexdigest()[:32] + '.json'
+    cache_file = os.path.join(cache_dir, name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(cache_file):
+            # Mark as recently used
+            os.utime(cache_file)
+        others = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json') and entry.name != name:
+                    others.append((entry.stat().st_mtime_ns, entry.path))
+        for _, path in sorted(others)[:max(0, len(others) - max_files + 1)]:
+            os.remove(path)
+    except OSError as e:
+        print(f'{Text.YELLOW}Could not prune cache directory {cache_dir}: {e}{Text.DEFAULT}')
+    return cache_file
+
+
+def _read_runs_cache(cache_file: str) -> dict[str, dict[str, Any]]:
+    """Read cached benchmark run rows.
+
+    Args:
+        cache_file (str): Cache file to read.
+
+    Returns:
+        dict[str, dict[str, Any]]: Cache entries keyed by absolute path of
+            benchmark report file. An empty dict is returned if the cache does
+            not exist, cannot be read, or was made with different COLUMNS.
+    """
+    if not os.path.isfile(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r', encoding='UTF-8') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        print(f'{Text.YELLOW}Ignoring unreadable cache: {cache_file}{Text.DEFAULT}')
+        return {}
+    if cache.get('version') != RUNS_CACHE_VERSION or cache.get('columns') != list(COLUMNS):
+        # Cache was made by an incompatible version of this module
+        return {}
+    return cache.get('entries', {})
+
+
+def _write_runs_cache(
+        cache_file: str,
+        entries: dict[str, dict[str, Any]]) -> None:
+    """Write benchmark run rows to cache.
+
+    Args:
+        cache_file (str): Cache file to write.
+        entries (dict[str, dict[str, Any]]): Cache entries keyed by absolute
+            path of benchmark report file.
+    """
+    cache = {
+        'version': RUNS_CACHE_VERSION,
+        'columns': list(COLUMNS),
+        'entries': entries,
+    }
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, 'w', encoding='UTF-8') as file:
+            json.dump(cache, file)
+        # Atomic replacement, so concurrent readers never see a partial file
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f'{Text.YELLOW}Could not write cache {cache_file}: {e}{Text.DEFAULT}')
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def make_benchmark_runs_df_from_rows(
+        rows: list[dict[str, Any]]) -> pd.DataFrame:
+    """Create DataFrame for benchmark run results from a list of rows.
+
+    The DataFrame is built once from column lists, rather than appending rows
+    one at a time.
+
+    Args:
+        rows (list[dict[str, Any]]): Rows having values for each column in
+            COLUMNS.
+
+    Returns:
+        DataFrame: Benchmark runs.
+    """
+    if not rows:
+        return make_benchmark_runs_df()
+    runs_df = pd.DataFrame(
+        {col: [row[col] for row in rows] for col in COLUMNS})
+    for col, props in COLUMNS.items():
+        # Integers are inferred for float columns when all values are whole
+        if props.dtype == 'float' and pd.api.types.is_numeric_dtype(runs_df[col]):
+            runs_df[col] = runs_df[col].astype(props.dtype)
+    return runs_df
+
+
+def _load_benchmark_run_row_or_none(
+        br_file: str,
+        strict: bool = True) -> dict[str, Any] | None:
+    """Load a benchmark report file as a row of the benchmark runs DataFrame,
+    returning None if it cannot be loaded, such as when it is still being
+    written.
+
+    Args:
+        br_file (str): Benchmark report file to import.
+        strict (bool): Run all consistency checks of the benchmark report.
+
+    Returns:
+        dict[str, Any] | None: Values for each column in COLUMNS, or None.
+    """
+    try:
+        return _load_benchmark_run_row(br_file, strict)
+    except Exception as e:
+        print(f'{Text.YELLOW}Could not load {br_file}: {e}{Text.DEFAULT}')
+        return None
+
+
+def _parse_benchmark_run_rows(
+        br_files: list[str],
+        max_workers: int | None = None,
+        strict: bool = False,
+        skip_errors: bool = False) -> list[dict[str, Any] | None]:
+    """Parse benchmark report files into rows, in parallel processes.
+
+    Args:
+        br_files (list[str]): Benchmark report files to import.
+        max_workers (int | None): Maximum number of worker processes. If None,
+            the number of CPUs is used. If 1, files are parsed in this process.
+        strict (bool): Run all consistency checks of benchmark reports.
+        skip_errors (bool): Return None for files which cannot be loaded,
+            rather than raising an exception.
+
+    Returns:
+        list[dict[str, Any] | None]: Row of each file.
+    """
+    load_row = partial(
+        _load_benchmark_run_row_or_none if skip_errors else _load_benchmark_run_row,
+        strict=strict)
+    if max_workers == 1 or len(br_files) <= 1:
+        return list(map(load_row, br_files))
+    workers = max_workers or os.cpu_count() or 1
+    # Send files to workers in batches to limit IPC overhead
+    chunksize = max(1, min(64, len(br_files) // (workers * 4)))
+    # Workers are spawned rather than forked, as forking a multi-threaded
+    # process (such as a Streamlit server) can deadlock the children
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(load_row, br_files, chunksize=chunksize))
+
+
+def load_benchmark_reports(
+        br_files: list[str],
+        max_workers: int | None = None,
+        cache_file: str | None = None,
+        strict: bool = False) -> pd.DataFrame:
+    """Load benchmark report files into a new DataFrame of benchmark runs.
+
+    Report files are parsed in parallel using a pool of processes. If a cache
+    file is provided, rows from previously parsed reports are reused when the
+    modification time and size of the report file are unchanged, so only new
+    or changed reports are parsed. The cache is updated with newly parsed
+    reports.
+
+    Consistency checks of reports are skipped by default, as they were run
+    when the reports were written by a harness (see schema.create_from_dict).
+
+    Args:
+        br_files (list[str]): Benchmark report files to import.
+        max_workers (int | None): Maximum number of worker processes. If None,
+            the number of CPUs is used. If 1, files are parsed in this process.
+        cache_file (str | None): JSON file to cache parsed rows in.
+        strict (bool): Run all consistency checks of benchmark reports.
+
+    Returns:
+        DataFrame: Benchmark runs, with rows in the same order as br_files.
+    """
+    paths = [os.path.abspath(br_file) for br_file in br_files]
+    cache = _read_runs_cache(cache_file) if cache_file else {}
+
+    keys = {}
+    to_parse = []
+    for path in paths:
+        keys[path] = _file_cache_key(path)
+        entry = cache.get(path)
+        if entry is None or entry['key'] != keys[path]:
+            to_parse.append(path)
+
+    if to_parse:
+        parsed = _parse_benchmark_run_rows(to_parse, max_workers, strict)
+        for path, row in zip(to_parse, parsed):
+            cache[path] = {'key': keys[path], 'row': row}
+        if cache_file:
+            # Drop entries of removed report files
+            _write_runs_cache(cache_file, {
+                path: entry for path, entry in cache.items()
+                if path in keys or os.path.exists(path)})
+
+    return make_benchmark_runs_df_from_rows([cache[path]['row'] for path in paths])
+
+
+def load_report_logs(
+        log_files: list[str],
+        strict: bool = False) -> pd.DataFrame:
+    """Load report logs into a new DataFrame of benchmark runs.
+
+    Each log is read sequentially. Reports are keyed by
+    <results directory name>/<results file name>, relative to the directory
+    of the log, which is used as the report path for the Directory columns.
+    When a key appears more than once in a log, the last report is used.
+
+    Args:
+        log_files (list[str]): Report logs to import.
+        strict (bool): Run all consistency checks of benchmark reports.
+
+    Returns:
+        DataFrame: Benchmark runs, in the order of log files and of first
+            appearance of each key in a log.
+    """
+    rows = []
+    for log_file in log_files:
+        rows.extend(_load_report_log_rows(log_file, strict).values())
+    return make_benchmark_runs_df_from_rows(rows)
+
+
+def _load_report_log_rows(
+        log_file: str,
+        strict: bool = False) -> dict[str, dict[str, Any]]:
+    """Load a report log as rows of the benchmark runs DataFrame.
+
+    Args:
+        log_file (str): Report log to import.
+        strict (bool): Run all consistency checks of benchmark reports.
+
+    Returns:
+        dict[str, dict[str, Any]]: Row of the last report of each key, keyed
+            by report path, in order of first appearance of each key.
+    """
+    log_dir = os.path.dirname(os.path.abspath(log_file))
+    rows = {}
+    for key, report in convert.import_report_log(log_file, strict=strict):
+        path = os.path.join(log_dir, *key.split('/'))
+        rows[path] = _make_benchmark_run_row(report, path)
+    return rows
+
+
+class BenchmarkReportWatcher:
+    """Incrementally load the benchmark report files within a directory.
+
+    Each refresh() scans the directory tree for new, changed, and removed
+    benchmark report files, and only parses new or changed files. Report logs
+    (see load_report_logs) are read again when they change, and replace the
+    report files of the results directories they have reports of, so report
+    files are only parsed for results without a log. Listings of
+    directories whose modification time is unchanged are reused, so a scan
+    stats directories and report files without listing the whole tree again.
+    Listings taken shortly after a directory was modified are not reused, and
+    every WATCHER_FULL_SCAN_REFRESHES refreshes all directories are listed
+    again, so files added within the modification time resolution of the
+    filesystem are found.
+    When reports were only added, their rows are appended to the DataFrame of
+    benchmark runs. This allows following a sweep while its results are
+    being written.
+
+    Files which cannot be loaded, such as a report still being written, are
+    skipped until they change.
+    """
+
+    def __init__(
+            self,
+            source_dir: str,
+            max_workers: int | None = None,
+            cache_file: str | None = None,
+            strict: bool = False):
+        """Create a watcher, without loading any reports until refresh().
+
+        Args:
+            source_dir (str): Directory to recursively search for benchmark
+                report files.
+            max_workers (int | None): Maximum number of worker processes to
+                parse reports with (see load_benchmark_reports).
+            cache_file (str | None): JSON file to cache parsed rows in, which
+                is read on the first refresh and written when reports change.
+            strict (bool): Run all consistency checks of benchmark reports.
+        """
+        check_dir(source_dir)
+        self.source_dir = os.path.abspath(source_dir)
+        self.max_workers = max_workers
+        self.cache_file = cache_file
+        self.strict = strict
+        # Modification time (ns), subdirectories, report files, report logs
+        # and time of listing (ns), keyed by directory
+        self._dirs: dict[str, tuple[int, list[str], list[str], list[str], int]] = {}
+        self._scans = 0
+        # Cache key and row (None if file could not be loaded), keyed by
+        # report file in order of ingestion
+        self._entries: dict[str, dict[str, Any]] = {}
+        # Cache key and rows keyed by report path, keyed by report log
+        self._logs: dict[str, dict[str, Any]] = {}
+        self._runs_df = make_benchmark_runs_df()
+        self._cache_read = False
+
+    @property
+    def runs_df(self) -> pd.DataFrame:
+        """DataFrame of benchmark runs as of the last refresh()."""
+        return self._runs_df
+
+    @property
+    def br_files(self) -> list[str]:
+        """Benchmark report files loaded as of the last refresh()."""
+        return [path for path, entry in self._entries.items() if entry['row'] is not None]
+
+    @property
+    def log_files(self) -> list[str]:
+        """Report logs loaded as of the last refresh()."""
+        return list(self._logs)
+
+    def _scan(self) -> tuple[list[str], list[str]]:
+        """Find benchmark report files and report logs, listing only changed
+        directories.
+
+        Returns:
+            tuple[list[str], list[str]]: Paths of benchmark report files and
+                of report logs.
+        """
+        dirs = {}
+        br_files = []
+        log_files = []
+        full_scan = self._scans % WATCHER_FULL_SCAN_REFRESHES == 0
+        self._scans += 1
+        to_scan = [self.source_dir]
+        while to_scan:
+            dir_path = to_scan.pop()
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+                listing = None if full_scan else self._dirs.get(dir_path)
+                if (listing is None or listing[0] != mtime
+                        or listing[4] - mtime < WATCHER_MTIME_RESOLUTION_NS):
+                    listed = time.time_ns()
+                    subdirs = []
+                    files = []
+                    logs = []
+                    with os.scandir(dir_path) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                            elif fnmatch(entry.name, BENCHMARK_REPORT_PATTERN):
+                                files.append(entry.path)
+                            elif entry.name == convert.REPORT_LOG_FILE:
+                                logs.append(entry.path)
+                    listing = (mtime, sorted(subdirs), sorted(files), logs, listed)
+            except FileNotFoundError:
+                # Directory removed while scanning
+                continue
+            dirs[dir_path] = listing
+            br_files.extend(listing[2])
+            log_files.extend(listing[3])
+            # Visit subdirectories in sorted order
+            to_scan.extend(reversed(listing[1]))
+        self._dirs = dirs
+        return br_files, log_files
+
+    def _refresh_logs(self, log_files: list[str]) -> bool:
+        """Read new and changed report logs.
+
+        Args:
+            log_files (list[str]): Paths of report logs.
+
+        Returns:
+            bool: True if rows of report logs changed.
+        """
+        changed = False
+        for path in list(self._logs):
+            if path not in log_files:
+                del self._logs[path]
+                changed = True
+        for path in log_files:
+            try:
+                key = _file_cache_key(path)
+            except FileNotFoundError:
+                continue
+            entry = self._logs.get(path)
+            if entry is not None and entry['key'] == key:
+                continue
+            try:
+                rows = _load_report_log_rows(path, self.strict)
+            except Exception as e:
+                # Such as a line being appended, read again on next refresh
+                print(f'{Text.YELLOW}Could not load {path}: {e}{Text.DEFAULT}')
+                continue
+            self._logs[path] = {'key': key, 'rows': rows}
+            changed = True
+        return changed
+
+    def refresh(self) -> bool:
+        """Load new and changed benchmark report files and report logs.
+
+        Returns:
+            bool: True if the DataFrame of benchmark runs changed.
+        """
+        if not self._cache_read and self.cache_file:
+            # Only reuse cached rows of files which still exist
+            self._cache_read = True
+            cache = _read_runs_cache(self.cache_file)
+        else:
+            cache = {}
+
+        br_files, log_files = self._scan()
+        logs_changed = self._refresh_logs(log_files)
+        # Results directories with reports in a log are read from the log
+        logged_dirs = {
+            os.path.dirname(path) for log in self._logs.values() for path in log['rows']}
+        keys = {}
+        for path in br_files:
+            if os.path.dirname(path) in logged_dirs:
+                continue
+            try:
+                keys[path] = _file_cache_key(path)
+            except FileNotFoundError:
+                continue
+
+        removed = [path for path in self._entries if path not in keys]
+        added = []
+        changed = []
+        to_parse = []
+        for path, key in keys.items():
+            entry = self._entries.get(path)
+            if entry is None:
+                added.append(path)
+                cached = cache.get(path)
+                if cached is not None and cached['key'] == key:
+                    self._entries[path] = cached
+                    continue
+            elif entry['key'] == key:
+                continue
+            else:
+                changed.append(path)
+            to_parse.append(path)
+
+        if not (removed or added or changed or logs_changed):
+            return False
+
+        for path in removed:
+            del self._entries[path]
+        parsed = _parse_benchmark_run_rows(
+            to_parse, self.max_workers, self.strict, skip_errors=True)
+        for path, row in zip(to_parse, parsed):
+            self._entries[path] = {'key': keys[path], 'row': row}
+        if self.cache_file and to_parse:
+            _write_runs_cache(self.cache_file, {
+                path: entry for path, entry in self._entries.items()
+                if entry['row'] is not None})
+
+        if removed or changed or logs_changed or self._runs_df.empty:
+            # Rows are rebuilt from report logs, then from parsed rows in order
+            # of ingestion
+            rows = [row for log in self._logs.values() for row in log['rows'].values()]
+            rows.extend(
+                entry['row'] for entry in self._entries.values() if entry['row'] is not None)
+            self._runs_df = make_benchmark_runs_df_from_rows(rows)
+            return True
+        new_rows = [self._entries[path]['row'] for path in added
+                    if self._entries[path]['row'] is not None]
+        if not new_rows:
+            return False
+        self._runs_df = pd.concat(
+            [self._runs_df, make_benchmark_runs_df_from_rows(new_rows)],
+            ignore_index=True)
+        return True
+
+
 def get_scenarios(runs_df: pd.DataFrame,
                   scenario_columns: list[str]) -> list[dict[str, Any]]:
     """Get a list of available scenarios from runs DataFrame.
@@ -1149,19 +1757,124 @@ def get_scenarios(runs_df: pd.DataFrame,
     return scenarios
 
 
+@dataclass
+class ScenarioIndex:
+    """Row positions of every scenario in a benchmark runs DataFrame."""
+
+    # Columns defining a scenario
+    columns: list[str]
+    # Row positions (for DataFrame.iloc) keyed by tuple of scenario values
+    groups: dict[tuple[Any, ...], np.ndarray]
+    # Number of rows in indexed DataFrame
+    num_rows: int
+
+    def scenarios(self) -> list[dict[str, Any]]:
+        """Get a list of scenarios in the index.
+
+        Returns:
+            list[dict[str, Any]]: List of scenarios, consisting of unique
+                groups of values from the scenario columns.
+        """
+        return [dict(zip(self.columns, key)) for key in self.groups]
+
+    def key(self, scenario: dict[str, Any]) -> tuple[Any, ...] | None:
+        """Get the key of a scenario in the index.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match.
+
+        Returns:
+            tuple | None: Key for groups, or None if scenario does not have
+                the same columns as the index.
+        """
+        if len(scenario) != len(self.columns):
+            return None
+        try:
+            return tuple(scenario[col] for col in self.columns)
+        except KeyError:
+            return None
+
+    def rows(self, scenario: dict[str, Any]) -> np.ndarray:
+        """Get row positions matching a scenario.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match.
+
+        Returns:
+            numpy.ndarray: Row positions, in ascending order.
+        """
+        key = self.key(scenario)
+        if key is None:
+            raise KeyError(
+                f'Scenario columns {list(scenario)} do not match index columns {self.columns}')
+        return self.groups.get(key, np.empty(0, dtype=np.intp))
+
+    def count(self, scenario: dict[str, Any]) -> int:
+        """Get number of rows matching a scenario.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match.
+
+        Returns:
+            int: Number of rows.
+        """
+        return len(self.rows(scenario))
+
+
+def make_scenario_index(
+        runs_df: pd.DataFrame,
+        scenario_columns: list[str]) -> ScenarioIndex:
+    """Group rows of a DataFrame by scenario in a single pass.
+
+    Rows having a null value in any scenario column are not part of any
+    scenario, consistent with get_scenarios() and get_scenario_df().
+
+    Args:
+        runs_df (pandas.DataFrame): Benchmark runs to index.
+        scenario_columns (list[str]): Columns to group into common sets.
+
+    Returns:
+        ScenarioIndex: Row positions of each scenario.
+    """
+    for col in scenario_columns:
+        if col not in runs_df.columns:
+            raise KeyError(f'Invalid column: {col}')
+    groups = {}
+    if len(runs_df) and scenario_columns:
+        indices = runs_df.groupby(
+            scenario_columns, dropna=True, sort=False).indices
+        for key, positions in indices.items():
+            if not isinstance(key, tuple):
+                key = (key,)
+            groups[key] = positions
+    return ScenarioIndex(
+        columns=list(scenario_columns),
+        groups=groups,
+        num_rows=len(runs_df),
+    )
+
+
 def get_scenario_df(
         runs_df: pd.DataFrame,
-        scenario: dict[str, Any]):
+        scenario: dict[str, Any],
+        scenario_index: ScenarioIndex | None = None) -> pd.DataFrame:
     """Get rows from a dataframe matching a scenario.
 
     Args:
         runs_df (pandas.DataFrame): Benchmark runs to retrieve the
             scenario data from.
         scenario (dict[str, Any]): Columns and values to match.
+        scenario_index (ScenarioIndex | None): Index of runs_df, made with
+            make_scenario_index(). If provided and its columns match the
+            scenario, rows are looked up rather than filtered.
 
     Returns:
         pandas.DataFrame: Rows matching the scenario.
     """
+    if scenario_index is not None and scenario_index.key(scenario) is not None:
+        if scenario_index.num_rows != len(runs_df):
+            raise ValueError('Scenario index does not match DataFrame')
+        return runs_df.iloc[scenario_index.rows(scenario)]
     for col, val in scenario.items():
         runs_df = runs_df[(runs_df[col] == val)]
     return runs_df
@@ -1180,10 +1893,15 @@ def get_scenario_counts(
     Returns:
         list[int]: Counts for each scenario.
     """
+    # Scenarios are usually all made from the same columns, so only one
+    # index is needed
+    indexes = {}
     counts = []
     for sc in scenarios:
-        count = len(get_scenario_df(runs_df, sc))
-        counts.append(count)
+        columns = tuple(sc)
+        if columns not in indexes:
+            indexes[columns] = make_scenario_index(runs_df, list(columns))
+        counts.append(indexes[columns].count(sc))
     return counts
 
 
@@ -1213,16 +1931,12 @@ def print_scenarios(
                 spans[ii] = len(str(value))
 
     # Create header, starting with scenario index
+    counts = []
     if runs_df is None:
         header = f'{Text.BOLD}{Text.BLUE}IDX  {Text.DEFAULT}{Text.BOLD}'
     else:
         counts = get_scenario_counts(runs_df, scenarios)
-        header = f'{
-            Text.BOLD}{
-            Text.BLUE}IDX  {
-            Text.RED}Count  {
-                Text.DEFAULT}{
-                    Text.BOLD}'
+        header = f'{Text.BOLD}{Text.BLUE}IDX  {Text.RED}Count  {Text.DEFAULT}{Text.BOLD}'
 
     # Add each column name to header
     for ii, col in enumerate(scenarios[0].keys()):
@@ -1274,14 +1988,19 @@ def make_scenarios_summary_df(
 
     # Populate DataFrame
     counts = get_scenario_counts(runs_df, scenarios)
+    rows = []
+    # Index of DataFrame will have 1:1 correspondance with scenario index
+    index = []
     for ii, sc in enumerate(scenarios):
         if counts[ii] < min_count:
             continue
         row = {'Count': counts[ii]}
         for col, val in sc.items():
             row[col] = val
-        # Index of DataFrame will have 1:1 correspondance with scenario index
-        df.loc[ii] = row
+        rows.append(row)
+        index.append(ii)
+    if rows:
+        df = pd.DataFrame(rows, index=index, columns=df.columns)
 
     return df
 
@@ -1313,6 +2032,139 @@ def get_meet_slo_df(
     return runs_meet_slo_df
 
 
+def _pareto_front_mask(costs: np.ndarray) -> np.ndarray:
+    """Find points which are not strictly dominated by any other point.
+
+    A point is strictly dominated when another point is lower in every
+    objective. Points having a NaN objective can neither dominate nor be
+    dominated, so they are always on the front.
+
+    Two objectives are solved with a sort and running minimum. More
+    objectives use a sort-filter skyline: after sorting by the sum of
+    objectives, a point can only be dominated by points before it, and only
+    needs to be compared with the front found so far, in vectorized blocks.
+
+    Args:
+        costs (numpy.ndarray): Array of shape (points, objectives), where
+            lower values are better.
+
+    Returns:
+        numpy.ndarray: Boolean mask of points on the Pareto front.
+    """
+    n_points, n_obj = costs.shape
+    mask = np.ones(n_points, dtype=bool)
+    valid = ~np.isnan(costs).any(axis=1)
+    idx = np.flatnonzero(valid)
+    vals = costs[valid]
+    if len(idx) < 2 or n_obj == 0:
+        return mask
+
+    if n_obj == 1:
+        mask[idx] = vals[:, 0] == vals[:, 0].min()
+        return mask
+
+    if n_obj == 2:
+        order = np.lexsort((vals[:, 1], vals[:, 0]))
+        x = vals[order, 0]
+        y = vals[order, 1]
+        # Running minimum of y over points with strictly smaller x
+        y_min = np.minimum.accumulate(y)
+        group_start = np.searchsorted(x, x, side='left')
+        y_min_before = np.full(len(x), np.inf)
+        has_before = group_start > 0
+        y_min_before[has_before] = y_min[group_start[has_before] - 1]
+        mask[idx[order]] = ~(y_min_before < y)
+        return mask
+
+    def dominated_by(cand: np.ndarray, others: np.ndarray) -> np.ndarray:
+        """Mask of candidates strictly dominated by any of the others."""
+        dominates = others[None, :, 0] < cand[:, None, 0]
+        for kk in range(1, n_obj):
+            dominates &= others[None, :, kk] < cand[:, None, kk]
+        return dominates.any(axis=1)
+
+    order = np.argsort(vals.sum(axis=1), kind='stable')
+    vals = vals[order]
+    on_front = np.zeros(len(vals), dtype=bool)
+    front = np.empty((0, n_obj))
+    block = 1024
+    for start in range(0, len(vals), block):
+        cand = vals[start:start + block]
+        # Dominated by a point already on the front
+        dominated = np.zeros(len(cand), dtype=bool)
+        for f_start in range(0, len(front), block):
+            dominated |= dominated_by(cand, front[f_start:f_start + block])
+        # Dominated by another remaining candidate in this block
+        remaining = np.flatnonzero(~dominated)
+        dominated[remaining] = dominated_by(cand[remaining], cand[remaining])
+        on_front[start:start + len(cand)] = ~dominated
+        front = np.concatenate([front, cand[~dominated]])
+    mask[idx[order]] = on_front
+    return mask
+
+
+def get_pareto_front_multi_df(
+        runs_df: pd.DataFrame,
+        cols: list[str],
+        sort: bool = False,
+        prefs: dict[str, int] | None = None) -> pd.DataFrame:
+    """Get rows from dataset on Pareto front for any number of metrics.
+
+    A row is on the Pareto front unless another row is better in all metrics.
+
+    Args:
+        runs_df (pandas.DataFrame): Dataset to search.
+        cols (list[str]): Metric columns to optimize.
+        sort (bool): Sort results by the first metric column.
+        prefs (dict[str, int] | None): Preferred direction (Pref.LOW or
+            Pref.HIGH) for columns, overriding COLUMNS. This allows columns
+            derived during analysis, such as cost, to be optimized.
+
+    Returns:
+        pandas.DataFrame: Rows on the Pareto front.
+    """
+    pareto_df = runs_df[_pareto_front_mask(_pareto_costs(runs_df, cols, prefs))]
+    if sort:
+        return pareto_df.sort_values(by=cols[0])
+    # Preserve order
+    return pareto_df
+
+
+def _pareto_costs(
+        runs_df: pd.DataFrame,
+        cols: list[str],
+        prefs: dict[str, int] | None = None) -> np.ndarray:
+    """Get metric columns as costs, where lower values are better.
+
+    Args:
+        runs_df (pandas.DataFrame): Dataset to search.
+        cols (list[str]): Metric columns to optimize.
+        prefs (dict[str, int] | None): Preferred direction (Pref.LOW or
+            Pref.HIGH) for columns, overriding COLUMNS.
+
+    Returns:
+        numpy.ndarray: Array of shape (rows, columns).
+    """
+    if prefs is None:
+        prefs = {}
+    signs = []
+    for col in cols:
+        if col in prefs:
+            pref = prefs[col]
+        elif col in COLUMNS:
+            pref = COLUMNS[col].pref
+        else:
+            raise KeyError(f'Invalid column: {col}')
+        if pref == Pref.NEUTRAL:
+            raise Exception(f'Column does not have a preferred direction: {col}')
+        if pref not in (Pref.LOW, Pref.HIGH):
+            raise Exception(f'Invalid preference for column: {col}')
+        # Convert to costs where lower is better
+        signs.append(1.0 if pref == Pref.LOW else -1.0)
+
+    return runs_df[cols].to_numpy(dtype=float, na_value=np.nan) * np.array(signs)
+
+
 def get_pareto_front_df(
         runs_df: pd.DataFrame,
         col_a: str,
@@ -1335,25 +2187,375 @@ def get_pareto_front_df(
     if COLUMNS[col_b].pref == Pref.NEUTRAL:
         raise Exception(f'Column does not have a preferred direction: {col_b}')
 
-    def better(a: Any, b: Any, col: str) -> bool:
-        """Return true if column in 'a' is better than 'b'."""
-        if COLUMNS[col].pref == Pref.LOW:
-            return a[col] < b[col]
-        if COLUMNS[col].pref == Pref.HIGH:
-            return a[col] > b[col]
-        raise Exception(f'Invalid preference for column: {col}')
-
-    pareto_set = set(runs_df.index.tolist())
-    for ii, rowa in runs_df.iterrows():
-        is_pareto_front = runs_df.index.isin(pareto_set)
-        for jj, rowb in runs_df[is_pareto_front].iterrows():
-            if ii == jj:
-                continue
-            if better(rowa, rowb, col_a) and better(rowa, rowb, col_b):
-                # Index jj worse in all ways to index ii
-                pareto_set.remove(jj)
-    if sort:
-        return runs_df[runs_df.index.isin(pareto_set)].sort_values(by=col_a)
-    else:
-        # Preserve order
-        return runs_df[runs_df.index.isin(pareto_set)]
+    return get_pareto_front_multi_df(runs_df, [col_a, col_b], sort)
+
+
+class SweepIndex:
+    """Index of benchmark runs for interactive filtering, such as in the Sweep
+    Visualizer.
+
+    Rows are grouped by Model and GPU, and the rows of each group are sorted
+    by Num_GPUs, ISL and OSL, so selecting runs with at most a number of GPUs
+    is a binary search within a group rather than a mask over all runs. Rows
+    meeting SLOs and Pareto fronts are memoized by scenario and SLOs, so
+    lookups repeated with the same inputs, as on every rerun of a Streamlit
+    page, are not computed again.
+
+    The index must be rebuilt when its DataFrame changes.
+    """
+
+    GROUP_COLUMNS = ['Model', 'GPU']
+    SORT_COLUMNS = ['Num_GPUs', 'ISL', 'OSL']
+
+    def __init__(self, runs_df: pd.DataFrame, max_memoized: int = 256):
+        """Build index.
+
+        Args:
+            runs_df (pandas.DataFrame): Benchmark runs to index.
+            max_memoized (int): Maximum number of lookups to memoize, least
+                recently used lookups are discarded first.
+        """
+        for col in self.GROUP_COLUMNS + self.SORT_COLUMNS:
+            if col not in runs_df.columns:
+                raise KeyError(f'Invalid column: {col}')
+        self.runs_df = runs_df
+        self.max_memoized = max_memoized
+        self._memo: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self._columns: dict[str, np.ndarray] = {}
+
+        sort_values = [
+            runs_df[col].to_numpy(dtype=float, na_value=np.nan)
+            for col in self.SORT_COLUMNS]
+        # Row positions and sorted values of each group, sorted with NaN last
+        self._groups: dict[tuple[Any, ...], tuple[np.ndarray, list[np.ndarray]]] = {}
+        index = make_scenario_index(runs_df, self.GROUP_COLUMNS)
+        for key, positions in index.groups.items():
+            order = np.lexsort([values[positions] for values in reversed(sort_values)])
+            positions = positions[order]
+            self._groups[key] = (positions, [values[positions] for values in sort_values])
+
+    def _column(self, col: str) -> np.ndarray:
+        """Get values of a column as an array.
+
+        Args:
+            col (str): Column.
+
+        Returns:
+            numpy.ndarray: Values of column.
+        """
+        if col not in self._columns:
+            if col not in self.runs_df.columns:
+                raise KeyError(f'Invalid column: {col}')
+            self._columns[col] = self.runs_df[col].to_numpy()
+        return self._columns[col]
+
+    def _memoize(self, key: tuple[Any, ...], func: Any) -> Any:
+        """Get the memoized result of a lookup, or compute and memoize it.
+
+        Args:
+            key (tuple): Key of lookup.
+            func (Callable): Function computing result.
+
+        Returns:
+            Any: Result.
+        """
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+        value = func()
+        self._memo[key] = value
+        if len(self._memo) > self.max_memoized:
+            self._memo.popitem(last=False)
+        return value
+
+    def model_gpus(self) -> list[tuple[Any, Any]]:
+        """Get the (Model, GPU) groups of the index.
+
+        Returns:
+            list[tuple[Any, Any]]: Model and GPU of each group.
+        """
+        return list(self._groups)
+
+    def rows(self,
+             scenario: dict[str, Any],
+             max_num_gpus: float | None = None,
+             min_isl: float | None = None,
+             min_osl: float | None = None) -> np.ndarray:
+        """Get row positions matching a scenario.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match, which must
+                include Model and GPU.
+            max_num_gpus (float | None): Maximum number of GPUs.
+            min_isl (float | None): Minimum input sequence length.
+            min_osl (float | None): Minimum output sequence length.
+
+        Returns:
+            numpy.ndarray: Row positions (for DataFrame.iloc), in ascending
+                order.
+        """
+        key = ('rows', tuple(scenario.items()), max_num_gpus, min_isl, min_osl)
+        return self._memoize(key, lambda: self._rows(scenario, max_num_gpus, min_isl, min_osl))
+
+    def _rows(self,
+              scenario: dict[str, Any],
+              max_num_gpus: float | None,
+              min_isl: float | None,
+              min_osl: float | None) -> np.ndarray:
+        """Find row positions matching a scenario, see rows()."""
+        try:
+            group_key = tuple(scenario[col] for col in self.GROUP_COLUMNS)
+        except KeyError:
+            raise KeyError(
+                f'Scenario columns {list(scenario)} must include {self.GROUP_COLUMNS}')
+        if group_key not in self._groups:
+            return np.empty(0, dtype=np.intp)
+        positions, (num_gpus, isl, osl) = self._groups[group_key]
+        end = len(positions)
+        if max_num_gpus is not None:
+            end = np.searchsorted(num_gpus, max_num_gpus, side='right')
+        positions = positions[:end]
+        mask = np.ones(end, dtype=bool)
+        if min_isl is not None:
+            mask &= isl[:end] >= min_isl
+        if min_osl is not None:
+            mask &= osl[:end] >= min_osl
+        for col, val in scenario.items():
+            if col not in self.GROUP_COLUMNS:
+                mask &= self._column(col)[positions] == val
+        return np.sort(positions[mask])
+
+    def get_df(self, scenario: dict[str, Any], **kwargs) -> pd.DataFrame:
+        """Get rows matching a scenario.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match, which must
+                include Model and GPU.
+            **kwargs: Limits on Num_GPUs, ISL and OSL (see rows()).
+
+        Returns:
+            pandas.DataFrame: Rows matching the scenario.
+        """
+        return self.runs_df.iloc[self.rows(scenario, **kwargs)]
+
+    def meet_slo_rows(self, scenario: dict[str, Any], slos: list[SLO]) -> np.ndarray:
+        """Get row positions matching a scenario and meeting SLOs.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match, which must
+                include Model and GPU.
+            slos (list[SLO]): SLOs to meet.
+
+        Returns:
+            numpy.ndarray: Row positions, in ascending order.
+        """
+        key = ('slo', tuple(scenario.items()), tuple((slo.col, slo.value) for slo in slos))
+
+        def meet_slo_rows() -> np.ndarray:
+            positions = self.rows(scenario)
+            mask = np.ones(len(positions), dtype=bool)
+            for slo in slos:
+                values = self._column(slo.col)[positions]
+                if COLUMNS[slo.col].pref == Pref.LOW:
+                    # Must be less than or equal to SLO value to meet SLO
+                    mask &= values <= slo.value
+                elif COLUMNS[slo.col].pref == Pref.HIGH:
+                    # Must be greater than or equal to SLO value to meet SLO
+                    mask &= values >= slo.value
+                else:
+                    raise Exception(f'Invalid SLO: {slo.col}')
+            return positions[mask]
+
+        return self._memoize(key, meet_slo_rows)
+
+    def get_meet_slo_df(self, scenario: dict[str, Any], slos: list[SLO]) -> pd.DataFrame:
+        """Get rows matching a scenario and meeting SLOs, like
+        get_meet_slo_df(get_scenario_df(runs_df, scenario), slos).
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match, which must
+                include Model and GPU.
+            slos (list[SLO]): SLOs to meet.
+
+        Returns:
+            pandas.DataFrame: Rows meeting SLOs.
+        """
+        return self.runs_df.iloc[self.meet_slo_rows(scenario, slos)]
+
+    def pareto_front_rows(self,
+                          scenario: dict[str, Any],
+                          slos: list[SLO],
+                          cols: list[str]) -> np.ndarray:
+        """Get row positions on the Pareto front of rows matching a scenario
+        and meeting SLOs.
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match, which must
+                include Model and GPU.
+            slos (list[SLO]): SLOs to meet.
+            cols (list[str]): Metric columns to optimize.
+
+        Returns:
+            numpy.ndarray: Row positions, in ascending order.
+        """
+        key = ('pareto', tuple(scenario.items()),
+               tuple((slo.col, slo.value) for slo in slos), tuple(cols))
+
+        def pareto_front_rows() -> np.ndarray:
+            positions = self.meet_slo_rows(scenario, slos)
+            costs = _pareto_costs(self.runs_df.iloc[positions], cols)
+            return positions[_pareto_front_mask(costs)]
+
+        return self._memoize(key, pareto_front_rows)
+
+    def get_pareto_front_df(self,
+                            scenario: dict[str, Any],
+                            slos: list[SLO],
+                            col_a: str,
+                            col_b: str,
+                            sort: bool = False) -> pd.DataFrame:
+        """Get rows on the Pareto front of rows matching a scenario and
+        meeting SLOs, like get_pareto_front_df() of get_meet_slo_df().
+
+        Args:
+            scenario (dict[str, Any]): Columns and values to match, which must
+                include Model and GPU.
+            slos (list[SLO]): SLOs to meet.
+            col_a (str): First metric column to optimize.
+            col_b (str): Second metric column to optimize.
+            sort (bool): Sort results by first metric column.
+
+        Returns:
+            pandas.DataFrame: Rows on the Pareto front.
+        """
+        pareto_df = self.runs_df.iloc[self.pareto_front_rows(scenario, slos, [col_a, col_b])]
+        if sort:
+            return pareto_df.sort_values(by=col_a)
+        return pareto_df
+
+
+def _parquet_schema(columns: list[str] | None = None):
+    """Get the Arrow schema of the benchmark runs table from COLUMNS.
+
+    Args:
+        columns (list[str] | None): Columns to include, or all if None.
+
+    Returns:
+        pyarrow.Schema: Schema for benchmark runs.
+    """
+    import pyarrow as pa
+
+    arrow_types = {
+        'str': pa.string(),
+        'float': pa.float64(),
+        'int': pa.int64(),
+        'bool': pa.bool_(),
+    }
+    if columns is None:
+        columns = list(COLUMNS)
+    return pa.schema(
+        [pa.field(col, arrow_types[COLUMNS[col].dtype]) for col in columns])
+
+
+def export_benchmark_runs_parquet(
+        runs_df: pd.DataFrame,
+        dest_dir: str,
+        partition_cols: list[str] | None = None,
+        replace_partitions: bool = False) -> None:
+    """Save benchmark runs to a partitioned Parquet dataset.
+
+    Columns are stored with the data types declared in COLUMNS. Each call adds
+    new files to the dataset, so runs may be exported incrementally as they
+    become available.
+
+    Args:
+        runs_df (DataFrame): Benchmark runs to save.
+        dest_dir (str): Root directory of Parquet dataset.
+        partition_cols (list[str] | None): Columns to partition the dataset
+            by, defaults to PARQUET_PARTITION_COLUMNS.
+        replace_partitions (bool): Delete existing data in partitions that
+            runs_df writes to, rather than adding to them.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if partition_cols is None:
+        partition_cols = PARQUET_PARTITION_COLUMNS
+    for col in partition_cols:
+        if col not in COLUMNS:
+            raise KeyError(f'Invalid column: {col}')
+
+    table = pa.Table.from_pandas(
+        runs_df[list(COLUMNS)],
+        schema=_parquet_schema(),
+        preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        dest_dir,
+        partition_cols=partition_cols,
+        existing_data_behavior='delete_matching' if replace_partitions else 'overwrite_or_ignore')
+
+
+def import_benchmark_runs_parquet(
+        source_dir: str,
+        scenario: dict[str, Any] | None = None,
+        slos: list[SLO] | None = None,
+        columns: list[str] | None = None,
+        partition_cols: list[str] | None = None) -> pd.DataFrame:
+    """Load benchmark runs from a partitioned Parquet dataset.
+
+    Scenario and SLO filters are pushed down to the Parquet reader, so
+    partitions and row groups which cannot match are skipped. The result is
+    equivalent to get_meet_slo_df(get_scenario_df(runs_df, scenario), slos)
+    on the full dataset, restricted to the requested columns.
+
+    Args:
+        source_dir (str): Root directory of Parquet dataset.
+        scenario (dict[str, Any] | None): Columns and values to match.
+        slos (list[SLO] | None): SLOs to meet.
+        columns (list[str] | None): Columns to load, or all if None.
+        partition_cols (list[str] | None): Columns the dataset is
+            partitioned by, defaults to PARQUET_PARTITION_COLUMNS.
+
+    Returns:
+        DataFrame: Benchmark runs matching scenario and SLOs.
+    """
+    import pyarrow.dataset as ds
+
+    check_dir(source_dir)
+    if partition_cols is None:
+        partition_cols = PARQUET_PARTITION_COLUMNS
+    if columns is None:
+        columns = list(COLUMNS)
+    for col in columns + list(scenario or {}) + [slo.col for slo in slos or []]:
+        if col not in COLUMNS:
+            raise KeyError(f'Invalid column: {col}')
+
+    expression = None
+    for col, val in (scenario or {}).items():
+        if val is None or (isinstance(val, float) and pd.isna(val)):
+            term = ds.field(col).is_null()
+        else:
+            term = ds.field(col) == val
+        expression = term if expression is None else expression & term
+    for slo in slos or []:
+        if COLUMNS[slo.col].pref == Pref.LOW:
+            # Must be less than or equal to SLO value to meet SLO
+            term = ds.field(slo.col) <= slo.value
+        elif COLUMNS[slo.col].pref == Pref.HIGH:
+            # Must be greater than or equal to SLO value to meet SLO
+            term = ds.field(slo.col) >= slo.value
+        else:
+            raise Exception(f'Invalid SLO: {slo.col}')
+        expression = term if expression is None else expression & term
+
+    schema = _parquet_schema()
+    dataset = ds.dataset(
+        source_dir,
+        schema=schema,
+        format='parquet',
+        partitioning=ds.partitioning(
+            _parquet_schema(partition_cols), flavor='hive'),
+    )
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table.to_pandas()
@@ -16,6 +16,9 @@ try:
     from explorer import (
         COLUMNS,
         SLO,
+        ScenarioIndex,
+        SweepIndex,
+        make_scenario_index,
         get_scenario_df,
         get_meet_slo_df,
         get_pareto_front_df
@@ -24,6 +27,9 @@ except ImportError:
     from config_explorer.explorer import (
         COLUMNS,
         SLO,
+        ScenarioIndex,
+        SweepIndex,
+        make_scenario_index,
         get_scenario_df,
         get_meet_slo_df,
         get_pareto_front_df
@@ -76,7 +82,8 @@ def plot_scenario(
         col_y: str,
         col_seg_by: str = '',
         log_x: bool = False,
-        log_y: bool = False) -> plt.Figure:
+        log_y: bool = False,
+        scenario_index: ScenarioIndex | None = None) -> plt.Figure:
     """Plot the metrics of a scenario from a column (Y) versus another
     column (X).
 
@@ -100,6 +107,8 @@ def plot_scenario(
             directory that is common only to points within a run.
         log_x (bool): Plot X axis on log scale.
         log_y (bool): Plot Y axis on log scale.
+        scenario_index (ScenarioIndex | None): Index of runs_df from
+            make_scenario_index(), used to look up the scenario rows.
 
     Returns:
         matplotlib.pyplot.Figure: Plot figure.
@@ -109,7 +118,7 @@ def plot_scenario(
             raise KeyError(f'Invalid column: {col}')
 
     # Filter runs to specific scenario
-    runs_df = get_scenario_df(runs_df, scenario)
+    runs_df = get_scenario_df(runs_df, scenario, scenario_index)
 
     if log_x and log_y:
         plot_func = plt.loglog
@@ -135,17 +144,15 @@ def plot_scenario(
             ck.append(col_seg_by)
 
         # Given configuration keys, find the set of unique combinations of
-        # these columns within the dataset.
-        config_sets = list(set(runs_df.set_index(ck).index.dropna()))
-        config_sets.sort()
+        # these columns within the dataset, and the rows of each.
+        config_index = make_scenario_index(runs_df, ck)
+        config_sets = sorted(config_index.groups)
 
         for ii, conf in enumerate(config_sets):
             # Make a DataFrame for specific configuration
-            conf_df = runs_df
+            conf_df = runs_df.iloc[config_index.groups[conf]].sort_values(by=col_x)
             labels = []
             for jj, val in enumerate(conf):
-                conf_df = conf_df[(conf_df[ck[jj]] == val)
-                                  ].sort_values(by=col_x)
                 if ck[jj] == col_seg_by:
                     continue
                 labels.append(f'{COLUMNS[ck[jj]].label}={val}')
@@ -192,7 +199,8 @@ def plot_scenario_tradeoff(
         col_z: str,
         col_seg_by: str = '',
         log_x: bool = False,
-        log_y: bool = False) -> plt.Figure:
+        log_y: bool = False,
+        scenario_index: ScenarioIndex | None = None) -> plt.Figure:
     """Make a plot displaying the tradeoff between two columns (X and Y)
     while a third column (Z) is changed.
 
@@ -218,6 +226,8 @@ def plot_scenario_tradeoff(
             directory that is common only to points within a run.
         log_x (bool): Plot X axis on log scale.
         log_y (bool): Plot Y axis on log scale.
+        scenario_index (ScenarioIndex | None): Index of runs_df from
+            make_scenario_index(), used to look up the scenario rows.
 
     Returns:
         matplotlib.pyplot.Figure: Plot figure.
@@ -227,7 +237,7 @@ def plot_scenario_tradeoff(
             raise KeyError(f'Invalid column: {col}')
 
     # Filter runs to specific scenario
-    runs_df = get_scenario_df(runs_df, scenario)
+    runs_df = get_scenario_df(runs_df, scenario, scenario_index)
 
     if log_x and log_y:
         plot_func = plt.loglog
@@ -253,17 +263,15 @@ def plot_scenario_tradeoff(
             ck.append(col_seg_by)
 
         # Given configuration keys, find the set of unique combinations of
-        # these columns within the dataset.
-        config_sets = list(set(runs_df.set_index(ck).index.dropna()))
-        config_sets.sort()
+        # these columns within the dataset, and the rows of each.
+        config_index = make_scenario_index(runs_df, ck)
+        config_sets = sorted(config_index.groups)
 
         for ii, conf in enumerate(config_sets):
             # Make a DataFrame for specific configuration
-            conf_df = runs_df
+            conf_df = runs_df.iloc[config_index.groups[conf]].sort_values(by=col_z)
             labels = []
             for jj, val in enumerate(conf):
-                conf_df = conf_df[(conf_df[ck[jj]] == val)
-                                  ].sort_values(by=col_z)
                 if ck[jj] == col_seg_by:
                     continue
                 labels.append(f'{COLUMNS[ck[jj]].label}={val}')
@@ -319,7 +327,9 @@ def plot_pareto_tradeoff(
         col_y: str,
         slos: list[SLO] = [],
         log_x: bool = False,
-        log_y: bool = False) -> plt.Figure:
+        log_y: bool = False,
+        scenario_index: ScenarioIndex | None = None,
+        sweep_index: SweepIndex | None = None) -> plt.Figure:
     """Make a plot displaying the tradeoff between two columns (X and Y),
     highlighting the Pareto front and graying out points failng SLOs.
 
@@ -331,6 +341,11 @@ def plot_pareto_tradeoff(
         slos (list[SLO]): Service level objectives.
         log_x (bool): Plot X axis on log scale.
         log_y (bool): Plot Y axis on log scale.
+        scenario_index (ScenarioIndex | None): Index of runs_df from
+            make_scenario_index(), used to look up the scenario rows.
+        sweep_index (SweepIndex | None): Index of runs_df, used to look up
+            memoized rows meeting SLOs and on the Pareto front. The scenario
+            must include Model and GPU.
 
     Returns:
         matplotlib.pyplot.Figure: Plot figure.
@@ -339,18 +354,23 @@ def plot_pareto_tradeoff(
         if col not in runs_df.columns:
             raise KeyError(f'Invalid column: {col}')
 
-    # Filter runs to specific scenario
-    scenario_df = get_scenario_df(runs_df, scenario)
-    # Get just the rows that meet SLOs
-    meet_slo_df = get_meet_slo_df(scenario_df, slos)
-    # From rows matching SLOs, get rows on Pareto front
-    pareto_df = get_pareto_front_df(meet_slo_df, col_x, col_y)
+    if sweep_index is not None:
+        if sweep_index.runs_df is not runs_df:
+            raise ValueError('Sweep index does not match DataFrame')
+        scenario_df = sweep_index.get_df(scenario)
+        meet_slo_df = sweep_index.get_meet_slo_df(scenario, slos)
+        pareto_df = sweep_index.get_pareto_front_df(scenario, slos, col_x, col_y)
+    else:
+        # Filter runs to specific scenario
+        scenario_df = get_scenario_df(runs_df, scenario, scenario_index)
+        # Get just the rows that meet SLOs
+        meet_slo_df = get_meet_slo_df(scenario_df, slos)
+        # From rows matching SLOs, get rows on Pareto front
+        pareto_df = get_pareto_front_df(meet_slo_df, col_x, col_y)
     # Rows that fail SLOs
-    fail_slo_df = scenario_df[~scenario_df.index.isin(
-        meet_slo_df.index.tolist())]
+    fail_slo_df = scenario_df[~scenario_df.index.isin(meet_slo_df.index)]
     # Rows that meet SLOs, but are not on the Pareto front
-    meet_slo_not_pareto_df = meet_slo_df[~meet_slo_df.index.isin(
-        pareto_df.index.tolist())]
+    meet_slo_not_pareto_df = meet_slo_df[~meet_slo_df.index.isin(pareto_df.index)]
 
     if log_x and log_y:
         plot_func = plt.loglog
@@ -407,4 +427,101 @@ def plot_pareto_tradeoff(
     plt.ylabel(_column_axis_label(col_y), fontsize='16')
     plt.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
     plt.grid(True, linewidth=1, ls='--', color='gray')
-    return fig
\ No newline at end of file
+    return fig
+
+def plot_roofline(
+        runs_df: pd.DataFrame,
+        scenario: dict[str, Any],
+        config_keys: list[str],
+        col_x: str,
+        col_y: str,
+        col_roofline: str,
+        log_x: bool = False,
+        log_y: bool = False,
+        scenario_index: ScenarioIndex | None = None) -> plt.Figure:
+    """Plot measured metrics of a scenario from a column (Y) versus another
+    column (X), against predictions of an analytic roofline model.
+
+    Each unique combination of config_keys is a trace of measured points,
+    with its roofline predictions as a dashed line of the same color. Since
+    a roofline model gives bounds, the gap between the two is how far a
+    configuration is from the hardware limits.
+
+    Args:
+        runs_df (pandas.DataFrame): Benchmark run data, with predictions
+            such as from capacity_planner.estimate_roofline() in an extra
+            column.
+        scenario (dict[str, Any]): Scenario from benchmark data to plot.
+        config_keys (list[str]): Columns to be grouped together as a set of
+            configuration parameters to be compared within the plot.
+        col_x (str): Column from benchmark data for X axis.
+        col_y (str): Column from benchmark data for Y axis.
+        col_roofline (str): Column of predictions for col_y.
+        log_x (bool): Plot X axis on log scale.
+        log_y (bool): Plot Y axis on log scale.
+        scenario_index (ScenarioIndex | None): Index of runs_df from
+            make_scenario_index(), used to look up the scenario rows.
+
+    Returns:
+        matplotlib.pyplot.Figure: Plot figure.
+    """
+    for col in list(scenario) + [col_roofline]:
+        if col not in runs_df.columns:
+            raise KeyError(f'Invalid column: {col}')
+
+    # Filter runs to specific scenario
+    runs_df = get_scenario_df(runs_df, scenario, scenario_index)
+
+    if log_x and log_y:
+        plot_func = plt.loglog
+    elif log_x:
+        plot_func = plt.semilogx
+    elif log_y:
+        plot_func = plt.semilogy
+    else:
+        plot_func = plt.plot
+
+    global fignum
+    fignum += 1
+    fig = plt.figure(fignum)
+
+    config_index = make_scenario_index(runs_df, config_keys)
+    for ii, conf in enumerate(sorted(config_index.groups)):
+        conf_df = runs_df.iloc[config_index.groups[conf]].sort_values(by=col_x)
+        label = ', '.join(
+            f'{COLUMNS[col].label}={val}' for col, val in zip(config_keys, conf))
+        plot_func(
+            conf_df[col_x], conf_df[col_y],
+            label=label,
+            marker=MARKERS[0], markersize=4,
+            color=COLORS[ii % len(COLORS)],
+            linestyle=''
+        )
+        plot_func(
+            conf_df[col_x], conf_df[col_roofline],
+            label=f'{label} (roofline)',
+            color=COLORS[ii % len(COLORS)],
+            linestyle=LINE_STYLES[1]
+        )
+
+    if log_x and log_y:
+        plt.axis([None, None, None, None])
+    elif log_x:
+        plt.axis([None, None, 0, None])
+    elif log_y:
+        plt.axis([0, None, None, None])
+    else:
+        plt.axis([0, None, 0, None])
+
+    title = ''
+    for key, value in scenario.items():
+        if len(title.rsplit('\n')[-1]) > 30:
+            title += '\n'
+        title += f'{COLUMNS[key].label}: {value}  '
+    title.strip()
+    plt.title(title)
+    plt.xlabel(_column_axis_label(col_x), fontsize='16')
+    plt.ylabel(_column_axis_label(col_y), fontsize='16')
+    plt.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
+    plt.grid(True, linewidth=1, ls='--', color='gray')
+    return fig
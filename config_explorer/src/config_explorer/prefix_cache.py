@@ -0,0 +1,440 @@
+"""
+This file contains an offline simulator of prefix cache hit rates of
+cache-aware routing by the inference scheduler, to predict the effect of
+prefix-cache-scorer settings before running benchmarks.
+
+A request stream is described by a PrefixCacheWorkload, made from the
+parameters of a shared prefix workload profile with shared_prefix_workload(),
+or from the token IDs of recorded prompts with token_ids_workload(). Requests
+are replayed against replicas with simulate_prefix_cache(), where each replica
+has an LRU cache of lruCapacityPerServer blocks of blockSize tokens, and
+requests are routed by a weighted sum of prefix and queue scores like the
+prefix-cache-scorer and queue-scorer plugins. sweep_prefix_cache() simulates
+many configurations in parallel processes, returning a DataFrame of hit rates
+and prefill tokens saved.
+
+Prompts are split in blocks, and consecutive blocks which are always requested
+together are merged into segments. As with vLLM, blocks of a request are freed
+last block first, so the blocks of a segment are evicted from its end and the
+cached blocks of a segment are always a prefix of it. Tracking segments rather
+than blocks gives the same hits and evictions as a cache of blocks, in a
+fraction of the time.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+import heapq
+import multiprocessing
+import os
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# Scorer weights of routing policies
+ROUTING_POLICIES = {
+    'random': {'prefix_weight': 0.0, 'queue_weight': 0.0},
+    'prefix-aware': {'prefix_weight': 1.0, 'queue_weight': 0.0},
+    'queue-aware': {'prefix_weight': 0.0, 'queue_weight': 1.0},
+}
+
+
+@dataclass
+class PrefixCacheWorkload:
+    """Stream of requests, with prompts as sequences of segments of blocks."""
+    # Block size in tokens
+    block_size: int
+    # Number of blocks of each segment
+    segment_blocks: np.ndarray
+    # Segment IDs of the prompt of each request, in order
+    requests: list[tuple[int, ...]]
+    # Number of prompt tokens of each request
+    prompt_tokens: np.ndarray
+    # Arrival time of each request in seconds, in ascending order
+    arrival_times: np.ndarray
+
+
+@dataclass
+class PrefixCacheConfig:
+    """Replicas and routing to simulate."""
+    # Number of replicas
+    replicas: int = 1
+    # Blocks cached by each replica (lruCapacityPerServer)
+    lru_capacity_per_server: int = 31250
+    # Blocks at the start of a prompt matched for the prefix score
+    # (maxPrefixBlocksToMatch)
+    max_prefix_blocks_to_match: int = 256
+    # Weight of the fraction of prompt blocks cached by a replica
+    prefix_weight: float = 0.0
+    # Weight of the normalized number of requests in flight on a replica
+    queue_weight: float = 0.0
+    # Seconds a request is in flight on its replica
+    service_time: float = 1.0
+
+    @classmethod
+    def from_policy(cls, policy: str, **kwargs) -> 'PrefixCacheConfig':
+        """Make a configuration with the scorer weights of a routing policy.
+
+        Args:
+            policy (str): Routing policy in ROUTING_POLICIES.
+            **kwargs: Other fields of the configuration.
+
+        Returns:
+            PrefixCacheConfig: Configuration.
+        """
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f'Invalid routing policy: {policy}')
+        return cls(**ROUTING_POLICIES[policy], **kwargs)
+
+
+@dataclass
+class PrefixCacheResult:
+    """Outcome of a simulation."""
+    # Prompt tokens of all requests
+    prompt_tokens: int
+    # Prompt tokens found in the prefix cache of the replica of each request
+    cached_tokens: int
+    # Requests routed to each replica
+    requests_per_replica: np.ndarray = field(repr=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of prompt tokens found in the prefix cache."""
+        if self.prompt_tokens == 0:
+            return 0.0
+        return self.cached_tokens / self.prompt_tokens
+
+    @property
+    def prefill_tokens(self) -> int:
+        """Prompt tokens which must be prefilled."""
+        return self.prompt_tokens - self.cached_tokens
+
+
+def _arrival_times(
+        num_requests: int,
+        rate: float | None,
+        rng: np.random.Generator) -> np.ndarray:
+    """Make Poisson arrival times.
+
+    Args:
+        num_requests (int): Number of requests.
+        rate (float | None): Requests per second. If None, all requests arrive
+            at time zero.
+        rng (numpy.random.Generator): Random number generator.
+
+    Returns:
+        numpy.ndarray: Arrival time of each request in seconds.
+    """
+    if rate is None:
+        return np.zeros(num_requests)
+    return np.cumsum(rng.exponential(1 / rate, num_requests))
+
+
+def shared_prefix_workload(
+        num_groups: int,
+        num_prompts_per_group: int,
+        system_prompt_len: int,
+        question_len: int,
+        block_size: int = 16,
+        num_requests: int | None = None,
+        rate: float | None = None,
+        seed: int = 0) -> PrefixCacheWorkload:
+    """Make a workload like the shared_prefix data of inference-perf.
+
+    Each of num_groups groups has a system prompt, shared by its
+    num_prompts_per_group prompts which each have a unique question. Each
+    request sends one of the prompts, chosen at random.
+
+    Args:
+        num_groups (int): Number of distinct shared prefixes.
+        num_prompts_per_group (int): Number of unique questions per shared
+            prefix.
+        system_prompt_len (int): Length of the shared prefix in tokens.
+        question_len (int): Length of the unique question in tokens.
+        block_size (int): Block size in tokens.
+        num_requests (int | None): Number of requests. If None, every prompt
+            is sent four times on average.
+        rate (float | None): Poisson arrival rate in requests per second. If
+            None, all requests arrive at time zero.
+        seed (int): Seed of the random prompt choices and arrival times.
+
+    Returns:
+        PrefixCacheWorkload: Workload.
+    """
+    num_prompts = num_groups * num_prompts_per_group
+    if num_requests is None:
+        num_requests = 4 * num_prompts
+    rng = np.random.default_rng(seed)
+
+    # Only full blocks are cached, and the block spanning the end of the
+    # system prompt and the start of the question is unique to the prompt
+    system_blocks = system_prompt_len // block_size
+    question_blocks = (system_prompt_len + question_len) // block_size - system_blocks
+    # Segments 0 to num_groups - 1 are system prompts, then questions
+    segment_blocks = np.array(
+        [system_blocks] * num_groups + [question_blocks] * num_prompts, dtype=np.int64)
+    prompts = rng.integers(0, num_prompts, num_requests)
+    requests = [
+        tuple(seg for seg in (prompt // num_prompts_per_group, num_groups + prompt)
+              if segment_blocks[seg])
+        for prompt in prompts.tolist()
+    ]
+    return PrefixCacheWorkload(
+        block_size=block_size,
+        segment_blocks=segment_blocks,
+        requests=requests,
+        prompt_tokens=np.full(num_requests, system_prompt_len + question_len, dtype=np.int64),
+        arrival_times=_arrival_times(num_requests, rate, rng),
+    )
+
+
+def token_ids_workload(
+        token_ids: Sequence[Sequence[int]],
+        block_size: int = 16,
+        arrival_times: Sequence[float] | None = None) -> PrefixCacheWorkload:
+    """Make a workload from the token IDs of recorded prompts.
+
+    Prompts are split in full blocks, which are identified by their tokens and
+    all tokens before them, as with the block hashes of vLLM. The blocks of
+    all prompts form a tree, where chains of blocks which are always requested
+    together are merged into segments.
+
+    Args:
+        token_ids (Sequence[Sequence[int]]): Token IDs of the prompt of each
+            request, in order of arrival.
+        block_size (int): Block size in tokens.
+        arrival_times (Sequence[float] | None): Arrival time of each request
+            in seconds. If None, all requests arrive at time zero.
+
+    Returns:
+        PrefixCacheWorkload: Workload.
+    """
+    # Tree of blocks, as the parent, number of children, and number of
+    # prompts ending at each node. Node 0 is the root.
+    nodes = {}
+    parents = [-1]
+    children = [0]
+    ends = [0]
+    paths = []
+    for prompt in token_ids:
+        node = 0
+        path = []
+        for start in range(0, len(prompt) - block_size + 1, block_size):
+            key = (node, tuple(prompt[start:start + block_size]))
+            child = nodes.get(key)
+            if child is None:
+                child = nodes[key] = len(parents)
+                parents.append(node)
+                children.append(0)
+                ends.append(0)
+                children[node] += 1
+            node = child
+            path.append(node)
+        ends[node] += 1
+        paths.append(path)
+
+    # A node starts a new segment unless it is the only child of a node where
+    # no prompt ends
+    segment_of = [-1] * len(parents)
+    segment_blocks = []
+    for node in range(1, len(parents)):
+        parent = parents[node]
+        if parent == 0 or children[parent] != 1 or ends[parent]:
+            segment_of[node] = len(segment_blocks)
+            segment_blocks.append(1)
+        else:
+            segment_of[node] = segment_of[parent]
+            segment_blocks[segment_of[node]] += 1
+
+    requests = [tuple(dict.fromkeys(segment_of[node] for node in path)) for path in paths]
+    if arrival_times is None:
+        arrival_times = np.zeros(len(requests))
+    return PrefixCacheWorkload(
+        block_size=block_size,
+        segment_blocks=np.array(segment_blocks, dtype=np.int64),
+        requests=requests,
+        prompt_tokens=np.array([len(prompt) for prompt in token_ids], dtype=np.int64),
+        arrival_times=np.asarray(arrival_times, dtype=float),
+    )
+
+
+class _SegmentLRU:
+    """LRU cache of blocks, tracked by segment."""
+
+    def __init__(self, capacity: int, segment_blocks: list[int]):
+        self.capacity = capacity
+        self.segment_blocks = segment_blocks
+        # Cached blocks of each segment, least recently used first
+        self.cached: OrderedDict[int, int] = OrderedDict()
+        self.size = 0
+
+    def match(self, request: tuple[int, ...]) -> int:
+        """Get the number of blocks at the start of a prompt which are cached.
+
+        Args:
+            request (tuple[int, ...]): Segment IDs of the prompt.
+
+        Returns:
+            int: Number of cached blocks.
+        """
+        matched = 0
+        for seg in request:
+            blocks = self.cached.get(seg, 0)
+            matched += blocks
+            if blocks < self.segment_blocks[seg]:
+                break
+        return matched
+
+    def add(self, request: tuple[int, ...]) -> None:
+        """Cache all blocks of a prompt, evicting least recently used blocks.
+
+        Args:
+            request (tuple[int, ...]): Segment IDs of the prompt.
+        """
+        cached = self.cached
+        # Blocks are freed last block first, so the first segment is the
+        # most recently used
+        for seg in reversed(request):
+            self.size += self.segment_blocks[seg] - cached.pop(seg, 0)
+            cached[seg] = self.segment_blocks[seg]
+        while self.size > self.capacity:
+            seg, blocks = next(iter(cached.items()))
+            evict = min(blocks, self.size - self.capacity)
+            self.size -= evict
+            if evict == blocks:
+                del cached[seg]
+            else:
+                cached[seg] = blocks - evict
+
+
+def simulate_prefix_cache(
+        workload: PrefixCacheWorkload,
+        config: PrefixCacheConfig,
+        seed: int = 0) -> PrefixCacheResult:
+    """Replay a workload against replicas with prefix caches.
+
+    Each request is routed to the replica with the highest score, choosing at
+    random among ties. The score is the sum of the prefix score, the fraction
+    of the first max_prefix_blocks_to_match blocks of the prompt cached by the
+    replica, and the queue score, the number of requests in flight on the
+    replica normalized from 1 for the least loaded to 0 for the most loaded,
+    multiplied by their weights. A request is in flight from its arrival for
+    service_time seconds. Its prompt is then cached on its replica.
+
+    Args:
+        workload (PrefixCacheWorkload): Requests to replay.
+        config (PrefixCacheConfig): Replicas and routing.
+        seed (int): Seed of random choices among replicas.
+
+    Returns:
+        PrefixCacheResult: Prompt tokens found in cache and requests per
+            replica.
+    """
+    num_replicas = config.replicas
+    segment_blocks = workload.segment_blocks.tolist()
+    caches = [_SegmentLRU(config.lru_capacity_per_server, segment_blocks) for _ in range(num_replicas)]
+    in_flight = [0] * num_replicas
+    requests_per_replica = [0] * num_replicas
+    # Finish time and replica of requests in flight
+    finishes = []
+    ties = np.random.default_rng(seed).random(len(workload.requests)).tolist()
+    arrival_times = workload.arrival_times.tolist()
+    prompt_tokens = workload.prompt_tokens.tolist()
+    max_blocks = config.max_prefix_blocks_to_match
+    cached_tokens = 0
+
+    for ii, request in enumerate(workload.requests):
+        now = arrival_times[ii]
+        while finishes and finishes[0][0] <= now:
+            in_flight[heapq.heappop(finishes)[1]] -= 1
+
+        scores = [0.0] * num_replicas
+        if config.prefix_weight and request:
+            request_blocks = min(max_blocks, sum(segment_blocks[seg] for seg in request))
+            for rr, cache in enumerate(caches):
+                scores[rr] = config.prefix_weight * min(max_blocks, cache.match(request)) / request_blocks
+        if config.queue_weight:
+            least, most = min(in_flight), max(in_flight)
+            for rr in range(num_replicas):
+                queue_score = 1.0 if most == least else (most - in_flight[rr]) / (most - least)
+                scores[rr] += config.queue_weight * queue_score
+        best = max(scores)
+        candidates = [rr for rr in range(num_replicas) if scores[rr] == best]
+        replica = candidates[int(ties[ii] * len(candidates))]
+
+        cache = caches[replica]
+        cached_tokens += min(cache.match(request) * workload.block_size, prompt_tokens[ii])
+        cache.add(request)
+        requests_per_replica[replica] += 1
+        in_flight[replica] += 1
+        heapq.heappush(finishes, (now + config.service_time, replica))
+
+    return PrefixCacheResult(
+        prompt_tokens=int(workload.prompt_tokens.sum()),
+        cached_tokens=cached_tokens,
+        requests_per_replica=np.array(requests_per_replica),
+    )
+
+
+def _simulate_prefix_cache_row(
+        config: PrefixCacheConfig,
+        workload: PrefixCacheWorkload,
+        seed: int) -> dict[str, Any]:
+    """Simulate a configuration, returning a row of sweep_prefix_cache().
+
+    Args:
+        config (PrefixCacheConfig): Replicas and routing.
+        workload (PrefixCacheWorkload): Requests to replay.
+        seed (int): Seed of random choices among replicas.
+
+    Returns:
+        dict[str, Any]: Configuration and results.
+    """
+    result = simulate_prefix_cache(workload, config, seed)
+    row = asdict(config)
+    row.update({
+        'block_size': workload.block_size,
+        'hit_rate': result.hit_rate,
+        'prompt_tokens': result.prompt_tokens,
+        'cached_tokens': result.cached_tokens,
+        'prefill_tokens': result.prefill_tokens,
+        'max_requests_per_replica': int(result.requests_per_replica.max()),
+    })
+    return row
+
+
+def sweep_prefix_cache(
+        workload: PrefixCacheWorkload,
+        configs: list[PrefixCacheConfig],
+        seed: int = 0,
+        max_workers: int | None = None) -> pd.DataFrame:
+    """Simulate many configurations on a workload, in parallel processes.
+
+    Args:
+        workload (PrefixCacheWorkload): Requests to replay.
+        configs (list[PrefixCacheConfig]): Configurations to simulate.
+        seed (int): Seed of random choices among replicas.
+        max_workers (int | None): Maximum number of worker processes. If None,
+            the number of CPUs is used. If 1, configurations are simulated in
+            this process.
+
+    Returns:
+        pandas.DataFrame: Fields of each configuration, with its hit rate,
+            prompt tokens, cached tokens, prefill tokens and the most requests
+            routed to a replica.
+    """
+    simulate = partial(_simulate_prefix_cache_row, workload=workload, seed=seed)
+    if max_workers == 1 or len(configs) <= 1:
+        return pd.DataFrame(list(map(simulate, configs)))
+    workers = max_workers or os.cpu_count() or 1
+    # Send configurations to workers in batches to limit IPC overhead
+    chunksize = max(1, min(64, len(configs) // (workers * 4)))
+    # Workers are spawned rather than forked, as forking a multi-threaded
+    # process (such as a Streamlit server) can deadlock the children
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn')) as executor:
+        return pd.DataFrame(list(executor.map(simulate, configs, chunksize=chunksize)))
@@ -2,6 +2,7 @@
 Tests Capacity Planner functions
 """
 
+import numpy as np
 import pytest
 from src.config_explorer.capacity_planner import *
 
@@ -464,3 +465,395 @@ def test_inference_dtype():
         model_config = get_model_config_from_hf(model)
         assert inference_dtype(model_config) == expceted
 
+
+def test_plan_capacity_batch():
+    """
+    Tests batch capacity planning matches planning one deployment at a time
+    """
+
+    from transformers import LlamaConfig
+
+    # Model defined locally so the test runs offline
+    model_info = ModelInfo(id=small_model_id, safetensors={"parameters": {"BF16": 8_000_000_000}, "total": 8_000_000_000})
+    model_config = LlamaConfig(
+        architectures=["LlamaForCausalLM"],
+        torch_dtype="bfloat16",
+        num_hidden_layers=32,
+        hidden_size=4096,
+        num_attention_heads=32,
+        num_key_value_heads=8,
+    )
+    profile = ModelMemoryProfile.from_model(model_info, model_config)
+
+    tp, pp, dp, context_len, gpu_mem, gpu_util = np.meshgrid(
+        [1, 2, 4, 8], [1, 2], [1, 3], [1024, 32768, 131072], [24, 80], [0.8, 0.95], indexing="ij")
+    plan = plan_capacity_batch(profile, context_len, gpu_mem, gpu_util, tp, pp, dp)
+    assert plan.max_concurrent_requests.shape == tp.shape
+    assert (plan.max_concurrent_requests == 0).any()
+
+    for ii in np.ndindex(tp.shape):
+        args = dict(gpu_memory=int(gpu_mem[ii]), gpu_mem_util=float(gpu_util[ii]), tp=int(tp[ii]), pp=int(pp[ii]), dp=int(dp[ii]))
+        assert plan.gpus_required[ii] == gpus_required(args["tp"], args["pp"], args["dp"])
+        assert plan.kv_cache_allocatable_gb[ii] == allocatable_kv_cache_memory(
+            model_info, model_config, args["gpu_memory"], args["gpu_mem_util"], args["tp"], args["pp"], args["dp"])
+        assert plan.per_request_kv_cache_gb[ii] == kv_cache_req(model_info, model_config, int(context_len[ii]))
+        assert plan.max_concurrent_requests[ii] == max_concurrent_requests(
+            model_info, model_config, max_model_len=int(context_len[ii]), **args)
+        assert plan.total_kv_cache_blocks[ii] == total_kv_cache_blocks(
+            model_info, model_config, context_len=int(context_len[ii]), **args)
+
+    # Scalars broadcast against arrays
+    plan = plan_capacity_batch(profile, 4096, np.array([40, 80]), tp=np.array([[1], [2]]))
+    assert plan.total_kv_cache_blocks.shape == (2, 2)
+
+def test_model_metadata_store(tmp_path, monkeypatch):
+    """
+    Tests that model metadata is cached, expires, and can be read offline from a snapshot
+    """
+
+    import os
+    import src.config_explorer.capacity_planner as cp
+    from transformers import LlamaConfig, Mistral3Config
+
+    configs = {
+        small_model_id: LlamaConfig(architectures=["LlamaForCausalLM"], torch_dtype="bfloat16", num_key_value_heads=8),
+        "repo/multimodal-model": Mistral3Config(text_config={"model_type": "mistral", "num_hidden_layers": 4}),
+    }
+    fetched = []
+
+    def fake_model_info(model_name, hf_token=None):
+        fetched.append(("info", model_name))
+        return ModelInfo(id=model_name, sha="abc", safetensors={"parameters": {"BF16": 1000, "F8_E4M3": 10}, "total": 1010})
+
+    def fake_model_config(model_name, hf_token=None):
+        fetched.append(("config", model_name))
+        return configs[model_name]
+
+    monkeypatch.setattr(cp, "get_model_info_from_hf", fake_model_info)
+    monkeypatch.setattr(cp, "get_model_config_from_hf", fake_model_config)
+
+    cache_dir = str(tmp_path / "cache")
+    store = ModelMetadataStore(cache_dir=cache_dir, ttl=60, offline=False)
+    model_info = store.get_model_info(small_model_id)
+    model_config = store.get_model_config(small_model_id)
+    assert model_info.safetensors.parameters == {"BF16": 1000, "F8_E4M3": 10}
+    assert model_total_params(model_info) == 1010
+    assert model_config.to_dict() == configs[small_model_id].to_dict()
+    assert model_memory_req(model_info, model_config) == model_memory_req(fake_model_info(small_model_id), configs[small_model_id])
+    multimodal_config = store.get_model_config("repo/multimodal-model")
+    assert get_text_config(multimodal_config).num_hidden_layers == 4
+
+    # Entries are reused by another store until they expire
+    fetched.clear()
+    store = ModelMetadataStore(cache_dir=cache_dir, ttl=60, offline=False)
+    store.get_model_info(small_model_id)
+    store.get_model_config(small_model_id)
+    assert fetched == []
+    config_file = os.path.join(cache_dir, "repo", "small-model", "config.json")
+    os.utime(config_file, (0, 0))
+    store = ModelMetadataStore(cache_dir=cache_dir, ttl=60, offline=False)
+    store.get_model_config(small_model_id)
+    assert fetched == [("config", small_model_id)]
+
+    # Expired entries are used when Hugging Face cannot be reached
+    def unreachable(model_name, hf_token=None):
+        raise OSError("unreachable")
+
+    monkeypatch.setattr(cp, "get_model_config_from_hf", unreachable)
+    os.utime(config_file, (0, 0))
+    store = ModelMetadataStore(cache_dir=cache_dir, ttl=60, offline=False)
+    assert store.get_model_config(small_model_id).to_dict() == configs[small_model_id].to_dict()
+    store.invalidate(small_model_id)
+    with pytest.raises(OSError):
+        store.get_model_config(small_model_id)
+
+    # Offline, only the snapshot and cache are used
+    monkeypatch.setattr(cp, "get_model_config_from_hf", fake_model_config)
+    snapshot_dir = str(tmp_path / "snapshot")
+    ModelMetadataStore(cache_dir=None).save_snapshot(snapshot_dir, [small_model_id])
+    fetched.clear()
+    store = ModelMetadataStore(cache_dir=None, snapshot_dir=snapshot_dir, offline=True)
+    assert store.get_model_info(small_model_id) == model_info
+    assert store.get_model_config(small_model_id).to_dict() == configs[small_model_id].to_dict()
+    assert fetched == []
+    with pytest.raises(FileNotFoundError):
+        store.get_model_config("repo/other-model")
+    with pytest.raises(ValueError):
+        store.get_model_config("../other-model")
+
+def test_model_metadata_store_sharing(tmp_path, monkeypatch):
+    """
+    Tests that a store shared by users does not serve gated configs to users without access, that entries in memory
+    expire, and that invalidating the store only removes its entries
+    """
+
+    import os
+    import src.config_explorer.capacity_planner as cp
+    from transformers import LlamaConfig
+
+    gated_model_id = "repo/gated-model"
+    fetched = []
+
+    def fake_model_info(model_name, hf_token=None):
+        fetched.append(("info", model_name, hf_token))
+        return ModelInfo(id=model_name, sha="abc", gated="manual" if model_name == gated_model_id else False)
+
+    def fake_model_config(model_name, hf_token=None):
+        fetched.append(("config", model_name, hf_token))
+        if model_name == gated_model_id and hf_token != "granted":
+            raise OSError(f"Access to model {model_name} is restricted, it is a gated repo")
+        return LlamaConfig(num_hidden_layers=2)
+
+    monkeypatch.setattr(cp, "get_model_info_from_hf", fake_model_info)
+    monkeypatch.setattr(cp, "get_model_config_from_hf", fake_model_config)
+
+    cache_dir = tmp_path / "cache"
+    store = ModelMetadataStore(cache_dir=str(cache_dir), ttl=60, offline=False)
+    assert store.get_model_config(gated_model_id, hf_token="granted").num_hidden_layers == 2
+    store.get_model_config(gated_model_id, hf_token="granted")
+    fetched.clear()
+
+    # Other tokens are checked by Hugging Face, also with a new store reading the cache directory
+    for user_store in [store, ModelMetadataStore(cache_dir=str(cache_dir), ttl=60, offline=False)]:
+        for hf_token in [None, "denied"]:
+            with pytest.raises(OSError, match="gated"):
+                user_store.get_model_config(gated_model_id, hf_token=hf_token)
+    assert [entry for entry in fetched if entry[0] == "config"] == [
+        ("config", gated_model_id, None), ("config", gated_model_id, "denied")] * 2
+
+    # Offline, a token is needed to read a gated config from the cache directory
+    offline_store = ModelMetadataStore(cache_dir=str(cache_dir), offline=True)
+    with pytest.raises(PermissionError, match="gated"):
+        offline_store.get_model_config(gated_model_id)
+    assert offline_store.get_model_config(gated_model_id, hf_token="any").num_hidden_layers == 2
+
+    # Entries in memory expire with the cache directory
+    fetched.clear()
+    store.get_model_config(small_model_id)
+    store.get_model_config(small_model_id)
+    assert fetched == [("info", small_model_id, None), ("config", small_model_id, None)]
+    store.ttl = 0
+    monkeypatch.setattr(cp.time, "time", lambda: 1e12)
+    store.get_model_config(small_model_id)
+    assert len(fetched) == 4
+    monkeypatch.undo()
+
+    # Other files of the cache directory are kept
+    (cache_dir / "notes.txt").write_text("kept")
+    (cache_dir / "other").mkdir()
+    (cache_dir / "other" / "data.json").write_text("{}")
+    store.invalidate()
+    assert sorted(os.listdir(cache_dir)) == ["notes.txt", "other"]
+    assert os.listdir(cache_dir / "other") == ["data.json"]
+
+def test_gpu_fit_table():
+    """
+    Tests the GPU fit table matches capacity planning of each configuration, and the cheapest fit is found
+    """
+
+    from transformers import LlamaConfig
+
+    model_info = ModelInfo(id=small_model_id, safetensors={"parameters": {"BF16": 8_000_000_000}, "total": 8_000_000_000})
+    model_config = LlamaConfig(architectures=["LlamaForCausalLM"], torch_dtype="bfloat16", num_key_value_heads=8)
+    profile = ModelMemoryProfile.from_model(model_info, model_config)
+    gpu_specs = {"small": {"memory": 16}, "large": {"memory": 80}}
+    context_lens = [1024, 4096, 32768]
+
+    table = gpu_fit_table(profile, gpu_specs, context_lens, [1, 2, 4, 8], [1, 2], [1, 2], gpu_mem_util=0.9, max_gpus=8)
+    # TP x PP x DP of (4, 2, 2), (8, 2, 1), (8, 1, 2) and (8, 2, 2) exceed max_gpus
+    assert len(table) == 2 * 3 * (4 * 2 * 2 - 4)
+    assert table["GPUs"].max() == 8
+    for row in table.itertuples():
+        args = dict(gpu_memory=gpu_specs[row.GPU]["memory"], gpu_mem_util=0.9, tp=row.TP, pp=row.PP, dp=row.DP)
+        assert row.Max_Concurrency == max_concurrent_requests(model_info, model_config, row.Context_Len, **args)
+        assert row.Fits == (row.Max_Concurrency >= 1)
+    assert not table["Fits"].all()
+
+    # Cheapest fit, compared with searching every row
+    for concurrency, context_len in [(1, 1024), (10, 3000), (200, 32768), (10**6, 1024)]:
+        fits = find_cheapest_fit(table, concurrency, context_len)
+        table_len = min(c for c in context_lens if c >= context_len)
+        expected = table[(table["Context_Len"] == table_len) & (table["Max_Concurrency"] >= concurrency)]
+        assert fits.index.tolist() == expected.index.tolist()
+        if len(fits):
+            assert fits["GPUs"].iloc[0] == expected["GPUs"].min()
+    # Model weights do not fit on one small GPU
+    assert find_cheapest_fit(table, 1, 1024).iloc[0][["GPU", "GPUs"]].tolist() == ["large", 1]
+    assert find_cheapest_fit(table, 1, 1024).iloc[1][["GPU", "GPUs"]].tolist() == ["small", 2]
+    with pytest.raises(ValueError):
+        find_cheapest_fit(table, 1, 65536)
+
+def test_estimate_roofline():
+    """
+    Tests roofline estimates are bound by memory bandwidth in decode and by FLOPS in prefill of long prompts
+    """
+
+    from transformers import LlamaConfig
+
+    model_info = ModelInfo(id=small_model_id, safetensors={"parameters": {"BF16": 8_000_000_000}, "total": 8_000_000_000})
+    model_config = LlamaConfig(architectures=["LlamaForCausalLM"], torch_dtype="bfloat16", num_key_value_heads=8)
+    profile = ModelComputeProfile.from_model(model_info, model_config)
+    assert profile.num_params == 8_000_000_000
+    assert profile.per_token_memory_bytes == KVCacheDetail(model_info, model_config).per_token_memory_bytes
+    assert profile.attention_dim == model_config.hidden_size
+    weight_bytes = gib_to_bytes(model_memory_req(model_info, model_config))
+
+    # H100: decode of a single request reads the model weights and KV cache
+    estimate = estimate_roofline(profile, 3350, 989, input_len=1000, output_len=200)
+    assert not estimate.decode_compute_bound
+    kv_bytes = 1100 * profile.per_token_memory_bytes
+    assert estimate.itl_s == pytest.approx((weight_bytes + kv_bytes) / 3350e9)
+    assert estimate.decode_tokens_per_s == pytest.approx(1 / estimate.itl_s)
+    assert estimate.prefill_compute_bound
+    assert estimate.prefill_tokens_per_s == pytest.approx(1000 / estimate.ttft_s)
+
+    # Broadcast over batch sizes and TP, matching scalar estimates
+    batch_size, tp = np.meshgrid([1, 8, 64, 512], [1, 2, 4], indexing="ij")
+    estimates = estimate_roofline(profile, 3350, 989, 1000, 200, batch_size, tp)
+    assert estimates.itl_s.shape == (4, 3)
+    for ii, jj in np.ndindex(batch_size.shape):
+        scalar = estimate_roofline(profile, 3350, 989, 1000, 200, int(batch_size[ii, jj]), int(tp[ii, jj]))
+        assert estimates.ttft_s[ii, jj] == pytest.approx(scalar.ttft_s)
+        assert estimates.itl_s[ii, jj] == pytest.approx(scalar.itl_s)
+    # TP scales FLOPS and bandwidth
+    assert estimates.itl_s[:, 0] == pytest.approx(2 * estimates.itl_s[:, 1])
+    # Batching amortizes reading weights until decode is compute bound
+    assert np.all(np.diff(estimates.decode_tokens_per_s[:, 0]) > 0)
+    assert np.all(np.diff(estimates.itl_s[:, 0]) > 0)
+
+    # Lower efficiency increases latency
+    slower = estimate_roofline(profile, 3350, 989, 1000, 200, compute_efficiency=0.5, bandwidth_efficiency=0.5)
+    assert slower.ttft_s == pytest.approx(2 * estimate.ttft_s)
+    assert slower.itl_s == pytest.approx(2 * estimate.itl_s)
+
+def test_estimate_roofline_moe():
+    """
+    Tests roofline estimates of MoE models count the FLOPs of active parameters and read the routed experts
+    """
+
+    from transformers import DeepseekV3Config, MixtralConfig
+
+    # Active parameters of DeepSeek-V3 and Mixtral-8x7B
+    models = {
+        "deepseek-ai/DeepSeek-V3": (
+            DeepseekV3Config(architectures=["DeepseekV3ForCausalLM"], torch_dtype="bfloat16"), 671.0e9, 37e9),
+        "mistralai/Mixtral-8x7B-v0.1": (
+            MixtralConfig(architectures=["MixtralForCausalLM"], torch_dtype="bfloat16"), 46.7e9, 12.9e9),
+    }
+    for model_id, (model_config, total, active) in models.items():
+        model_info = ModelInfo(id=model_id, safetensors={"parameters": {"BF16": int(total)}, "total": int(total)})
+        profile = ModelComputeProfile.from_model(model_info, model_config)
+        assert profile.num_params == pytest.approx(active, rel=0.05)
+        assert profile.expert_fraction == model_config.num_experts_per_tok / get_num_experts(model_config)
+        layer_memory = ModelLayerMemory.from_model(model_info, model_config)
+        assert profile.expert_memory_gb == pytest.approx(layer_memory.layers["Expert_GB"].sum())
+
+        # A token reads the dense weights and its routed experts, many tokens read all the weights
+        weight_bytes = gib_to_bytes(profile.model_memory_gb)
+        expert_bytes = gib_to_bytes(profile.expert_memory_gb)
+        assert profile.weight_bytes(1) == pytest.approx(weight_bytes - expert_bytes * (1 - profile.expert_fraction))
+        assert profile.weight_bytes(10**6) == pytest.approx(weight_bytes)
+        assert np.all(np.diff(profile.weight_bytes(np.array([1, 8, 64, 512]))) > 0)
+
+        # Decode of a single request is faster than reading all the weights
+        estimate = estimate_roofline(profile, 3350, 989, input_len=1000, output_len=200)
+        assert not estimate.decode_compute_bound
+        kv_bytes = 1100 * profile.per_token_memory_bytes
+        assert estimate.itl_s == pytest.approx((profile.weight_bytes(1) + kv_bytes) / 3350e9)
+        assert estimate.itl_s < weight_bytes / 3350e9
+
+def test_model_layer_memory():
+    """
+    Tests per-layer memory of known MoE, MLA and dense configs, and its placement on GPUs under TP, PP and EP
+    """
+
+    from transformers import DeepseekV3Config, LlamaConfig, MixtralConfig, Qwen3MoeConfig
+
+    def bf16_model_info(model_id: str, total: int) -> ModelInfo:
+        return ModelInfo(id=model_id, safetensors={"parameters": {"BF16": total}, "total": total})
+
+    # Known parameter counts of DeepSeek-V3, Mixtral-8x7B, Qwen3-30B-A3B and Llama-3.1-8B
+    models = {
+        "deepseek-ai/DeepSeek-V3": (
+            DeepseekV3Config(architectures=["DeepseekV3ForCausalLM"], torch_dtype="bfloat16"), 671.0e9),
+        "mistralai/Mixtral-8x7B-v0.1": (
+            MixtralConfig(architectures=["MixtralForCausalLM"], torch_dtype="bfloat16"), 46.7e9),
+        "Qwen/Qwen3-30B-A3B": (
+            Qwen3MoeConfig(architectures=["Qwen3MoeForCausalLM"], torch_dtype="bfloat16", hidden_size=2048,
+                           num_hidden_layers=48, num_attention_heads=32, num_key_value_heads=4, head_dim=128,
+                           num_experts=128, moe_intermediate_size=768, vocab_size=151936, tie_word_embeddings=False), 30.5e9),
+        "meta-llama/Llama-3.1-8B": (
+            LlamaConfig(architectures=["LlamaForCausalLM"], torch_dtype="bfloat16", hidden_size=4096,
+                        intermediate_size=14336, num_hidden_layers=32, num_attention_heads=32, num_key_value_heads=8,
+                        vocab_size=128256), 8.03e9),
+    }
+    layer_memories = {}
+    for model_id, (model_config, params) in models.items():
+        # Checkpoints with twice the parameters are attributed to parameters outside of the layers
+        for total in [params, 2 * params]:
+            model_info = bf16_model_info(model_id, int(total))
+            layer_memory = ModelLayerMemory.from_model(model_info, model_config)
+            assert layer_memory.total_gb == pytest.approx(model_memory_req(model_info, model_config))
+            assert layer_memory.other_gb == pytest.approx(bytes_to_gib(2 * (total - params)), rel=0.01, abs=0.1)
+            assert layer_memory.layers["KV_Cache_Bytes_Per_Token"].sum() == \
+                KVCacheDetail(model_info, model_config).per_token_memory_bytes
+        layer_memories[model_id] = layer_memory = ModelLayerMemory.from_model(bf16_model_info(model_id, int(params)), model_config)
+
+        # Without parallelism, one GPU holds the whole model
+        breakdown = per_gpu_memory_breakdown(layer_memory)
+        assert len(breakdown) == 1
+        assert breakdown["Weights_GB"][0] == pytest.approx(layer_memory.total_gb)
+
+        # Stages hold all layers and their KV cache
+        for pp in [2, 3, 4]:
+            breakdown = per_gpu_memory_breakdown(layer_memory, pp=pp)
+            assert breakdown["Layers"].sum() == len(layer_memory.layers)
+            assert breakdown["Layers"].max() - breakdown["Layers"].min() <= 1
+            assert breakdown["KV_Cache_Bytes_Per_Token"].sum() == layer_memory.layers["KV_Cache_Bytes_Per_Token"].sum()
+
+    # DeepSeek-V3: 3 dense layers, then 58 MoE layers of 256 experts
+    deepseek = layer_memories["deepseek-ai/DeepSeek-V3"]
+    assert deepseek.mla
+    assert deepseek.layers["Num_Experts"].tolist() == [0] * 3 + [256] * 58
+    # EP distributes whole experts across TP x DP GPUs, replicating attention and dense layers on each DP rank
+    tp_only = per_gpu_memory_breakdown(deepseek, tp=8)
+    ep = per_gpu_memory_breakdown(deepseek, tp=8, dp=2, enable_ep=True)
+    assert ep["Experts_Per_Layer"][0] == 16
+    assert ep["Expert_GB"][0] == pytest.approx(tp_only["Expert_GB"][0] / 2)
+    assert ep["Attention_GB"][0] == pytest.approx(tp_only["Attention_GB"][0])
+    assert ep["Dense_MLP_GB"][0] == pytest.approx(tp_only["Dense_MLP_GB"][0])
+    # Uneven splits place the extra expert on the GPU reported
+    assert per_gpu_memory_breakdown(deepseek, tp=8, dp=3, enable_ep=True)["Experts_Per_Layer"][0] == 11
+    # Without EP, DP > 1 shards every expert across TP x DP GPUs, like EP but with all experts on every GPU
+    tp_dp = per_gpu_memory_breakdown(deepseek, tp=8, dp=2)
+    assert tp_dp["Experts_Per_Layer"][0] == 256
+    assert tp_dp["Expert_GB"][0] == pytest.approx(ep["Expert_GB"][0])
+    assert tp_dp["Attention_GB"][0] == pytest.approx(tp_only["Attention_GB"][0])
+    assert tp_dp["Weights_GB"][0] == pytest.approx(ep["Weights_GB"][0])
+    # The compressed KV cache of MLA is replicated on each TP rank: 61 layers x (512 + 64) x 2 bytes
+    assert tp_only["KV_Cache_Bytes_Per_Token"][0] == 61 * 576 * 2
+
+    # GQA KV heads are sharded by TP, down to one head per GPU
+    qwen = layer_memories["Qwen/Qwen3-30B-A3B"]
+    full = 48 * 2 * 128 * 4 * 2
+    for tp, expected in [(1, full), (2, full // 2), (4, full // 4), (8, full // 4)]:
+        assert per_gpu_memory_breakdown(qwen, tp=tp)["KV_Cache_Bytes_Per_Token"][0] == expected
+
+    # KV cache blocks per GPU, limited by the most loaded stage
+    llama = layer_memories["meta-llama/Llama-3.1-8B"]
+    breakdown = per_gpu_memory_breakdown(llama)
+    expected = math.floor(gib_to_bytes(80 * 0.9 - breakdown["Weights_GB"][0]) / (32 * 2 * 128 * 8 * 2 * 16))
+    assert per_gpu_kv_cache_blocks(llama, 80) == expected
+    assert per_gpu_kv_cache_blocks(llama, 80, tp=2) > 2 * expected
+    breakdown = per_gpu_memory_breakdown(llama, pp=3)
+    assert per_gpu_kv_cache_blocks(llama, 80, pp=3) == min(
+        math.floor(gib_to_bytes(72 - row.Weights_GB) / (row.KV_Cache_Bytes_Per_Token * 16)) for row in breakdown.itertuples())
+    # Weights do not fit
+    assert per_gpu_kv_cache_blocks(deepseek, 80, tp=8) == 0
+    assert per_gpu_kv_cache_blocks(deepseek, 80, tp=8, dp=4, enable_ep=True) > 0
+    assert per_gpu_kv_cache_blocks(deepseek, 80, tp=8, dp=4) == per_gpu_kv_cache_blocks(deepseek, 80, tp=8, dp=4, enable_ep=True)
+
+    # Each DP replica serves requests of max_model_len tokens with its blocks
+    assert per_gpu_max_concurrent_requests(1000, 4096) == 3
+    assert per_gpu_max_concurrent_requests(1000, 4096, dp=4) == 12
+    assert per_gpu_max_concurrent_requests(1000, 4096, block_size=32) == 7
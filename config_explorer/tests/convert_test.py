@@ -0,0 +1,361 @@
+"""
+Tests conversion of harness results to benchmark reports
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import yaml
+
+from config_explorer import convert
+from config_explorer.schema import BenchmarkReport, Statistics, Units, WorkloadGenerator
+
+
+def test_import_is_lightweight():
+    """
+    Tests numpy, pandas and scipy are not imported until results need them
+    """
+
+    code = (
+        "import sys; import config_explorer.convert; "
+        "print(','.join(m for m in ['numpy', 'pandas', 'scipy'] if m in sys.modules))"
+    )
+    # Import from the same source tree as this test, the package may not be installed
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(convert.__file__)))
+    env = {**os.environ, "PYTHONPATH": src_dir}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=src_dir, env=env)
+    assert result.stdout.strip() == ""
+
+
+def test_mode():
+    """
+    Tests the most common value is found, the smallest one for ties
+    """
+
+    assert convert._mode(np.array([3, 1, 2, 3, 1])) == 1
+    assert convert._mode(np.array([0.5, 2.5, 2.5])) == 2.5
+    assert convert._mode(np.array([7])) == 7
+    assert convert._mode(np.array([1, 10**9, 10**9])) == 10**9
+
+
+def test_import_yaml_json(tmp_path):
+    """
+    Tests JSON and YAML files with the same content import the same way
+    """
+
+    data = {"a": [1, 2.5, None, True], "b": {"c": "2025-01-01", "d": "text"}}
+    json_file = tmp_path / "data.json"
+    json_file.write_text(json.dumps(data))
+    yaml_file = tmp_path / "data.yaml"
+    yaml_file.write_text(yaml.dump({"a": data["a"], "b": {"d": "text"}}))
+
+    assert convert.import_yaml(str(json_file)) == data
+    assert convert.import_yaml(str(yaml_file)) == {"a": data["a"], "b": {"d": "text"}}
+
+    # YAML flow mappings and JSON which is not valid for orjson
+    assert convert.load_json_or_yaml("{a: 1, b: [x, y]}") == {"a": 1, "b": ["x", "y"]}
+    assert np.isnan(convert.load_json_or_yaml('{"a": NaN}')["a"])
+    assert convert.load_json_or_yaml(b"  [1, 2]\n") == [1, 2]
+
+
+def test_compute_statistics():
+    """
+    Tests statistics from a single percentile call match separate calls
+    """
+
+    rng = np.random.default_rng(0)
+    latency = rng.lognormal(size=1001)
+    stats = convert.compute_statistics(latency, Units.MS)
+    Statistics(**stats)
+    assert stats["mean"] == latency.mean()
+    assert stats["min"] == latency.min()
+    assert stats["max"] == latency.max()
+    for field, percentile in convert.STATISTICS_PERCENTILES.items():
+        assert stats[field] == np.percentile(latency, percentile)
+    # No mode for continuous values
+    assert "mode" not in stats
+    assert convert.LogHistogram.from_dict(stats["sketch"]).count == len(latency)
+    assert "sketch" not in convert.compute_statistics(latency, Units.MS, sketch=False)
+
+    tokens = rng.integers(10, 20, size=1001)
+    stats = convert.compute_statistics(tokens, Units.COUNT)
+    Statistics(**stats)
+    assert isinstance(stats["min"], int) and stats["min"] == tokens.min()
+    assert isinstance(stats["max"], int) and stats["max"] == tokens.max()
+    assert stats["mode"] == convert._mode(tokens)
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_import_csv_with_header(tmp_path, memory_map):
+    """
+    Tests CSV columns are typed, with quoted fields and malformed rows
+    """
+
+    csv_file = tmp_path / "results.csv"
+    csv_file.write_text(
+        "launch_time, prompt_tokens ,name,note\n"
+        "0.1, 16 ,a,\"x, y\"\n"
+        "0.30000000000000004,32, b ,z\n"
+        "1,2,3,4,5\n"
+    )
+    with pytest.warns(Warning):
+        data = convert.import_csv_with_header(str(csv_file), memory_map=memory_map)
+    assert list(data) == ["launch_time", "prompt_tokens", "name", "note"]
+    assert data["launch_time"].tolist() == [0.1, 0.30000000000000004]
+    assert data["prompt_tokens"].dtype.kind == "i"
+    assert data["prompt_tokens"].tolist() == [16, 32]
+    assert data["name"] == ["a", "b"]
+    assert data["note"] == ["x, y", "z"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 1024 * 1024])
+def test_iter_json_records(tmp_path, chunk_size):
+    """
+    Tests streaming elements of JSON arrays and JSON Lines files
+    """
+
+    records = [{"id": ii, "text": "x" * ii, "times": [0.5] * ii} for ii in range(20)]
+    array_file = tmp_path / "records.json"
+    array_file.write_text(json.dumps(records, indent=2))
+    lines_file = tmp_path / "records.jsonl"
+    lines_file.write_text("\n".join(json.dumps(record) for record in records))
+
+    assert list(convert.iter_json_records(str(array_file), chunk_size)) == records
+    assert list(convert.iter_json_records(str(lines_file), chunk_size)) == records
+
+    array_file.write_text('[{"id": 1}, {"id"')
+    with pytest.raises(ValueError):
+        list(convert.iter_json_records(str(array_file), chunk_size))
+
+
+def test_import_inference_perf_requests(tmp_path, monkeypatch):
+    """
+    Tests per-request lifecycle metrics of a stage are summarized by sketches, reading the file once for all stages
+    """
+
+    records = []
+    for ii in range(100):
+        start = float(ii)
+        token_times = [start + 0.1 + 0.01 * jj for jj in range(10)]
+        records.append({
+            "stage_id": ii % 2,
+            "start_time": start,
+            "end_time": token_times[-1],
+            "request_data": "{}",
+            "response_data": "text",
+            "info": {
+                "input_tokens": 100 + ii,
+                "output_tokens": 10,
+                "output_token_times": token_times,
+            },
+            "error": {"error_type": "timeout", "error_msg": ""} if ii == 0 else None,
+        })
+    # Requests without a stage are not part of any stage
+    for record in records[:5]:
+        records.append(dict(record, stage_id=None))
+    del records[-1]["stage_id"]
+    requests_file = tmp_path / "per_request_lifecycle_metrics.json"
+    requests_file.write_text(json.dumps(records))
+
+    sketches = convert.import_inference_perf_requests(str(requests_file), stage=0)
+    assert set(sketches) == set(convert.INFERENCE_PERF_REQUEST_METRICS)
+    # Stage 0 without the failed request
+    assert sketches["request_latency"].count == 49
+    assert sketches["input_length"].min == 102
+    assert sketches["time_to_first_token"].mean == pytest.approx(0.1)
+    assert sketches["time_per_output_token"].mean == pytest.approx(0.01)
+    assert sketches["inter_token_latency"].count == 49 * 9
+    assert sketches["normalized_time_per_output_token"].max == pytest.approx(0.019)
+
+    assert convert.import_inference_perf_requests(str(requests_file))["output_length"].count == 103
+
+    reads = []
+    iter_json_records = convert.iter_json_records
+    monkeypatch.setattr(convert, "iter_json_records", lambda *args: reads.append(args) or iter_json_records(*args))
+    for stage in [0, 1, 0]:
+        stage_sketches = convert._get_inference_perf_stage_sketches(str(requests_file))
+        assert stage_sketches[stage]["request_latency"].to_dict() == \
+            convert.import_inference_perf_requests(str(requests_file), stage)["request_latency"].to_dict()
+    assert sorted(stage_sketches, key=str) == [0, 1, None]
+    assert stage_sketches[None]["request_latency"].count == 4
+    # Once for all stages, once for each stage imported alone
+    assert len(reads) == 1 + 3
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_convert_batch(tmp_path, max_workers):
+    """
+    Tests a missing results file is reported without stopping the conversion of others
+    """
+
+    (tmp_path / "results_0.csv").write_text(
+        "launch_time,finish_time,ttft,prompt_tokens,generation_tokens\n"
+        "0.0,1.0,100.0,10,11\n"
+        "0.5,2.0,200.0,20,21\n"
+    )
+    # Link to a results file that no longer exists
+    os.symlink(tmp_path / "missing.csv", tmp_path / "results_1.csv")
+
+    errors = convert.convert_batch(str(tmp_path), WorkloadGenerator.FMPERF, max_workers=max_workers)
+    assert list(errors) == [str(tmp_path / "results_0.csv"), str(tmp_path / "results_1.csv")]
+    assert errors[str(tmp_path / "results_0.csv")] is None
+    assert errors[str(tmp_path / "results_1.csv")].startswith("FileNotFoundError")
+    report = convert.import_benchmark_report(str(tmp_path / "benchmark_report,_results_0.csv.yaml"))
+    assert report.metrics.requests.total == 2
+
+    with pytest.raises(FileNotFoundError):
+        convert.import_fmperf(str(tmp_path / "missing.csv"))
+    with pytest.raises(ValueError):
+        convert.import_fmperf(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        convert.convert_batch(str(tmp_path), WorkloadGenerator.LOADGEN)
+
+
+def test_cli_loadgen(tmp_path):
+    """
+    Tests the CLI rejects loadgen, whose harness already writes benchmark reports
+    """
+
+    result = subprocess.run(
+        [sys.executable, convert.__file__, "--batch", str(tmp_path), "-w", WorkloadGenerator.LOADGEN],
+        capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stderr.startswith("Unsupported workload generator: loadgen\n")
+    assert "Traceback" not in result.stderr
+
+
+def make_report(latency: np.ndarray, sketch: bool = True) -> BenchmarkReport:
+    """
+    Makes a benchmark report from per-request latencies
+    """
+
+    tokens = np.full(len(latency), 100)
+    return BenchmarkReport(**{
+        "scenario": {
+            "model": {"name": "repo/small-model"},
+            "load": {"name": WorkloadGenerator.FMPERF},
+        },
+        "metrics": {
+            "time": {"duration": 10.0, "start": 0.0},
+            "requests": {
+                "total": len(latency),
+                "failures": 0,
+                "input_length": convert.compute_statistics(tokens, Units.COUNT, sketch),
+                "output_length": convert.compute_statistics(tokens, Units.COUNT, sketch),
+            },
+            "latency": {
+                "time_to_first_token": convert.compute_statistics(latency, Units.S, sketch),
+            },
+            "throughput": {
+                "output_tokens_per_sec": 10.0 * len(latency),
+                "total_tokens_per_sec": 20.0 * len(latency),
+                "requests_per_sec": len(latency) / 10,
+            },
+        },
+    })
+
+
+def test_aggregate_reports():
+    """
+    Tests aggregated percentiles match percentiles of all requests
+    """
+
+    rng = np.random.default_rng(0)
+    latencies = [rng.lognormal(-1, 0.5, 1000), rng.lognormal(0, 0.5, 3000)]
+    reports = [make_report(latency) for latency in latencies]
+    all_latency = np.concatenate(latencies)
+
+    report = convert.aggregate_reports(reports)
+    ttft = report.metrics.latency.time_to_first_token
+    assert report.metrics.requests.total == 4000
+    assert ttft.mean == pytest.approx(all_latency.mean())
+    assert ttft.stddev == pytest.approx(all_latency.std())
+    assert ttft.min == all_latency.min()
+    assert ttft.max == all_latency.max()
+    for field, percentile in convert.STATISTICS_PERCENTILES.items():
+        exact = np.percentile(all_latency, percentile, method="lower")
+        assert getattr(ttft, field) == pytest.approx(exact, rel=0.0101)
+    assert report.metrics.throughput.requests_per_sec == pytest.approx(200)
+    assert report.metrics.time.duration == 20
+
+    # Reports measured at the same time add up throughputs
+    report = convert.aggregate_reports(reports, concurrent=True)
+    assert report.metrics.throughput.requests_per_sec == pytest.approx(400)
+    assert report.metrics.time.duration == 10
+
+    # Without sketches, percentiles are not combined
+    report = convert.aggregate_reports([make_report(latency, False) for latency in latencies])
+    ttft = report.metrics.latency.time_to_first_token
+    assert ttft.mean == pytest.approx(all_latency.mean())
+    assert ttft.stddev == pytest.approx(all_latency.std())
+    assert ttft.p99 is None and ttft.sketch is None
+
+
+def test_import_benchmark_report_not_strict(tmp_path):
+    """
+    Tests reports loaded without consistency checks match checked reports
+    """
+
+    report = make_report(np.random.default_rng(0).lognormal(size=100))
+    br_file = tmp_path / "benchmark_report.yaml"
+    report.export_yaml(br_file)
+
+    strict = convert.import_benchmark_report(str(br_file))
+    fast = convert.import_benchmark_report(str(br_file), strict=False)
+    assert fast == strict
+
+    # Inconsistent units are only detected when strict
+    br_dict = report.dump()
+    br_dict["metrics"]["latency"]["time_to_first_token"]["units"] = Units.COUNT
+    assert convert.create_from_dict(br_dict, strict=False).metrics.latency.time_to_first_token.units == Units.COUNT
+    with pytest.raises(ValueError):
+        convert.create_from_dict(br_dict)
+    # Field types are always validated
+    br_dict["metrics"]["requests"]["total"] = "many"
+    with pytest.raises(ValueError):
+        convert.create_from_dict(br_dict, strict=False)
+
+
+def test_report_log(tmp_path):
+    """
+    Tests reports round trip through a report log, with and without its index
+    """
+
+    rng = np.random.default_rng(0)
+    reports = {f"run_{ii}/results_{ii}.csv": make_report(rng.lognormal(size=100)) for ii in range(3)}
+    log_file = str(tmp_path / convert.REPORT_LOG_FILE)
+    for key, report in reports.items():
+        convert.append_report_log(log_file, key, report)
+
+    # Reports are the same as those read from YAML
+    for key, report in reports.items():
+        br_file = tmp_path / "benchmark_report.yaml"
+        report.export_yaml(br_file)
+        assert convert.import_report_log_entry(log_file, key) == convert.import_benchmark_report(str(br_file))
+    logged = list(convert.import_report_log(log_file))
+    assert [key for key, _ in logged] == list(reports)
+    assert [report.dump() for _, report in logged] == [report.dump() for report in reports.values()]
+
+    # Last report of a key replaces earlier ones
+    replaced = make_report(rng.lognormal(size=10))
+    convert.append_report_log(log_file, "run_1/results_1.csv", replaced)
+    index = convert.read_report_log_index(log_file)
+    assert len(index) == 3
+    assert convert.import_report_log_entry(log_file, "run_1/results_1.csv") == replaced
+
+    # Missing or stale index is rebuilt from the log
+    os.remove(log_file + ".idx")
+    assert convert.read_report_log_index(log_file) == index
+    convert.append_report_log(log_file, "run_3/results_3.csv", replaced)
+    with open(log_file + ".idx", "rb") as file:
+        lines = file.readlines()
+    with open(log_file + ".idx", "wb") as file:
+        file.writelines(lines[:-1] + [lines[-1][:5]])
+    assert convert.import_report_log_entry(log_file, "run_3/results_3.csv") == replaced
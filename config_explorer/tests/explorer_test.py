@@ -0,0 +1,503 @@
+"""
+Tests explorer functions
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.config_explorer.explorer as xp
+from config_explorer.schema import BenchmarkReport, Units, WorkloadGenerator
+
+
+def make_report(tp: int = 1, replicas: int = 1, rate: float = 1.0) -> BenchmarkReport:
+    """
+    Makes a minimal aggregate benchmark report from inference-perf
+    """
+
+    stats_ms = {
+        "units": Units.MS,
+        "mean": 10 / rate,
+        "p50": 9 / rate,
+        "p90": 20 / rate,
+        "max": 30 / rate,
+    }
+    stats_tok = {
+        "units": Units.MS_PER_TOKEN,
+        "mean": 5.0,
+        "p90": 8.0,
+    }
+    return BenchmarkReport(**{
+        "scenario": {
+            "model": {"name": "repo/small-model"},
+            "load": {
+                "name": WorkloadGenerator.INFERENCE_PERF,
+                "args": {
+                    "load": {"stages": [{"rate": rate}]},
+                    "data": {"shared_prefix": {
+                        "num_groups": 2,
+                        "num_prompts_per_group": 4,
+                        "system_prompt_len": 1000,
+                        "question_len": 100,
+                        "output_len": 200,
+                    }},
+                },
+                "metadata": {"stage": 0},
+            },
+            "host": {
+                "type": ["replica"] * replicas,
+                "accelerator": [{
+                    "model": "H100",
+                    "count": tp,
+                    "parallelism": {"tp": tp},
+                }] * replicas,
+            },
+            "platform": {
+                "engine": [{"name": "vllm"}] * replicas,
+            },
+        },
+        "metrics": {
+            "time": {"duration": 60.0, "start": 1000.0},
+            "requests": {
+                "total": 100,
+                "failures": 0,
+                "input_length": {"units": Units.COUNT, "mean": 1100},
+                "output_length": {"units": Units.COUNT, "mean": 200},
+            },
+            "latency": {
+                "time_to_first_token": stats_ms,
+                "time_per_output_token": stats_tok,
+                "inter_token_latency": stats_tok,
+                "request_latency": stats_ms,
+            },
+            "throughput": {
+                "output_tokens_per_sec": 100.0 * rate,
+                "total_tokens_per_sec": 600.0 * rate,
+                "requests_per_sec": rate,
+            },
+        },
+    })
+
+
+@pytest.fixture
+def report_dir(tmp_path):
+    """
+    Directory tree of benchmark report files
+    """
+
+    for ii, tp in enumerate([1, 2, 4]):
+        run_dir = tmp_path / f"run_{ii}" / "analysis"
+        run_dir.mkdir(parents=True)
+        make_report(tp=tp, rate=ii + 1).export_yaml(
+            run_dir / f"benchmark_report,_stage_{ii}.yaml")
+    return tmp_path
+
+
+def test_load_benchmark_reports(report_dir):
+    """
+    Tests that bulk loading matches loading reports one at a time
+    """
+
+    br_files = sorted(xp.get_benchmark_report_files(str(report_dir)))
+    assert len(br_files) == 3
+
+    serial_df = xp.make_benchmark_runs_df()
+    for br_file in br_files:
+        xp.add_benchmark_report_to_df(serial_df, br_file)
+
+    for max_workers, strict in [(1, False), (2, False), (1, True)]:
+        runs_df = xp.load_benchmark_reports(br_files, max_workers=max_workers, strict=strict)
+        assert list(runs_df.columns) == list(xp.COLUMNS)
+        assert runs_df['TP'].tolist() == [1, 2, 4]
+        assert runs_df['Max_QPS'].tolist() == [1.0, 2.0, 3.0]
+        assert runs_df['P90_TTFT_ms'].tolist() == serial_df['P90_TTFT_ms'].tolist()
+        assert runs_df['Directory'].tolist() == serial_df['Directory'].tolist()
+
+    assert len(xp.load_benchmark_reports([])) == 0
+
+
+def test_load_report_logs(report_dir):
+    """
+    Tests that loading report logs matches loading report files
+    """
+
+    br_files = sorted(xp.get_benchmark_report_files(str(report_dir)))
+    for br_file in br_files:
+        # Log is in the parent of the results directory
+        xp.convert.append_report_log(
+            os.path.join(os.path.dirname(os.path.dirname(br_file)), xp.convert.REPORT_LOG_FILE),
+            xp.convert.get_report_log_key(br_file),
+            xp.convert.import_benchmark_report(br_file))
+
+    log_files = sorted(xp.get_report_log_files(str(report_dir)))
+    assert len(log_files) == 3
+    runs_df = xp.load_report_logs(log_files)
+    files_df = xp.load_benchmark_reports(br_files)
+    assert list(runs_df.columns) == list(xp.COLUMNS)
+    for column in ['TP', 'Max_QPS', 'P90_TTFT_ms', 'Directory']:
+        assert runs_df[column].tolist() == files_df[column].tolist()
+
+
+def test_load_benchmark_reports_cache(report_dir, monkeypatch):
+    """
+    Tests that cached rows are reused, and only changed reports are parsed
+    """
+
+    cache_file = str(report_dir / "cache.json")
+    br_files = sorted(xp.get_benchmark_report_files(str(report_dir)))
+    first_df = xp.load_benchmark_reports(br_files, max_workers=1, cache_file=cache_file)
+    assert os.path.isfile(cache_file)
+
+    parsed = []
+    load_row = xp._load_benchmark_run_row
+
+    def counting_load_row(br_file, strict=True):
+        parsed.append(br_file)
+        return load_row(br_file, strict)
+
+    monkeypatch.setattr(xp, "_load_benchmark_run_row", counting_load_row)
+
+    # Nothing changed, everything comes from the cache
+    cached_df = xp.load_benchmark_reports(br_files, max_workers=1, cache_file=cache_file)
+    assert parsed == []
+    assert cached_df['Mean_TTFT_ms'].tolist() == first_df['Mean_TTFT_ms'].tolist()
+    assert cached_df['Workload_Generator'].tolist() == first_df['Workload_Generator'].tolist()
+
+    # Rewrite one report, only that one should be parsed again
+    make_report(tp=8, rate=1).export_yaml(br_files[0])
+    os.utime(br_files[0], ns=(0, 0))
+    updated_df = xp.load_benchmark_reports(br_files, max_workers=1, cache_file=cache_file)
+    assert parsed == [os.path.abspath(br_files[0])]
+    assert updated_df['TP'].tolist() == [8, 2, 4]
+
+
+def test_get_runs_cache_file(report_dir, tmp_path):
+    """
+    Tests that cache files are kept out of report directories, and the least recently used ones are removed
+    """
+
+    cache_dir = str(tmp_path / "cache")
+    cache_files = []
+    for ii in range(4):
+        cache_files.append(xp.get_runs_cache_file(str(report_dir / f"run_{ii}"), cache_dir, max_files=3))
+        assert os.path.dirname(cache_files[-1]) == cache_dir
+        xp.load_benchmark_reports(
+            xp.get_benchmark_report_files(str(report_dir / "run_0")), max_workers=1, cache_file=cache_files[-1])
+        os.utime(cache_files[-1], ns=(ii, ii))
+    assert len(set(cache_files)) == 4
+    assert xp.get_runs_cache_file(str(report_dir / "run_0" / ".." / "run_1"), cache_dir, max_files=3) == cache_files[1]
+    assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(path) for path in cache_files[1:])
+
+
+def test_benchmark_report_watcher(report_dir, monkeypatch):
+    """
+    Tests that refreshing a watcher only parses new and changed reports
+    """
+
+    parsed = []
+    load_row = xp._load_benchmark_run_row
+
+    def counting_load_row(br_file, strict=True):
+        parsed.append(os.path.basename(br_file))
+        return load_row(br_file, strict)
+
+    monkeypatch.setattr(xp, "_load_benchmark_run_row", counting_load_row)
+    cache_file = str(report_dir / "cache.json")
+    watcher = xp.BenchmarkReportWatcher(str(report_dir), max_workers=1, cache_file=cache_file)
+    assert watcher.refresh()
+    assert len(parsed) == 3
+    assert watcher.runs_df['TP'].tolist() == [1, 2, 4]
+    assert not watcher.refresh()
+
+    # New report is appended, a report being written is skipped until it changes
+    new_dir = report_dir / "run_3" / "analysis"
+    new_dir.mkdir(parents=True)
+    make_report(tp=8, rate=4).export_yaml(new_dir / "benchmark_report,_stage_3.yaml")
+    (new_dir / "benchmark_report,_stage_4.yaml").write_text("metrics:\n  time: [")
+    parsed.clear()
+    assert watcher.refresh()
+    assert sorted(parsed) == ["benchmark_report,_stage_3.yaml", "benchmark_report,_stage_4.yaml"]
+    assert watcher.runs_df['TP'].tolist() == [1, 2, 4, 8]
+    parsed.clear()
+    assert not watcher.refresh()
+    assert parsed == []
+
+    # Changed and removed reports
+    make_report(tp=16, rate=5).export_yaml(new_dir / "benchmark_report,_stage_4.yaml")
+    os.remove(report_dir / "run_0" / "analysis" / "benchmark_report,_stage_0.yaml")
+    assert watcher.refresh()
+    assert parsed == ["benchmark_report,_stage_4.yaml"]
+    assert watcher.runs_df['TP'].tolist() == [2, 4, 8, 16]
+    assert len(watcher.br_files) == 4
+
+    # Rows are reused from cache by a new watcher
+    parsed.clear()
+    watcher = xp.BenchmarkReportWatcher(str(report_dir), max_workers=1, cache_file=cache_file)
+    assert watcher.refresh()
+    assert parsed == []
+    assert watcher.runs_df['TP'].tolist() == [2, 4, 8, 16]
+
+
+def test_benchmark_report_watcher_mtime_resolution(report_dir, monkeypatch):
+    """
+    Tests that a watcher finds reports added without changing the directory modification time
+    """
+
+    def add_report(run: int, tp: int, mtime_ns: int | None = None):
+        # Keeps the directory modification time, like filesystems with coarse modification times
+        run_dir = report_dir / f"run_{run}" / "analysis"
+        mtime_ns = os.stat(run_dir).st_mtime_ns if mtime_ns is None else mtime_ns
+        make_report(tp=tp).export_yaml(run_dir / f"benchmark_report,_stage_{tp}.yaml")
+        os.utime(run_dir, ns=(mtime_ns, mtime_ns))
+
+    monkeypatch.setattr(xp, "WATCHER_FULL_SCAN_REFRESHES", 4)
+    watcher = xp.BenchmarkReportWatcher(str(report_dir), max_workers=1)
+    assert watcher.refresh()
+
+    # Directory was listed within the modification time resolution of its last change
+    add_report(0, 8)
+    assert watcher.refresh()
+    assert watcher.runs_df['TP'].tolist() == [1, 2, 4, 8]
+
+    # Directory listed well after its last change is not listed again
+    old_ns = time.time_ns() - 10 * xp.WATCHER_MTIME_RESOLUTION_NS
+    os.utime(report_dir / "run_1" / "analysis", ns=(old_ns, old_ns))
+    assert not watcher.refresh()
+    add_report(1, 16, old_ns)
+    assert not watcher.refresh()
+
+    # Until all directories are listed again
+    assert watcher.refresh()
+    assert watcher.runs_df['TP'].tolist() == [1, 2, 4, 8, 16]
+
+
+def test_benchmark_report_watcher_logs(report_dir, monkeypatch):
+    """
+    Tests that a watcher reads report logs, and report files of results without a log
+    """
+
+    parsed = []
+    load_row = xp._load_benchmark_run_row
+
+    def counting_load_row(br_file, strict=True):
+        parsed.append(os.path.basename(br_file))
+        return load_row(br_file, strict)
+
+    monkeypatch.setattr(xp, "_load_benchmark_run_row", counting_load_row)
+
+    # Runs 0 and 1 have a report log, run 2 only report files
+    br_files = sorted(xp.get_benchmark_report_files(str(report_dir)))
+    for br_file in br_files[:2]:
+        xp.convert.append_report_log(
+            os.path.join(os.path.dirname(os.path.dirname(br_file)), xp.convert.REPORT_LOG_FILE),
+            xp.convert.get_report_log_key(br_file),
+            xp.convert.import_benchmark_report(br_file))
+    watcher = xp.BenchmarkReportWatcher(str(report_dir), max_workers=1)
+    assert watcher.refresh()
+    assert parsed == ["benchmark_report,_stage_2.yaml"]
+    assert sorted(watcher.log_files) == [
+        str(report_dir / f"run_{ii}" / xp.convert.REPORT_LOG_FILE) for ii in range(2)]
+    assert watcher.runs_df['TP'].tolist() == [1, 2, 4]
+    assert watcher.runs_df['Directory'].tolist() == xp.load_benchmark_reports(br_files, max_workers=1)['Directory'].tolist()
+    assert not watcher.refresh()
+
+    # A report appended to a log replaces the report file of its results
+    log_file = str(report_dir / "run_0" / xp.convert.REPORT_LOG_FILE)
+    xp.convert.append_report_log(log_file, xp.convert.get_report_log_key(br_files[0]), make_report(tp=8))
+    assert watcher.refresh()
+    assert watcher.runs_df['TP'].tolist() == [8, 2, 4]
+
+    # Without the log, the report file is read
+    parsed.clear()
+    os.remove(log_file)
+    assert watcher.refresh()
+    assert parsed == ["benchmark_report,_stage_0.yaml"]
+    assert sorted(watcher.runs_df['TP'].tolist()) == [1, 2, 4]
+
+
+def test_benchmark_runs_parquet(report_dir, tmp_path):
+    """
+    Tests round trip of benchmark runs through a Parquet dataset, with
+    scenario and SLO filters applied while reading
+    """
+
+    pytest.importorskip("pyarrow")
+
+    runs_df = xp.load_benchmark_reports(
+        sorted(xp.get_benchmark_report_files(str(report_dir))), max_workers=1)
+    runs_df.loc[1, 'Model'] = 'org/other-model'
+    store = str(tmp_path / "store")
+    xp.export_benchmark_runs_parquet(runs_df, store)
+
+    # Partition directories are created for each model
+    assert len(os.listdir(store)) == 2
+
+    all_df = xp.import_benchmark_runs_parquet(store)
+    assert list(all_df.columns) == list(xp.COLUMNS)
+    assert sorted(all_df['TP'].tolist()) == [1, 2, 4]
+    assert sorted(all_df['Model'].tolist()) == sorted(runs_df['Model'].tolist())
+
+    scenario = {'Model': 'repo/small-model', 'GPU': 'H100'}
+    slos = [xp.SLO('P90_TTFT_ms', 15)]
+    expected = xp.get_meet_slo_df(xp.get_scenario_df(runs_df, scenario), slos)
+    filtered = xp.import_benchmark_runs_parquet(
+        store, scenario=scenario, slos=slos, columns=['TP', 'P90_TTFT_ms'])
+    assert list(filtered.columns) == ['TP', 'P90_TTFT_ms']
+    assert filtered['TP'].tolist() == expected['TP'].tolist() == [4]
+
+    # Replacing partitions does not duplicate rows
+    xp.export_benchmark_runs_parquet(runs_df, store, replace_partitions=True)
+    assert len(xp.import_benchmark_runs_parquet(store)) == 3
+    xp.export_benchmark_runs_parquet(runs_df, store)
+    assert len(xp.import_benchmark_runs_parquet(store)) == 6
+
+
+def brute_force_pareto_mask(costs: np.ndarray) -> np.ndarray:
+    """
+    Quadratic reference for the Pareto front, where lower costs are better
+    """
+
+    mask = np.ones(len(costs), dtype=bool)
+    for ii in range(len(costs)):
+        for jj in range(len(costs)):
+            if np.all(costs[jj] < costs[ii]):
+                mask[ii] = False
+                break
+    return mask
+
+
+@pytest.mark.parametrize("n_obj", [1, 2, 3, 4])
+def test_pareto_front_mask(n_obj):
+    """
+    Tests the vectorized Pareto front against a brute force search, including
+    ties and NaN values
+    """
+
+    rng = np.random.default_rng(n_obj)
+    # Integer values produce many ties
+    costs = rng.integers(0, 20, size=(300, n_obj)).astype(float)
+    costs[rng.integers(0, 300, size=10), rng.integers(0, n_obj, size=10)] = np.nan
+    assert np.array_equal(xp._pareto_front_mask(costs), brute_force_pareto_mask(costs))
+
+    # Anti-correlated values produce a large front
+    costs = rng.random((300, n_obj))
+    costs[:, -1] = n_obj - costs[:, :-1].sum(axis=1) + 0.01 * costs[:, -1]
+    assert np.array_equal(xp._pareto_front_mask(costs), brute_force_pareto_mask(costs))
+
+
+def test_get_pareto_front_df():
+    """
+    Tests Pareto front honors the preferred direction of columns
+    """
+
+    runs_df = pd.DataFrame({
+        'Thpt_per_GPU': [10.0, 20.0, 15.0, 5.0, 20.0, None],
+        'Mean_TTFT_ms': [100.0, 300.0, 200.0, 400.0, 300.0, 1.0],
+        'Cost': [1.0, 1.0, 3.0, 2.0, 2.0, 1.0],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+    pareto_df = xp.get_pareto_front_df(runs_df, 'Thpt_per_GPU', 'Mean_TTFT_ms')
+    assert pareto_df.index.tolist() == [10, 11, 12, 14, 15]
+
+    pareto_df = xp.get_pareto_front_df(runs_df, 'Mean_TTFT_ms', 'Thpt_per_GPU', sort=True)
+    assert pareto_df.index.tolist() == [15, 10, 12, 11, 14]
+
+    pareto_df = xp.get_pareto_front_multi_df(
+        runs_df, ['Thpt_per_GPU', 'Mean_TTFT_ms', 'Cost'], prefs={'Cost': xp.Pref.LOW})
+    assert pareto_df.index.tolist() == [10, 11, 12, 14, 15]
+
+    with pytest.raises(KeyError):
+        xp.get_pareto_front_multi_df(runs_df, ['Thpt_per_GPU', 'Cost'])
+    with pytest.raises(Exception):
+        xp.get_pareto_front_df(runs_df, 'Thpt_per_GPU', 'TP')
+
+
+def test_scenario_index():
+    """
+    Tests scenario index lookups match boolean filtering
+    """
+
+    rng = np.random.default_rng(0)
+    runs_df = pd.DataFrame({
+        'Model': rng.choice(['a', 'b', 'c'], 200),
+        'GPU': rng.choice(['H100', 'L40S'], 200),
+        'ISL': rng.choice([100, 1000, None], 200),
+        'TP': rng.choice([1, 2, 4], 200),
+    }, index=rng.permutation(1000)[:200])
+    columns = ['Model', 'GPU', 'ISL']
+    scenarios = xp.get_scenarios(runs_df, columns)
+    index = xp.make_scenario_index(runs_df, columns)
+
+    assert {tuple(sc.values()) for sc in index.scenarios()} == \
+        {tuple(sc.values()) for sc in scenarios}
+    counts = xp.get_scenario_counts(runs_df, scenarios)
+    for sc, count in zip(scenarios, counts):
+        expected = xp.get_scenario_df(runs_df, sc)
+        looked_up = xp.get_scenario_df(runs_df, sc, index)
+        assert looked_up.index.tolist() == expected.index.tolist()
+        assert count == index.count(sc) == len(expected)
+
+    # Missing scenarios have no rows, and scenarios with other columns are
+    # filtered without the index
+    assert xp.get_scenario_counts(runs_df, [{'Model': 'x', 'GPU': 'H100', 'ISL': 100}]) == [0]
+    assert len(xp.get_scenario_df(runs_df, {'Model': 'a'}, index)) == (runs_df['Model'] == 'a').sum()
+    with pytest.raises(ValueError):
+        xp.get_scenario_df(runs_df.iloc[1:], scenarios[0], index)
+
+    summary_df = xp.make_scenarios_summary_df(scenarios, runs_df, min_count=10)
+    assert summary_df['Count'].tolist() == [c for c in counts if c >= 10]
+    assert summary_df.index.tolist() == [ii for ii, c in enumerate(counts) if c >= 10]
+
+    # Printing without counts
+    xp.print_scenarios(scenarios)
+
+
+def test_sweep_index():
+    """
+    Tests sweep index lookups match boolean filtering, and are memoized
+    """
+
+    rng = np.random.default_rng(0)
+    n = 500
+    runs_df = pd.DataFrame({
+        'Model': rng.choice(['a', 'b'], n),
+        'GPU': rng.choice(['H100', 'L40S'], n),
+        'Num_GPUs': rng.choice([1, 2, 4, 8, np.nan], n),
+        'ISL': rng.choice([100, 1000, 10000], n),
+        'OSL': rng.choice([100, 1000], n),
+        'Groups': rng.choice([1, 2], n),
+        'Thpt_per_GPU': rng.random(n) * 100,
+        'Mean_TTFT_ms': rng.random(n) * 1000,
+    }, index=rng.permutation(10 * n)[:n])
+    index = xp.SweepIndex(runs_df)
+    assert sorted(index.model_gpus()) == [('a', 'H100'), ('a', 'L40S'), ('b', 'H100'), ('b', 'L40S')]
+
+    scenario = {'Model': 'a', 'GPU': 'L40S', 'Groups': 2}
+    expected = runs_df[
+        (runs_df['Model'] == 'a') & (runs_df['GPU'] == 'L40S') & (runs_df['Groups'] == 2) &
+        (runs_df['Num_GPUs'] <= 4) & (runs_df['ISL'] >= 1000) & (runs_df['OSL'] >= 1000)]
+    looked_up = index.get_df(scenario, max_num_gpus=4, min_isl=1000, min_osl=1000)
+    assert looked_up.index.tolist() == expected.index.tolist()
+    assert len(index.get_df({'Model': 'x', 'GPU': 'H100'})) == 0
+    with pytest.raises(KeyError):
+        index.get_df({'Model': 'a'})
+
+    slos = [xp.SLO('Thpt_per_GPU', 20.0), xp.SLO('Mean_TTFT_ms', 800.0)]
+    meet_slo_df = xp.get_meet_slo_df(xp.get_scenario_df(runs_df, scenario), slos)
+    assert index.get_meet_slo_df(scenario, slos).index.tolist() == meet_slo_df.index.tolist()
+    for sort in [False, True]:
+        expected = xp.get_pareto_front_df(meet_slo_df, 'Mean_TTFT_ms', 'Thpt_per_GPU', sort)
+        looked_up = index.get_pareto_front_df(scenario, slos, 'Mean_TTFT_ms', 'Thpt_per_GPU', sort)
+        assert looked_up.index.tolist() == expected.index.tolist()
+
+    # Repeated lookups are memoized, with the least recently used discarded
+    rows = index.pareto_front_rows(scenario, slos, ['Mean_TTFT_ms', 'Thpt_per_GPU'])
+    assert index.pareto_front_rows(scenario, slos, ['Mean_TTFT_ms', 'Thpt_per_GPU']) is rows
+    index = xp.SweepIndex(runs_df, max_memoized=2)
+    rows = index.rows(scenario)
+    index.rows({'Model': 'b', 'GPU': 'H100'})
+    index.rows({'Model': 'b', 'GPU': 'L40S'})
+    assert index.rows(scenario) is not rows
@@ -0,0 +1,258 @@
+"""
+Tests the loadgen harness against a mock OpenAI-compatible server
+"""
+
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+
+from config_explorer import convert
+from config_explorer.schema import WorkloadGenerator
+
+HARNESS_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "workload", "harnesses", "loadgen-llm-d-benchmark.py")
+
+# Delays of the mock server
+TTFT = 0.05
+ITL = 0.005
+
+
+def load_harness():
+    """
+    Imports the harness, whose file name is not a module name
+    """
+
+    spec = importlib.util.spec_from_file_location("loadgen_harness", HARNESS_FILE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+lg = load_harness()
+
+
+async def mock_completions(request: web.Request) -> web.StreamResponse:
+    """
+    Streams max_tokens tokens, with usage counting a token per word of the prompt
+    """
+
+    body = await request.json()
+    if body["model"] != "mock-model":
+        return web.json_response({"error": "model not found"}, status=404)
+    chat = request.path.endswith("/chat/completions")
+    prompt = body["messages"][0]["content"] if chat else body["prompt"]
+    usage = {"prompt_tokens": len(prompt.split()), "completion_tokens": body["max_tokens"]}
+    await asyncio.sleep(TTFT)
+    if not body["stream"]:
+        await asyncio.sleep(ITL * (body["max_tokens"] - 1))
+        return web.json_response({"choices": [{"text": "x " * body["max_tokens"]}], "usage": usage})
+
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await response.prepare(request)
+    if chat:
+        # The first chunk of chat completions only has the role
+        await response.write(b'data: {"choices": [{"delta": {"role": "assistant", "content": ""}}]}\n\n')
+    for ii in range(body["max_tokens"]):
+        if ii:
+            await asyncio.sleep(ITL)
+        choice = {"delta": {"content": "x "}} if chat else {"text": "x "}
+        await response.write(b"data: " + json.dumps({"choices": [choice]}).encode() + b"\n\n")
+    if body.get("stream_options", {}).get("include_usage"):
+        await response.write(b"data: " + json.dumps({"choices": [], "usage": usage}).encode() + b"\n\n")
+    await response.write(b"data: [DONE]\n\n")
+    return response
+
+
+async def mock_models(request: web.Request) -> web.Response:
+    """
+    Lists the served model
+    """
+
+    return web.json_response({"data": [{"id": "mock-model"}]})
+
+
+def serve_mock(port_queue: multiprocessing.Queue):
+    """
+    Runs the mock server on a free port, put in port_queue
+    """
+
+    async def serve():
+        app = web.Application()
+        app.router.add_post("/v1/completions", mock_completions)
+        app.router.add_post("/v1/chat/completions", mock_completions)
+        app.router.add_get("/v1/models", mock_models)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port_queue.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    """
+    URL of a mock server running in another process
+    """
+
+    ctx = multiprocessing.get_context("fork")
+    port_queue = ctx.Queue()
+    server = ctx.Process(target=serve_mock, args=(port_queue,), daemon=True)
+    server.start()
+    yield "http://127.0.0.1:%d" % port_queue.get(timeout=30)
+    server.terminate()
+    server.join()
+
+
+def make_config(base_url: str, stages: list[dict], **kwargs) -> "lg.LoadgenConfig":
+    """
+    Makes a configuration from a profile with fixed lengths
+    """
+
+    profile = {
+        "base_url": base_url,
+        "model": "mock-model",
+        "data": {"input_tokens": 20, "output_tokens": 10},
+        "load": {"stages": stages},
+    }
+    for key, value in kwargs.items():
+        if key in ["processes", "max_connections"]:
+            profile["load"][key] = value
+        elif key in ["input_tokens", "output_tokens", "prefix_tokens", "num_prefixes"]:
+            profile["data"][key] = value
+        else:
+            profile[key] = value
+    return lg.LoadgenConfig.from_dict(profile)
+
+
+def test_arrival_times():
+    """
+    Tests arrivals of each load type have the requested rate, and are shared between workers
+    """
+
+    times = lg.arrival_times(lg.Stage(type="constant", rate=10, duration=5))
+    assert np.allclose(times, np.arange(50) / 10)
+
+    for load_type, burstiness, cv in [("poisson", 1.0, 1.0), ("bursty", 0.25, 2.0)]:
+        times = lg.arrival_times(lg.Stage(type=load_type, rate=100, duration=200, burstiness=burstiness))
+        intervals = np.diff(times)
+        assert len(times) == pytest.approx(20000, rel=0.1)
+        assert intervals.mean() == pytest.approx(0.01, rel=0.1)
+        assert intervals.std() / intervals.mean() == pytest.approx(cv, rel=0.1)
+        assert times[-1] < 200
+
+    stage = lg.Stage(type="poisson", rate=1000, num_requests=100)
+    times = lg.arrival_times(stage, seed=3)
+    assert len(times) == 100
+    assert times[0] == 0
+    shares = [times[worker::3] for worker in range(3)]
+    assert np.array_equal(np.sort(np.concatenate(shares)), times)
+
+    with pytest.raises(ValueError):
+        lg.Stage(type="poisson", duration=10)
+    with pytest.raises(ValueError):
+        lg.Stage(type="concurrent", rate=10, duration=10)
+    with pytest.raises(ValueError):
+        lg.Stage(type="uniform", rate=10, duration=10)
+
+
+def test_closed_loop(base_url: str):
+    """
+    Tests concurrent users measure the token timings of the mock server
+    """
+
+    config = make_config(
+        base_url, [{"type": "concurrent", "concurrency": 4, "num_requests": 20}],
+        prefix_tokens=30, num_prefixes=2)
+    results = lg.run_stage_worker(config, 0, 0, 1, time.time())
+    report = lg.make_report(config, 0, results)
+
+    metrics = report.metrics
+    assert metrics.requests.total == 20
+    assert metrics.requests.failures == 0
+    assert metrics.requests.input_length.min == metrics.requests.input_length.max == 50
+    assert metrics.requests.output_length.mean == 10
+    assert metrics.latency.time_to_first_token.min >= TTFT
+    assert metrics.latency.time_to_first_token.p50 < TTFT + 0.05
+    assert metrics.latency.inter_token_latency.p50 == pytest.approx(ITL, abs=0.004)
+    assert metrics.latency.time_per_output_token.mean == pytest.approx(ITL, abs=0.004)
+    assert metrics.latency.request_latency.min >= TTFT + 9 * ITL
+    assert metrics.latency.inter_token_latency.sketch["count"] == 20 * 9
+    # 4 users, each sending a request about every 0.1 s
+    assert metrics.throughput.requests_per_sec == pytest.approx(4 / (TTFT + 9 * ITL), rel=0.5)
+    assert metrics.throughput.output_tokens_per_sec == pytest.approx(
+        10 * metrics.throughput.requests_per_sec)
+    assert report.scenario.load.name == WorkloadGenerator.LOADGEN
+    assert report.scenario.load.type == "concurrent"
+
+
+def test_open_loop(base_url: str):
+    """
+    Tests open-loop chat requests are sent at their arrival times, and failures are counted
+    """
+
+    stages = [{"type": "constant", "rate": 50, "duration": 1}]
+    config = make_config(base_url, stages, api="chat")
+    results = lg.run_stage_worker(config, 0, 0, 1, time.time())
+    report = lg.make_report(config, 0, results)
+    assert report.metrics.requests.total == 50
+    assert report.metrics.requests.failures == 0
+    assert report.metrics.latency.time_to_first_token.min >= TTFT
+    # First request at start of stage, last one after 0.98 s
+    assert report.metrics.time.duration >= 0.98 + TTFT + 9 * ITL
+
+    # Without streaming, the first token arrives with the response
+    config = make_config(base_url, stages, streaming=False)
+    report = lg.make_report(config, 0, lg.run_stage_worker(config, 0, 0, 1, time.time()))
+    assert report.metrics.latency.inter_token_latency is None
+    assert report.metrics.latency.time_to_first_token.mean == report.metrics.latency.request_latency.mean
+
+    config = make_config(base_url, stages, model="other-model")
+    results = lg.run_stage_worker(config, 0, 0, 1, time.time())
+    assert sum(results.success) == 0
+    assert list(results.errors.values()) == [50]
+    assert list(results.errors)[0].startswith("HTTP 404")
+    with pytest.raises(RuntimeError):
+        lg.make_report(config, 0, results)
+
+
+def test_run_benchmark(base_url: str, tmp_path):
+    """
+    Tests stages fanned out to several processes are written as benchmark reports
+    """
+
+    stages = [
+        {"type": "poisson", "rate": 100, "num_requests": 60},
+        {"type": "concurrent", "concurrency": 5, "duration": 0.5},
+    ]
+    config = make_config(base_url, stages, processes=2, model=None)
+    results_dir = tmp_path / "loadgen_run"
+    results_dir.mkdir()
+    report_log = str(tmp_path / convert.REPORT_LOG_FILE)
+    reports = lg.run_benchmark(config, str(results_dir), report_log)
+
+    assert config.model == "mock-model"
+    assert len(reports) == 2
+    assert reports[0].metrics.requests.total == 60
+    assert reports[1].metrics.requests.total >= 5 * int(0.5 / (TTFT + 9 * ITL))
+    for ii, report in enumerate(reports):
+        assert report.metrics.requests.failures == 0
+        assert report.scenario.load.metadata == {"stage": ii, "processes": 2}
+        imported = convert.import_benchmark_report(
+            str(results_dir / f"benchmark_report,_stage_{ii}.yaml"))
+        assert imported.metrics.requests.total == report.metrics.requests.total
+    assert [key for key, _ in convert.import_report_log(report_log)] == [
+        "loadgen_run/stage_0", "loadgen_run/stage_1"]
@@ -0,0 +1,204 @@
+"""
+Tests the nop harness parsing and aggregation of vLLM logs
+"""
+
+import importlib.util
+import io
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("kubernetes")
+
+HARNESS_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "workload", "harnesses", "nop-llm-d-benchmark.py")
+
+
+def load_harness():
+    """
+    Imports the harness, whose file name is not a module name
+    """
+
+    spec = importlib.util.spec_from_file_location("nop_harness", HARNESS_FILE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+nop = load_harness()
+
+
+def test_aggregate_categories():
+    """
+    Tests categories of several pods are aggregated by their path, also when titles repeat among siblings
+    """
+
+    def pod(load: float, first_gap: float, second_gap: float, compile_time: float) -> list[dict]:
+        return [
+            {"title": "Load Model", "elapsed": load},
+            {"title": "Uncategorized", "elapsed": first_gap},
+            {"title": "Compile", "elapsed": compile_time, "categories": [
+                {"title": "Dynamo", "elapsed": compile_time / 2},
+                {"title": "Uncategorized", "elapsed": compile_time / 2},
+            ]},
+            {"title": "Uncategorized", "elapsed": second_gap},
+        ]
+
+    aggregate = nop.aggregate_categories([pod(10, 1, 100, 4), pod(20, 3, 300, 8), pod(30, 2, 200, 6)])
+    assert [category["title"] for category in aggregate] == [
+        "Load Model", "Uncategorized", "Compile", "Uncategorized"]
+    assert aggregate[0]["elapsed"] == {"min": 10, "p50": 20, "max": 30}
+    assert aggregate[1]["elapsed"] == {"min": 1, "p50": 2, "max": 3}
+    assert aggregate[3]["elapsed"] == {"min": 100, "p50": 200, "max": 300}
+    assert aggregate[2]["categories"] == [
+        {"title": "Dynamo", "elapsed": {"min": 2, "p50": 3, "max": 4}},
+        {"title": "Uncategorized", "elapsed": {"min": 2, "p50": 3, "max": 4}},
+    ]
+
+    # Categories missing in some pods are aggregated over the pods that have them
+    other_pod = [{"title": "Load Model", "elapsed": 40}, {"title": "Sleep", "elapsed": 5}]
+    aggregate = nop.aggregate_categories([pod(10, 1, 100, 4), other_pod])
+    assert [category["title"] for category in aggregate] == [
+        "Load Model", "Uncategorized", "Compile", "Uncategorized", "Sleep"]
+    assert aggregate[0]["elapsed"] == {"min": 10, "p50": 25, "max": 40}
+    assert aggregate[4]["elapsed"] == {"min": 5, "p50": 5, "max": 5}
+
+
+# Startup of vLLM with an API server and an engine core process, and lines without dates
+VLLM_LOG = """\
+INFO 08-13 10:00:00 [__init__.py:36] No plugins for group vllm.platform_plugins found.
+INFO 08-13 10:00:01 [__init__.py:235] Automatically detected platform cuda.
+INFO 08-13 10:00:03 [__init__.py:36] Available plugins for group vllm.general_plugins:
+(APIServer pid=1) INFO 08-13 10:00:05 [api_server.py:1805] vLLM API server version 0.10.1
+(APIServer pid=1) INFO 08-13 10:00:05 [utils.py:326] non-default args: {'model': 'repo/model', 'enable_sleep_mode': True}
+(APIServer pid=1) INFO 08-13 10:00:09 [__init__.py:1750] Using max model len 4096
+(EngineCore_0 pid=200) INFO 08-13 10:00:12 [core.py:654] Waiting for init message from front-end.
+(EngineCore_0 pid=200) INFO 08-13 10:00:15 [gpu_model_runner.py:1913] Starting to load model repo/model...
+(EngineCore_0 pid=200) Loading safetensors checkpoint shards:   0% Completed | 0/2 [00:00<?, ?it/s]
+(EngineCore_0 pid=200) Loading safetensors checkpoint shards: 100% Completed | 2/2 [00:07<00:00,  3.50s/it]
+(EngineCore_0 pid=200) INFO 08-13 10:00:23 [default_loader.py:262] Loading weights took 7.10 seconds
+(EngineCore_0 pid=200) INFO 08-13 10:00:24 [gpu_model_runner.py:1962] Model loading took 15.2209 GB and 8.221976 seconds
+(EngineCore_0 pid=200) INFO 08-13 10:00:30 [backends.py:530] Using cache directory: /root/.cache/vllm/torch_compile_cache for vLLM's torch.compile
+(EngineCore_0 pid=200) INFO 08-13 10:00:30 [backends.py:541] Start compiling function
+(EngineCore_0 pid=200) INFO 08-13 10:00:34 [backends.py:215] Dynamo bytecode transform time: 3.96 s
+(EngineCore_0 pid=200) INFO 08-13 10:00:40 [backends.py:194] Compiling a graph for dynamic shape takes 5.50 s
+(EngineCore_0 pid=200) INFO 08-13 10:00:48 [monitor.py:34] torch.compile takes 17.88 s in total
+(EngineCore_0 pid=200) Capturing CUDA graph shapes: 100%|##########| 67/67 [00:05<00:00, 13.10it/s]
+(EngineCore_0 pid=200) INFO 08-13 10:00:56 [core.py:214] init engine (profile, create kv cache, warmup model) took 31.50 seconds
+(APIServer pid=1) INFO 08-13 10:00:58 [api_server.py:1857] Starting vLLM API server 0 on http://0.0.0.0:8000
+(APIServer pid=1) INFO 08-13 10:00:58 [launcher.py:37] Route: /metrics, Methods: GET
+"""
+
+
+def old_categorize_logs(logs: str, vllm_model: str) -> "nop.BenchmarkCategory":
+    """
+    Categorizes logs as before streaming: every line is kept, grouped by process after a tensorizer serialization
+    """
+
+    log_list = [
+        nop.LogLine(line, idx + 1, nop.BenchmarkProcess.process_from_line(line))
+        for idx, line in enumerate(logs.splitlines())
+    ]
+    serialization_end = f"End model {vllm_model} serialization"
+    start = next((log_line.line_number for log_line in log_list if serialization_end in log_line.line), 0)
+    log_list_per_process = {}
+    for log_line in log_list[start:]:
+        log_list_per_process.setdefault(log_line.process, []).append(log_line)
+    return nop.categorize_logs(log_list_per_process)
+
+
+def categories_log(root_category: "nop.BenchmarkCategory") -> str:
+    """
+    Returns the categories log of a pod, with the lines starting and ending each category
+    """
+
+    file = io.StringIO()
+    nop.write_benchmark_categories_to_log(1, root_category, file)
+    return file.getvalue()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_parser_matches_full_categorization(chunk_size: int):
+    """
+    Tests categories of the streaming parser are the same as when categorizing all the lines
+    """
+
+    data = VLLM_LOG.encode()
+    parser = nop.VllmLogParser("repo/model")
+    parser.feed(data[ii:ii + chunk_size] for ii in range(0, len(data), chunk_size))
+    root_category = nop.categorize_logs(parser.log_list_per_process)
+    old_root_category = old_categorize_logs(VLLM_LOG, "repo/model")
+    assert categories_log(root_category) == categories_log(old_root_category)
+    categories = root_category.dump()
+    assert categories == old_root_category.dump()
+
+    assert parser.line_number == len(VLLM_LOG.splitlines())
+    assert parser.benchmark_result.scenario.sleep_mode
+    assert [category["title"] for category in categories] == [
+        "Detect Platform", "LLM Imports", "Get Model Info", "Worker Initialization", "Model Loading",
+        "Pytorch Compilation", "CUDA Graph Capture", "API Server Starts"]
+    titles = {category["title"]: category for category in categories}
+    assert titles["Model Loading"]["elapsed"] == 9
+    assert titles["Model Loading"]["process"] == {"name": "EngineCore_0", "pid": 200}
+    assert [(category["title"], category["elapsed"]) for category in titles["Pytorch Compilation"]["categories"]] == [
+        ("Dynamo", 4), ("Inductor", 14)]
+
+    # Only the lines needed for categorization are kept
+    assert sum(len(log_list) for log_list in parser.log_list_per_process.values()) < parser.line_number
+
+
+def test_parser_process_logs(tmp_path):
+    """
+    Tests all the lines of each process are written while streaming, after a tensorizer serialization
+    """
+
+    serialization = (
+        "(EngineCore_0 pid=100) INFO 08-13 09:59:00 [tensorizer.py:100] Start model repo/model serialization\n"
+        "(EngineCore_0 pid=100) INFO 08-13 09:59:30 [tensorizer.py:200] End model repo/model serialization\n")
+    logs = serialization + VLLM_LOG
+    parser = nop.VllmLogParser("repo/model", str(tmp_path / "vllm-pod"))
+    parser.feed([logs.encode()])
+    parser.close()
+
+    assert categories_log(nop.categorize_logs(parser.log_list_per_process)) == categories_log(
+        old_categorize_logs(logs, "repo/model"))
+
+    lines = logs.splitlines()
+    processes = [None, nop.BenchmarkProcess("APIServer", 1), nop.BenchmarkProcess("EngineCore_0", 200)]
+    assert sorted(os.listdir(tmp_path)) == ["vllm-pod-0.log", "vllm-pod-1.log", "vllm-pod-2.log"]
+    for idx, process in enumerate(processes):
+        expected = [
+            f"{line_number:5d} {line}" for line_number, line in enumerate(lines, 1)
+            if line_number > 2 and nop.BenchmarkProcess.process_from_line(line) == process]
+        assert (tmp_path / f"vllm-pod-{idx}.log").read_text().splitlines() == expected
+
+
+def test_get_pod_url():
+    """
+    Tests sleep/wake requests of each pod go to its ip and container port
+    """
+
+    def pod(name: str, ip: str | None, ports: list[int]) -> SimpleNamespace:
+        container = SimpleNamespace(
+            image="vllm/vllm-openai:v0.10.1",
+            ports=[SimpleNamespace(container_port=port) for port in ports] or None)
+        return SimpleNamespace(
+            metadata=SimpleNamespace(name=name),
+            spec=SimpleNamespace(containers=[container]),
+            status=SimpleNamespace(pod_ip=ip))
+
+    pods = [pod("vllm-0", "10.0.0.5", [8000, 9000]), pod("vllm-1", "10.0.0.6", []), pod("vllm-2", None, [8000])]
+    v1 = SimpleNamespace(list_namespaced_pod=lambda namespace, label_selector: SimpleNamespace(items=pods))
+    pod_infos = nop.get_pod_infos(v1, "llmdbench", "vllm")
+    assert pod_infos[0] == {"name": "vllm-0", "image": "vllm/vllm-openai:v0.10.1", "ip": "10.0.0.5", "port": "8000"}
+
+    endpoint_url = "http://vllm-service.llmdbench.svc.cluster.local:80/"
+    assert nop.get_pod_url(pod_infos[0], endpoint_url) == "http://10.0.0.5:8000/"
+    # Without container ports, the port of the service is used
+    assert nop.get_pod_url(pod_infos[1], endpoint_url) == "http://10.0.0.6:80/"
+    assert nop.get_pod_url(pod_infos[1], "http://vllm-service/") == "http://10.0.0.6/"
+    with pytest.raises(RuntimeError):
+        nop.get_pod_url(pod_infos[2], endpoint_url)
@@ -0,0 +1,185 @@
+"""
+Tests prefix cache simulator functions
+"""
+
+from collections import OrderedDict
+import heapq
+
+import numpy as np
+import pytest
+
+import src.config_explorer.prefix_cache as pc
+
+
+def simulate_blocks(workload: pc.PrefixCacheWorkload, config: pc.PrefixCacheConfig, seed: int = 0) -> tuple[int, list[int]]:
+    """
+    Simulates a workload with an LRU cache of blocks, as a reference for simulate_prefix_cache()
+    """
+
+    prompts = [
+        [(seg, kk) for seg in request for kk in range(workload.segment_blocks[seg])]
+        for request in workload.requests
+    ]
+    caches = [OrderedDict() for _ in range(config.replicas)]
+    in_flight = [0] * config.replicas
+    requests_per_replica = [0] * config.replicas
+    finishes = []
+    ties = np.random.default_rng(seed).random(len(prompts))
+    cached_tokens = 0
+
+    def match(cache, blocks):
+        matched = 0
+        while matched < len(blocks) and blocks[matched] in cache:
+            matched += 1
+        return matched
+
+    for ii, blocks in enumerate(prompts):
+        now = workload.arrival_times[ii]
+        while finishes and finishes[0][0] <= now:
+            in_flight[heapq.heappop(finishes)[1]] -= 1
+        scores = [0.0] * config.replicas
+        for rr, cache in enumerate(caches):
+            if config.prefix_weight and blocks:
+                max_blocks = config.max_prefix_blocks_to_match
+                scores[rr] += config.prefix_weight * min(max_blocks, match(cache, blocks)) / min(max_blocks, len(blocks))
+            if config.queue_weight:
+                least, most = min(in_flight), max(in_flight)
+                scores[rr] += config.queue_weight * (1.0 if most == least else (most - in_flight[rr]) / (most - least))
+        candidates = [rr for rr in range(config.replicas) if scores[rr] == max(scores)]
+        replica = candidates[int(ties[ii] * len(candidates))]
+
+        cache = caches[replica]
+        cached_tokens += min(match(cache, blocks) * workload.block_size, workload.prompt_tokens[ii])
+        # Blocks are freed last block first
+        for block in reversed(blocks):
+            cache.pop(block, None)
+            cache[block] = True
+        while len(cache) > config.lru_capacity_per_server:
+            cache.popitem(last=False)
+        requests_per_replica[replica] += 1
+        in_flight[replica] += 1
+        heapq.heappush(finishes, (now + config.service_time, replica))
+    return cached_tokens, requests_per_replica
+
+
+def test_shared_prefix_workload():
+    """
+    Tests shared prefix workloads split prompts in system prompt and question segments of full blocks
+    """
+
+    workload = pc.shared_prefix_workload(4, 8, 100, 50, block_size=16, num_requests=1000, rate=10)
+    # 100 tokens are 6 full blocks, and 150 tokens are 9 full blocks
+    assert workload.segment_blocks.tolist() == [6] * 4 + [3] * 32
+    assert len(workload.requests) == 1000
+    for request in workload.requests:
+        system, question = request
+        assert system == (question - 4) // 8
+    assert np.all(workload.prompt_tokens == 150)
+    assert np.all(np.diff(workload.arrival_times) > 0)
+    assert workload.arrival_times[-1] == pytest.approx(100, rel=0.2)
+
+    # Short system prompts have no block of their own
+    workload = pc.shared_prefix_workload(4, 8, 10, 50, block_size=16)
+    assert all(len(request) == 1 for request in workload.requests)
+
+
+def test_token_ids_workload():
+    """
+    Tests prompts are merged into segments of blocks always requested together
+    """
+
+    system = list(range(10))
+    prompts = [
+        system + [100, 101, 102],
+        system + [200, 201],
+        system[:4],
+        [7] * 9,
+    ]
+    workload = pc.token_ids_workload(prompts, block_size=2)
+    # Segments: blocks of system[:4], where a prompt ends, of system[4:], of
+    # each question, and of the unrelated prompt
+    assert workload.segment_blocks.tolist() == [2, 3, 1, 1, 4]
+    assert workload.requests == [(0, 1, 2), (0, 1, 3), (0,), (4,)]
+    assert workload.prompt_tokens.tolist() == [13, 12, 4, 9]
+
+    for prompt, request in zip(prompts, workload.requests):
+        assert workload.segment_blocks[list(request)].sum() == len(prompt) // 2
+
+
+@pytest.mark.parametrize('policy', pc.ROUTING_POLICIES)
+def test_simulate_prefix_cache(policy: str):
+    """
+    Tests simulated hits and routing match an LRU cache of blocks
+    """
+
+    rng = np.random.default_rng(0)
+    for trial in range(10):
+        if trial % 2:
+            workload = pc.shared_prefix_workload(
+                int(rng.integers(1, 6)), int(rng.integers(1, 6)), int(rng.integers(0, 200)), int(rng.integers(1, 100)),
+                num_requests=200, rate=float(rng.uniform(1, 20)), seed=trial)
+        else:
+            prefixes = [rng.integers(0, 3, int(rng.integers(0, 80))).tolist() for _ in range(8)]
+            prompts = [
+                prefixes[int(rng.integers(0, 8))][:int(rng.integers(0, 80))] + rng.integers(0, 2, int(rng.integers(0, 40))).tolist()
+                for _ in range(200)
+            ]
+            workload = pc.token_ids_workload(prompts, block_size=4, arrival_times=np.cumsum(rng.exponential(0.1, 200)))
+        config = pc.PrefixCacheConfig.from_policy(
+            policy,
+            replicas=int(rng.integers(1, 5)),
+            lru_capacity_per_server=int(rng.integers(1, 60)),
+            max_prefix_blocks_to_match=int(rng.integers(1, 20)),
+            service_time=0.5,
+        )
+
+        result = pc.simulate_prefix_cache(workload, config, seed=trial)
+        cached_tokens, requests_per_replica = simulate_blocks(workload, config, seed=trial)
+        assert result.cached_tokens == cached_tokens
+        assert result.requests_per_replica.tolist() == requests_per_replica
+        assert result.prefill_tokens == workload.prompt_tokens.sum() - cached_tokens
+
+
+def test_routing_policies():
+    """
+    Tests prefix-aware routing increases hit rate, and queue-aware routing balances load
+    """
+
+    workload = pc.shared_prefix_workload(16, 16, 2048, 256, num_requests=4000, rate=20)
+    results = {
+        policy: pc.simulate_prefix_cache(
+            workload, pc.PrefixCacheConfig.from_policy(policy, replicas=8, lru_capacity_per_server=1000))
+        for policy in pc.ROUTING_POLICIES
+    }
+    assert results['prefix-aware'].hit_rate > 0.9
+    assert results['random'].hit_rate < 0.5
+    assert results['queue-aware'].requests_per_replica.max() < results['prefix-aware'].requests_per_replica.max()
+
+    # Caches holding every prompt hit all full blocks after the first request of each prompt
+    result = pc.simulate_prefix_cache(workload, pc.PrefixCacheConfig(replicas=1, lru_capacity_per_server=10**6))
+    num_prompts = len({request for request in workload.requests})
+    assert result.cached_tokens == (len(workload.requests) - num_prompts) * (2304 // 16) * 16 + (num_prompts - 16) * 2048
+
+    with pytest.raises(ValueError):
+        pc.PrefixCacheConfig.from_policy('round-robin')
+
+
+def test_sweep_prefix_cache():
+    """
+    Tests a sweep returns the results of each configuration
+    """
+
+    workload = pc.shared_prefix_workload(8, 8, 512, 128, num_requests=500, rate=10)
+    configs = [
+        pc.PrefixCacheConfig(replicas=replicas, lru_capacity_per_server=capacity, prefix_weight=prefix_weight)
+        for replicas in [1, 4] for capacity in [50, 500] for prefix_weight in [0, 1]
+    ]
+    for max_workers in [1, 2]:
+        sweep = pc.sweep_prefix_cache(workload, configs, max_workers=max_workers)
+        assert len(sweep) == len(configs)
+        for row, config in zip(sweep.itertuples(), configs):
+            result = pc.simulate_prefix_cache(workload, config)
+            assert row.replicas == config.replicas
+            assert row.hit_rate == result.hit_rate
+            assert row.prefill_tokens == result.prefill_tokens
+            assert row.block_size == 16
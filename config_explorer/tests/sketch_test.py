@@ -0,0 +1,90 @@
+"""
+Tests mergeable sketches of metric distributions
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from config_explorer.sketch import LogHistogram
+
+
+def test_log_histogram_quantiles():
+    """
+    Tests quantiles are within the relative accuracy of exact values
+    """
+
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(-2, 1, 10000)
+    hist = LogHistogram(relative_accuracy=0.01)
+    hist.update(values.tolist())
+
+    assert hist.count == len(values)
+    assert hist.mean == pytest.approx(values.mean())
+    assert hist.stddev == pytest.approx(values.std())
+    assert hist.quantile(0) == values.min()
+    assert hist.quantile(1) == values.max()
+    for q in [0.001, 0.01, 0.25, 0.5, 0.9, 0.99, 0.999]:
+        exact = np.quantile(values, q, method="lower")
+        assert abs(hist.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_log_histogram_merge():
+    """
+    Tests merged histograms match a histogram of all values, including zeros,
+    and survive serialization
+    """
+
+    rng = np.random.default_rng(1)
+    first = np.concatenate([np.zeros(10), rng.exponential(1, 1000)])
+    second = rng.exponential(10, 500)
+
+    combined = LogHistogram()
+    combined.update(first.tolist() + second.tolist())
+    merged = LogHistogram()
+    merged.update(first.tolist())
+    other = LogHistogram()
+    other.update(second.tolist())
+    merged.merge(LogHistogram.from_dict(other.to_dict()))
+
+    assert merged.counts == combined.counts
+    assert merged.zero_count == combined.zero_count == 10
+    assert merged.min == 0
+    assert merged.max == combined.max
+    for q in [0.005, 0.5, 0.99]:
+        assert merged.quantile(q) == combined.quantile(q)
+
+    with pytest.raises(ValueError):
+        merged.merge(LogHistogram(relative_accuracy=0.02))
+
+
+def test_log_histogram_empty():
+    """
+    Tests empty histograms
+    """
+
+    hist = LogHistogram.from_dict(LogHistogram().to_dict())
+    assert hist.count == 0
+    assert math.isnan(hist.quantile(0.5))
+    assert math.isnan(hist.mean)
+    with pytest.raises(ValueError):
+        LogHistogram.from_dict({"type": "t_digest"})
+
+
+def test_log_histogram_numpy_update():
+    """
+    Tests adding a numpy array matches adding values one at a time
+    """
+
+    values = np.concatenate([[0.0, -1.0], np.random.default_rng(2).pareto(2, 5000)])
+    looped = LogHistogram()
+    looped.update(values.tolist())
+    vectorized = LogHistogram()
+    vectorized.update(values)
+
+    assert vectorized.counts == looped.counts
+    assert vectorized.zero_count == looped.zero_count == 2
+    assert vectorized.count == looped.count
+    assert vectorized.sum == pytest.approx(looped.sum)
+    assert (vectorized.min, vectorized.max) == (looped.min, looped.max)
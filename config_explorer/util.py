@@ -18,6 +18,10 @@ SELECTED_GPU_PER_NODE_KEY = "selected_gpu_per_node"
 SELECTED_NODE_COUNT_KEY = "selected_node_count"
 SELECTED_MAX_MODEL_LEN_KEY = "selected_max_model_len"
 SELECTED_CONCURRENCY_KEY = "selected_concurrency"
+SELECTED_WHAT_IF_CONCURRENCY_KEY = "selected_what_if_concurrency"
+SELECTED_WHAT_IF_CONTEXT_LEN_KEY = "selected_what_if_context_len"
+SELECTED_ROOFLINE_ISL_KEY = "selected_roofline_isl"
+SELECTED_ROOFLINE_OSL_KEY = "selected_roofline_osl"
 
 ## Parallelism strategy keys
 SELECTED_TP_SIZE_KEY = "selected_tp_size"
@@ -84,6 +88,14 @@ class Scenario:
         self.dp_size = 1
         self.enable_ep = False
 
+@st.cache_resource
+def model_metadata_store() -> ModelMetadataStore:
+    """
+    Store of model info and config shared by sessions, so models are not fetched from HF on every rerun.
+    Configs of gated models are only shared with sessions whose HF token was given access.
+    """
+    return ModelMetadataStore()
+
 def init_session_state():
     """
     Inits session state for data persistence
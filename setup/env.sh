@@ -180,6 +180,9 @@ export LLMDBENCH_CONTROL_PERMISSIONS_CHECKED=${LLMDBENCH_CONTROL_PERMISSIONS_CHE
 export LLMDBENCH_CONTROL_WARNING_DISPLAYED=${LLMDBENCH_CONTROL_WARNING_DISPLAYED:-0}
 export LLMDBENCH_CONTROL_STANDUP_ALL_STEPS=${LLMDBENCH_CONTROL_STANDUP_ALL_STEPS:-0}
 export LLMDBENCH_CONTROL_WAIT_TIMEOUT=${LLMDBENCH_CONTROL_WAIT_TIMEOUT:-900}
+export LLMDBENCH_CONTROL_MODEL_CACHE_DIR=${LLMDBENCH_CONTROL_MODEL_CACHE_DIR:-~/.cache/llm-d-benchmark/models}
+export LLMDBENCH_CONTROL_MODEL_CACHE_TTL=${LLMDBENCH_CONTROL_MODEL_CACHE_TTL:-86400}
+export LLMDBENCH_CONTROL_MODEL_SNAPSHOT_DIR=${LLMDBENCH_CONTROL_MODEL_SNAPSHOT_DIR:-}
 export LLMDBENCH_CONTROL_CHECK_CLUSTER_AUTHORIZATIONS=${LLMDBENCH_CONTROL_CHECK_CLUSTER_AUTHORIZATIONS:-0}
 export LLMDBENCH_CONTROL_RESOURCE_LIST=${LLMDBENCH_CONTROL_RESOURCE_LIST:-deployment,httproute,service,gateway,gatewayparameters,inferencepool,inferencemodel,cm,ing,pod,job}
 export LLMDBENCH_CONTROL_STEP_00_IMPLEMENTATION=${LLMDBENCH_CONTROL_STEP_00_IMPLEMENTATION:-py}
@@ -35,7 +35,7 @@ logger = logging.getLogger(__name__)
 current_file = Path(__file__).resolve()
 workspace_root = current_file.parents[2]
 try:
-    from config_explorer.capacity_planner import KVCacheDetail, gpus_required, get_model_info_from_hf, get_model_config_from_hf, get_text_config, find_possible_tp, max_context_len, available_gpu_memory, model_total_params, model_memory_req, allocatable_kv_cache_memory, kv_cache_req, max_concurrent_requests
+    from config_explorer.capacity_planner import KVCacheDetail, ModelMetadataStore, DEFAULT_MODEL_CACHE_DIR, DEFAULT_MODEL_CACHE_TTL, gpus_required, get_text_config, find_possible_tp, max_context_len, available_gpu_memory, model_total_params, model_memory_req, allocatable_kv_cache_memory, kv_cache_req, max_concurrent_requests
 except ModuleNotFoundError as e:
     print(f"❌ ERROR: Failed to import config_explorer module: {e}")
     print(f"\nTry: pip install -r {workspace_root / 'config_explorer' / 'requirements.txt'}")
@@ -1575,9 +1575,28 @@ def convert_accelerator_memory(gpu_name: str, accelerator_memory_param: str) ->
 
     return result
 
+_model_metadata_store = None
+
+def get_model_metadata_store() -> ModelMetadataStore:
+    """
+    Returns the store of model info and config shared by all validations in this process, backed by a persistent cache
+    (LLMDBENCH_CONTROL_MODEL_CACHE_DIR, LLMDBENCH_CONTROL_MODEL_CACHE_TTL in seconds) and an optional snapshot directory
+    for offline use (LLMDBENCH_CONTROL_MODEL_SNAPSHOT_DIR, with HF_HUB_OFFLINE=1 in air-gapped clusters)
+    """
+
+    global _model_metadata_store
+    if _model_metadata_store is None:
+        ttl = os.environ.get("LLMDBENCH_CONTROL_MODEL_CACHE_TTL", "")
+        _model_metadata_store = ModelMetadataStore(
+            cache_dir=os.environ.get("LLMDBENCH_CONTROL_MODEL_CACHE_DIR") or DEFAULT_MODEL_CACHE_DIR,
+            ttl=float(ttl) if ttl else DEFAULT_MODEL_CACHE_TTL,
+            snapshot_dir=os.environ.get("LLMDBENCH_CONTROL_MODEL_SNAPSHOT_DIR") or None,
+        )
+    return _model_metadata_store
+
 def get_model_info(model_name: str, hf_token: str, ignore_if_failed: bool) -> ModelInfo | None:
     """
-    Obtains model info from HF
+    Obtains model info from the model metadata store or HF
     """
 
     if ignore_if_failed :
@@ -1586,7 +1605,7 @@ def get_model_info(model_name: str, hf_token: str, ignore_if_failed: bool) -> Mo
         msgtag="ERROR:"
 
     try:
-        return get_model_info_from_hf(model_name, hf_token)
+        return get_model_metadata_store().get_model_info(model_name, hf_token)
 
     except GatedRepoError:
         announce(f"{msgtag} Model is gated and the token provided via LLMDBENCH_HF_TOKEN does not, work. Please double check.")
@@ -1599,7 +1618,7 @@ def get_model_info(model_name: str, hf_token: str, ignore_if_failed: bool) -> Mo
 
 def get_model_config_and_text_config(model_name: str, hf_token: str, ignore_if_failed: bool) -> Tuple[AutoConfig | None, AutoConfig | None]:
     """
-    Obtains model config and text config from HF
+    Obtains model config and text config from the model metadata store or HF
     """
 
     if ignore_if_failed :
@@ -1608,7 +1627,7 @@ def get_model_config_and_text_config(model_name: str, hf_token: str, ignore_if_f
         msgtag="ERROR:"
 
     try:
-        config = get_model_config_from_hf(model_name, hf_token)
+        config = get_model_metadata_store().get_model_config(model_name, hf_token)
         return config, get_text_config(config)
 
     except GatedRepoError:
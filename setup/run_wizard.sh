@@ -261,7 +261,7 @@ export_var LLMDBENCH_HARNESS_PVC_NAME ${reply}
 # HARNESS
 # =======
 harnesses=()
-for harness in "inference-perf" "fmperf" "vllm-benchmark" "guidellm"; do
+for harness in "inference-perf" "fmperf" "vllm-benchmark" "guidellm" "loadgen"; do
   if [[ "${harness}" == "${LLMDBENCH_HARNESS_NAME}" ]]; then
     harnesses+=("${harness} (current value)")
   else
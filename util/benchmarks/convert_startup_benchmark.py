@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of convert.py startup time.
+
+Harness pods run convert.py after each benchmark, so its import time adds to
+every conversion. This runs `python -X importtime -c "import convert"` from
+workload/report several times and reports the median import time of convert,
+and of the modules it imports directly.
+
+Exits with an error if modules that should only be imported when needed
+(numpy, pandas and scipy by default) are imported at startup, or if the median
+import time exceeds --max-ms:
+
+    python util/benchmarks/convert_startup_benchmark.py --max-ms 500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPORT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "workload", "report"
+)
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Import a module in a new interpreter with -X importtime.
+
+    Args:
+        module (str): Module to import.
+
+    Returns:
+        dict[str, tuple[int, int]]: Import time in microseconds of every
+            imported module, keyed by the module name with its indentation
+            level, as (self, cumulative).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPORT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.rstrip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark convert.py import time with python -X importtime."
+    )
+    parser.add_argument(
+        "-r", "--runs", type=int, default=5, help="Number of interpreter runs."
+    )
+    parser.add_argument(
+        "-m",
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if the median import time of convert exceeds this.",
+    )
+    parser.add_argument(
+        "-f",
+        "--forbid",
+        type=str,
+        nargs="*",
+        default=["numpy", "pandas", "scipy"],
+        help="Modules which must not be imported at startup.",
+    )
+    args = parser.parse_args()
+
+    runs = [import_times("convert") for _ in range(args.runs)]
+    total_ms = statistics.median(run[" convert"][1] for run in runs) / 1000
+    print(f"convert import time: {total_ms:8.1f} ms (median of {args.runs} runs)")
+
+    # Modules imported by convert are listed before it, and the ones it imports
+    # directly are indented by one more level
+    names = list(runs[-1])
+    direct = []
+    for name in reversed(names[: names.index(" convert")]):
+        if not name.startswith("  "):
+            break
+        if name[3] != " ":
+            direct.append(name)
+    direct_ms = {
+        name.strip(): statistics.median(run.get(name, (0, 0))[1] for run in runs) / 1000
+        for name in direct
+    }
+    for name, elapsed in sorted(direct_ms.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {name:<30} {elapsed:8.1f} ms")
+
+    failed = False
+    imported = {name.strip().split(".")[0] for name in runs[-1]}
+    for module in args.forbid:
+        if module in imported:
+            print(f"error: {module} is imported at startup")
+            failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"error: import time exceeds {args.max_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
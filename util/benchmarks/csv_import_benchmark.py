@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of CSV import in convert.py.
+
+Writes a synthetic fmperf results CSV, and compares the time and peak memory
+of the previous line by line parser, which converted every value with int()
+or float() into Python lists, against import_csv_with_header (with the
+pyarrow CSV reader if it is installed), and with memory mapping:
+
+    python util/benchmarks/csv_import_benchmark.py --rows 5000000
+
+Peak memory is traced with --memory, which makes the previous parser several
+times slower.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "workload", "report"
+    ),
+)
+import convert  # noqa: E402
+
+
+def reference_import_csv_with_header(file_path: str) -> dict[str, Any]:
+    """Previous line by line CSV parser."""
+    with open(file_path, "r", encoding="UTF-8") as file:
+        for ii, line in enumerate(file):
+            if ii == 0:
+                headers = list(map(str.strip, line.split(",")))
+                data = {hdr: [] for hdr in headers}
+                continue
+            row_vals = list(map(str.strip, line.split(",")))
+            if len(row_vals) != len(headers):
+                continue
+            for jj, val in enumerate(row_vals):
+                try:
+                    val = int(val)
+                except ValueError:
+                    try:
+                        val = float(val)
+                    except ValueError:
+                        pass
+                data[headers[jj]].append(val)
+    for hdr in headers:
+        if isinstance(data[hdr][0], (int, float)):
+            data[hdr] = np.array(data[hdr])
+    return data
+
+
+def make_csv(file_path: str, rows: int, seed: int = 0) -> None:
+    """Write a synthetic fmperf results CSV."""
+    rng = np.random.default_rng(seed)
+    launch_time = np.sort(rng.random(rows) * rows / 100)
+    ttft = rng.lognormal(-2, 0.5, rows)
+    generation_tokens = rng.integers(2, 1024, rows)
+    finish_time = launch_time + ttft + generation_tokens * rng.lognormal(-4, 0.2, rows)
+    prompt_tokens = rng.integers(16, 4096, rows)
+    np.savetxt(
+        file_path,
+        np.column_stack(
+            [launch_time, finish_time, ttft, prompt_tokens, generation_tokens]
+        ),
+        fmt=["%.17g", "%.17g", "%.17g", "%d", "%d"],
+        delimiter=",",
+        header="launch_time,finish_time,ttft,prompt_tokens,generation_tokens",
+        comments="",
+    )
+
+
+def measure(func, *args, memory: bool = False, **kwargs) -> tuple[float, str, Any]:
+    """Run a function, returning elapsed seconds, peak memory if traced and its
+    result."""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = ""
+    if memory:
+        peak = f"{tracemalloc.get_traced_memory()[1] / 1e6:8.1f} MB"
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark CSV import of convert.py on a synthetic fmperf CSV."
+    )
+    parser.add_argument(
+        "-r", "--rows", type=int, default=5_000_000, help="Number of CSV rows."
+    )
+    parser.add_argument(
+        "-m", "--memory", action="store_true", help="Trace peak memory."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = os.path.join(tmp_dir, "results.csv")
+        make_csv(csv_file, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(csv_file) / 1e6:.1f} MB")
+
+        ref_elapsed, ref_peak, ref_data = measure(
+            reference_import_csv_with_header, csv_file, memory=args.memory
+        )
+        print(f"  {'previous parser:':<32}{ref_elapsed:8.3f} s  {ref_peak}")
+
+        for memory_map in [False, True]:
+            elapsed, peak, data = measure(
+                convert.import_csv_with_header,
+                csv_file,
+                memory=args.memory,
+                memory_map=memory_map,
+            )
+            label = "import_csv_with_header" + (" (mmap)" if memory_map else "")
+            print(
+                f"  {label + ':':<32}{elapsed:8.3f} s  {peak}  "
+                f"({ref_elapsed / elapsed:.1f}x faster)"
+            )
+            for hdr, values in ref_data.items():
+                if not np.array_equal(values, data[hdr]):
+                    raise AssertionError(f"Column {hdr} does not match")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of vLLM log categorization in the 'nop' harness.
+
+Generates a synthetic vLLM log with startup messages from several processes
+followed by request logging, and compares:
+
+- the previous category search, which walked the whole category tree for
+  every log line running the start and end pattern of each category;
+- the combined pattern matcher (CategoryMatcher) on the same log lines;
+- the streaming parser (VllmLogParser), which only keeps the lines that can
+  start or end a category before categorizing them.
+
+Requires the 'nop' harness dependencies (kubernetes, requests, pyyaml):
+
+    python util/benchmarks/nop_log_benchmark.py --lines 1000000
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+from typing import Any
+
+HARNESS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "workload",
+    "harnesses",
+    "nop-llm-d-benchmark.py",
+)
+
+
+def load_harness() -> Any:
+    """Import the nop harness script as a module."""
+    spec = importlib.util.spec_from_file_location("nop_harness", HARNESS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_log(lines: int, seed: int = 0) -> str:
+    """Make a synthetic vLLM log with the given number of lines."""
+    rnd = random.Random(seed)
+    millis = 0
+    log_lines = []
+
+    def add(process: str, message: str):
+        nonlocal millis
+        millis += rnd.randint(0, 50)
+        date = (
+            f"{10 + millis // 3_600_000 % 10:02d}:{millis // 60_000 % 60:02d}:"
+            f"{millis // 1000 % 60:02d}.{millis % 1000:03d}"
+        )
+        log_lines.append(f"{process}INFO 10-17 {date} [logger.py:42] {message}")
+
+    api = ""
+    engine = "(EngineCore_0 pid=321) "
+    workers = [f"(VllmWorker rank={rank} pid={400 + rank}) " for rank in range(4)]
+    startup = [
+        (api, "No plugins for group vllm.platform_plugins found."),
+        (api, "Automatically detected platform cuda."),
+        (api, "Available plugins for group vllm.general_plugins:"),
+        (api, "vLLM API server version 0.10.1"),
+        (api, "non-default args: {'model': 'm', 'enable_sleep_mode': True}"),
+        (api, "Using max model len 4096"),
+        (engine, "Waiting for init message from front-end."),
+        (engine, "Starting to load model m..."),
+        (engine, "Model loading took 15.2209 GB and 12.221976 seconds"),
+        (engine, "Start compiling function <code object forward>"),
+        (engine, "Dynamo bytecode transform time: 3.96 s"),
+        (engine, "Compiling a graph for dynamic shape takes 7.50 s"),
+        (engine, "torch.compile takes 17.88 s in total"),
+        (engine, "init engine (profile, create kv cache, warmup model) took 30 s"),
+        (api, "Starting vLLM API server 0 on http://0.0.0.0:8000"),
+        (api, "Route: /metrics, Methods: GET"),
+    ]
+    filler = [
+        "Loading weights took 0.71 seconds",
+        "Capturing CUDA graphs (mixed prefill-decode, PIECEWISE): 100%",
+        "Avg prompt throughput: 1021.3 tokens/s, Avg generation throughput: 98.7 tokens/s",
+        '127.0.0.1:54321 - "POST /v1/completions HTTP/1.1" 200 OK',
+        "Received request cmpl-7f3a: prompt: 'Tell me a story', params: SamplingParams(n=1)",
+        "Finished request cmpl-7f3a.",
+    ]
+    per_message = max(1, (lines - len(startup)) // len(startup))
+    for process, message in startup:
+        add(process, message)
+        for _ in range(per_message):
+            add(rnd.choice([api, engine, *workers]), rnd.choice(filler))
+
+    return "\n".join(log_lines[:lines]) + "\n"
+
+
+def reference_populate_benchmark_category(
+    index: int, log_list: list[Any], benchmark_category: Any
+) -> int:
+    """Previous category search, walking the category tree for every line."""
+    category = benchmark_category
+    while category is not None and index < len(log_list):
+        if category.start.log_line is None and category.start.matches(log_list[index]):
+            category.start.log_line = log_list[index]
+            category.end.log_line = None
+            while category.start.log_line.time is None:
+                index += 1
+                if index >= len(log_list):
+                    return index
+                category.start.log_line = log_list[index]
+
+        if category.end.log_line is None and category.end.matches(log_list[index]):
+            category.end.log_line = log_list[index]
+            while category.end.log_line.time is None:
+                index += 1
+                if index >= len(log_list):
+                    return index
+                category.end.log_line = log_list[index]
+
+        if category.root_child is not None:
+            index = reference_populate_benchmark_category(
+                index, log_list, category.root_child
+            )
+
+        category = category.next
+
+    return index
+
+
+def reference_categorize_logs(nop: Any, log_list_per_process: dict) -> Any:
+    """Previous categorization of log lines grouped by process."""
+    root_category = nop.initialize_benchmark_categories(nop.DEFINED_CATEGORIES, None)
+    for log_list_process in log_list_per_process.values():
+        index = 0
+        while index < len(log_list_process):
+            index = reference_populate_benchmark_category(
+                index, log_list_process, root_category
+            )
+            index += 1
+    nop.add_uncategorized_categories(root_category)
+    return root_category
+
+
+def get_log_list_per_process(nop: Any, logs: str) -> dict:
+    """Keep every log line, grouped by process, as before streaming."""
+    log_list_per_process = {}
+    for idx, line in enumerate(logs.splitlines()):
+        process = nop.BenchmarkProcess.process_from_line(line)
+        log_line = nop.LogLine(line, idx + 1, process)
+        log_list_per_process.setdefault(process, []).append(log_line)
+    return log_list_per_process
+
+
+def timed(func, *args, **kwargs) -> tuple[float, Any]:
+    """Run a function, returning elapsed seconds and its result."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark vLLM log categorization on a synthetic log."
+    )
+    parser.add_argument(
+        "-l",
+        "--lines",
+        type=int,
+        default=1_000_000,
+        help="Number of lines of the synthetic log.",
+    )
+    args = parser.parse_args()
+
+    nop = load_harness()
+    logs = make_log(args.lines)
+    log_list_per_process = get_log_list_per_process(nop, logs)
+    print(f"{args.lines} log lines, {len(logs) / 1e6:.1f} MB")
+
+    ref_elapsed, ref_root = timed(reference_categorize_logs, nop, log_list_per_process)
+    print(f"  previous category search:  {ref_elapsed:8.3f} s")
+
+    for log_list_process in log_list_per_process.values():
+        for log_line in log_list_process:
+            log_line._time = nop._UNPARSED_TIME
+    elapsed, root = timed(nop.categorize_logs, log_list_per_process)
+    print(
+        f"  combined pattern matcher:  {elapsed:8.3f} s  "
+        f"({ref_elapsed / elapsed:.1f}x faster)"
+    )
+    if root.dump() != ref_root.dump():
+        raise AssertionError("Categories do not match")
+
+    def stream_and_categorize() -> Any:
+        log_parser = nop.VllmLogParser("m")
+        data = logs.encode("utf-8")
+        chunk_size = nop.LOG_CHUNK_SIZE
+        log_parser.feed(
+            data[start : start + chunk_size]
+            for start in range(0, len(data), chunk_size)
+        )
+        return nop.categorize_logs(log_parser.log_list_per_process)
+
+    elapsed, root = timed(stream_and_categorize)
+    print(f"  streaming parser and metrics, end to end: {elapsed:8.3f} s")
+    if root.dump() != ref_root.dump():
+        raise AssertionError("Categories do not match")
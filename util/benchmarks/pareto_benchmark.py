@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of Pareto front search in the configuration explorer.
+
+Compares get_pareto_front_df() against the previous implementation, which
+used nested iterrows() loops, on synthetic benchmark runs. The previous
+implementation is quadratic, so it is only run on up to --max-reference-rows
+rows.
+
+Requires the config_explorer package to be installed:
+
+    pip install ./config_explorer
+    python util/benchmarks/pareto_benchmark.py
+"""
+
+import argparse
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+import config_explorer.explorer as xp
+
+
+def reference_pareto_front_df(
+        runs_df: pd.DataFrame,
+        col_a: str,
+        col_b: str) -> pd.DataFrame:
+    """Previous implementation of get_pareto_front_df()."""
+
+    def better(a: Any, b: Any, col: str) -> bool:
+        if xp.COLUMNS[col].pref == xp.Pref.LOW:
+            return a[col] < b[col]
+        return a[col] > b[col]
+
+    pareto_set = set(runs_df.index.tolist())
+    for ii, rowa in runs_df.iterrows():
+        is_pareto_front = runs_df.index.isin(pareto_set)
+        for jj, rowb in runs_df[is_pareto_front].iterrows():
+            if ii == jj:
+                continue
+            if better(rowa, rowb, col_a) and better(rowa, rowb, col_b):
+                pareto_set.remove(jj)
+    return runs_df[runs_df.index.isin(pareto_set)]
+
+
+def make_runs(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Make synthetic benchmark runs with a throughput/latency tradeoff."""
+    rng = np.random.default_rng(seed)
+    concurrency = rng.integers(1, 512, rows)
+    num_gpus = rng.choice([1, 2, 4, 8, 16], rows)
+    thpt = concurrency * rng.uniform(20, 60, rows) / np.sqrt(concurrency)
+    return pd.DataFrame({
+        'Num_GPUs': num_gpus,
+        'Thpt_per_GPU': thpt / num_gpus,
+        'Mean_TTFT_ms': 10 * concurrency * rng.uniform(0.5, 1.5, rows),
+        'Cost_per_GPU': num_gpus * rng.uniform(1.0, 4.0, rows),
+    })
+
+
+def timed(func, *args, **kwargs) -> tuple[float, Any]:
+    """Run a function, returning elapsed seconds and its result."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Benchmark Pareto front search on synthetic benchmark runs.')
+    parser.add_argument(
+        '-r', '--rows',
+        type=int,
+        nargs='+',
+        default=[10_000, 100_000],
+        help='Numbers of rows to benchmark.')
+    parser.add_argument(
+        '-m', '--max-reference-rows',
+        type=int,
+        default=10_000,
+        help='Largest number of rows to run the previous implementation on.')
+    args = parser.parse_args()
+
+    cols = ['Thpt_per_GPU', 'Mean_TTFT_ms']
+    cols_3d = cols + ['Cost_per_GPU']
+    for rows in args.rows:
+        runs_df = make_runs(rows)
+        elapsed, front = timed(xp.get_pareto_front_df, runs_df, *cols)
+        print(f'{rows:>9} rows  2 metrics  vectorized: {elapsed:9.4f} s  ({len(front)} on front)')
+        elapsed, front_3d = timed(
+            xp.get_pareto_front_multi_df, runs_df, cols_3d,
+            prefs={'Cost_per_GPU': xp.Pref.LOW})
+        print(f'{rows:>9} rows  3 metrics  vectorized: {elapsed:9.4f} s  ({len(front_3d)} on front)')
+        if rows > args.max_reference_rows:
+            print(f'{rows:>9} rows  2 metrics  previous:   skipped (--max-reference-rows {args.max_reference_rows})')
+            continue
+        ref_elapsed, ref_front = timed(reference_pareto_front_df, runs_df, *cols)
+        if not ref_front.index.equals(front.index):
+            raise AssertionError('Pareto fronts do not match')
+        print(f'{rows:>9} rows  2 metrics  previous:   {ref_elapsed:9.4f} s  ({ref_elapsed / elapsed:.0f}x slower)')
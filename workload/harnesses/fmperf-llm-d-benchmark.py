@@ -214,23 +214,21 @@ def convert_data_result(capture_dir: str) -> None:
         logger.error(f'Invalid directory: {capture_dir}')
         return
 
-    for data_file in os.listdir(capture_dir):
-        if data_file.lower()[-4:] != '.csv':
-            continue
-        data_file_full_path = os.path.join(capture_dir, data_file)
-        logger.info(f'Converting file to benchmark report: {data_file_full_path}')
-        os_command = [
-            'convert.py',
-            data_file_full_path,
-            os.path.join(capture_dir, f'benchmark_report,_{data_file}.yaml'),
-            '-w',
-            'fmperf',
-            '-f',
-        ]
-        result = subprocess.run(os_command, capture_output=True, text=True)
-        if result.returncode != 0:
+    # convert.py is installed next to the harness, convert all files in
+    # process instead of starting an interpreter per file
+    import convert
+
+    logger.info(f'Converting files to benchmark reports in: {capture_dir}')
+    errors = convert.convert_batch(
+        capture_dir, 'fmperf', pattern='*.[cC][sS][vV]', force=True,
+        report_log=os.path.join(
+            os.path.dirname(os.path.abspath(capture_dir)), convert.REPORT_LOG_FILE))
+    for data_file, error in errors.items():
+        if error:
             # Report error, but do not quit
-            logger.error(f'Error converting result data: {result.stderr}')
+            logger.error(f'Error converting result data {data_file}: {error}')
+        else:
+            logger.info(f'Converted file to benchmark report: {data_file}')
 
 def main():
 
@@ -13,7 +13,7 @@ fi
 echo "Harness completed successfully."
 
 # Convert results into universal format
-convert.py $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/results.json -w guidellm $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/benchmark_report,_results.json.yaml 2> >(tee -a $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stderr.log >&2)
+convert.py $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/results.json -w guidellm $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/benchmark_report,_results.json.yaml --log "$(dirname $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR)/benchmark_reports.jsonl" 2> >(tee -a $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stderr.log >&2)
 export LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC=$?
 if [[ $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC -ne 0 ]]; then
   echo "convert.py returned with error $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC"
@@ -14,13 +14,10 @@ if [[ $LLMDBENCH_RUN_EXPERIMENT_HARNESS_RC -ne 0 ]]; then
 fi
 echo "Harness completed successfully."
 
-# Convert results into universal format
-for result in $(find $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR -maxdepth 1 -name 'stage_*.json'); do
-  result_fname=$(echo $result | rev | cut -d '/' -f 1 | rev)
-  convert.py $result -w inference-perf $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/benchmark_report,_$result_fname.yaml 2> >(tee -a $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stderr.log >&2)
-  # Report errors but don't quit
-  export LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC=$?
-  if [[ $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC -ne 0 ]]; then
-    echo "convert.py returned with error $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC converting: $result"
-  fi
-done
+# Convert results into universal format, all stages in one convert.py run
+convert.py --batch $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR -w inference-perf -p 'stage_*.json' --log "$(dirname $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR)/benchmark_reports.jsonl" 2> >(tee -a $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stderr.log >&2)
+# Report errors but don't quit
+export LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC=$?
+if [[ $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC -ne 0 ]]; then
+  echo "convert.py returned with error $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC converting results in: $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR"
+fi
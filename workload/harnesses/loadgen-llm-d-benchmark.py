@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark 'loadgen' harness
+
+Native load generator for OpenAI-compatible endpoints. Each stage of the
+workload profile sends requests open-loop, with constant, Poisson or bursty
+arrivals, or closed-loop, with a fixed number of concurrent users. Responses
+are streamed and the arrival time of every token is recorded. A stage can be
+fanned out over several processes, each with its own event loop and pool of
+keep-alive connections, to reach request rates a single event loop cannot.
+
+Results are written directly as benchmark reports, one per stage, so there is
+no convert.py step.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from typing import Any
+
+import aiohttp
+import numpy as np
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Hack to ensure the report modules can be imported from harness pod, where
+# they are installed next to the harness, or config explorer.
+try:
+    import convert
+    from schema import BenchmarkReport, Units, WorkloadGenerator
+except ImportError:
+    from config_explorer import convert
+    from config_explorer.schema import BenchmarkReport, Units, WorkloadGenerator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+REQUEST_TIMEOUT = 600.0  # time (seconds) to wait for a request to complete
+START_DELAY = 1.0  # time (seconds) for worker processes to be ready for a stage
+MAX_ERRORS_LOGGED = 10  # distinct request errors logged per stage
+
+# Open-loop arrivals, and closed-loop concurrency
+LOAD_TYPES = ["constant", "poisson", "bursty", "concurrent"]
+API_PATHS = {
+    "completions": "/v1/completions",
+    "chat": "/v1/chat/completions",
+}
+
+# Common English words, most of them a single token for the usual tokenizers,
+# to build synthetic prompts of roughly the requested number of tokens
+PROMPT_WORDS = np.array(
+    """the of and to in is was for on that with as by at from his it an were
+    are which this be or has had not first one their its new after but who
+    they have her she two been other when there all during into school time
+    may years more most only over city some world would where later up such
+    used many can state about national out known university united then made
+    team group three any area part found game since work house water people
+    while between high north south east west number name life
+    music film year day long small large early great public system war""".split()
+)
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse JSON, with orjson if it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass
+class LengthDistribution:
+    """Normal distribution of lengths (tokens), clipped to [min, max]"""
+
+    mean: float
+    std: float = 0.0
+    min: int = 1
+    max: int | None = None
+
+    @staticmethod
+    def from_value(value: Any) -> LengthDistribution:
+        """distribution from a profile value, a fixed length or a dict"""
+        if isinstance(value, dict):
+            return LengthDistribution(**value)
+        return LengthDistribution(mean=value)
+
+    def sample(self, rng: np.random.Generator) -> int:
+        """sample a length"""
+        length = round(rng.normal(self.mean, self.std)) if self.std else round(self.mean)
+        if self.max is not None:
+            length = min(length, self.max)
+        return max(length, self.min)
+
+
+@dataclass
+class Stage:
+    """Load of a stage, limited by duration (seconds) and/or number of requests"""
+
+    type: str = "poisson"
+    rate: float | None = None
+    concurrency: int | None = None
+    duration: float | None = None
+    num_requests: int | None = None
+    # Shape of the gamma distribution of inter-arrival times of bursty load,
+    # lower values are burstier, 1 is Poisson
+    burstiness: float = 0.5
+
+    def __post_init__(self):
+        if self.type not in LOAD_TYPES:
+            raise ValueError(f"Unknown load type '{self.type}', must be one of {LOAD_TYPES}")
+        if self.type == "concurrent":
+            if not self.concurrency or self.concurrency < 1:
+                raise ValueError("Concurrent stages need a concurrency of at least 1")
+        elif not self.rate or self.rate <= 0:
+            raise ValueError(f"Stages of type '{self.type}' need a positive rate")
+        if self.duration is None and self.num_requests is None:
+            raise ValueError("Stages need a duration or a number of requests")
+        if self.burstiness <= 0:
+            raise ValueError("Burstiness must be positive")
+
+
+@dataclass
+class LoadgenConfig:
+    """Workload profile of the harness"""
+
+    base_url: str
+    stages: list[Stage]
+    model: str | None = None
+    api: str = "completions"
+    streaming: bool = True
+    ignore_eos: bool = True
+    # Tokens of each prompt after its shared prefix, and of each response
+    input_tokens: LengthDistribution = field(default_factory=lambda: LengthDistribution(128))
+    output_tokens: LengthDistribution = field(default_factory=lambda: LengthDistribution(128))
+    # Prompts start with one of num_prefixes shared prefixes of prefix_tokens
+    prefix_tokens: int = 0
+    num_prefixes: int = 1
+    processes: int = 1
+    # Connections of the pool of each process, 0 for no limit
+    max_connections: int = 0
+    timeout: float = REQUEST_TIMEOUT
+    seed: int = 0
+    # Profile the configuration was created from, kept in benchmark reports
+    profile: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if self.api not in API_PATHS:
+            raise ValueError(f"Unknown api '{self.api}', must be one of {list(API_PATHS)}")
+        if not self.stages:
+            raise ValueError("Workload profile has no stages")
+        if self.processes < 1:
+            raise ValueError("Number of processes must be at least 1")
+
+    @staticmethod
+    def from_dict(profile: dict[str, Any]) -> LoadgenConfig:
+        """configuration from a workload profile"""
+        data = profile.get("data", {})
+        load = profile.get("load", {})
+        return LoadgenConfig(
+            base_url=profile["base_url"],
+            stages=[Stage(**stage) for stage in load.get("stages", [])],
+            model=profile.get("model"),
+            api=profile.get("api", "completions"),
+            streaming=profile.get("streaming", True),
+            ignore_eos=profile.get("ignore_eos", True),
+            input_tokens=LengthDistribution.from_value(data.get("input_tokens", 128)),
+            output_tokens=LengthDistribution.from_value(data.get("output_tokens", 128)),
+            prefix_tokens=data.get("prefix_tokens", 0),
+            num_prefixes=data.get("num_prefixes", 1),
+            processes=load.get("processes", 1),
+            max_connections=load.get("max_connections", 0),
+            timeout=profile.get("timeout", REQUEST_TIMEOUT),
+            seed=profile.get("seed", 0),
+            profile=profile,
+        )
+
+    @property
+    def url(self) -> str:
+        """url of requests"""
+        return self.base_url.rstrip("/") + API_PATHS[self.api]
+
+
+@dataclass
+class StageResults:
+    """Per-request measurements of a stage, times in seconds"""
+
+    # Time of request (epoch)
+    start: array = field(default_factory=lambda: array("d"))
+    ttft: array = field(default_factory=lambda: array("d"))
+    latency: array = field(default_factory=lambda: array("d"))
+    input_tokens: array = field(default_factory=lambda: array("q"))
+    output_tokens: array = field(default_factory=lambda: array("q"))
+    success: array = field(default_factory=lambda: array("b"))
+    # Time between consecutive tokens of successful requests
+    itl: array = field(default_factory=lambda: array("d"))
+    # Delay of sending open-loop requests after their arrival time
+    scheduling_delay: array = field(default_factory=lambda: array("d"))
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: StageResults):
+        """add the measurements of another worker"""
+        for name in ["start", "ttft", "latency", "input_tokens", "output_tokens",
+                     "success", "itl", "scheduling_delay"]:
+            getattr(self, name).extend(getattr(other, name))
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+
+def arrival_times(stage: Stage, seed: int = 0) -> np.ndarray:
+    """Arrival times (seconds from start of stage) of open-loop requests.
+
+    Constant arrivals are evenly spaced, Poisson arrivals have exponential
+    inter-arrival times, and bursty arrivals have gamma inter-arrival times
+    with shape stage.burstiness and the same mean 1 / stage.rate.
+    """
+    if stage.type == "concurrent":
+        raise ValueError("Concurrent stages have no arrival times")
+    rng = np.random.default_rng(seed)
+    mean_interval = 1 / stage.rate
+    if stage.num_requests is not None:
+        count = stage.num_requests
+    else:
+        # Enough arrivals to cover the duration, nearly always
+        expected = stage.rate * stage.duration
+        count = int(expected + 6 * np.sqrt(expected / min(stage.burstiness, 1)) + 10)
+
+    while True:
+        # First request at start of stage
+        if stage.type == "constant":
+            times = np.arange(count) * mean_interval
+        else:
+            if stage.type == "poisson":
+                intervals = rng.exponential(mean_interval, count - 1)
+            else:
+                intervals = rng.gamma(stage.burstiness, mean_interval / stage.burstiness, count - 1)
+            times = np.concatenate([[0.0], np.cumsum(intervals)])
+        if stage.duration is None:
+            return times
+        if stage.num_requests is not None or times[-1] >= stage.duration:
+            return times[times < stage.duration]
+        count *= 2
+
+
+def make_prefixes(config: LoadgenConfig) -> list[str]:
+    """shared prefixes of prompts"""
+    if not config.prefix_tokens:
+        return [""]
+    rng = np.random.default_rng([config.seed, 1 << 20])
+    return [
+        " ".join(rng.choice(PROMPT_WORDS, config.prefix_tokens).tolist()) + " "
+        for _ in range(config.num_prefixes)
+    ]
+
+
+def make_payload(
+    config: LoadgenConfig, rng: np.random.Generator, prefixes: list[str]
+) -> tuple[dict[str, Any], int]:
+    """body of a synthetic request, and the approximate number of prompt tokens"""
+    input_tokens = config.input_tokens.sample(rng)
+    prompt = prefixes[int(rng.integers(len(prefixes)))] + " ".join(
+        rng.choice(PROMPT_WORDS, input_tokens).tolist()
+    )
+    payload = {
+        "model": config.model,
+        "max_tokens": config.output_tokens.sample(rng),
+        "stream": config.streaming,
+    }
+    if config.api == "chat":
+        payload["messages"] = [{"role": "user", "content": prompt}]
+    else:
+        payload["prompt"] = prompt
+    if config.streaming:
+        payload["stream_options"] = {"include_usage": True}
+    if config.ignore_eos:
+        payload["ignore_eos"] = True
+    return payload, config.prefix_tokens + input_tokens
+
+
+async def send_request(
+    session: aiohttp.ClientSession,
+    config: LoadgenConfig,
+    payload: dict[str, Any],
+    prompt_tokens: int,
+    results: StageResults,
+):
+    """Send a request and record its token timings.
+
+    With streaming, the time to first token and the time between tokens are
+    measured from the server-sent events carrying text. Without streaming,
+    the time to first token is the request latency. Token counts are taken
+    from the usage reported by the server, if any.
+    """
+    chat = config.api == "chat"
+    start_time = time.time()
+    start = time.perf_counter()
+    first = last = None
+    chunks = 0
+    usage = None
+    itl = array("d")
+    error = None
+    try:
+        async with session.post(config.url, json=payload) as response:
+            if response.status != 200:
+                error = f"HTTP {response.status}: {(await response.text())[:200]}"
+            elif config.streaming:
+                async for line in response.content:
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    now = time.perf_counter()
+                    chunk = _loads_json(data)
+                    if chunk.get("usage"):
+                        usage = chunk["usage"]
+                    choices = chunk.get("choices")
+                    if not choices:
+                        continue
+                    text = choices[0].get("delta", {}).get("content") if chat else choices[0].get("text")
+                    if text:
+                        if first is None:
+                            first = now
+                        else:
+                            itl.append(now - last)
+                        last = now
+                        chunks += 1
+            else:
+                body = await response.json()
+                first = last = time.perf_counter()
+                usage = body.get("usage")
+                chunks = 1
+    except Exception as e:
+        # Any failure of a request is recorded, and the load goes on
+        error = f"{type(e).__name__}: {e}"
+    if error is None and first is None:
+        error = "No tokens in response"
+
+    results.start.append(start_time)
+    if error is None:
+        results.ttft.append(first - start)
+        results.latency.append(last - start)
+        results.input_tokens.append(usage["prompt_tokens"] if usage else prompt_tokens)
+        results.output_tokens.append(usage["completion_tokens"] if usage else chunks)
+        results.success.append(1)
+        results.itl.extend(itl)
+    else:
+        results.ttft.append(0.0)
+        results.latency.append(time.perf_counter() - start)
+        results.input_tokens.append(prompt_tokens)
+        results.output_tokens.append(0)
+        results.success.append(0)
+        results.errors[error] = results.errors.get(error, 0) + 1
+
+
+async def _run_open_loop(
+    session: aiohttp.ClientSession,
+    config: LoadgenConfig,
+    arrivals: np.ndarray,
+    start: float,
+    rng: np.random.Generator,
+    results: StageResults,
+):
+    """send requests at their arrival times, from start (perf_counter)"""
+    prefixes = make_prefixes(config)
+    tasks = set()
+    for arrival in (start + arrivals).tolist():
+        # Always yield, so requests are sent even when behind schedule
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        results.scheduling_delay.append(time.perf_counter() - arrival)
+        payload, prompt_tokens = make_payload(config, rng, prefixes)
+        task = asyncio.create_task(send_request(session, config, payload, prompt_tokens, results))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.wait(tasks)
+
+
+async def _run_closed_loop(
+    session: aiohttp.ClientSession,
+    config: LoadgenConfig,
+    concurrency: int,
+    num_requests: int | None,
+    deadline: float | None,
+    rng: np.random.Generator,
+    results: StageResults,
+):
+    """send requests from concurrent users, each waiting for its previous
+    response, until the deadline (perf_counter) or num_requests are sent"""
+    prefixes = make_prefixes(config)
+    remaining = [num_requests]
+
+    async def user():
+        while deadline is None or time.perf_counter() < deadline:
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            payload, prompt_tokens = make_payload(config, rng, prefixes)
+            await send_request(session, config, payload, prompt_tokens, results)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+
+
+def _split(total: int | None, num_workers: int, worker: int) -> int | None:
+    """share of a worker in a total"""
+    if total is None:
+        return None
+    return total // num_workers + (worker < total % num_workers)
+
+
+async def _run_stage(
+    config: LoadgenConfig, stage_index: int, worker: int, num_workers: int, start_time: float
+) -> StageResults:
+    """run the share of a worker in a stage, starting at start_time (epoch)"""
+    stage = config.stages[stage_index]
+    rng = np.random.default_rng([config.seed, stage_index, worker])
+    results = StageResults()
+    connector = aiohttp.TCPConnector(limit=config.max_connections, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=config.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter() + start_time - time.time()
+        if stage.type == "concurrent":
+            await asyncio.sleep(max(0.0, start - time.perf_counter()))
+            await _run_closed_loop(
+                session,
+                config,
+                _split(stage.concurrency, num_workers, worker),
+                _split(stage.num_requests, num_workers, worker),
+                None if stage.duration is None else start + stage.duration,
+                rng,
+                results,
+            )
+        else:
+            # Every worker draws the same arrivals, and takes its share
+            arrivals = arrival_times(stage, seed=config.seed + stage_index)
+            await _run_open_loop(session, config, arrivals[worker::num_workers], start, rng, results)
+    return results
+
+
+def run_stage_worker(
+    config: LoadgenConfig, stage_index: int, worker: int, num_workers: int, start_time: float
+) -> StageResults:
+    """Run the share of a worker (process) in a stage.
+
+    Arrivals of open-loop stages are dealt round-robin to workers, so together
+    they send the same arrivals as a single worker. Concurrent users and
+    number of requests of closed-loop stages are split between workers.
+    """
+    return asyncio.run(_run_stage(config, stage_index, worker, num_workers, start_time))
+
+
+async def _get_model(config: LoadgenConfig) -> str:
+    """first model served by the endpoint"""
+    timeout = aiohttp.ClientTimeout(total=config.timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(config.base_url.rstrip("/") + "/v1/models") as response:
+            response.raise_for_status()
+            return (await response.json())["data"][0]["id"]
+
+
+def make_report(config: LoadgenConfig, stage_index: int, results: StageResults) -> BenchmarkReport:
+    """Make the benchmark report of a stage.
+
+    Latency and length statistics are of successful requests, with sketches
+    so reports of repeated runs can be aggregated. Throughputs are over the
+    time from the first request to the last response.
+    """
+    success = np.frombuffer(results.success, dtype=np.int8).astype(bool)
+    if not success.any():
+        raise RuntimeError(f"No successful requests in stage {stage_index}")
+    start = np.frombuffer(results.start)
+    latency = np.frombuffer(results.latency)
+    ttft = np.frombuffer(results.ttft)[success]
+    input_tokens = np.frombuffer(results.input_tokens, dtype=np.int64)[success]
+    output_tokens = np.frombuffer(results.output_tokens, dtype=np.int64)[success]
+    time_start = start.min()
+    time_stop = (start + latency).max()
+    duration = time_stop - time_start
+
+    latency = latency[success]
+    stage = config.stages[stage_index]
+    metrics_latency = {
+        "time_to_first_token": convert.compute_statistics(ttft, Units.S),
+        "request_latency": convert.compute_statistics(latency, Units.S),
+    }
+    generating = output_tokens > 0
+    if generating.any():
+        metrics_latency["normalized_time_per_output_token"] = convert.compute_statistics(
+            latency[generating] / output_tokens[generating], Units.S_PER_TOKEN)
+    decoding = output_tokens > 1
+    if config.streaming and decoding.any():
+        metrics_latency["time_per_output_token"] = convert.compute_statistics(
+            (latency - ttft)[decoding] / (output_tokens[decoding] - 1), Units.S_PER_TOKEN)
+    if results.itl:
+        metrics_latency["inter_token_latency"] = convert.compute_statistics(
+            np.frombuffer(results.itl), Units.S_PER_TOKEN)
+
+    metadata = {"errors": results.errors}
+    if results.scheduling_delay:
+        delay = np.frombuffer(results.scheduling_delay)
+        metadata["scheduling_delay"] = {
+            "units": Units.S,
+            "mean": delay.mean().item(),
+            "p99": np.percentile(delay, 99).item(),
+            "max": delay.max().item(),
+        }
+
+    # Get environment variables from llm-d-benchmark run as a dict following the
+    # schema of BenchmarkReport
+    br_dict = convert._get_llmd_benchmark_envars()
+    convert.update_dict(br_dict, {
+        "scenario": {
+            "model": {"name": config.model},
+            "load": {
+                "name": WorkloadGenerator.LOADGEN,
+                "type": stage.type,
+                "args": config.profile,
+                "metadata": {
+                    "stage": stage_index,
+                    "processes": config.processes,
+                },
+            },
+        },
+        "metrics": {
+            "time": {
+                "duration": duration,
+                "start": time_start,
+                "stop": time_stop,
+            },
+            "requests": {
+                "total": len(success),
+                "failures": int((~success).sum()),
+                "input_length": convert.compute_statistics(input_tokens, Units.COUNT),
+                "output_length": convert.compute_statistics(output_tokens, Units.COUNT),
+            },
+            "latency": metrics_latency,
+            "throughput": {
+                "input_tokens_per_sec": input_tokens.sum().item() / duration,
+                "output_tokens_per_sec": output_tokens.sum().item() / duration,
+                "total_tokens_per_sec": (input_tokens.sum() + output_tokens.sum()).item() / duration,
+                "requests_per_sec": success.sum().item() / duration,
+            },
+            "metadata": metadata,
+        },
+    })
+    return BenchmarkReport(**br_dict)
+
+
+def log_summary(report: BenchmarkReport, stage_index: int):
+    """log the main metrics of a stage"""
+    metrics = report.metrics
+    latency = metrics.latency
+    logger.info("Stage %d (%s):", stage_index, report.scenario.load.type)
+    logger.info(
+        "  Requests       : %d, failures: %d, %.2f requests/s",
+        metrics.requests.total, metrics.requests.failures, metrics.throughput.requests_per_sec,
+    )
+    logger.info(
+        "  Tokens/s       : input %.1f, output %.1f",
+        metrics.throughput.input_tokens_per_sec, metrics.throughput.output_tokens_per_sec,
+    )
+    for name, stats in [
+        ("TTFT (s)", latency.time_to_first_token),
+        ("TPOT (s/token)", latency.time_per_output_token),
+        ("ITL (s/token)", latency.inter_token_latency),
+        ("Latency (s)", latency.request_latency),
+    ]:
+        if stats is not None:
+            logger.info(
+                "  %-15s: mean %.4f, p50 %.4f, p90 %.4f, p99 %.4f",
+                name, stats.mean, stats.p50, stats.p90, stats.p99,
+            )
+    delay = metrics.metadata.get("scheduling_delay")
+    if delay and delay["p99"] > 0.01:
+        logger.warning(
+            "Requests were sent up to %.3f s late (p99), consider more processes",
+            delay["p99"],
+        )
+    for error, count in list(metrics.metadata["errors"].items())[:MAX_ERRORS_LOGGED]:
+        logger.warning("  %d requests failed with: %s", count, error)
+
+
+def run_benchmark(
+    config: LoadgenConfig, results_dir: str, report_log: str | None = None
+) -> list[BenchmarkReport]:
+    """Run the stages of a workload profile one after another.
+
+    The benchmark report of each stage is written to
+    benchmark_report,_stage_<stage>.yaml in results_dir, and appended to the
+    report log if given. Stages without any successful request have no report.
+    """
+    if config.model is None:
+        config.model = asyncio.run(_get_model(config))
+        logger.info("Using model served by endpoint: %s", config.model)
+
+    reports = []
+    executor = ProcessPoolExecutor(config.processes) if config.processes > 1 else None
+    try:
+        for ii in range(len(config.stages)):
+            if executor is None:
+                results = run_stage_worker(config, ii, 0, 1, time.time())
+            else:
+                start_time = time.time() + START_DELAY
+                futures = [
+                    executor.submit(run_stage_worker, config, ii, worker, config.processes, start_time)
+                    for worker in range(config.processes)
+                ]
+                results = StageResults()
+                for future in futures:
+                    results.merge(future.result())
+
+            try:
+                report = make_report(config, ii, results)
+            except RuntimeError:
+                logger.exception("Stage %d failed, errors: %s", ii, results.errors)
+                continue
+            log_summary(report, ii)
+            report_file = os.path.join(results_dir, f"benchmark_report,_stage_{ii}.yaml")
+            report.export_yaml(report_file)
+            logger.info("benchmark report saved to path: %s", report_file)
+            if report_log:
+                convert.append_report_log(
+                    report_log,
+                    convert.get_report_log_key(os.path.join(results_dir, f"stage_{ii}")),
+                    report,
+                )
+            reports.append(report)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return reports
+
+
+def main() -> int:
+    """main entry point"""
+
+    parser = argparse.ArgumentParser(description="Native OpenAI-compatible load generator")
+    parser.add_argument(
+        "--config",
+        default=os.path.join(
+            os.environ.get("LLMDBENCH_RUN_WORKSPACE_DIR", "."),
+            "profiles",
+            "loadgen",
+            os.environ.get("LLMDBENCH_RUN_EXPERIMENT_HARNESS_WORKLOAD_NAME", ""),
+        ),
+        help="workload profile",
+    )
+    parser.add_argument(
+        "--results-dir",
+        default=os.environ.get("LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR", "."),
+        help="directory of benchmark reports",
+    )
+    parser.add_argument(
+        "--log",
+        default=None,
+        help=f"report log to append benchmark reports to, default {convert.REPORT_LOG_FILE} in the parent of the results directory",
+    )
+    args = parser.parse_args()
+
+    results_dir = os.path.abspath(args.results_dir)
+    os.makedirs(results_dir, exist_ok=True)
+
+    file_handler = logging.FileHandler(os.path.join(results_dir, "stdout.log"))
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+
+    with open(args.config, "r", encoding="utf-8") as file:
+        profile = yaml.safe_load(file)
+    if os.path.dirname(os.path.abspath(args.config)) != results_dir:
+        shutil.copy(args.config, results_dir)
+    config = LoadgenConfig.from_dict(profile)
+
+    report_log = args.log or os.path.join(os.path.dirname(results_dir), convert.REPORT_LOG_FILE)
+    reports = run_benchmark(config, results_dir, report_log)
+    return 0 if len(reports) == len(config.stages) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
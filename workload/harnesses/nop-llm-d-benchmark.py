@@ -6,6 +6,8 @@ Benchmark 'nop' harness
 
 from __future__ import annotations
 import ast
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import StrEnum
@@ -13,7 +15,7 @@ import io
 import json
 import os
 import re
-import subprocess
+import statistics
 import time
 import logging
 from typing import Any
@@ -32,6 +34,8 @@ formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 
 REQUEST_TIMEOUT = 60.0  # time (seconds) to wait for request
 MAX_VLLM_WAIT = 15.0 * 60.0  # time (seconds) to wait for vllm to respond
+LOG_CHUNK_SIZE = 1024 * 1024  # bytes read at a time from the pod log stream
+MAX_LOG_WORKERS = 8  # pods whose logs are read and parsed at the same time
 
 # MM-DD HH:MM:SS or MM-DD HH:MM:SS.MMM
 DATE_PATTERN = re.compile(r"\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}(?:\.\d{3})?")
@@ -142,14 +146,32 @@ class BenchmarkProcess:
         return dump_dict
 
 
-@dataclass
-class LogLine:
-    """log line info"""
+# marks a log line whose date was not parsed yet
+_UNPARSED_TIME = object()
 
-    time: datetime | None = None
-    process: BenchmarkProcess | None = None
-    line: str = ""
-    line_number: int = 0
+
+class LogLine:
+    """log line info, the date is only parsed when first accessed"""
+
+    __slots__ = ("line", "line_number", "process", "_time")
+
+    def __init__(
+        self,
+        line: str = "",
+        line_number: int = 0,
+        process: BenchmarkProcess | None = None,
+    ):
+        self.line = line
+        self.line_number = line_number
+        self.process = process
+        self._time = _UNPARSED_TIME
+
+    @property
+    def time(self) -> datetime | None:
+        """log line date"""
+        if self._time is _UNPARSED_TIME:
+            self._time = extract_datetime(self.line)
+        return self._time
 
     def process_desc(self) -> str:
         """process description"""
@@ -253,6 +275,117 @@ class BenchmarkCategory:
         return categories
 
 
+def combine_patterns(patterns: list[str]) -> re.Pattern[str]:
+    """combine patterns in one regular expression matching any of them
+
+    Alternatives are not captured: capturing groups prevent the regular
+    expression engine from quickly skipping to the possible first characters.
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns) or r"(?!)")
+
+
+class CategoryMatcher:
+    """Finds the categories whose start or end patterns match a log line.
+
+    The distinct patterns of all categories are combined in one regular
+    expression, so a log line is scanned once instead of once per category
+    pattern. Lines matching it are scanned again by an expression with a
+    named group per pattern, to find which patterns matched. Categories are
+    numbered in the order they are visited when populated: each category,
+    then its children, then its next category.
+    """
+
+    def __init__(self, root_category: BenchmarkCategory | None):
+        self.categories: list[BenchmarkCategory] = []
+        self._patterns: list[re.Pattern[str]] = []
+        self._start_ids: list[int] = []
+        self._end_ids: list[int] = []
+        pattern_ids: dict[str, int] = {}
+        for category in CategoryMatcher._walk(root_category):
+            ids = []
+            for details in [category.start, category.end]:
+                if details.pattern is None:
+                    ids.append(-1)
+                    continue
+                if details.pattern.pattern not in pattern_ids:
+                    pattern_ids[details.pattern.pattern] = len(self._patterns)
+                    self._patterns.append(details.pattern)
+                ids.append(pattern_ids[details.pattern.pattern])
+            self.categories.append(category)
+            self._start_ids.append(ids[0])
+            self._end_ids.append(ids[1])
+
+        # category positions using each pattern
+        self._pattern_categories: list[list[int]] = [[] for _ in self._patterns]
+        for position, ids in enumerate(zip(self._start_ids, self._end_ids)):
+            for pattern_id in set(ids):
+                if pattern_id >= 0:
+                    self._pattern_categories[pattern_id].append(position)
+
+        self._combined = combine_patterns(
+            [pattern.pattern for pattern in self._patterns]
+        )
+        # zero width lookaheads, so overlapping matches are all reported
+        self._combined_named = re.compile(
+            "|".join(
+                f"(?=(?P<p{idx}>{pattern.pattern}))"
+                for idx, pattern in enumerate(self._patterns)
+            )
+            or r"(?!)"
+        )
+
+    @staticmethod
+    def _walk(
+        benchmark_category: BenchmarkCategory | None,
+    ) -> Iterator[BenchmarkCategory]:
+        category = benchmark_category
+        while category is not None:
+            yield category
+            if category.root_child is not None:
+                yield from CategoryMatcher._walk(category.root_child)
+            category = category.next
+
+    def search(self, line: str) -> bool:
+        """check if any category pattern matches the line"""
+        return self._combined.search(line) is not None
+
+    def match(self, line: str) -> set[int]:
+        """ids of the patterns matching the line"""
+
+        pattern_ids = set()
+        if self._combined.search(line) is None:
+            return pattern_ids
+
+        for match in self._combined_named.finditer(line):
+            pattern_ids.add(int(match.lastgroup[1:]))
+            # alternation reports one pattern per position, check the others
+            for idx, pattern in enumerate(self._patterns):
+                if idx not in pattern_ids and pattern.match(line, match.start()):
+                    pattern_ids.add(idx)
+
+        return pattern_ids
+
+    def starts(self, position: int, pattern_ids: set[int]) -> bool:
+        """check if the category start pattern is in the matched patterns"""
+        return self._start_ids[position] in pattern_ids
+
+    def ends(self, position: int, pattern_ids: set[int]) -> bool:
+        """check if the category end pattern is in the matched patterns"""
+        return self._end_ids[position] in pattern_ids
+
+    def next_candidate(self, pattern_ids: set[int], position: int) -> int | None:
+        """first category from position using any of the matched patterns"""
+        return min(
+            (
+                candidate
+                for pattern_id in pattern_ids
+                for candidate in self._pattern_categories[pattern_id]
+                if candidate >= position
+            ),
+            default=None,
+        )
+
+
 class LoadFormat(StrEnum):
     """Type of model formats"""
 
@@ -513,32 +646,146 @@ class BenchmarkMetrics:
         return dump_dict
 
 
+@dataclass
+class PodResult:
+    """Results of one vLLM pod"""
+
+    name: str = ""
+    image: str = ""
+    scenario: BenchmarkScenario = field(default_factory=BenchmarkScenario)
+    metrics: BenchmarkMetrics = field(default_factory=BenchmarkMetrics)
+
+    def dump(self) -> dict[str, Any]:
+        """Convert PodResult to dict.
+
+        Returns:
+            dict: Defined fields of PodResult, without the run time.
+        """
+        dump_dict = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            dump_dict[f.name] = (
+                value.dump()
+                if hasattr(value, "dump") and callable(value.dump)
+                else value
+            )
+
+        # run time is the same for all pods
+        dump_dict["metrics"].pop("time", None)
+        return dump_dict
+
+
 @dataclass
 class BenchmarkResult:
-    """Results of one benchmark run"""
+    """Results of one benchmark run
+
+    scenario and metrics are the ones of the first pod, pods has the results
+    of every pod.
+    """
 
     version: str = "0.1"
     scenario: BenchmarkScenario = field(default_factory=BenchmarkScenario)
     metrics: BenchmarkMetrics = field(default_factory=BenchmarkMetrics)
+    pods: list[PodResult] = field(default_factory=list)
 
     def dump(self) -> dict[str, Any]:
         """Convert BenchmarkResult to dict.
 
         Returns:
-            dict: Defined fields of BenchmarkResult.
+            dict: Defined fields of BenchmarkResult, and aggregate statistics
+                of the metrics of all pods.
         """
         dump_dict = {}
         for f in fields(self):
             value = getattr(self, f.name)
+            if f.name == "pods":
+                value = [pod.dump() for pod in value]
             dump_dict[f.name] = (
                 value.dump()
                 if hasattr(value, "dump") and callable(value.dump)
                 else value
             )
 
+        if len(self.pods) > 0:
+            dump_dict["aggregate"] = aggregate_metrics(
+                [pod["metrics"] for pod in dump_dict["pods"]]
+            )
         return dump_dict
 
 
+def aggregate_values(values: list[float]) -> dict[str, float]:
+    """min, median and max of values"""
+    return {
+        "min": min(values),
+        "p50": statistics.median(values),
+        "max": max(values),
+    }
+
+
+def aggregate_metrics(metrics_dumps: list[dict[str, Any]]) -> dict[str, Any]:
+    """aggregate statistics of dumped metrics of several pods
+
+    Args:
+        metrics_dumps (list[dict]): dumped BenchmarkMetrics of each pod.
+
+    Returns:
+        dict: same structure as the dumped metrics, with min, p50 and max of
+            each value across the pods where it is present.
+    """
+    aggregate = {}
+    keys = list(dict.fromkeys(key for dump in metrics_dumps for key in dump))
+    for key in keys:
+        values = [dump[key] for dump in metrics_dumps if key in dump]
+        if key == "categories":
+            aggregate[key] = aggregate_categories(values)
+        elif isinstance(values[0], dict):
+            aggregate[key] = aggregate_metrics(values)
+        elif isinstance(values[0], (int, float)) and not isinstance(values[0], bool):
+            aggregate[key] = aggregate_values(values)
+
+    return aggregate
+
+
+def aggregate_categories(
+    category_dumps: list[list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """aggregate elapsed time of dumped categories of several pods
+
+    Categories are matched by their path in the tree of categories, with the
+    occurrence of their title among their siblings, as titles like
+    "Uncategorized" repeat.
+    """
+
+    matching: dict[tuple[str, int], list[dict[str, Any]]] = {}
+    for categories in category_dumps:
+        occurrences: dict[str, int] = {}
+        for category in categories:
+            occurrence = occurrences.get(category["title"], 0)
+            occurrences[category["title"]] = occurrence + 1
+            matching.setdefault((category["title"], occurrence), []).append(
+                category
+            )
+
+    aggregate = []
+    for (title, _), categories in matching.items():
+        aggregate_dict = {
+            "title": title,
+            "elapsed": aggregate_values(
+                [category["elapsed"] for category in categories]
+            ),
+        }
+        children = [
+            category["categories"]
+            for category in categories
+            if "categories" in category
+        ]
+        if len(children) > 0:
+            aggregate_dict["categories"] = aggregate_categories(children)
+        aggregate.append(aggregate_dict)
+
+    return aggregate
+
+
 def get_env_variables(keys: list[str]) -> list[str]:
     """get environment variables"""
 
@@ -664,10 +911,10 @@ def wake(base_url: str, timeout: float):
             raise RuntimeError(f"Server failed sleeping status after {elapsed} secs.")
 
 
-def get_vllm_pod_info(
+def get_vllm_pod_infos(
     v1: client.CoreV1Api, namespace: str, deployment_name: str
-) -> dict[str, str]:
-    """get vllm pod name"""
+) -> list[dict[str, str]]:
+    """get vllm pod names"""
 
     selectors = get_deployment_selectors(namespace, deployment_name)
     if len(selectors) == 0:
@@ -682,7 +929,7 @@ def get_vllm_pod_info(
             f"No pods found on namespace {namespace} with selector 'app={selector}'."
         )
 
-    return pod_infos[0]
+    return sorted(pod_infos, key=lambda pod_info: pod_info["name"])
 
 
 def get_deployment_selectors(namespace: str, name: str) -> list[str]:
@@ -714,20 +961,64 @@ def get_pod_infos(
     )
     pod_infos = []
     for pod in pod_list.items:
-        image = pod.spec.containers[0].image
-        name = pod.metadata.name
-        pod_infos.append({"name": name, "image": image})
+        container = pod.spec.containers[0]
+        ports = container.ports or []
+        pod_infos.append(
+            {
+                "name": pod.metadata.name,
+                "image": container.image,
+                "ip": pod.status.pod_ip or "",
+                "port": str(ports[0].container_port) if len(ports) > 0 else "",
+            }
+        )
 
     return pod_infos
 
 
-def get_pod_logs(v1: client.CoreV1Api, namespace: str, pod_name: str) -> bytes:
-    """get pod logs"""
+def get_pod_url(pod_info: dict[str, str], endpoint_url: str) -> str:
+    """endpoint url with the pod ip and container port instead of the service"""
+
+    url = urlparse(endpoint_url)
+    if pod_info["ip"] == "":
+        raise RuntimeError(f"pod {pod_info['name']} has no ip.")
+    port = pod_info["port"] if pod_info["port"] != "" else url.port
+    netloc = pod_info["ip"] if port is None else f"{pod_info['ip']}:{port}"
+    return url._replace(netloc=netloc).geturl()
+
+
+def stream_pod_logs(
+    v1: client.CoreV1Api,
+    namespace: str,
+    pod_name: str,
+    chunk_size: int = LOG_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """stream pod logs in chunks, without loading all of it in memory"""
 
     response = v1.read_namespaced_pod_log(
         name=pod_name, namespace=namespace, pretty=False, _preload_content=False
     )
-    return response.data
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.release_conn()
+
+
+def iter_log_lines(
+    chunks: Iterable[bytes], file: io.BufferedWriter | None = None
+) -> Iterator[str]:
+    """split log chunks in lines, optionally copying the chunks to a file"""
+
+    remainder = b""
+    for chunk in chunks:
+        if file is not None:
+            file.write(chunk)
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8", errors="replace").rstrip("\r")
+
+    if remainder:
+        yield remainder.decode("utf-8", errors="replace").rstrip("\r")
 
 
 def extract_datetime(log_line: str) -> datetime | None:
@@ -787,56 +1078,6 @@ def initialize_benchmark_categories(
     return root_benchmark_category
 
 
-def get_log_list(logs: str) -> list[LogLine]:
-    """get log lines info"""
-
-    log_list = []
-    for idx, line in enumerate(logs.splitlines()):
-        log_line = LogLine()
-        log_line.line_number = idx + 1
-        log_line.line = line
-        log_line.time = extract_datetime(log_line.line)
-        log_line.process = BenchmarkProcess.process_from_line(log_line.line)
-        log_list.append(log_line)
-
-    return log_list
-
-
-def get_log_list_per_process(
-    vllm_model: str, log_list: list[LogLine]
-) -> dict[BenchmarkProcess, list[LogLine]]:
-    """get log list divided by Process"""
-
-    tensorizer_serialization_end = f"End model {vllm_model} serialization"
-
-    # look for possible tensorizer serialization end
-    idx = 0
-    for log_line in log_list:
-        if tensorizer_serialization_end in log_line.line:
-            # skips tensorizer serialization lines
-            idx = log_line.line_number
-            break
-
-    log_list_per_process = {}
-    if idx > 0:
-        if idx >= len(log_list):
-            return log_list_per_process
-        log_line = log_list[idx]
-        logger.info(
-            "Skip tensorizer serialization. Start from log line %d: %s",
-            log_line.line_number,
-            log_line.line,
-        )
-
-    for log_line in log_list[idx:]:
-        if log_line.process not in log_list_per_process:
-            log_list_per_process[log_line.process] = []
-
-        log_list_per_process[log_line.process].append(log_line)
-
-    return log_list_per_process
-
-
 def categorize_logs(
     log_list_per_process: dict[BenchmarkProcess, list[LogLine]],
 ) -> BenchmarkCategory:
@@ -855,12 +1096,13 @@ def populate_benchmark_categories(
 ):
     """populate categories from log lines"""
 
+    matcher = CategoryMatcher(root_benchmark_category)
     for _, log_list_process in log_list_per_process.items():
         index = 0
         while index < len(log_list_process):
-            index = populate_benchmark_category(
-                index, log_list_process, root_benchmark_category
-            )
+            # most lines match no category
+            if matcher.search(log_list_process[index].line):
+                index = populate_benchmark_category(index, log_list_process, matcher)
             index += 1
 
 
@@ -896,13 +1138,15 @@ def add_uncategorized_categories(benchmark_category: BenchmarkCategory):
 
 
 def populate_benchmark_category(
-    index: int, log_list: list[LogLine], benchmark_category: BenchmarkCategory
+    index: int, log_list: list[LogLine], matcher: CategoryMatcher
 ) -> int:
     """populate category from log line"""
 
-    category = benchmark_category
-    while category is not None and index < len(log_list):
-        if category.start.log_line is None and category.start.matches(log_list[index]):
+    pattern_ids = matcher.match(log_list[index].line)
+    position = matcher.next_candidate(pattern_ids, 0)
+    while position is not None:
+        category = matcher.categories[position]
+        if category.start.log_line is None and matcher.starts(position, pattern_ids):
             category.start.log_line = log_list[index]
             category.end.log_line = None
             # if no date, try next log line
@@ -912,8 +1156,9 @@ def populate_benchmark_category(
                     return index
 
                 category.start.log_line = log_list[index]
+                pattern_ids = matcher.match(log_list[index].line)
 
-        if category.end.log_line is None and category.end.matches(log_list[index]):
+        if category.end.log_line is None and matcher.ends(position, pattern_ids):
             category.end.log_line = log_list[index]
             # if no date, try next log line
             while category.end.log_line.time is None:
@@ -921,194 +1166,376 @@ def populate_benchmark_category(
                 if index >= len(log_list):
                     return index
 
-                category.end = log_list[index]
-
-        if category.root_child is not None:
-            index = populate_benchmark_category(index, log_list, category.root_child)
+                category.end.log_line = log_list[index]
+                pattern_ids = matcher.match(log_list[index].line)
 
-        category = category.next
+        position = matcher.next_candidate(pattern_ids, position + 1)
 
     return index
 
 
-def parse_logs(logs: str) -> BenchmarkResult:
-    """parse vllm logs"""
-
-    # Strings to be searched on logging ouput in order to extract values
-
-    server_non_default_args = "non-default args:"
-    model_sleep_mode = "'enable_sleep_mode':"
-    model_load_format = "load_format="
-    # Model loading took 15.2209 GB and 12.221976 seconds
-    model_load_string = "Model loading took"
+# Strings to be searched on logging ouput in order to extract values
+
+SERVER_NON_DEFAULT_ARGS = "non-default args:"
+MODEL_SLEEP_MODE = "'enable_sleep_mode':"
+MODEL_LOAD_FORMAT = "load_format="
+# Model loading took 15.2209 GB and 12.221976 seconds
+MODEL_LOAD_STRING = "Model loading took"
+
+# Dynamo bytecode transform time: 3.96 s
+DYNAMO_BYTECODE_TRANSFORM = "Dynamo bytecode transform time"
+
+# Directly load the compiled graph(s) for dynamic shape from the cache, took %.3f s
+# Directly load the compiled graph(s) for shape %s from the cache, took %.3f s
+CACHED_COMPILED_GRAPH = "Directly load the compiled graph(s) for "
+
+# Compiling a graph for dynamic shape takes %.2f s
+# Compiling a graph for shape %s takes %.2f s
+COMPILED_GRAPH = "Compiling a graph for "
+
+# torch.compile takes 17.88 s in total
+TORCH_COMPILE = "torch.compile takes"
+
+# Initial free memory: 43.90 GiB; Requested memory: 0.95 (util), 42.17 GiB
+INITIAL_FREE_MEMORY = "Initial free memory:"
+# Free memory after profiling: 42.85 GiB (total), 41.12 GiB (within requested)
+FREE_MEMORY_AFTER_PROFILING = "Free memory after profiling:"
+# Memory profiling takes 26.21 seconds. Total non KV cache memory: 1.48GiB
+# torch peak memory increase: 0.52GiB; non-torch forward increase memory: 0.04GiB;
+# weights memory: 0.93GiB.
+MEMORY_PROFILING = "Memory profiling takes"
+
+# It took 0.001315 seconds to fall asleep.
+MODEL_SLEEP_STRING = " seconds to fall asleep"
+# It took 0.000018 seconds to wake up.
+MODEL_WAKE_STRING = " seconds to wake up"
+MODEL_TOOK_STRING = " It took "
+# Sleep mode freed 69.50 GiB memory, 0.75 GiB memory is still in use.
+MODEL_GPU_FREED = "Sleep mode freed"
+
+# matches lines with any of the strings above
+METRICS_PATTERN = combine_patterns(
+    [
+        re.escape(key)
+        for key in [
+            SERVER_NON_DEFAULT_ARGS,
+            MODEL_SLEEP_MODE,
+            MODEL_LOAD_FORMAT,
+            MODEL_LOAD_STRING,
+            DYNAMO_BYTECODE_TRANSFORM,
+            CACHED_COMPILED_GRAPH,
+            COMPILED_GRAPH,
+            TORCH_COMPILE,
+            INITIAL_FREE_MEMORY,
+            FREE_MEMORY_AFTER_PROFILING,
+            MEMORY_PROFILING,
+            MODEL_SLEEP_STRING,
+            MODEL_WAKE_STRING,
+            MODEL_GPU_FREED,
+        ]
+    ]
+)
+
+
+class VllmLogParser:
+    """Single pass vllm log parser.
+
+    Log lines are fed in order, metrics are updated as they are found, with
+    the latest statistics replacing older ones. Only the lines needed to
+    categorize the logs are kept, grouped by process.
+
+    With process_logs_prefix, all the lines of each process are also written
+    while streaming, with their line number, to <prefix>-<index>.log, the
+    index being the order in which processes first log. Lines before the end
+    of a tensorizer serialization are left out, as for categorization.
+    """
+
+    def __init__(self, vllm_model: str = "", process_logs_prefix: str | None = None):
+        self.benchmark_result = BenchmarkResult()
+        self.log_list_per_process: dict[BenchmarkProcess | None, list[LogLine]] = {}
+        self.line_number = 0
+        self._tensorizer_serialization_end = f"End model {vllm_model} serialization"
+        self._tensorizer_serialization_skipped = False
+        self._category_matcher = CategoryMatcher(
+            initialize_benchmark_categories(DEFINED_CATEGORIES, None)
+        )
+        self._processes: dict[str, BenchmarkProcess | None] = {}
+        # processes whose last kept line has no date
+        self._pending_date: set[BenchmarkProcess | None] = set()
+        self._process_logs_prefix = process_logs_prefix
+        self._process_logs: dict[BenchmarkProcess | None, io.TextIOWrapper] = {}
 
-    # Dynamo bytecode transform time: 3.96 s
-    dynamo_bytecode_transform = "Dynamo bytecode transform time"
+    def feed(self, chunks: Iterable[bytes], file: io.BufferedWriter | None = None):
+        """parse streamed log chunks, optionally copying them to a file
 
-    # Directly load the compiled graph(s) for dynamic shape from the cache, took %.3f s
-    # Directly load the compiled graph(s) for shape %s from the cache, took %.3f s
-    cached_compiled_graph = "Directly load the compiled graph(s) for "
+        Args:
+            chunks (Iterable[bytes]): log contents, split at any point.
+            file (io.BufferedWriter): optional file to write the log contents.
+        """
+        for line in iter_log_lines(chunks, file):
+            self.feed_line(line)
 
-    # Compiling a graph for dynamic shape takes %.2f s
-    # Compiling a graph for shape %s takes %.2f s
-    compiled_graph = "Compiling a graph for "
+    def feed_line(self, line: str):
+        """parse next log line"""
 
-    # torch.compile takes 17.88 s in total
-    torch_compile = "torch.compile takes"
+        self.line_number += 1
+        self._categorize_line(line)
+        self._extract_metrics(line.strip())
 
-    # Initial free memory: 43.90 GiB; Requested memory: 0.95 (util), 42.17 GiB
-    initial_free_memory = "Initial free memory:"
-    # Free memory after profiling: 42.85 GiB (total), 41.12 GiB (within requested)
-    free_memory_after_profiling = "Free memory after profiling:"
-    # Memory profiling takes 26.21 seconds. Total non KV cache memory: 1.48GiB
-    # torch peak memory increase: 0.52GiB; non-torch forward increase memory: 0.04GiB;
-    # weights memory: 0.93GiB.
-    memory_profiling = "Memory profiling takes"
+    def close(self):
+        """close the log files of each process, listing them"""
 
-    # It took 0.001315 seconds to fall asleep.
-    model_sleep_string = " seconds to fall asleep"
-    # It took 0.000018 seconds to wake up.
-    model_wake_string = " seconds to wake up"
-    model_took_string = " It took "
-    # Sleep mode freed 69.50 GiB memory, 0.75 GiB memory is still in use.
-    model_gpu_freed = "Sleep mode freed"
+        for file in self._process_logs.values():
+            file.close()
+            logger.info("vllm log file saved to path: %s", file.name)
+        self._process_logs.clear()
 
-    benchmark_result = BenchmarkResult()
+    def _write_process_log(self, process: BenchmarkProcess | None, line: str):
+        """write the log line to the log file of its process"""
 
-    # loop from the bottom to catch latest statistics before old ones
-    sleep_mode = ""
-    args = None
-    for line in reversed(logs.splitlines()):
-        if (
-            args is not None
-            and sleep_mode != ""
-            and benchmark_result.scenario.load_format != LoadFormat.UNKNOWN
-            and benchmark_result.metrics.load.time != 0
-            and benchmark_result.metrics.dynamo_bytecode_transform != 0
-            and (
-                benchmark_result.metrics.load_cached_compiled_graph != 0
-                or benchmark_result.metrics.compile_graph != 0
+        file = self._process_logs.get(process)
+        if file is None:
+            logs_filepath = (
+                f"{self._process_logs_prefix}-{len(self._process_logs)}.log"
             )
-            and benchmark_result.metrics.memory_profiling.initial_free != 0
-            and benchmark_result.metrics.memory_profiling.after_free != 0
-            and benchmark_result.metrics.memory_profiling.time != 0
-            and benchmark_result.metrics.torch_compile != 0
-            and benchmark_result.metrics.sleep.time != 0
-            and benchmark_result.metrics.sleep.gpu_freed != 0
-            and benchmark_result.metrics.sleep.gpu_in_use != 0
-            and benchmark_result.metrics.wake != 0
-        ):
-            break
+            file = open(logs_filepath, "w", encoding="utf-8")
+            self._process_logs[process] = file
+        file.write(f"{self.line_number:5d} {line}\n")
 
-        line = line.strip()
+    def _get_process(self, line: str) -> BenchmarkProcess | None:
+        """process of the log line, cached by its '(name pid=N)' text"""
 
-        if args is None:
-            start_index = line.find(server_non_default_args)
-            if start_index >= 0:
-                start_index += len(server_non_default_args)
-                args = line[start_index:].strip()
-                try:
-                    benchmark_result.scenario.platform.engine.args = ast.literal_eval(
-                        args
-                    )
-                except Exception:
-                    logger.exception(
-                        "log args dict parsing returned error converting: %s",
-                        args,
-                    )
+        index = line.rfind("pid=")
+        if index < 0:
+            return None
 
-        if sleep_mode == "":
-            start_index = line.find(model_sleep_mode)
-            if start_index >= 0:
-                start_index += len(model_sleep_mode)
-                end_index = line.find(",", start_index)
-                if end_index < 0:
-                    end_index = line.find("}", start_index)
-                if end_index >= 0:
-                    sleep_mode = line[start_index:end_index].strip().lower()
-                    benchmark_result.scenario.sleep_mode = "true" == sleep_mode
-
-        if benchmark_result.scenario.load_format == LoadFormat.UNKNOWN:
-            start_index = line.find(model_load_format)
-            if start_index >= 0:
-                start_index += len(model_load_format)
-                end_index = line.find(",", start_index)
-                if end_index >= 0:
-                    format_value = line[start_index:end_index].strip()
-                    benchmark_result.scenario.load_format = (
-                        LoadFormat.loadformat_from_value(format_value)
-                    )
+        start_index = line.rfind("(", 0, index)
+        end_index = line.find(")", index)
+        if start_index < 0 or end_index < 0:
+            return BenchmarkProcess.process_from_line(line)
 
-        if benchmark_result.metrics.load.time == 0:
-            floats = find_floats_in_line(model_load_string, line)
-            if len(floats) > 1:
-                benchmark_result.metrics.load.size = floats[0]
-                benchmark_result.metrics.load.time = floats[1]
-                continue
+        key = line[start_index : end_index + 1]
+        if key not in self._processes:
+            self._processes[key] = BenchmarkProcess.process_from_line(key)
+        return self._processes[key]
 
-        if benchmark_result.metrics.dynamo_bytecode_transform == 0:
-            floats = find_floats_in_line(dynamo_bytecode_transform, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.dynamo_bytecode_transform = floats[0]
-                continue
+    def _categorize_line(self, line: str):
+        """keep the log line if it may start or end a category"""
 
         if (
-            benchmark_result.metrics.load_cached_compiled_graph == 0
-            and benchmark_result.metrics.compile_graph == 0
+            not self._tensorizer_serialization_skipped
+            and self._tensorizer_serialization_end in line
         ):
-            floats = find_floats_in_line(cached_compiled_graph, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.load_cached_compiled_graph = floats[0]
-                continue
-            floats = find_floats_in_line(compiled_graph, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.compile_graph = floats[0]
-                continue
+            # skips tensorizer serialization lines
+            self._tensorizer_serialization_skipped = True
+            self.log_list_per_process.clear()
+            self._pending_date.clear()
+            for file in self._process_logs.values():
+                file.close()
+                os.remove(file.name)
+            self._process_logs.clear()
+            logger.info(
+                "Skip tensorizer serialization. Start from log line %d",
+                self.line_number + 1,
+            )
+            return
+
+        process = self._get_process(line)
+        if self._process_logs_prefix is not None:
+            self._write_process_log(process, line)
+        log_list_process = self.log_list_per_process.setdefault(process, [])
+        matched = self._category_matcher.search(line)
+        # if a kept line has no date, the next lines of the process are kept
+        # until one has a date
+        if not matched and process not in self._pending_date:
+            return
+
+        log_line = LogLine(line, self.line_number, process)
+        log_list_process.append(log_line)
+        if log_line.time is None:
+            self._pending_date.add(process)
+        else:
+            self._pending_date.discard(process)
+
+    def _extract_metrics(self, line: str):
+        """extract metrics from log line"""
+
+        if METRICS_PATTERN.search(line) is None:
+            return
+
+        benchmark_result = self.benchmark_result
+
+        start_index = line.find(SERVER_NON_DEFAULT_ARGS)
+        if start_index >= 0:
+            start_index += len(SERVER_NON_DEFAULT_ARGS)
+            args = line[start_index:].strip()
+            try:
+                benchmark_result.scenario.platform.engine.args = ast.literal_eval(args)
+            except Exception:
+                benchmark_result.scenario.platform.engine.args = {}
+                logger.exception(
+                    "log args dict parsing returned error converting: %s",
+                    args,
+                )
 
-        if benchmark_result.metrics.torch_compile == 0:
-            floats = find_floats_in_line(torch_compile, line)
+        start_index = line.find(MODEL_SLEEP_MODE)
+        if start_index >= 0:
+            start_index += len(MODEL_SLEEP_MODE)
+            end_index = line.find(",", start_index)
+            if end_index < 0:
+                end_index = line.find("}", start_index)
+            if end_index >= 0:
+                sleep_mode = line[start_index:end_index].strip().lower()
+                benchmark_result.scenario.sleep_mode = "true" == sleep_mode
+
+        start_index = line.find(MODEL_LOAD_FORMAT)
+        if start_index >= 0:
+            start_index += len(MODEL_LOAD_FORMAT)
+            end_index = line.find(",", start_index)
+            if end_index >= 0:
+                load_format = LoadFormat.loadformat_from_value(
+                    line[start_index:end_index].strip()
+                )
+                if load_format != LoadFormat.UNKNOWN:
+                    benchmark_result.scenario.load_format = load_format
+
+        metrics = benchmark_result.metrics
+
+        floats = find_floats_in_line(MODEL_LOAD_STRING, line)
+        if len(floats) > 1:
+            metrics.load.size = floats[0]
+            metrics.load.time = floats[1]
+            return
+
+        floats = find_floats_in_line(DYNAMO_BYTECODE_TRANSFORM, line)
+        if len(floats) > 0:
+            metrics.dynamo_bytecode_transform = floats[0]
+            return
+
+        # graphs are either loaded from the cache or compiled
+        floats = find_floats_in_line(CACHED_COMPILED_GRAPH, line)
+        if len(floats) > 0:
+            metrics.load_cached_compiled_graph = floats[0]
+            metrics.compile_graph = 0.0
+            return
+        floats = find_floats_in_line(COMPILED_GRAPH, line)
+        if len(floats) > 0:
+            metrics.compile_graph = floats[0]
+            metrics.load_cached_compiled_graph = 0.0
+            return
+
+        floats = find_floats_in_line(TORCH_COMPILE, line)
+        if len(floats) > 0:
+            metrics.torch_compile = floats[0]
+            return
+
+        floats = find_floats_in_line(INITIAL_FREE_MEMORY, line)
+        if len(floats) > 0:
+            metrics.memory_profiling.initial_free = floats[0]
+            return
+
+        floats = find_floats_in_line(FREE_MEMORY_AFTER_PROFILING, line)
+        if len(floats) > 0:
+            metrics.memory_profiling.after_free = floats[0]
+            return
+
+        floats = find_floats_in_line(MEMORY_PROFILING, line)
+        if len(floats) > 0:
+            metrics.memory_profiling.time = floats[0]
+            return
+
+        if MODEL_SLEEP_STRING in line:
+            floats = find_floats_in_line(MODEL_TOOK_STRING, line)
             if len(floats) > 0:
-                benchmark_result.metrics.torch_compile = floats[0]
-                continue
+                metrics.sleep.time = floats[0]
+                return
 
-        if benchmark_result.metrics.memory_profiling.initial_free == 0:
-            floats = find_floats_in_line(initial_free_memory, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.memory_profiling.initial_free = floats[0]
-                continue
+        floats = find_floats_in_line(MODEL_GPU_FREED, line)
+        if len(floats) > 1:
+            metrics.sleep.gpu_freed = floats[0]
+            metrics.sleep.gpu_in_use = floats[1]
+            return
 
-        if benchmark_result.metrics.memory_profiling.after_free == 0:
-            floats = find_floats_in_line(free_memory_after_profiling, line)
+        if MODEL_WAKE_STRING in line:
+            floats = find_floats_in_line(MODEL_TOOK_STRING, line)
             if len(floats) > 0:
-                benchmark_result.metrics.memory_profiling.after_free = floats[0]
-                continue
+                metrics.wake = floats[0]
 
-        if benchmark_result.metrics.memory_profiling.time == 0:
-            floats = find_floats_in_line(memory_profiling, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.memory_profiling.time = floats[0]
-                continue
 
-        if benchmark_result.metrics.sleep.time == 0 and model_sleep_string in line:
-            floats = find_floats_in_line(model_took_string, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.sleep.time = floats[0]
-                continue
+def parse_pod_logs(
+    v1: client.CoreV1Api,
+    namespace: str,
+    pod_name: str,
+    vllm_model: str,
+    logs_filepath: str,
+    process_logs_prefix: str | None = None,
+) -> VllmLogParser:
+    """parse pod logs while streaming them to a file, and optionally to a file
+    per process"""
 
-        if benchmark_result.metrics.sleep.gpu_freed == 0:
-            floats = find_floats_in_line(model_gpu_freed, line)
-            if len(floats) > 1:
-                benchmark_result.metrics.sleep.gpu_freed = floats[0]
-                benchmark_result.metrics.sleep.gpu_in_use = floats[1]
-                continue
+    parser = VllmLogParser(vllm_model, process_logs_prefix)
+    try:
+        with open(logs_filepath, "wb") as file:
+            parser.feed(stream_pod_logs(v1, namespace, pod_name), file)
+    finally:
+        parser.close()
+    logger.info("vllm log file of pod %s saved to path: %s", pod_name, logs_filepath)
+    return parser
+
+
+def parse_pods_logs(
+    v1: client.CoreV1Api,
+    namespace: str,
+    pod_infos: list[dict[str, str]],
+    vllm_model: str,
+    requests_dir: str,
+    write_log_per_process: bool = False,
+) -> list[VllmLogParser]:
+    """parse logs of all pods concurrently
+
+    Args:
+        v1 (client.CoreV1Api): Kubernetes client.
+        namespace (str): namespace of the pods.
+        pod_infos (list[dict[str, str]]): pod names and images.
+        vllm_model (str): served model.
+        requests_dir (str): directory where the pod logs are saved, as
+            vllm.log for a single pod or vllm-<pod name>.log otherwise.
+        write_log_per_process (bool): also save the logs of each process of
+            a pod, as vllm-<pod name>-<process index>.log.
+
+    Returns:
+        list[VllmLogParser]: parsers with the logs of each pod, in order.
+    """
+
+    def _parse(pod_info: dict[str, str]) -> VllmLogParser:
+        file_name = (
+            "vllm.log" if len(pod_infos) == 1 else f"vllm-{pod_info['name']}.log"
+        )
+        return parse_pod_logs(
+            v1,
+            namespace,
+            pod_info["name"],
+            vllm_model,
+            os.path.join(requests_dir, file_name),
+            (
+                os.path.join(requests_dir, f"vllm-{pod_info['name']}")
+                if write_log_per_process
+                else None
+            ),
+        )
 
-        if benchmark_result.metrics.wake == 0 and model_wake_string in line:
-            floats = find_floats_in_line(model_took_string, line)
-            if len(floats) > 0:
-                benchmark_result.metrics.wake = floats[0]
-                continue
+    max_workers = max(1, min(MAX_LOG_WORKERS, len(pod_infos)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_parse, pod_infos))
 
-    return benchmark_result
+
+def parse_logs(logs: str, vllm_model: str = "") -> VllmLogParser:
+    """parse vllm logs already in memory"""
+
+    parser = VllmLogParser(vllm_model)
+    for line in logs.splitlines():
+        parser.feed_line(line)
+    return parser
 
 
 def find_floats_in_line(key: str, line: str) -> list[float]:
@@ -1125,33 +1552,25 @@ def extract_floats(text: str) -> list[float]:
     return [float(num) for num in re.findall(r"[-+]?\d*\.\d+|\d+", text)]
 
 
-def convert_result(result_filepath: str, output_filepath: str) -> tuple[str, str, int]:
+def convert_result(result_filepath: str, output_filepath: str):
     """converts result to universal format"""
 
     try:
-        cmd = ["convert.py", result_filepath, output_filepath, "-w", "nop", "-f"]
-        with subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=False,
-        ) as proc:
-            stdout, stderr = proc.communicate()
-            out_str = stdout.strip().decode("ascii")
-            err_str = stderr.strip().decode("ascii")
-            if proc.returncode != 0:
-                logger.info(
-                    "convert.py returned with error %s converting: %s",
-                    proc.returncode,
-                    result_filepath,
-                )
-            else:
-                logger.info("convert.py succeeded converting: %s", result_filepath)
-
-            if err_str != "":
-                logger.info("convert.py stderr: %s", err_str)
-            if out_str != "":
-                logger.info("convert.py stdout: %s", out_str)
+        # convert.py is installed next to the harness, convert in process
+        # instead of starting another interpreter
+        import convert
+
+        convert.convert_results_file(
+            result_filepath,
+            output_filepath,
+            "nop",
+            force=True,
+            report_log=os.path.join(
+                os.path.dirname(os.path.dirname(os.path.abspath(result_filepath))),
+                convert.REPORT_LOG_FILE,
+            ),
+        )
+        logger.info("convert.py succeeded converting: %s", result_filepath)
     except Exception:
         logger.exception("convert.py returned error converting: %s", result_filepath)
 
@@ -1259,14 +1678,15 @@ def main():
 
     v1 = client.CoreV1Api()
 
-    pod_info = None
+    pod_infos = []
     try:
-        pod_info = get_vllm_pod_info(v1, namespace, arr[0])
-        logger.info(
-            "vLLM standalone pod name: %s image: %s",
-            pod_info["name"],
-            pod_info["image"],
-        )
+        pod_infos = get_vllm_pod_infos(v1, namespace, arr[0])
+        for pod_info in pod_infos:
+            logger.info(
+                "vLLM standalone pod name: %s image: %s",
+                pod_info["name"],
+                pod_info["image"],
+            )
     except Exception as e:
         logger.info(
             "Skipping harness because vLLM standalone pod not found: %s", str(e)
@@ -1276,52 +1696,60 @@ def main():
     vllm_version = get_vllm_version(endpoint_url, REQUEST_TIMEOUT)
     vllm_model = get_vllm_model(endpoint_url, REQUEST_TIMEOUT)
 
-    pod_logs = get_pod_logs(v1, namespace, pod_info["name"])
-    benchmark_result = parse_logs(pod_logs.decode("utf-8"))
-    if benchmark_result.scenario.sleep_mode:
-        logger.info("Request sleep/wake")
-        sleep(endpoint_url, 1, REQUEST_TIMEOUT)
-        wake(endpoint_url, REQUEST_TIMEOUT)
+    # parse the logs of all pods while streaming them to the vllm log files
+    parsers = parse_pods_logs(
+        v1, namespace, pod_infos, vllm_model, requests_dir, write_log_per_process
+    )
+    if any(parser.benchmark_result.scenario.sleep_mode for parser in parsers):
+        # the service routes to a single pod, so each pod is sent sleep/wake
+        for pod_info, parser in zip(pod_infos, parsers):
+            if not parser.benchmark_result.scenario.sleep_mode:
+                continue
+            pod_url = get_pod_url(pod_info, endpoint_url)
+            logger.info("Request sleep/wake of pod %s at %s", pod_info["name"], pod_url)
+            sleep(pod_url, 1, REQUEST_TIMEOUT)
+            wake(pod_url, REQUEST_TIMEOUT)
         # get logs again with latest sleep/wake statistics
-        pod_logs = get_pod_logs(v1, namespace, pod_info["name"])
-        benchmark_result = parse_logs(pod_logs.decode("utf-8"))
-
-    benchmark_result.scenario.model.name = vllm_model
-    benchmark_result.scenario.platform.engine.name = pod_info["image"]
-    benchmark_result.scenario.platform.engine.version = vllm_version
-    # if failed to extract from logs
-    if benchmark_result.scenario.load_format == LoadFormat.UNKNOWN:
-        logger.info("Using load format from env. variable")
-        benchmark_result.scenario.load_format = load_format
-
-    # categorize logs
-    log_list = get_log_list(pod_logs.decode("utf-8"))
-    log_list_per_process = get_log_list_per_process(vllm_model, log_list)
-    benchmark_result.metrics.root_category = categorize_logs(log_list_per_process)
-
-    os.makedirs(requests_dir, exist_ok=True)
-
-    # write vllm log file
-    logs_filepath = os.path.join(requests_dir, "vllm.log")
-    with open(logs_filepath, "wb") as file:
-        file.write(pod_logs)
-        logger.info("vllm log file saved to path: %s", logs_filepath)
-
-    if write_log_per_process:
-        # write vllm logs per process
-        for idx, (_, log_list_process) in enumerate(log_list_per_process.items()):
-            logs_filepath = os.path.join(requests_dir, f"vllm-{idx}.log")
-            with open(logs_filepath, "w", encoding="utf-8") as file:
-                for log_line in log_list_process:
-                    file.write(f"{log_line.line_number:5d} {log_line.line}\n")
-                logger.info("vllm log file saved to path: %s", logs_filepath)
+        parsers = parse_pods_logs(
+            v1, namespace, pod_infos, vllm_model, requests_dir, write_log_per_process
+        )
+
+    pod_results = []
+    for pod_info, parser in zip(pod_infos, parsers):
+        pod_result = PodResult(
+            name=pod_info["name"],
+            image=pod_info["image"],
+            scenario=parser.benchmark_result.scenario,
+            metrics=parser.benchmark_result.metrics,
+        )
+        pod_result.scenario.model.name = vllm_model
+        pod_result.scenario.platform.engine.name = pod_info["image"]
+        pod_result.scenario.platform.engine.version = vllm_version
+        # if failed to extract from logs
+        if pod_result.scenario.load_format == LoadFormat.UNKNOWN:
+            logger.info(
+                "Using load format from env. variable for pod %s", pod_info["name"]
+            )
+            pod_result.scenario.load_format = load_format
+
+        # categorize logs
+        log_list_per_process = parser.log_list_per_process
+        pod_result.metrics.root_category = categorize_logs(log_list_per_process)
+        pod_results.append(pod_result)
+
+    benchmark_result = BenchmarkResult(
+        scenario=pod_results[0].scenario,
+        metrics=pod_results[0].metrics,
+        pods=pod_results,
+    )
 
     # write log categories log file
     log_categories_filepath = os.path.join(requests_dir, "categories.log")
     with open(log_categories_filepath, "w", encoding="utf-8", newline="") as file:
-        write_benchmark_categories_to_log(
-            0, benchmark_result.metrics.root_category, file
-        )
+        for pod_result in pod_results:
+            file.write(f"Pod: '{pod_result.name}'\n")
+            write_benchmark_categories_to_log(1, pod_result.metrics.root_category, file)
+            file.write("\n")
         logger.info(
             "benchmark categories log file saved to path: %s", log_categories_filepath
         )
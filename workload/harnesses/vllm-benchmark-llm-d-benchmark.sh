@@ -17,15 +17,12 @@ echo "Harness completed successfully."
 
 # Convert results into universal format
 # We can't easily determine what the result filename will be, so search for and
-# convert all possibilities.
-for result in $(find $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR -maxdepth 1 -name 'vllm*.json'); do
-  result_fname=$(echo $result | rev | cut -d '/' -f 1 | rev)
-  convert.py $result -w vllm-benchmark $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/benchmark_report,_$result_fname.yaml 2> >(tee -a $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stderr.log >&2)
-  # Report errors but don't quit
-  export LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC=$?
-  if [[ $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC -ne 0 ]]; then
-    echo "convert.py returned with error $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC converting: $result"
-  fi
-done
+# convert all possibilities, in one convert.py run.
+convert.py --batch $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR -w vllm-benchmark -p 'vllm*.json' --log "$(dirname $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR)/benchmark_reports.jsonl" 2> >(tee -a $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR/stderr.log >&2)
+# Report errors but don't quit
+export LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC=$?
+if [[ $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC -ne 0 ]]; then
+  echo "convert.py returned with error $LLMDBENCH_RUN_EXPERIMENT_CONVERT_RC converting results in: $LLMDBENCH_RUN_EXPERIMENT_RESULTS_DIR"
+fi
 
 echo "Results data conversion completed."
@@ -7,23 +7,40 @@
 
 import argparse
 import base64
+from concurrent.futures import ProcessPoolExecutor
 import datetime
+import glob
+import json
+import math
 import os
 import re
 import sys
-from typing import Any
+from typing import Any, Iterator
 import yaml
 
-import numpy as np
-from scipy import stats
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows
+    fcntl = None
 
 # TODO fix this during refactor after repository has been converted into
 # full Python.
 # Hack to ensure schema can be imported from harness pod or config explorer.
 try:
-    from schema import BenchmarkReport, Units, WorkloadGenerator
+    from schema import BenchmarkReport, Units, WorkloadGenerator, create_from_dict
+    from sketch import LogHistogram
 except ImportError:
-    from config_explorer.schema import BenchmarkReport, Units, WorkloadGenerator
+    from config_explorer.schema import BenchmarkReport, Units, WorkloadGenerator, create_from_dict
+    from config_explorer.sketch import LogHistogram
+
+# Use the libyaml bindings when PyYAML was built with them, they are much
+# faster than the pure Python loader
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 def check_file(file_path: str) -> None:
@@ -31,13 +48,15 @@ def check_file(file_path: str) -> None:
 
     Args:
         file_path (str): File to check.
+
+    Raises:
+        FileNotFoundError: File does not exist.
+        ValueError: File is not a regular file.
     """
     if not os.path.exists(file_path):
-        sys.stderr.write('File does not exist: %s\n' % file_path)
-        exit(2)
+        raise FileNotFoundError('File does not exist: %s' % file_path)
     if not os.path.isfile(file_path):
-        sys.stderr.write('Not a regular file: %s\n' % file_path)
-        exit(2)
+        raise ValueError('Not a regular file: %s' % file_path)
 
 
 def import_yaml(file_path: str) -> dict[Any, Any]:
@@ -50,51 +69,370 @@ def import_yaml(file_path: str) -> dict[Any, Any]:
         dict: Imported data.
     """
     check_file(file_path)
+    with open(file_path, 'rb') as file:
+        return load_json_or_yaml(file.read())
+
+
+def load_json_or_yaml(content: bytes | str) -> Any:
+    """Parse JSON/YAML content.
+
+    JSON is a subset of YAML, but JSON parsers are much faster than YAML ones.
+    Content starting with '{' or '[' is parsed as JSON, with orjson if it is
+    installed, falling back to YAML if it is not valid JSON (e.g. a YAML flow
+    mapping).
+
+    Args:
+        content (bytes | str): JSON/YAML content.
+
+    Returns:
+        Any: Parsed data.
+    """
+    if isinstance(content, str):
+        content = content.encode('UTF-8')
+    if content.lstrip()[:1] in (b'{', b'['):
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # orjson rejects NaN and Infinity, which json accepts
+                pass
+        try:
+            return json.loads(content)
+        except ValueError:
+            pass
+    return yaml.load(content, Loader=YamlLoader)
+
+
+def iter_json_records(file_path: str, chunk_size: int = 1024 * 1024) -> Iterator[Any]:
+    """Stream the elements of a JSON array, or the lines of a JSON Lines file.
+
+    Only one chunk of the file and the element being decoded are held in
+    memory, so files with millions of records can be read.
+
+    Args:
+        file_path (str): Path to JSON/JSON Lines file.
+        chunk_size (int): Number of characters to read at a time.
+
+    Returns:
+        Iterator[Any]: Decoded elements.
+    """
+    check_file(file_path)
+    decoder = json.JSONDecoder()
     with open(file_path, 'r', encoding='UTF-8') as file:
-        data = yaml.safe_load(file)
-    return data
+        buffer = ''
+        pos = 0
+        eof = False
+        in_array = None
+        while True:
+            # Skip separators between elements
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            try:
+                if pos == len(buffer):
+                    raise EOFError()
+                if in_array is None:
+                    in_array = buffer[pos] == '['
+                    if in_array:
+                        pos += 1
+                    continue
+                if in_array and buffer[pos] == ']':
+                    return
+                record, end = decoder.raw_decode(buffer, pos)
+                # A value at the very end of the chunk may be truncated (e.g.
+                # a number), so decode it again with the next chunk
+                if end == len(buffer) and not eof:
+                    raise EOFError()
+            except (EOFError, json.JSONDecodeError) as exc:
+                if eof:
+                    if isinstance(exc, json.JSONDecodeError):
+                        raise
+                    if in_array:
+                        raise ValueError('Unterminated JSON array: %s' % file_path)
+                    return
+                chunk = file.read(chunk_size)
+                eof = chunk == ''
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            pos = end
+            yield record
 
 
-def import_csv_with_header(file_path: str) -> dict[str, list[Any]]:
+def import_csv_with_header(file_path: str, memory_map: bool = False) -> dict[str, Any]:
     """Import a CSV file where the first line is a header.
 
+    Columns are parsed with pandas, which infers the type of each column once,
+    using the pyarrow CSV reader if it is installed. Rows with more values than
+    the header are skipped with a warning.
+
     Args:
         file_path (str): Path to CSV file.
+        memory_map (bool): Memory-map the file instead of reading it, which
+            avoids buffering large files. This uses the pandas C reader.
 
     Returns:
-        dict: Imported data where the header provides key names.
+        dict: Imported data where the header provides key names. Columns of
+            ints or floats are numpy arrays, other columns are lists.
     """
+    # pandas is imported when needed, to keep startup fast when converting
+    # results that do not need it
+    import importlib.util
+    import pandas as pd
+
     check_file(file_path)
-    with open(file_path, 'r', encoding='UTF-8') as file:
-        for ii, line in enumerate(file):
-            if ii == 0:
-                headers: list[str] = list(map(str.strip, line.split(',')))
-                data: dict[str, list[Any]] = {}
-                for hdr in headers:
-                    data[hdr] = []
-                continue
-            row_vals = list(map(str.strip, line.split(',')))
-            if len(row_vals) != len(headers):
-                sys.stderr.write('Warning: line %d of "%s" does not match header length, skipping: %d != %d\n' %
-                (ii + 1, file_path, len(row_vals), len(headers)))
-                continue
-            for jj, val in enumerate(row_vals):
-                # Try converting the value to an int or float
-                try:
-                    val = int(val)
-                except ValueError:
-                    try:
-                        val = float(val)
-                    except ValueError:
-                        pass
-                data[headers[jj]].append(val)
-    # Convert lists of ints or floats to numpy arrays
-    for hdr in headers:
-        if isinstance(data[hdr][0], int) or isinstance(data[hdr][0], float):
-            data[hdr] = np.array(data[hdr])
+    if not memory_map and importlib.util.find_spec('pyarrow') is not None:
+        df = pd.read_csv(
+            file_path,
+            engine='pyarrow',
+            on_bad_lines='warn',
+            encoding='UTF-8',
+        )
+    else:
+        df = pd.read_csv(
+            file_path,
+            skipinitialspace=True,
+            on_bad_lines='warn',
+            # Parse floats exactly like float() does
+            float_precision='round_trip',
+            memory_map=memory_map,
+            encoding='UTF-8',
+        )
+    data: dict[str, Any] = {}
+    for hdr, column in df.items():
+        if column.dtype.kind in 'iuf':
+            data[hdr.strip()] = column.to_numpy()
+        else:
+            data[hdr.strip()] = [
+                val.strip() if isinstance(val, str) else val for val in column
+            ]
     return data
 
 
+def _mode(values: Any) -> Any:
+    """Get the most common value, the smallest one if there are several.
+
+    Args:
+        values (Any): Array of values.
+
+    Returns:
+        Any: Most common value.
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu' and len(values) > 0:
+        # Counting is much faster than sorting for integers within a small
+        # range, like token counts
+        low = values.min()
+        if values.max() - low <= 4 * len(values) + 1024:
+            return low + np.argmax(np.bincount(values - low))
+    unique, counts = np.unique(values, return_counts=True)
+    return unique[np.argmax(counts)]
+
+
+# Percentiles of Statistics, by field name
+STATISTICS_PERCENTILES = {
+    'p0p1': 0.1,
+    'p1': 1,
+    'p5': 5,
+    'p10': 10,
+    'p25': 25,
+    'p50': 50,
+    'p75': 75,
+    'p90': 90,
+    'p95': 95,
+    'p99': 99,
+    'p99p9': 99.9,
+}
+
+
+def compute_statistics(values: Any, units: Units, sketch: bool = True) -> dict[str, Any]:
+    """Compute the fields of Statistics from raw values, such as per-request
+    metrics.
+
+    All percentiles, including min (0) and max (100), are found with a single
+    np.percentile call, so the values are only partitioned once. The mode is
+    only computed for integer values (e.g. token counts), as it is meaningless
+    for continuous values like latencies.
+
+    Args:
+        values (Any): Array of values.
+        units (Units): Units of values.
+        sketch (bool): Include a sketch of values, which can be merged with
+            those of other reports.
+
+    Returns:
+        dict: Statistics fields.
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    names = ['min', *STATISTICS_PERCENTILES, 'max']
+    percentiles = np.percentile(
+        values, [0, *STATISTICS_PERCENTILES.values(), 100]).tolist()
+    stats = {
+        'units': units,
+        'mean': values.mean().item(),
+        'stddev': values.std().item(),
+    }
+    stats.update(zip(names, percentiles))
+    if values.dtype.kind in 'iu':
+        # min and max are values of the array, keep them as integers
+        stats['min'] = int(stats['min'])
+        stats['max'] = int(stats['max'])
+        stats['mode'] = _mode(values).item()
+    if sketch:
+        hist = LogHistogram()
+        hist.update(values)
+        stats['sketch'] = hist.to_dict()
+    return stats
+
+
+def statistics_from_sketch(sketch: LogHistogram, units: Units) -> dict[str, Any]:
+    """Compute the fields of Statistics from a sketch.
+
+    Mean, standard deviation, min and max are exact, percentiles are within
+    the relative accuracy of the sketch.
+
+    Args:
+        sketch (LogHistogram): Sketch of values.
+        units (Units): Units of values.
+
+    Returns:
+        dict: Statistics fields, including the serialized sketch.
+    """
+    stats = {
+        'units': units,
+        'mean': sketch.mean,
+        'stddev': sketch.stddev,
+        'min': sketch.min,
+        'max': sketch.max,
+        'sketch': sketch.to_dict(),
+    }
+    for name, percentile in STATISTICS_PERCENTILES.items():
+        stats[name] = sketch.quantile(percentile / 100)
+    return stats
+
+
+def merge_statistics(
+        stats_list: list[dict[str, Any]], weights: list[float]) -> dict[str, Any]:
+    """Merge statistics of the same quantity from several reports.
+
+    If every statistics has a sketch, the sketches are merged and all fields
+    are recomputed from it. Otherwise the mean is weighted, the standard
+    deviation pooled, and min and max are exact, but percentiles cannot be
+    combined correctly and are left out.
+
+    Args:
+        stats_list (list[dict]): Statistics fields of each report.
+        weights (list[float]): Number of values of each statistics (e.g.
+            number of requests), used when there are no sketches.
+
+    Returns:
+        dict: Merged statistics fields.
+    """
+    units = stats_list[0]['units']
+    for stats in stats_list:
+        if stats['units'] != units:
+            raise ValueError('Cannot merge statistics with different units: %s, %s' %
+                             (units, stats['units']))
+
+    if all(stats.get('sketch') for stats in stats_list):
+        merged = LogHistogram.from_dict(stats_list[0]['sketch'])
+        for stats in stats_list[1:]:
+            merged.merge(LogHistogram.from_dict(stats['sketch']))
+        return statistics_from_sketch(merged, units)
+
+    total = sum(weights)
+    mean = sum(stats['mean'] * ww for stats, ww in zip(stats_list, weights)) / total
+    merged = {'units': units, 'mean': mean}
+    if all(stats.get('stddev') is not None for stats in stats_list):
+        # Pool variances around the overall mean
+        second_moment = sum(
+            (stats['stddev'] ** 2 + stats['mean'] ** 2) * ww
+            for stats, ww in zip(stats_list, weights)) / total
+        merged['stddev'] = math.sqrt(max(0.0, second_moment - mean ** 2))
+    for name, func in [('min', min), ('max', max)]:
+        if all(stats.get(name) is not None for stats in stats_list):
+            merged[name] = func(stats[name] for stats in stats_list)
+    return merged
+
+
+def aggregate_reports(reports: list[BenchmarkReport], concurrent: bool = False) -> BenchmarkReport:
+    """Aggregate benchmark reports of the same scenario, such as repetitions
+    of a run, stages with the same load, or harness pods sharing a load.
+
+    Request counts are added, and the statistics of request lengths and
+    latencies are merged with merge_statistics, so percentiles are recomputed
+    from sketches when every report has them. The scenario is the one of the
+    first report.
+
+    Args:
+        reports (list[BenchmarkReport]): Reports to aggregate.
+        concurrent (bool): Whether the reports were measured at the same time
+            (e.g. harness pods), so their throughputs add up. Otherwise the
+            reports measured the same load one after another, and throughputs
+            are averaged weighted by duration.
+
+    Returns:
+        BenchmarkReport: Aggregated report.
+    """
+    if not reports:
+        raise ValueError('No reports to aggregate')
+    dumps = [report.dump() for report in reports]
+    metrics_list = [dump['metrics'] for dump in dumps]
+
+    requests = {}
+    for name in ['total', 'failures', 'incomplete']:
+        values = [metrics['requests'].get(name) for metrics in metrics_list]
+        if all(value is not None for value in values):
+            requests[name] = sum(values)
+    # Weigh statistics without sketches by number of successful requests
+    weights = [
+        max(metrics['requests']['total'] - metrics['requests'].get('failures', 0), 1)
+        for metrics in metrics_list
+    ]
+    for name in ['input_length', 'output_length']:
+        requests[name] = merge_statistics(
+            [metrics['requests'][name] for metrics in metrics_list], weights)
+
+    latency = {}
+    for name in metrics_list[0]['latency']:
+        if all(name in metrics['latency'] for metrics in metrics_list):
+            latency[name] = merge_statistics(
+                [metrics['latency'][name] for metrics in metrics_list], weights)
+
+    durations = [metrics['time']['duration'] for metrics in metrics_list]
+    time_metrics = {'duration': max(durations) if concurrent else sum(durations)}
+    for name, func in [('start', min), ('stop', max)]:
+        values = [metrics['time'].get(name) for metrics in metrics_list]
+        if all(value is not None for value in values):
+            time_metrics[name] = func(values)
+
+    throughput = {}
+    for name in metrics_list[0]['throughput']:
+        values = [metrics['throughput'].get(name) for metrics in metrics_list]
+        if any(value is None for value in values):
+            continue
+        if concurrent:
+            throughput[name] = sum(values)
+        else:
+            throughput[name] = sum(
+                value * duration for value, duration in zip(values, durations)) / sum(durations)
+
+    return BenchmarkReport(**{
+        'version': dumps[0]['version'],
+        'scenario': dumps[0]['scenario'],
+        'metrics': {
+            'time': time_metrics,
+            'requests': requests,
+            'latency': latency,
+            'throughput': throughput,
+            'metadata': {'aggregated_reports': len(reports)},
+        },
+    })
+
+
 def update_dict(dest: dict[Any, Any], source: dict[Any, Any]) -> None:
     """Deep update a dict using values from another dict. If a value is a dict,
     then update that dict, otherwise overwrite with the new value.
@@ -179,7 +517,7 @@ def _get_llmd_benchmark_envars() -> dict:
             sys.stderr.write('Warning: LLMDBENCH_VLLM_MODELSERVICE_GAIE_PRESETS_CONFIG empty.')
         else:
             epp_config_content = base64.b64decode(epp_config_content).decode("utf-8")
-            epp_config = yaml.safe_load(epp_config_content)
+            epp_config = load_json_or_yaml(epp_config_content)
 
             # Insert default parameter values for scorers if left undefined
             for ii, plugin in enumerate(epp_config['plugins']):
@@ -245,11 +583,14 @@ def _get_llmd_benchmark_envars() -> dict:
     return {}
 
 
-def import_benchmark_report(br_file: str) -> BenchmarkReport:
+def import_benchmark_report(br_file: str, strict: bool = True) -> BenchmarkReport:
     """Import benchmark report, and supplement with additional data from llm-d-benchmark run.
 
     Args:
         br_file (str): Benchmark report file to import.
+        strict (bool): Run all consistency checks of the report. Checks may
+            be skipped for reports known to be valid, such as when loading
+            many reports for analysis (see schema.create_from_dict).
 
     Returns:
         BenchmarkReport: Imported benchmark report supplemented with run data.
@@ -259,7 +600,7 @@ def import_benchmark_report(br_file: str) -> BenchmarkReport:
     # Import benchmark report as a dict following the schema of BenchmarkReport
     br_dict = import_yaml(br_file)
 
-    return BenchmarkReport(**br_dict)
+    return create_from_dict(br_dict, strict)
 
 
 def _vllm_timestamp_to_epoch(date_str: str) -> int:
@@ -596,7 +937,8 @@ def import_fmperf(results_file: str) -> BenchmarkReport:
     duration = results['finish_time'][-1] - results['launch_time'][0]
     req_latency = results['finish_time'] - results['launch_time']
     tpot = (req_latency - results['ttft']) / (results['generation_tokens'] - 1)
-    itl = tpot
+    # Inter-token latency is the same as time per output token
+    tpot_stats = compute_statistics(tpot, Units.MS_PER_TOKEN)
     update_dict(br_dict, {
         "scenario": {
             "model": {"name": model_name},
@@ -612,122 +954,14 @@ def import_fmperf(results_file: str) -> BenchmarkReport:
             },
             "requests": {
                 "total": len(results['prompt_tokens']),
-                "input_length": {
-                    "units": Units.COUNT,
-                    "mean": results['prompt_tokens'].mean(),
-                    "mode": stats.mode(results['prompt_tokens'])[0],
-                    "stddev": results['prompt_tokens'].std(),
-                    "min": results['prompt_tokens'].min(),
-                    "p0p1": np.percentile(results['prompt_tokens'], 0.1),
-                    "p1": np.percentile(results['prompt_tokens'], 1),
-                    "p5": np.percentile(results['prompt_tokens'], 5),
-                    "p10": np.percentile(results['prompt_tokens'], 10),
-                    "p25": np.percentile(results['prompt_tokens'], 25),
-                    "p50": np.percentile(results['prompt_tokens'], 50),
-                    "p75": np.percentile(results['prompt_tokens'], 75),
-                    "p90": np.percentile(results['prompt_tokens'], 90),
-                    "p95": np.percentile(results['prompt_tokens'], 95),
-                    "p99": np.percentile(results['prompt_tokens'], 99),
-                    "p99p9": np.percentile(results['prompt_tokens'], 99.9),
-                    "max": results['prompt_tokens'].max(),
-                },
-                "output_length": {
-                    "units": Units.COUNT,
-                    "mean": results['generation_tokens'].mean(),
-                    "mode": stats.mode(results['generation_tokens'])[0],
-                    "stddev": results['generation_tokens'].std(),
-                    "min": results['generation_tokens'].min(),
-                    "p0p1": np.percentile(results['generation_tokens'], 0.1),
-                    "p1": np.percentile(results['generation_tokens'], 1),
-                    "p5": np.percentile(results['generation_tokens'], 5),
-                    "p10": np.percentile(results['generation_tokens'], 10),
-                    "p25": np.percentile(results['generation_tokens'], 25),
-                    "p50": np.percentile(results['generation_tokens'], 50),
-                    "p75": np.percentile(results['generation_tokens'], 75),
-                    "p90": np.percentile(results['generation_tokens'], 90),
-                    "p95": np.percentile(results['generation_tokens'], 95),
-                    "p99": np.percentile(results['generation_tokens'], 99),
-                    "p99p9": np.percentile(results['generation_tokens'], 99.9),
-                    "max": results['generation_tokens'].max(),
-                },
+                "input_length": compute_statistics(results['prompt_tokens'], Units.COUNT),
+                "output_length": compute_statistics(results['generation_tokens'], Units.COUNT),
             },
             "latency": {
-                "time_to_first_token": {
-                    "units": Units.MS,
-                    "mean": results['ttft'].mean(),
-                    "mode": stats.mode(results['ttft'])[0],
-                    "stddev": results['ttft'].std(),
-                    "min": results['ttft'].min(),
-                    "p0p1": np.percentile(results['ttft'], 0.1),
-                    "p1": np.percentile(results['ttft'], 1),
-                    "p5": np.percentile(results['ttft'], 5),
-                    "p10": np.percentile(results['ttft'], 10),
-                    "p25": np.percentile(results['ttft'], 25),
-                    "p50": np.percentile(results['ttft'], 50),
-                    "p75": np.percentile(results['ttft'], 75),
-                    "p90": np.percentile(results['ttft'], 90),
-                    "p95": np.percentile(results['ttft'], 95),
-                    "p99": np.percentile(results['ttft'], 99),
-                    "p99p9": np.percentile(results['ttft'], 99.9),
-                    "max": results['ttft'].max(),
-                },
-                "time_per_output_token": {
-                    "units": Units.MS_PER_TOKEN,
-                    "mean": tpot.mean(),
-                    "mode": stats.mode(tpot)[0],
-                    "stddev": tpot.std(),
-                    "min": tpot.min(),
-                    "p0p1": np.percentile(tpot, 0.1),
-                    "p1": np.percentile(tpot, 1),
-                    "p5": np.percentile(tpot, 5),
-                    "p10": np.percentile(tpot, 10),
-                    "p25": np.percentile(tpot, 25),
-                    "p50": np.percentile(tpot, 50),
-                    "p75": np.percentile(tpot, 75),
-                    "p90": np.percentile(tpot, 90),
-                    "p95": np.percentile(tpot, 95),
-                    "p99": np.percentile(tpot, 99),
-                    "p99p9": np.percentile(tpot, 99.9),
-                    "max": tpot.max(),
-                },
-                "inter_token_latency": {
-                    "units": Units.MS_PER_TOKEN,
-                    "mean": itl.mean(),
-                    "mode": stats.mode(itl)[0],
-                    "stddev": itl.std(),
-                    "min": itl.min(),
-                    "p0p1": np.percentile(itl, 0.1),
-                    "p1": np.percentile(itl, 1),
-                    "p5": np.percentile(itl, 5),
-                    "p10": np.percentile(itl, 10),
-                    "p25": np.percentile(itl, 25),
-                    "p50": np.percentile(itl, 50),
-                    "p75": np.percentile(itl, 75),
-                    "p90": np.percentile(itl, 90),
-                    "p95": np.percentile(itl, 95),
-                    "p99": np.percentile(itl, 99),
-                    "p99p9": np.percentile(itl, 99.9),
-                    "max": itl.max(),
-                },
-                "request_latency": {
-                    "units": Units.MS,
-                    "mean": req_latency.mean(),
-                    "mode": stats.mode(req_latency)[0],
-                    "stddev": req_latency.std(),
-                    "min": req_latency.min(),
-                    "p0p1": np.percentile(req_latency, 0.1),
-                    "p1": np.percentile(req_latency, 1),
-                    "p5": np.percentile(req_latency, 5),
-                    "p10": np.percentile(req_latency, 10),
-                    "p25": np.percentile(req_latency, 25),
-                    "p50": np.percentile(req_latency, 50),
-                    "p75": np.percentile(req_latency, 75),
-                    "p90": np.percentile(req_latency, 90),
-                    "p95": np.percentile(req_latency, 95),
-                    "p99": np.percentile(req_latency, 99),
-                    "p99p9": np.percentile(req_latency, 99.9),
-                    "max": req_latency.max(),
-                },
+                "time_to_first_token": compute_statistics(results['ttft'], Units.MS),
+                "time_per_output_token": tpot_stats,
+                "inter_token_latency": dict(tpot_stats),
+                "request_latency": compute_statistics(req_latency, Units.MS),
             },
             "throughput": {
                 "output_tokens_per_sec": results['generation_tokens'].sum()/duration,
@@ -740,6 +974,131 @@ def import_fmperf(results_file: str) -> BenchmarkReport:
     return BenchmarkReport(**br_dict)
 
 
+# Per-request metrics of Inference Perf summarized by sketches, with their units
+INFERENCE_PERF_REQUEST_METRICS = {
+    'input_length': Units.COUNT,
+    'output_length': Units.COUNT,
+    'time_to_first_token': Units.S,
+    'normalized_time_per_output_token': Units.S_PER_TOKEN,
+    'time_per_output_token': Units.S_PER_TOKEN,
+    'inter_token_latency': Units.S_PER_TOKEN,
+    'request_latency': Units.S,
+}
+
+
+def _add_inference_perf_request(
+        sketches: dict[str, LogHistogram], record: dict[str, Any]) -> None:
+    """Add the metrics of a successful Inference Perf request to sketches.
+
+    Args:
+        sketches (dict[str, LogHistogram]): Sketch of each metric in
+            INFERENCE_PERF_REQUEST_METRICS.
+        record (dict): Per-request lifecycle metrics of the request.
+    """
+    info = record.get('info') or {}
+    input_tokens = info.get('input_tokens', 0)
+    output_tokens = info.get('output_tokens', 0)
+    token_times = info.get('output_token_times') or []
+    latency = record['end_time'] - record['start_time']
+    sketches['input_length'].add(input_tokens)
+    sketches['output_length'].add(output_tokens)
+    sketches['request_latency'].add(latency)
+    if output_tokens > 0:
+        sketches['normalized_time_per_output_token'].add(latency / output_tokens)
+    if token_times:
+        # Token times are only available with streaming
+        ttft = token_times[0] - record['start_time']
+        sketches['time_to_first_token'].add(ttft)
+        if output_tokens > 1:
+            sketches['time_per_output_token'].add(
+                (latency - ttft) / (output_tokens - 1))
+        for previous, current in zip(token_times, token_times[1:]):
+            sketches['inter_token_latency'].add(current - previous)
+
+
+def import_inference_perf_stage_requests(
+        requests_file: str) -> dict[int | None, dict[str, LogHistogram]]:
+    """Stream per-request lifecycle metrics from Inference Perf into sketches
+    of each stage, in a single pass over the file.
+
+    Inference Perf saves the metrics of every request in
+    per_request_lifecycle_metrics.json when its report configuration has
+    request_lifecycle.per_request enabled. Requests are read one at a time, so
+    memory use does not grow with the number of requests. Only successful
+    requests are included.
+
+    Args:
+        requests_file (str): Per-request lifecycle metrics file.
+
+    Returns:
+        dict[int | None, dict[str, LogHistogram]]: Sketch of each metric in
+            INFERENCE_PERF_REQUEST_METRICS, by stage. Requests without a
+            stage_id are under None.
+    """
+    stage_sketches = {}
+    for record in iter_json_records(requests_file):
+        if record.get('error') is not None:
+            continue
+        stage = record.get('stage_id')
+        if stage not in stage_sketches:
+            stage_sketches[stage] = {
+                name: LogHistogram() for name in INFERENCE_PERF_REQUEST_METRICS}
+        _add_inference_perf_request(stage_sketches[stage], record)
+    return stage_sketches
+
+
+def import_inference_perf_requests(
+        requests_file: str, stage: int | None = None) -> dict[str, LogHistogram]:
+    """Stream per-request lifecycle metrics from Inference Perf into sketches.
+
+    Only successful requests are included. To summarize several stages, use
+    import_inference_perf_stage_requests, which reads the file once.
+
+    Args:
+        requests_file (str): Per-request lifecycle metrics file.
+        stage (int): Only include requests from this stage, or all requests
+            if None. Requests without a stage_id are not part of any stage.
+
+    Returns:
+        dict[str, LogHistogram]: Sketch of each metric in
+            INFERENCE_PERF_REQUEST_METRICS.
+    """
+    sketches = {name: LogHistogram() for name in INFERENCE_PERF_REQUEST_METRICS}
+    for record in iter_json_records(requests_file):
+        if record.get('error') is not None:
+            continue
+        if stage is not None and record.get('stage_id') != stage:
+            continue
+        _add_inference_perf_request(sketches, record)
+    return sketches
+
+
+# Sketches of each stage of the per-request metrics file last read, by path,
+# modification time and size, as the stages of a run are imported one by one
+_inference_perf_stage_sketches: tuple[tuple, dict] | None = None
+
+
+def _get_inference_perf_stage_sketches(
+        requests_file: str) -> dict[int | None, dict[str, LogHistogram]]:
+    """Sketches of each stage of a per-request metrics file, reading it only
+    once for all the stages of a run.
+
+    Args:
+        requests_file (str): Per-request lifecycle metrics file.
+
+    Returns:
+        dict[int | None, dict[str, LogHistogram]]: Sketches by stage, see
+            import_inference_perf_stage_requests.
+    """
+    global _inference_perf_stage_sketches
+    stat = os.stat(requests_file)
+    key = (os.path.realpath(requests_file), stat.st_mtime_ns, stat.st_size)
+    if _inference_perf_stage_sketches is None or _inference_perf_stage_sketches[0] != key:
+        _inference_perf_stage_sketches = (
+            key, import_inference_perf_stage_requests(requests_file))
+    return _inference_perf_stage_sketches[1]
+
+
 def import_inference_perf(results_file: str) -> BenchmarkReport:
     """Import data from a Inference Perf run as a BenchmarkReport.
 
@@ -767,6 +1126,16 @@ def import_inference_perf(results_file: str) -> BenchmarkReport:
     else:
         config = {}
 
+    # Summarize per-request metrics, if they were saved, with sketches that
+    # can be merged across runs (see aggregate_reports)
+    requests_file = os.path.join(
+        os.path.dirname(results_file),
+        'per_request_lifecycle_metrics.json'
+    )
+    sketches = {}
+    if os.path.isfile(requests_file):
+        sketches = _get_inference_perf_stage_sketches(requests_file).get(stage, {})
+
     # Get environment variables from llm-d-benchmark run as a dict following the
     # schema of BenchmarkReport
     br_dict = _get_llmd_benchmark_envars()
@@ -923,8 +1292,98 @@ def import_inference_perf(results_file: str) -> BenchmarkReport:
         },
     })
 
+    for name, sketch in sketches.items():
+        group = 'requests' if name in ('input_length', 'output_length') else 'latency'
+        if sketch.count and name in br_dict['metrics'][group]:
+            br_dict['metrics'][group][name]['sketch'] = sketch.to_dict()
+
     return BenchmarkReport(**br_dict)
 
+def _import_nop_value(units: Units, value: Any) -> dict[str, Any]:
+    """Make a nop metric with units. Aggregate metrics of several pods are a
+    dict of statistics (min, p50, max) rather than a single value.
+
+    Args:
+        units (Units): Units of the metric.
+        value (Any): Value of the metric, or dict of its statistics.
+
+    Returns:
+        dict: Metric with units.
+    """
+    if isinstance(value, dict):
+        return {"units": units, **value}
+    return {"units": units, "value": value}
+
+
+def _import_nop_categories(cat_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Import log categories from a nop run.
+
+    Args:
+        cat_list (list[dict[str, Any]]): Categories from nop results.
+
+    Returns:
+        list[dict[str, Any]]: Categories with units.
+    """
+    new_cat_list = []
+    for cat in cat_list:
+        cat_dict = {}
+        cat_dict["title"] = cat["title"]
+        process = cat.get("process")
+        if process is not None:
+            cat_dict["process"] = process["name"]
+        cat_dict["elapsed"] = _import_nop_value(Units.S, cat["elapsed"])
+        categories = cat.get("categories")
+        if categories is not None:
+            cat_dict["categories"] = _import_nop_categories(categories)
+
+        new_cat_list.append(cat_dict)
+
+    return new_cat_list
+
+
+def _import_nop_metrics(metrics: dict[str, Any]) -> dict[str, Any]:
+    """Import metrics of a nop run, from one pod or aggregated across pods.
+
+    Args:
+        metrics (dict[str, Any]): Metrics from nop results.
+
+    Returns:
+        dict[str, Any]: Metrics with units.
+    """
+    metrics_dict = {
+        "load": {
+            "time": _import_nop_value(Units.S, metrics["load"]["time"]),
+            "size": _import_nop_value(Units.GIB, metrics["load"]["size"]),
+            "transfer_rate": _import_nop_value(
+                Units.GIB_PER_S, metrics["load"]["transfer_rate"]),
+        },
+        "dynamo_bytecode_transform": _import_nop_value(
+            Units.S, metrics["dynamo_bytecode_transform"]),
+        "torch_compile": _import_nop_value(Units.S, metrics["torch_compile"]),
+        "memory_profiling": {
+            "initial_free": _import_nop_value(
+                Units.GIB, metrics["memory_profiling"]["initial_free"]),
+            "after_free": _import_nop_value(
+                Units.GIB, metrics["memory_profiling"]["after_free"]),
+            "time": _import_nop_value(Units.S, metrics["memory_profiling"]["time"]),
+        },
+        "sleep": {
+            "time": _import_nop_value(Units.S, metrics["sleep"]["time"]),
+            "gpu_freed": _import_nop_value(Units.GIB, metrics["sleep"]["gpu_freed"]),
+            "gpu_in_use": _import_nop_value(Units.GIB, metrics["sleep"]["gpu_in_use"]),
+        },
+        "wake": _import_nop_value(Units.S, metrics["wake"]),
+        "categories": _import_nop_categories(metrics.get("categories", [])),
+    }
+
+    for name in ["load_cached_compiled_graph", "compile_graph"]:
+        value = metrics.get(name)
+        if value is not None:
+            metrics_dict[name] = _import_nop_value(Units.S, value)
+
+    return metrics_dict
+
+
 def import_nop(results_file: str) -> BenchmarkReport:
     """Import data from a nop run as a BenchmarkReport.
 
@@ -938,32 +1397,25 @@ def import_nop(results_file: str) -> BenchmarkReport:
 
     results = import_yaml(results_file)
 
-    def _import_categories(cat_list: list[dict[str,Any]]) -> list[dict[str,Any]]:
-        new_cat_list = []
-        for cat in cat_list:
-            cat_dict = {}
-            cat_dict["title"] = cat["title"]
-            process = cat.get("process")
-            if process is not None:
-                cat_dict["process"] = process["name"]
-            cat_dict["elapsed"] = {
-                        "units": Units.S,
-                        "value": cat["elapsed"],
-                    }
-            categories = cat.get("categories")
-            if categories is not None:
-                cat_dict["categories"] = _import_categories(categories)
-
-            new_cat_list.append(cat_dict)
-
-        return new_cat_list
-
-    categories = _import_categories(results["metrics"]["categories"])
-
     # Get environment variables from llm-d-benchmark run as a dict following the
     # schema of BenchmarkReport
     br_dict = _get_llmd_benchmark_envars()
 
+    metrics_metadata = _import_nop_metrics(results["metrics"])
+    engines = [results["scenario"]["platform"]["engine"]]
+    pods = results.get("pods")
+    if pods:
+        # Results of every vLLM pod, and aggregate statistics across pods
+        engines = [pod["scenario"]["platform"]["engine"] for pod in pods]
+        metrics_metadata["pods"] = [{
+            "name": pod["name"],
+            "image": pod["image"],
+            "load_format": pod["scenario"]["load_format"],
+            "sleep_mode": pod["scenario"]["sleep_mode"],
+            **_import_nop_metrics(pod["metrics"]),
+        } for pod in pods]
+        metrics_metadata["aggregate"] = _import_nop_metrics(results["aggregate"])
+
     results_dict = {
         "scenario": {
             "model": {
@@ -973,7 +1425,7 @@ def import_nop(results_file: str) -> BenchmarkReport:
                 "name": WorkloadGenerator.NOP,
             },
             "platform": {
-                "engine": [results["scenario"]["platform"]["engine"]]
+                "engine": engines,
             },
             "metadata": {
                 "load_format": results["scenario"]["load_format"],
@@ -981,63 +1433,7 @@ def import_nop(results_file: str) -> BenchmarkReport:
             },
         },
         "metrics": {
-            "metadata": {
-                "load": {
-                    "time": {
-                        "units": Units.S,
-                        "value": results["metrics"]["load"]["time"],
-                    },
-                    "size": {
-                        "units": Units.GIB,
-                        "value": results["metrics"]["load"]["size"],
-                    },
-                    "transfer_rate": {
-                        "units": Units.GIB_PER_S,
-                        "value": results["metrics"]["load"]["transfer_rate"],
-                    },
-                },
-                "dynamo_bytecode_transform": {
-                        "units": Units.S,
-                        "value": results["metrics"]["dynamo_bytecode_transform"],
-                    },
-                "torch_compile": {
-                        "units": Units.S,
-                        "value": results["metrics"]["torch_compile"],
-                    },
-                "memory_profiling": {
-                        "initial_free": {
-                            "units": Units.GIB,
-                            "value": results["metrics"]["memory_profiling"]["initial_free"],
-                        },
-                        "after_free": {
-                            "units": Units.GIB,
-                            "value": results["metrics"]["memory_profiling"]["after_free"],
-                        },
-                        "time": {
-                            "units": Units.S,
-                            "value": results["metrics"]["memory_profiling"]["time"],
-                        },
-                },
-                "sleep": {
-                        "time": {
-                            "units": Units.S,
-                            "value": results["metrics"]["sleep"]["time"],
-                        },
-                        "gpu_freed": {
-                            "units": Units.GIB,
-                            "value": results["metrics"]["sleep"]["gpu_freed"],
-                        },
-                        "gpu_in_use": {
-                            "units": Units.GIB,
-                            "value": results["metrics"]["sleep"]["gpu_in_use"],
-                        },
-                    },
-                "wake": {
-                        "units": Units.S,
-                        "value": results["metrics"]["wake"],
-                    },
-                "categories": categories
-            },
+            "metadata": metrics_metadata,
             "time": {
                 "duration": results["metrics"]["time"]["duration"],
                 "start": results["metrics"]["time"]["start"],
@@ -1120,19 +1516,365 @@ def import_nop(results_file: str) -> BenchmarkReport:
         },
     }
 
-    for name in ["load_cached_compiled_graph", "compile_graph"]:
-        value = results["metrics"].get(name)
-        if value is not None:
-            results_dict["metrics"]["metadata"][name] = {
-                                "units": Units.S,
-                                "value": value,
-                            }
-
     update_dict(br_dict, results_dict)
 
     return BenchmarkReport(**br_dict)
 
 
+# Default results files of each workload generator with results to convert,
+# converted in batch mode. The loadgen harness writes benchmark reports.
+RESULTS_FILE_PATTERNS = {
+    WorkloadGenerator.FMPERF: '*.csv',
+    WorkloadGenerator.GUIDELLM: 'results.json',
+    WorkloadGenerator.INFERENCE_PERF: 'stage_*.json',
+    WorkloadGenerator.VLLM_BENCHMARK: 'vllm*.json',
+    WorkloadGenerator.NOP: 'result.yaml',
+}
+
+
+def import_results(results_file: str, workload_generator: str) -> BenchmarkReport:
+    """Import results of any supported workload generator as a BenchmarkReport.
+
+    Args:
+        results_file (str): Results file to import.
+        workload_generator (str): Workload generator that created the results.
+
+    Returns:
+        BenchmarkReport: Imported data.
+    """
+    match workload_generator:
+        case WorkloadGenerator.FMPERF:
+            return import_fmperf(results_file)
+        case WorkloadGenerator.GUIDELLM:
+            return import_guidellm(results_file)
+        case WorkloadGenerator.INFERENCE_PERF:
+            return import_inference_perf(results_file)
+        case WorkloadGenerator.VLLM_BENCHMARK:
+            return import_vllm_benchmark(results_file)
+        case WorkloadGenerator.NOP:
+            return import_nop(results_file)
+    raise ValueError('Unsupported workload generator: %s, must be one of: %s' %
+        (workload_generator, str([wg.value for wg in RESULTS_FILE_PATTERNS])[1:-1]))
+
+
+# Name of report log of an experiment, in the parent directory of the
+# results directories of its treatments
+REPORT_LOG_FILE = 'benchmark_reports.jsonl'
+
+
+def get_report_log_key(results_file: str) -> str:
+    """Get the key of the benchmark report of a results file in a report log,
+    which is <results directory name>/<results file name>.
+
+    Args:
+        results_file (str): Results file.
+
+    Returns:
+        str: Report log key.
+    """
+    results_file = os.path.abspath(results_file)
+    return '%s/%s' % (os.path.basename(os.path.dirname(results_file)),
+                      os.path.basename(results_file))
+
+
+def _dumps_json(data: Any) -> bytes:
+    """Serialize data as compact JSON, with orjson if it is installed.
+
+    Args:
+        data (Any): Data to serialize.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(',', ':')).encode('UTF-8')
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse JSON, with orjson if it is installed.
+
+    Args:
+        data (bytes): UTF-8 encoded JSON.
+
+    Returns:
+        Any: Parsed data.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _append_line(file_path: str, line: bytes) -> int:
+    """Append a line to a file with a single write, so lines from concurrent
+    writers are not interleaved.
+
+    O_APPEND writes are atomic on local filesystems, but not on NFS, where a
+    client appends at the end of the file as it last saw it, overwriting lines
+    appended by other clients. The write is done holding a POSIX record lock,
+    which NFS clients take through the server and which makes them revalidate
+    the file size. Filesystems without lock support, or Windows, only have the
+    guarantees of O_APPEND.
+
+    Args:
+        file_path (str): File to append to.
+        line (bytes): Line, without newline.
+
+    Returns:
+        int: Offset of line in file.
+    """
+    line += b'\n'
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            try:
+                # Lock the whole file, released when it is closed
+                fcntl.lockf(fd, fcntl.LOCK_EX)
+            except OSError:
+                # Locks not supported by filesystem
+                pass
+        written = os.write(fd, line)
+        if written != len(line):
+            raise OSError('Partial write of %d/%d bytes to %s' % (written, len(line), file_path))
+        # With O_APPEND the file position is the end of the line written
+        return os.lseek(fd, 0, os.SEEK_CUR) - len(line)
+    finally:
+        os.close(fd)
+
+
+def append_report_log(log_file: str, key: str, report: BenchmarkReport) -> None:
+    """Append a benchmark report to a report log.
+
+    A report log is a JSON Lines file with one benchmark report per line, as
+    {"key": key, "report": report}, where the report has the same fields as a
+    benchmark report file (including its schema version). Reading the log is
+    a single sequential read instead of a search for report files. An index
+    of the offset and length of each line by key is appended to
+    <log_file>.idx for random access.
+
+    Args:
+        log_file (str): Report log file.
+        key (str): Key of report, such as the treatment and results file (see
+            get_report_log_key). A later report with the same key replaces an
+            earlier one.
+        report (BenchmarkReport): Benchmark report.
+    """
+    line = _dumps_json({'key': key, 'report': report.dump()})
+    offset = _append_line(log_file, line)
+    _append_line(log_file + '.idx', _dumps_json(
+        {'key': key, 'offset': offset, 'length': len(line)}))
+
+
+def _index_report_log(log_file: str) -> dict[str, tuple[int, int]]:
+    """Index a report log by reading every line.
+
+    Args:
+        log_file (str): Report log file.
+
+    Returns:
+        dict[str, tuple[int, int]]: Offset and length of line of each key.
+    """
+    index = {}
+    offset = 0
+    with open(log_file, 'rb') as file:
+        for line in file:
+            if line.strip():
+                index[_loads_json(line)['key']] = (offset, len(line.rstrip(b'\n')))
+            offset += len(line)
+    return index
+
+
+def read_report_log_index(log_file: str) -> dict[str, tuple[int, int]]:
+    """Read the index of a report log.
+
+    The log is indexed again if the index is missing or does not cover the
+    whole log, for example if the index was not copied with the log.
+
+    Args:
+        log_file (str): Report log file.
+
+    Returns:
+        dict[str, tuple[int, int]]: Offset and length of line of each key.
+    """
+    check_file(log_file)
+    index = {}
+    end = 0
+    index_file = log_file + '.idx'
+    if os.path.isfile(index_file):
+        with open(index_file, 'rb') as file:
+            for line in file:
+                try:
+                    entry = _loads_json(line)
+                except ValueError:
+                    # Incomplete last line of an interrupted write
+                    continue
+                index[entry['key']] = (entry['offset'], entry['length'])
+                end = max(end, entry['offset'] + entry['length'] + 1)
+    if end != os.path.getsize(log_file):
+        return _index_report_log(log_file)
+    return index
+
+
+def import_report_log(log_file: str, strict: bool = True) -> Iterator[tuple[str, BenchmarkReport]]:
+    """Read all benchmark reports of a report log, in the order they were
+    appended.
+
+    Args:
+        log_file (str): Report log file.
+        strict (bool): Run all consistency checks of reports (see
+            schema.create_from_dict).
+
+    Returns:
+        Iterator[tuple[str, BenchmarkReport]]: Key and benchmark report of
+            each line.
+    """
+    check_file(log_file)
+    with open(log_file, 'rb') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = _loads_json(line)
+            yield entry['key'], create_from_dict(entry['report'], strict)
+
+
+def import_report_log_entry(log_file: str, key: str, strict: bool = True) -> BenchmarkReport:
+    """Read the benchmark report with a given key from a report log, using
+    its index.
+
+    Args:
+        log_file (str): Report log file.
+        key (str): Key of report.
+        strict (bool): Run all consistency checks of report (see
+            schema.create_from_dict).
+
+    Returns:
+        BenchmarkReport: Benchmark report.
+    """
+    offset, length = read_report_log_index(log_file)[key]
+    with open(log_file, 'rb') as file:
+        file.seek(offset)
+        entry = _loads_json(file.read(length))
+    if entry['key'] != key:
+        raise ValueError('Report log index is inconsistent with %s' % log_file)
+    return create_from_dict(entry['report'], strict)
+
+
+def convert_results_file(
+        results_file: str,
+        output_file: str,
+        workload_generator: str,
+        force: bool = False,
+        report_log: str | None = None) -> None:
+    """Convert a results file to a benchmark report file.
+
+    Args:
+        results_file (str): Results file to convert.
+        output_file (str): Output file for benchmark report.
+        workload_generator (str): Workload generator that created the results.
+        force (bool): Write to output file even if it already exists.
+        report_log (str): Report log to also append the benchmark report to,
+            with the key from get_report_log_key.
+    """
+    if os.path.exists(output_file) and not force:
+        raise FileExistsError('Output file already exists: %s' % output_file)
+    report = import_results(results_file, workload_generator)
+    report.export_yaml(output_file)
+    if report_log:
+        append_report_log(report_log, get_report_log_key(results_file), report)
+
+
+def get_benchmark_report_file(results_file: str, output_dir: str | None = None) -> str:
+    """Get the benchmark report file name for a results file, named
+    benchmark_report,_<results file name>.yaml
+
+    Args:
+        results_file (str): Results file.
+        output_dir (str): Directory of benchmark report, if not the directory
+            of the results file.
+
+    Returns:
+        str: Benchmark report file path.
+    """
+    if output_dir is None:
+        output_dir = os.path.dirname(results_file)
+    return os.path.join(
+        output_dir, 'benchmark_report,_%s.yaml' % os.path.basename(results_file))
+
+
+def _convert_batch_file(task: tuple[str, str, str, bool, str | None]) -> str | None:
+    """Convert a results file, returning the error message if it failed.
+
+    Args:
+        task (tuple[str, str, str, bool, str | None]): Arguments of
+            convert_results_file().
+
+    Returns:
+        str | None: Error message, or None if converted.
+    """
+    try:
+        convert_results_file(*task)
+    except Exception as e:
+        return '%s: %s' % (type(e).__name__, e)
+    return None
+
+
+def convert_batch(
+        results_dir: str,
+        workload_generator: str,
+        pattern: str | None = None,
+        output_dir: str | None = None,
+        force: bool = False,
+        max_workers: int | None = 1,
+        report_log: str | None = None) -> dict[str, str | None]:
+    """Convert all results files in a directory to benchmark reports, in a
+    single interpreter and optionally in parallel processes. A failure to
+    convert a file does not stop the conversion of others.
+
+    Args:
+        results_dir (str): Directory with results files, not searched
+            recursively.
+        workload_generator (str): Workload generator that created the results.
+        pattern (str): Glob pattern of results file names, defaults to the
+            results files of the workload generator in RESULTS_FILE_PATTERNS.
+        output_dir (str): Directory of benchmark reports, defaults to
+            results_dir. Reports are named benchmark_report,_<results file>.yaml
+        force (bool): Overwrite benchmark reports that already exist.
+        max_workers (int | None): Number of parallel processes, or None for
+            the number of CPUs.
+        report_log (str): Report log to also append benchmark reports to.
+
+    Returns:
+        dict[str, str | None]: Error message of each converted results file,
+            or None if converted.
+    """
+    if not os.path.isdir(results_dir):
+        raise FileNotFoundError('Not a directory: %s' % results_dir)
+    if pattern is None:
+        if workload_generator not in RESULTS_FILE_PATTERNS:
+            raise ValueError('Unsupported workload generator: %s' % workload_generator)
+        pattern = RESULTS_FILE_PATTERNS[workload_generator]
+    if output_dir is None:
+        output_dir = results_dir
+
+    # Paths that are not regular files, such as broken links, are reported as
+    # errors like any other file that fails to convert
+    results_files = sorted(glob.glob(os.path.join(glob.escape(results_dir), pattern)))
+    tasks = [
+        (results_file,
+         get_benchmark_report_file(results_file, output_dir),
+         workload_generator,
+         force,
+         report_log)
+        for results_file in results_files]
+
+    if max_workers == 1 or len(tasks) <= 1:
+        errors = map(_convert_batch_file, tasks)
+        return dict(zip(results_files, errors))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        errors = executor.map(_convert_batch_file, tasks)
+        return dict(zip(results_files, errors))
+
+
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(
@@ -1140,6 +1882,8 @@ if __name__ == "__main__":
     parser.add_argument(
         'results_file',
         type=str,
+        default=None,
+        nargs='?',
         help='Results file to convert.')
     parser.add_argument(
         'output_file',
@@ -1156,41 +1900,81 @@ if __name__ == "__main__":
         type=str,
         default=WorkloadGenerator.VLLM_BENCHMARK,
         help='Workload generator used.')
+    parser.add_argument(
+        '-b', '--batch',
+        type=str,
+        default=None,
+        metavar='RESULTS_DIR',
+        help='Convert all results files in a directory, each to '
+             'benchmark_report,_<results file>.yaml in the same directory.')
+    parser.add_argument(
+        '-p', '--pattern',
+        type=str,
+        default=None,
+        help='Glob pattern of results files to convert in batch mode, '
+             'defaults to the results files of the workload generator.')
+    parser.add_argument(
+        '-l', '--log',
+        type=str,
+        default=None,
+        metavar='REPORT_LOG',
+        help='Also append benchmark reports to a report log (JSON Lines), '
+             'such as %s in the parent directory of results directories.' % REPORT_LOG_FILE)
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of files to convert in parallel in batch mode, '
+             '0 to use all CPUs.')
 
     args = parser.parse_args()
-    if args.output_file and os.path.exists(args.output_file) and not args.force:
-        sys.stderr.write('Output file already exists: %s\n' % args.output_file)
+    if args.workload_generator not in RESULTS_FILE_PATTERNS:
+        sys.stderr.write('Unsupported workload generator: %s\n' %
+            args.workload_generator)
+        if args.workload_generator == WorkloadGenerator.LOADGEN:
+            sys.stderr.write('The loadgen harness writes benchmark reports, '
+                             'which need no conversion\n')
+        sys.stderr.write('Must be one of: %s\n' %
+            str([wg.value for wg in RESULTS_FILE_PATTERNS])[1:-1])
         sys.exit(1)
 
-    match args.workload_generator:
-        case WorkloadGenerator.FMPERF:
-            if args.output_file:
-                import_fmperf(args.results_file).export_yaml(args.output_file)
+    if args.batch:
+        if args.results_file:
+            parser.error('results_file cannot be used with --batch')
+        errors = convert_batch(
+            args.batch,
+            args.workload_generator,
+            pattern=args.pattern,
+            force=args.force,
+            max_workers=args.jobs if args.jobs > 0 else None,
+            report_log=args.log)
+        for results_file, error in errors.items():
+            if error:
+                sys.stderr.write('Error converting %s: %s\n' % (results_file, error))
             else:
-                import_fmperf(args.results_file).print_yaml()
-        case WorkloadGenerator.GUIDELLM:
-            if args.output_file:
-                import_guidellm(args.results_file).export_yaml(args.output_file)
-            else:
-                import_guidellm(args.results_file).print_yaml()
-        case WorkloadGenerator.INFERENCE_PERF:
-            if args.output_file:
-                import_inference_perf(args.results_file).export_yaml(args.output_file)
-            else:
-                import_inference_perf(args.results_file).print_yaml()
-        case WorkloadGenerator.VLLM_BENCHMARK:
-            if args.output_file:
-                import_vllm_benchmark(args.results_file).export_yaml(args.output_file)
-            else:
-                import_vllm_benchmark(args.results_file).print_yaml()
-        case WorkloadGenerator.NOP:
-            if args.output_file:
-                import_nop(args.results_file).export_yaml(args.output_file)
-            else:
-                import_nop(args.results_file).print_yaml()
-        case _:
-            sys.stderr.write('Unsupported workload generator: %s\n' %
-                args.workload_generator)
-            sys.stderr.write('Must be one of: %s\n' %
-                str([wg.value for wg in WorkloadGenerator])[1:-1])
+                sys.stdout.write('Converted %s\n' % results_file)
+        if not errors:
+            sys.stderr.write('No results files found matching: %s\n' %
+                os.path.join(args.batch, args.pattern or
+                             RESULTS_FILE_PATTERNS[args.workload_generator]))
+        if any(errors.values()):
             sys.exit(1)
+        sys.exit(0)
+
+    if not args.results_file:
+        parser.error('results_file is required, unless using --batch')
+    if args.output_file and os.path.exists(args.output_file) and not args.force:
+        sys.stderr.write('Output file already exists: %s\n' % args.output_file)
+        sys.exit(1)
+
+    try:
+        report = import_results(args.results_file, args.workload_generator)
+    except (FileNotFoundError, ValueError) as e:
+        sys.stderr.write('%s\n' % e)
+        sys.exit(2)
+    if args.output_file:
+        report.export_yaml(args.output_file)
+    else:
+        report.print_yaml()
+    if args.log:
+        append_report_log(args.log, get_report_log_key(args.results_file), report)
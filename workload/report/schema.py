@@ -5,13 +5,19 @@ import json
 from operator import attrgetter
 from typing import Optional, Any
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, ValidationInfo, model_validator
 import yaml
 
 
 # BenchmarkReport schema version
 VERSION = '0.1'
 
+
+def _skip_checks(info: ValidationInfo) -> bool:
+    """Whether consistency checks are disabled, see create_from_dict()."""
+    return bool(info.context) and not info.context.get('strict', True)
+
+
 class Parallelism(BaseModel):
     """Accelerator parallelism details."""
 
@@ -65,8 +71,10 @@ class Host(BaseModel):
     metadata: Optional[Any] = None
 
     @model_validator(mode='after')
-    def check_types(self):
+    def check_types(self, info: ValidationInfo):
         """Types must be either all 'replica' or a mix of 'prefill' and 'decode'."""
+        if _skip_checks(info):
+            return self
         if len(self.type) <= 1:
             # Nothing to compare
             return self
@@ -122,6 +130,8 @@ class WorkloadGenerator(StrEnum):
             benchmark_serving from vLLM
         NOP: str
             vLLM Load times
+        LOADGEN: str
+            Native load generator of llm-d-benchmark
     """
 
     FMPERF = auto()
@@ -129,6 +139,7 @@ class WorkloadGenerator(StrEnum):
     INFERENCE_PERF = 'inference-perf'
     VLLM_BENCHMARK = 'vllm-benchmark'
     NOP = 'nop'
+    LOADGEN = 'loadgen'
 
 
 class Load(BaseModel):
@@ -269,6 +280,9 @@ class Statistics(BaseModel):
     p99: Optional[float | int] = None
     p99p9: Optional[float | int] = None
     max: Optional[float | int] = None
+    sketch: Optional[dict[str, Any]] = None
+    """Serialized sketch of the distribution (see sketch.py), which can be
+    merged with sketches of other reports to recompute percentiles."""
 
 
 class Requests(BaseModel):
@@ -286,7 +300,9 @@ class Requests(BaseModel):
     """Output sequence length."""
 
     @model_validator(mode='after')
-    def check_units(self):
+    def check_units(self, info: ValidationInfo):
+        if _skip_checks(info):
+            return self
         if self.input_length.units not in units_quantity:
             raise ValueError(f'Invalid units "{self.input_length.units}", must be one of: {" ".join(units_quantity)}')
         if self.output_length.units not in units_quantity:
@@ -324,7 +340,9 @@ class Latency(BaseModel):
     """End-to-end request latency."""
 
     @model_validator(mode='after')
-    def check_units(self):
+    def check_units(self, info: ValidationInfo):
+        if _skip_checks(info):
+            return self
         if self.time_to_first_token.units not in units_time:
             raise ValueError(f'Invalid units "{self.time_to_first_token.units}", must be one of: {" ".join(units_time)}')
         if self.normalized_time_per_output_token and self.normalized_time_per_output_token.units not in units_gen_latency:
@@ -355,7 +373,9 @@ class Service(BaseModel):
     kv_cache_size: Optional[Statistics] = None
 
     @model_validator(mode='after')
-    def check_units(self):
+    def check_units(self, info: ValidationInfo):
+        if _skip_checks(info):
+            return self
         if self.batch_size and self.batch_size.units not in units_quantity:
             raise ValueError(f'Invalid units "{self.batch_size.units}", must be one of: {" ".join(units_quantity)}')
         if self.queue_size and self.queue_size.units not in units_quantity:
@@ -373,7 +393,9 @@ class MemoryMetrics(BaseModel):
     bandwidth: Optional[Statistics] = None
 
     @model_validator(mode='after')
-    def check_units(self):
+    def check_units(self, info: ValidationInfo):
+        if _skip_checks(info):
+            return self
         if self.consumption and self.consumption.units not in units_memory:
             raise ValueError(f'Invalid units "{self.consumption.units}", must be one of: {" ".join(units_memory)}')
         if self.utilization and self.utilization.units not in units_portion:
@@ -389,7 +411,9 @@ class ComputeMetrics(BaseModel):
     utilization: Optional[Statistics] = None
 
     @model_validator(mode='after')
-    def check_units(self):
+    def check_units(self, info: ValidationInfo):
+        if _skip_checks(info):
+            return self
         if self.utilization.units not in units_portion:
             raise ValueError(f'Invalid units "{self.utilization.units}", must be one of: {" ".join(units_portion)}')
         return self
@@ -403,7 +427,9 @@ class AcceleratorMetrics(BaseModel):
     power: Optional[Statistics] = None
 
     @model_validator(mode='after')
-    def check_units(self):
+    def check_units(self, info: ValidationInfo):
+        if _skip_checks(info):
+            return self
         if self.power and self.power.units not in units_power:
             raise ValueError(f'Invalid units "{self.power.units}", must be one of: {" ".join(units_power)}')
         return self
@@ -446,13 +472,15 @@ class BenchmarkReport(BaseModel):
         return self
 
     @model_validator(mode='after')
-    def check_corresponding_lengths(self):
+    def check_corresponding_lengths(self, info: ValidationInfo):
         """Ensure the lengths of the following match (if present):
             - scenario.host.accelerator
             - scenario.host.type
             - scenario.platform.engine
             - metrics.resources.accelerator
         """
+        if _skip_checks(info):
+            return self
         entity_lengths = {
             "scenario.host.accelerator": None,
             "scenario.host.type": None,
@@ -535,17 +563,39 @@ def make_json_schema() -> str:
     return json.dumps(BenchmarkReport.model_json_schema(), indent=2)
 
 
-def create_from_str(yaml_str: str) -> BenchmarkReport:
+def create_from_dict(data: dict[str, Any], strict: bool = True) -> BenchmarkReport:
+    """
+    Create a BenchmarkReport instance from a dict.
+
+    Reports that are known to be valid, such as those written by
+    llm-d-benchmark, may be loaded with strict set to False when loading many
+    reports. Field types are still validated, but consistency checks across
+    fields (units and corresponding list lengths) are skipped.
+
+    Args:
+        data (dict): Benchmark report fields.
+        strict (bool): Run all consistency checks.
+
+    Returns:
+        BenchmarkReport: Instance with values from dict.
+    """
+    return BenchmarkReport.model_validate(data, context={'strict': strict})
+
+
+def create_from_str(yaml_str: str, strict: bool = True) -> BenchmarkReport:
     """
     Create a BenchmarkReport instance from a JSON/YAML string.
 
     Args:
         yaml_str (str): JSON/YAML string to import.
+        strict (bool): Validate the report, see create_from_dict().
 
     Returns:
         BenchmarkReport: Instance with values from string.
     """
-    return BenchmarkReport(**yaml.safe_load(yaml_str))
+    # Use the libyaml bindings when PyYAML was built with them
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return create_from_dict(yaml.load(yaml_str, Loader=loader), strict)
 
 # If this is executed directly, print JSON schema.
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+# Mergeable sketches of metric distributions. A sketch summarizes any number of
+# values (such as per-request latencies) in a small, fixed amount of memory,
+# and sketches from different runs or harness pods can be merged to get
+# quantiles of the combined values.
+
+import base64
+import math
+import struct
+from typing import Any, Iterable
+import zlib
+
+
+class LogHistogram:
+    """Histogram with logarithmically sized buckets.
+
+    Every positive value falls in a bucket whose bounds are consecutive powers
+    of gamma = (1 + relative_accuracy) / (1 - relative_accuracy), so quantiles
+    are estimated within relative_accuracy of an actual value (as in DDSketch).
+    Values at or below min_value, including zero and negative values, are
+    counted in a separate zero bucket. Count, sum, sum of squares, min and max
+    are exact.
+
+    Histograms with the same relative accuracy and min value can be merged.
+    """
+
+    TYPE = 'log_histogram'
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('Relative accuracy must be between 0 and 1: %s' % relative_accuracy)
+        if min_value <= 0:
+            raise ValueError('Minimum value must be positive: %s' % min_value)
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.counts: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a value.
+
+        Args:
+            value (float): Value to add.
+        """
+        self.count += 1
+        self.sum += value
+        self.sum_squares += value * value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.counts[index] = self.counts.get(index, 0) + 1
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add several values.
+
+        Args:
+            values (Iterable[float]): Values to add. Numpy arrays are added
+                without looping over values in Python.
+        """
+        if type(values).__module__ != 'numpy':
+            for value in values:
+                self.add(value)
+            return
+
+        import numpy as np
+
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.sum += values.sum().item()
+        self.sum_squares += np.dot(values, values).item()
+        self.min = min(self.min, values.min().item())
+        self.max = max(self.max, values.max().item())
+        positive = values[values > self.min_value]
+        self.zero_count += values.size - positive.size
+        indexes, counts = np.unique(
+            np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+            return_counts=True)
+        for index, count in zip(indexes.tolist(), counts.tolist()):
+            self.counts[index] = self.counts.get(index, 0) + count
+
+    def merge(self, other: 'LogHistogram') -> None:
+        """Add the values of another histogram.
+
+        Args:
+            other (LogHistogram): Histogram to merge into this one.
+        """
+        if (other.relative_accuracy != self.relative_accuracy
+                or other.min_value != self.min_value):
+            raise ValueError('Cannot merge histograms with different relative accuracy or min value')
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        """Mean of values."""
+        if self.count == 0:
+            return math.nan
+        return self.sum / self.count
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of values."""
+        if self.count == 0:
+            return math.nan
+        mean = self.mean
+        return math.sqrt(max(0.0, self.sum_squares / self.count - mean * mean))
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile of values.
+
+        Args:
+            q (float): Quantile, between 0 and 1.
+
+        Returns:
+            float: Estimated value, within the relative accuracy of the value
+                at the quantile, or NaN if there are no values.
+        """
+        if self.count == 0:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return self.min
+        seen = self.zero_count
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                # Midpoint of bucket which minimizes the relative error
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize histogram.
+
+        Bucket counts are stored as a dense array starting from the lowest
+        bucket index, compressed and encoded in base64, which is compact for
+        the narrow ranges of latencies.
+
+        Returns:
+            dict: Serialized histogram, which may be saved as JSON/YAML.
+        """
+        offset = min(self.counts, default=0)
+        length = max(self.counts, default=-1) - offset + 1
+        counts = [0] * length
+        for index, count in self.counts.items():
+            counts[index - offset] = count
+        data = {
+            'type': self.TYPE,
+            'relative_accuracy': self.relative_accuracy,
+            'min_value': self.min_value,
+            'count': self.count,
+            'sum': self.sum,
+            'sum_squares': self.sum_squares,
+            'zero_count': self.zero_count,
+            'offset': offset,
+            'counts': base64.b64encode(
+                zlib.compress(struct.pack('<%dQ' % length, *counts))).decode('ascii'),
+        }
+        if self.count:
+            data['min'] = self.min
+            data['max'] = self.max
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'LogHistogram':
+        """Deserialize histogram.
+
+        Args:
+            data (dict): Serialized histogram from to_dict().
+
+        Returns:
+            LogHistogram: Histogram.
+        """
+        if data.get('type') != cls.TYPE:
+            raise ValueError('Not a serialized %s: %s' % (cls.TYPE, data.get('type')))
+        hist = cls(data['relative_accuracy'], data['min_value'])
+        packed = zlib.decompress(base64.b64decode(data['counts']))
+        counts = struct.unpack('<%dQ' % (len(packed) // 8), packed)
+        hist.counts = {
+            data['offset'] + ii: count
+            for ii, count in enumerate(counts)
+            if count
+        }
+        hist.zero_count = data['zero_count']
+        hist.count = data['count']
+        hist.sum = data['sum']
+        hist.sum_squares = data['sum_squares']
+        hist.min = data.get('min', math.inf)
+        hist.max = data.get('max', -math.inf)
+        return hist